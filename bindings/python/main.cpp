@@ -1,10 +1,134 @@
 #include <pybind11/pybind11.h>
+
+#include <string>
+#include <unordered_map>
+
 #include "corepy_kernels.h"
 
 namespace py = pybind11;
 
+namespace {
+
+// Element type of a 1-D contiguous buffer (array.array, memoryview, numpy)
+corepy::DType dtype_of(const py::buffer_info& info) {
+    if (info.ndim != 1 || (info.size > 1 && info.strides[0] != info.itemsize)) {
+        throw py::value_error("kernels take 1-D contiguous buffers");
+    }
+    const std::string& format = info.format;
+    const char code = format.empty() ? '\0' : format.back();
+    if ((code == 'B' || code == '?') && info.itemsize == 1) return corepy::DType::Bool;
+    if ((code == 'i' || code == 'l') && info.itemsize == 4) return corepy::DType::Int32;
+    if ((code == 'q' || code == 'l') && info.itemsize == 8) return corepy::DType::Int64;
+    if (code == 'f' && info.itemsize == 4) return corepy::DType::Float32;
+    if (code == 'd' && info.itemsize == 8) return corepy::DType::Float64;
+    throw py::type_error("unsupported buffer format '" + format + "'");
+}
+
+corepy::ConstSpan input(const py::buffer_info& info) {
+    return {info.ptr, static_cast<int64_t>(info.size), dtype_of(info)};
+}
+
+corepy::Span output(const py::buffer_info& info) {
+    if (info.readonly) {
+        throw py::value_error("output buffer is read-only");
+    }
+    return {info.ptr, static_cast<int64_t>(info.size), dtype_of(info)};
+}
+
+template <typename Op>
+Op lookup(const std::unordered_map<std::string, Op>& ops, const std::string& name) {
+    auto it = ops.find(name);
+    if (it == ops.end()) {
+        throw py::value_error("unknown kernel '" + name + "'");
+    }
+    return it->second;
+}
+
+const std::unordered_map<std::string, corepy::BinaryOp> kBinary = {
+    {"add", corepy::BinaryOp::Add}, {"sub", corepy::BinaryOp::Sub}, {"mul", corepy::BinaryOp::Mul},
+    {"truediv", corepy::BinaryOp::TrueDiv}, {"floordiv", corepy::BinaryOp::FloorDiv}, {"mod", corepy::BinaryOp::Mod},
+};
+
+const std::unordered_map<std::string, corepy::CompareOp> kCompare = {
+    {"eq", corepy::CompareOp::Eq}, {"ne", corepy::CompareOp::Ne}, {"lt", corepy::CompareOp::Lt},
+    {"le", corepy::CompareOp::Le}, {"gt", corepy::CompareOp::Gt}, {"ge", corepy::CompareOp::Ge},
+    {"and", corepy::CompareOp::And}, {"or", corepy::CompareOp::Or}, {"xor", corepy::CompareOp::Xor},
+};
+
+const std::unordered_map<std::string, corepy::UnaryOp> kUnary = {
+    {"neg", corepy::UnaryOp::Neg}, {"abs", corepy::UnaryOp::Abs}, {"not", corepy::UnaryOp::Not},
+};
+
+const std::unordered_map<std::string, corepy::ReduceOp> kReduce = {
+    {"sum", corepy::ReduceOp::Sum}, {"min", corepy::ReduceOp::Min}, {"max", corepy::ReduceOp::Max},
+};
+
+}  // namespace
+
 PYBIND11_MODULE(_corepy_cpp, m) {
-    m.doc() = "Corepy C++ Backend"; 
-    
+    m.doc() = "Corepy C++ Backend";
+
     m.def("add_one", &corepy::add_one_kernel, "A function that adds one");
+
+    // The kernels fill a preallocated output buffer and return a status code:
+    // 0 done, 1 rerun in Python (the result would differ from Python's),
+    // 2 no native kernel for these types. Buffers are resolved with the GIL
+    // held; the loops run with it released.
+    m.def("binary", [](const std::string& op, py::buffer a, py::buffer b, py::buffer out) {
+        const auto kind = lookup(kBinary, op);
+        const auto ia = a.request(), ib = b.request(), io = out.request(true);
+        const auto sa = input(ia), sb = input(ib);
+        const auto so = output(io);
+        py::gil_scoped_release release;
+        return static_cast<int>(corepy::binary(kind, sa, sb, so));
+    }, py::arg("op"), py::arg("a"), py::arg("b"), py::arg("out"),
+       "out = a <op> b for add, sub, mul, truediv, floordiv and mod");
+
+    m.def("compare", [](const std::string& op, py::buffer a, py::buffer b, py::buffer out) {
+        const auto kind = lookup(kCompare, op);
+        const auto ia = a.request(), ib = b.request(), io = out.request(true);
+        const auto sa = input(ia), sb = input(ib);
+        const auto so = output(io);
+        py::gil_scoped_release release;
+        return static_cast<int>(corepy::compare(kind, sa, sb, so));
+    }, py::arg("op"), py::arg("a"), py::arg("b"), py::arg("out"),
+       "out = a <op> b as 0/1 bytes for eq, ne, lt, le, gt, ge, and, or and xor");
+
+    m.def("unary", [](const std::string& op, py::buffer a, py::buffer out) {
+        const auto kind = lookup(kUnary, op);
+        const auto ia = a.request(), io = out.request(true);
+        const auto sa = input(ia);
+        const auto so = output(io);
+        py::gil_scoped_release release;
+        return static_cast<int>(corepy::unary(kind, sa, so));
+    }, py::arg("op"), py::arg("a"), py::arg("out"), "out = <op> a for neg, abs and not");
+
+    m.def("cast", [](py::buffer a, py::buffer out) {
+        const auto ia = a.request(), io = out.request(true);
+        const auto sa = input(ia);
+        const auto so = output(io);
+        py::gil_scoped_release release;
+        return static_cast<int>(corepy::cast(sa, so));
+    }, py::arg("a"), py::arg("out"), "Converts a into the element type of out");
+
+    m.def("reduce", [](const std::string& op, py::buffer a) -> py::object {
+        const auto kind = lookup(kReduce, op);
+        const auto ia = a.request();
+        const auto sa = input(ia);
+        corepy::Scalar result{};
+        corepy::Status status;
+        {
+            py::gil_scoped_release release;
+            status = corepy::reduce(kind, sa, &result);
+        }
+        if (status != corepy::Status::Ok) {
+            return py::none();
+        }
+        if (result.is_float) {
+            return py::float_(result.f);
+        }
+        return py::int_(result.i);
+    }, py::arg("op"), py::arg("a"), "sum, min or max of a; None when Python must compute it");
+
+    m.def("simd_level", &corepy::simd_level, "Instruction set the kernels run with on this CPU");
 }
@@ -1,10 +1,16 @@
 """
 Corepy: A unified, high-performance core runtime.
 """
-from corepy import data, schema, runtime
+from corepy import data, schema, runtime, io
+from .data import read_columnar, read_csv, read_ipc, scan_columnar, scan_csv, scan_ipc
 from .tensor import Tensor
 from . import backend
 from .ops import math as _math_ops # Trigger registration
+from .ops import vector as _vector_ops  # noqa: F401
+from .ops import sorting as _sorting_ops  # noqa: F401
+# C++ kernels over the Python ones, when built (imports ``vector`` itself)
+from .ops import native as _native_ops  # noqa: F401
+from . import shared
 
 try:
     from ._corepy_cpp import add_one
@@ -15,4 +21,19 @@ except ImportError:
 
 __version__ = "0.2.0"
 
-__all__ = ["data", "schema", "runtime", "add_one", "Tensor", "backend"]
+__all__ = [
+    "data",
+    "schema",
+    "runtime",
+    "io",
+    "shared",
+    "add_one",
+    "Tensor",
+    "backend",
+    "read_csv",
+    "read_ipc",
+    "read_columnar",
+    "scan_csv",
+    "scan_ipc",
+    "scan_columnar",
+]
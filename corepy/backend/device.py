@@ -60,8 +60,9 @@ class CPUDevice(Device):
     @property
     def memory_free(self) -> int:
         # Implementation to fetch real memory stats would go here (e.g., using psutil)
-        # For now, return a safe large number or implement basic `psutil` check if allowed
-        # Fallback to 'unknown'/None if not checking
+        # For now, report the memory limit when known, else a safe large number
+        if self._info.memory_limit_bytes is not None:
+            return self._info.memory_limit_bytes
         return 1024**3 * 16 # Placeholder: 16GB
 
 class GPUDevice(Device):
@@ -127,12 +128,46 @@ def _detect_cuda_gpus() -> List[int]:
             
     return []
 
+# cgroup v1 reports "no limit" as a huge page-aligned number rather than "max"
+_CGROUP_UNLIMITED = 1 << 60
+
+def _read_limit(path: str) -> Optional[int]:
+    try:
+        with open(path) as f:
+            value = f.read().strip()
+    except OSError:
+        return None
+    if not value.isdigit():
+        # cgroup v2 writes "max" when unlimited
+        return None
+    limit = int(value)
+    return limit if 0 < limit < _CGROUP_UNLIMITED else None
+
+def _detect_memory_limit() -> Optional[int]:
+    """
+    Returns the memory available to this process in bytes: the smaller of
+    physical memory and the cgroup (container) limit, or None if neither is known.
+    """
+    limits = [
+        _read_limit("/sys/fs/cgroup/memory.max"),                      # cgroup v2
+        _read_limit("/sys/fs/cgroup/memory/memory.limit_in_bytes"),    # cgroup v1
+    ]
+    try:
+        limits.append(os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES"))
+    except (AttributeError, ValueError, OSError):
+        # Not available on Windows
+        pass
+    known = [limit for limit in limits if limit]
+    return min(known) if known else None
+
 def detect_devices() -> DeviceInfo:
     """
     Detects available hardware devices on the system.
     """
-    info = DeviceInfo(cpu_cores=os.cpu_count() or 1)
-    
+    info = DeviceInfo(
+        cpu_cores=os.cpu_count() or 1, memory_limit_bytes=_detect_memory_limit()
+    )
+
     # Simple architecture checks
     machine = platform.machine().lower()
     if 'x86_64' in machine or 'amd64' in machine:
@@ -1,10 +1,12 @@
-from typing import Dict, Any, Callable, Tuple, Optional
+from typing import Dict, Any, Callable, Tuple, Optional, TypeVar
 from .types import BackendType
 from .errors import OperationNotSupportedError
 import logging
 
 logger = logging.getLogger("corepy.backend.dispatch")
 
+Kernel = TypeVar("Kernel", bound=Callable[..., Any])
+
 class Dispatcher:
     """
     Registry for backend-specific kernel implementations.
@@ -13,17 +15,21 @@ class Dispatcher:
     _registry: Dict[Tuple[str, BackendType], Callable] = {}
 
     @classmethod
-    def register(cls, op_name: str, backend: BackendType):
+    def register(
+        cls, op_name: str, backend: BackendType, replace: bool = False
+    ) -> Callable[[Kernel], Kernel]:
         """
         Decorator to register a kernel function for a specific operation and backend.
+        Pass ``replace=True`` when deliberately superseding an existing kernel
+        (e.g. a native kernel taking over from the pure-Python one).
         
         Usage:
             @Dispatcher.register("add", BackendType.CPU)
             def cpu_add(a, b): ...
         """
-        def decorator(func: Callable):
+        def decorator(func: Kernel) -> Kernel:
             key = (op_name, backend)
-            if key in cls._registry:
+            if key in cls._registry and not replace:
                 logger.warning(f"Overwriting kernel for {key}")
             cls._registry[key] = func
             return func
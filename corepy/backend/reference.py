@@ -1,5 +1,5 @@
 
-from typing import Any, List, Optional
+from typing import Any, Callable, List, Optional
 import math
 from corepy.backend.types import BackendType
 
@@ -48,6 +48,79 @@ class ReferenceBackend:
              return [ReferenceBackend.div(x, y) for x, y in zip(a, b)]
         return a / b
 
+    @staticmethod
+    def floordiv(a: Any, b: Any) -> Any:
+        if isinstance(a, list) and isinstance(b, list):
+             assert len(a) == len(b), "Shape mismatch"
+             return [ReferenceBackend.floordiv(x, y) for x, y in zip(a, b)]
+        return a // b
+
+    @staticmethod
+    def mod(a: Any, b: Any) -> Any:
+        if isinstance(a, list) and isinstance(b, list):
+             assert len(a) == len(b), "Shape mismatch"
+             return [ReferenceBackend.mod(x, y) for x, y in zip(a, b)]
+        return a % b
+
+    @staticmethod
+    def neg(a: Any) -> Any:
+        if isinstance(a, list):
+            return [ReferenceBackend.neg(x) for x in a]
+        return -a
+
+    @staticmethod
+    def abs(a: Any) -> Any:
+        if isinstance(a, list):
+            return [ReferenceBackend.abs(x) for x in a]
+        return abs(a)
+
+    @staticmethod
+    def compare(op: str, a: Any, b: Any) -> Any:
+        # eq, ne, lt, le, gt, ge, and, or, xor as 0/1
+        if isinstance(a, list) and isinstance(b, list):
+            assert len(a) == len(b), "Shape mismatch"
+            return [ReferenceBackend.compare(op, x, y) for x, y in zip(a, b)]
+        results: dict[str, Callable[[], Any]] = {
+            "eq": lambda: a == b, "ne": lambda: a != b,
+            "lt": lambda: a < b, "le": lambda: a <= b,
+            "gt": lambda: a > b, "ge": lambda: a >= b,
+            "and": lambda: bool(a) and bool(b), "or": lambda: bool(a) or bool(b),
+            "xor": lambda: bool(a) != bool(b),
+        }
+        return int(results[op]())
+
+    @staticmethod
+    def cast(a: list[Any], kind: type) -> list[Any]:
+        # kind is int (truncating), float or bool
+        return [kind(x) for x in a]
+
+    @staticmethod
+    def sum(a: list[Any]) -> Any:
+        if any(isinstance(x, float) for x in a):
+            return math.fsum(a)
+        total = 0
+        for x in a:
+            total += x
+        return total
+
+    @staticmethod
+    def min(a: list[Any]) -> Optional[Any]:
+        # NaN is skipped: it is replaced by any later value (and is the result
+        # only when every value is NaN)
+        result = None
+        for x in a:
+            if result is None or x < result or result != result:
+                result = x
+        return result
+
+    @staticmethod
+    def max(a: list[Any]) -> Optional[Any]:
+        result = None
+        for x in a:
+            if result is None or x > result or result != result:
+                result = x
+        return result
+
     @staticmethod
     def matmul(a: List[List[float]], b: List[List[float]]) -> List[List[float]]:
         # Naive O(N^3) matrix multiplication
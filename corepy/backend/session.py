@@ -1,12 +1,41 @@
-from typing import Optional, Dict
+import os
+import re
+import tempfile
+from typing import Optional, Dict, Union
 from .types import BackendType
 from .device import detect_devices, DeviceInfo
 from .backend import Backend, CPUBackend, GPUBackend
 
+# Share of the detected memory limit that spilling operators may hold by default
+MEMORY_BUDGET_FRACTION = 0.5
+
+_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+
+def parse_bytes(size: Union[int, str]) -> int:
+    """
+    Parses a byte count such as ``1048576``, ``"512MB"`` or ``"4G"``.
+    """
+    if isinstance(size, int):
+        return size
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMGT]?)i?B?\s*", size, re.IGNORECASE)
+    if match is None:
+        raise ValueError(
+            f"Invalid byte size '{size}'. Expected e.g. 1048576, '512MB' or '4GB'"
+        )
+    return int(float(match.group(1)) * _UNITS[match.group(2).upper()])
+
+
 class Session:
     """
     Manages the global state of the Corepy runtime, including detected devices
     and active backends.
+
+    ``memory_budget`` bounds the memory sort, group-by and join may use before
+    spilling to ``spill_dir`` (see ``corepy.data.spill``). It defaults to
+    ``COREPY_MEMORY_BUDGET`` when set, else to half the detected memory limit
+    (physical memory or the cgroup limit, whichever is smaller); None never
+    spills. ``spill_stats`` counts the spilling operations and the files,
+    bytes and rows they wrote.
     """
     _instance = None
 
@@ -26,9 +55,33 @@ class Session:
         self._backends[BackendType.CPU] = CPUBackend()
         if self._device_info.gpu_count > 0:
             self._backends[BackendType.GPU] = GPUBackend()
+
+        self.memory_budget: Optional[int] = self._default_memory_budget()
+        self.spill_dir: str = (
+            os.environ.get("COREPY_SPILL_DIR") or tempfile.gettempdir()
+        )
+        self.spill_stats: dict[str, int] = {}
+        self.reset_spill_stats()
             
         self._initialized = True
 
+    def _default_memory_budget(self) -> Optional[int]:
+        configured = os.environ.get("COREPY_MEMORY_BUDGET")
+        if configured:
+            return parse_bytes(configured)
+        limit = self._device_info.memory_limit_bytes
+        return int(limit * MEMORY_BUDGET_FRACTION) if limit is not None else None
+
+    def set_memory_budget(self, size: Optional[Union[int, str]]) -> None:
+        """
+        Sets the memory budget of spilling operators, e.g. ``"2GB"``; None
+        disables spilling.
+        """
+        self.memory_budget = parse_bytes(size) if size is not None else None
+
+    def reset_spill_stats(self) -> None:
+        self.spill_stats.update(operations=0, files=0, bytes=0, rows=0)
+
     @property
     def device_info(self) -> DeviceInfo:
         return self._device_info
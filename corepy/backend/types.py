@@ -46,4 +46,8 @@ class DataType(Enum):
     INT32 = "int32"
     INT64 = "int64"
     BOOL = "bool"
+    STRING = "string"
+    # Dictionary-encoded strings: integer codes + unique values
+    CATEGORICAL = "categorical"
+    OBJECT = "object"  # arbitrary Python objects, stored by reference
     # complex types etc.
@@ -1,3 +1,59 @@
-from .table import Table
+from .column import ChunkedColumn, Column
+from .columnar import ColumnarFile, read_columnar
+from .csv_reader import iter_csv, read_csv
+from .expr import AggExpr, Expr, col, lit
+from .groupby import GroupBy
+from .index import HashIndex, SortedIndex
+from .ipc import read_ipc
+from .lazy import LazyGroupBy, LazyTable, scan_columnar, scan_csv, scan_ipc
+from .materialized import MaterializedAggregate
+from .sketch import HeavyHitters, HyperLogLog, TDigest, hash_column
+from .table import Table, concat
+from .validation import CompiledSchema, SchemaValidationError, Violation, compile_schema
+from .window import (
+    EwmAggregator,
+    Rolling,
+    RollingAggregator,
+    WindowAggregator,
+    Windows,
+    parse_duration,
+)
 
-__all__ = ["Table"]
+__all__ = [
+    "Column",
+    "ChunkedColumn",
+    "Table",
+    "concat",
+    "Expr",
+    "AggExpr",
+    "col",
+    "lit",
+    "GroupBy",
+    "read_csv",
+    "iter_csv",
+    "read_ipc",
+    "ColumnarFile",
+    "read_columnar",
+    "CompiledSchema",
+    "SchemaValidationError",
+    "Violation",
+    "compile_schema",
+    "LazyTable",
+    "LazyGroupBy",
+    "scan_csv",
+    "scan_ipc",
+    "scan_columnar",
+    "Rolling",
+    "Windows",
+    "RollingAggregator",
+    "WindowAggregator",
+    "EwmAggregator",
+    "parse_duration",
+    "HyperLogLog",
+    "TDigest",
+    "HeavyHitters",
+    "hash_column",
+    "MaterializedAggregate",
+    "HashIndex",
+    "SortedIndex",
+]
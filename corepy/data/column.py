@@ -0,0 +1,858 @@
+"""
+Typed column storage for Tables.
+
+Fixed-width columns keep their values in one contiguous buffer (an
+``array.array`` or a typed ``memoryview``), nulls are tracked in an Arrow-style
+validity bitmap (bit ``i`` of the little-endian bitmap is 1 when row ``i`` is
+valid). String and object columns keep a Python list of values.
+
+Categorical columns are dictionary-encoded strings: ``values`` holds one
+integer code per row (the narrowest signed width that indexes the dictionary)
+and ``dictionary`` the distinct strings. Low-cardinality string data is
+encoded automatically when its dtype is inferred.
+
+Slicing shares buffers instead of copying them, and concatenation produces a
+``ChunkedColumn``: a list of immutable chunks that is only joined into one
+buffer when a kernel needs contiguous values (or on ``rechunk()``).
+"""
+import math
+import operator
+import sys
+from array import array
+from bisect import bisect_right
+from collections.abc import Iterable, Sequence
+from itertools import accumulate, chain, compress, repeat
+from typing import Any, Callable, Optional, Union
+
+from corepy.backend.dispatch import dispatch_kernel
+from corepy.backend.types import BackendType, DataType
+
+# array.array type codes of the fixed-width dtypes
+TYPECODES: dict[DataType, str] = {
+    DataType.INT64: "q",
+    DataType.INT32: "i",
+    DataType.FLOAT64: "d",
+    DataType.FLOAT32: "f",
+    DataType.BOOL: "B",
+}
+
+_DTYPE_ALIASES: dict[str, DataType] = {
+    "int": DataType.INT64,
+    "int64": DataType.INT64,
+    "i8": DataType.INT64,
+    "long": DataType.INT64,
+    "int32": DataType.INT32,
+    "i4": DataType.INT32,
+    "float": DataType.FLOAT64,
+    "float64": DataType.FLOAT64,
+    "f8": DataType.FLOAT64,
+    "double": DataType.FLOAT64,
+    "float32": DataType.FLOAT32,
+    "f4": DataType.FLOAT32,
+    "bool": DataType.BOOL,
+    "boolean": DataType.BOOL,
+    "str": DataType.STRING,
+    "string": DataType.STRING,
+    "utf8": DataType.STRING,
+    "category": DataType.CATEGORICAL,
+    "categorical": DataType.CATEGORICAL,
+    "dictionary": DataType.CATEGORICAL,
+    "object": DataType.OBJECT,
+    "any": DataType.OBJECT,
+}
+
+# Inferred string columns with at least this many rows and at most this share
+# of distinct values are stored dictionary-encoded
+AUTO_ENCODE_MIN_ROWS = 256
+AUTO_ENCODE_MAX_RATIO = 0.1
+
+_INT64_MIN = -(2 ** 63)
+_INT64_MAX = 2 ** 63 - 1
+
+# 256-entry tables converting between one bitmap byte and eight 0/1 bytes
+_UNPACK = [bytes((value >> bit) & 1 for bit in range(8)) for value in range(256)]
+_PACK = {bits: value for value, bits in enumerate(_UNPACK)}
+
+Buffer = Union["array[Any]", memoryview, list[Any]]
+
+
+def resolve_dtype(dtype: Union[str, DataType]) -> DataType:
+    """
+    Maps a Schema dtype string (e.g. ``"int"``, ``"float32"``, ``"str"``) to a DataType.
+    Unknown names map to ``DataType.OBJECT``.
+    """
+    if isinstance(dtype, DataType):
+        return dtype
+    return _DTYPE_ALIASES.get(dtype.lower(), DataType.OBJECT)
+
+
+def is_fixed_width(dtype: DataType) -> bool:
+    return dtype in TYPECODES
+
+
+def typed_view(values: Buffer) -> memoryview:
+    """
+    A memoryview of a typed values buffer (fixed-width values or categorical
+    codes). List buffers have none.
+    """
+    if isinstance(values, list):
+        raise TypeError("List buffers have no typed view")
+    return memoryview(values)
+
+
+def infer_dtype(values: Sequence[Any]) -> DataType:
+    """
+    Infers the narrowest dtype able to hold all non-null ``values``.
+    Mixed ints and floats promote to float64.
+    """
+    kinds = set(map(type, values))
+    kinds.discard(type(None))
+    if not kinds:
+        return DataType.OBJECT
+    if kinds == {bool}:
+        return DataType.BOOL
+    if kinds == {int}:
+        present = [v for v in values if v is not None]
+        if _INT64_MIN <= min(present) and max(present) <= _INT64_MAX:
+            return DataType.INT64
+        return DataType.OBJECT
+    if kinds <= {int, float}:
+        return DataType.FLOAT64
+    if kinds == {str}:
+        return DataType.STRING
+    return DataType.OBJECT
+
+
+def code_typecode(size: int) -> str:
+    """
+    Narrowest signed typecode whose values can index a dictionary of ``size`` entries.
+    """
+    if size <= 1 << 7:
+        return "b"
+    return "h" if size <= 1 << 15 else "i"
+
+
+def is_low_cardinality(values: Sequence[Any]) -> bool:
+    """
+    Whether ``values`` repeat enough to be worth dictionary-encoding on ingest.
+    """
+    if len(values) < AUTO_ENCODE_MIN_ROWS:
+        return False
+    return len(set(values)) <= len(values) * AUTO_ENCODE_MAX_RATIO
+
+
+def lookup_codes(codes: Buffer, table: bytes) -> bytes:
+    """
+    Maps each code to the byte at that position of ``table``, e.g. a per-entry
+    predicate result over a dictionary.
+    """
+    # Null slots hold code 0 even when the dictionary is empty
+    table = table or b"\0"
+    if isinstance(codes, (array, memoryview)) and memoryview(codes).itemsize == 1:
+        # One-byte codes are non-negative, so the bytes themselves index the table
+        return memoryview(codes).cast("B").tobytes().translate(table.ljust(256, b"\0"))
+    return bytes(map(table.__getitem__, codes))
+
+
+def pack_bits(mask: Iterable[int], length: int) -> bytes:
+    """
+    Packs a sequence of 0/1 values into an LSB-first bitmap.
+    """
+    mask = bytes(mask)
+    pad = -length % 8
+    if pad:
+        mask += bytes(pad)
+    groups = (mask[i:i + 8] for i in range(0, len(mask), 8))
+    return bytes(map(_PACK.__getitem__, groups))
+
+
+def unpack_bits(
+    bitmap: Union[bytes, bytearray, memoryview], length: int, offset: int = 0
+) -> bytes:
+    """
+    Expands ``length`` bits of an LSB-first bitmap, starting at bit ``offset``,
+    into one 0/1 byte per bit.
+    """
+    first = offset >> 3
+    last = (offset + length + 7) >> 3
+    expanded = b"".join(map(_UNPACK.__getitem__, bitmap[first:last]))
+    start = offset & 7
+    return expanded[start:start + length]
+
+
+def _null_fill(dtype: DataType) -> Any:
+    if dtype == DataType.BOOL:
+        return False
+    if dtype in (DataType.FLOAT32, DataType.FLOAT64):
+        return 0.0
+    return 0
+
+
+class Column:
+    """
+    A single typed column.
+
+    Attributes:
+        dtype: The column DataType.
+        values: Contiguous typed buffer for fixed-width dtypes, list otherwise.
+                Null slots hold a fill value (0, 0.0, False or None).
+        validity: Optional LSB-first bitmap; None when the column has no nulls.
+        dictionary: The distinct values of a categorical column, indexed by its
+                    codes; None for other dtypes.
+    """
+    def __init__(
+        self,
+        dtype: DataType,
+        values: Buffer,
+        validity: Optional[Union[bytes, bytearray, memoryview]] = None,
+        dictionary: Optional[list[Any]] = None,
+    ):
+        self.dtype = dtype
+        self.values = values
+        self.validity = validity
+        self.dictionary = dictionary
+        self._null_count: Optional[int] = None if validity is not None else 0
+        self._mask: Optional[bytes] = None
+
+    @classmethod
+    def from_pylist(
+        cls, values: Sequence[Any], dtype: Optional[Union[str, DataType]] = None
+    ) -> "Column":
+        """
+        Builds a column from Python values, with ``None`` marking nulls.
+
+        Args:
+            values: The column values.
+            dtype: Target dtype. Inferred from the values when omitted.
+        """
+        if not isinstance(values, list):
+            values = list(values)
+        if dtype is None:
+            dtype = infer_dtype(values)
+            if dtype == DataType.STRING and is_low_cardinality(values):
+                dtype = DataType.CATEGORICAL
+        else:
+            dtype = resolve_dtype(dtype)
+        if dtype == DataType.CATEGORICAL:
+            return cls._encode(values)
+        nulls = values.count(None)
+
+        if not is_fixed_width(dtype):
+            validity = None
+            if nulls:
+                validity = pack_bits(
+                    map(operator.is_not, values, repeat(None)), len(values)
+                )
+            return cls(dtype, values, validity)
+
+        validity = None
+        if nulls:
+            validity = pack_bits(
+                map(operator.is_not, values, repeat(None)), len(values)
+            )
+            fill = _null_fill(dtype)
+            values = [fill if v is None else v for v in values]
+        try:
+            buf = array(TYPECODES[dtype], values)
+        except (TypeError, OverflowError) as e:
+            raise ValueError(f"Cannot store values as {dtype.value}: {e}") from e
+        return cls(dtype, buf, validity)
+
+    @classmethod
+    def _encode(cls, values: list[Any]) -> "Column":
+        dictionary = list(dict.fromkeys(values))
+        nulls = None in dictionary
+        if nulls:
+            dictionary.remove(None)
+        if any(type(v) is not str for v in dictionary):
+            raise ValueError("Categorical columns hold strings only")
+        lookup: dict[Any, int] = dict(zip(dictionary, range(len(dictionary))))
+        validity = None
+        if nulls:
+            lookup[None] = 0
+            validity = pack_bits(
+                map(operator.is_not, values, repeat(None)), len(values)
+            )
+        codes = array(code_typecode(len(dictionary)), map(lookup.__getitem__, values))
+        return cls(DataType.CATEGORICAL, codes, validity, dictionary)
+
+    @classmethod
+    def from_codes(
+        cls, codes: Sequence[Optional[int]], dictionary: list[Any]
+    ) -> "Column":
+        """
+        Builds a categorical column from codes into ``dictionary`` (which must
+        hold distinct strings), with ``None`` codes marking nulls.
+        """
+        validity = None
+        if None in codes:
+            validity = pack_bits(map(operator.is_not, codes, repeat(None)), len(codes))
+            codes = [0 if c is None else c for c in codes]
+        return cls(
+            DataType.CATEGORICAL,
+            array(code_typecode(len(dictionary)), codes),
+            validity,
+            dictionary,
+        )
+
+    def dictionary_encode(self) -> "Column":
+        """
+        Returns this string column as a categorical column (codes + dictionary).
+        """
+        if self.dtype == DataType.CATEGORICAL:
+            return self
+        if self.dtype != DataType.STRING:
+            raise TypeError(
+                f"Only string columns can be dictionary-encoded, not {self.dtype.value}"
+            )
+        return self._encode(self.to_pylist())
+
+    def _decoder(self) -> Callable[[int], Any]:
+        # An all-null categorical has an empty dictionary while its slots hold code 0
+        return (self.dictionary or [None]).__getitem__
+
+    def dictionary_decode(self) -> "Column":
+        """
+        Returns a categorical column as a plain string column.
+        """
+        if self.dictionary is None:
+            return self
+        values = list(map(self._decoder(), self.values))
+        if self.validity is not None:
+            values = [v if m else None for v, m in zip(values, self.valid_mask())]
+        return Column(DataType.STRING, values, self.validity)
+
+    @classmethod
+    def from_numpy(cls, arr: Any) -> "Column":
+        """
+        Wraps a one-dimensional NumPy array. Contiguous numeric and bool arrays
+        are shared without copying; other arrays are converted element-wise.
+        """
+        import numpy as np  # type: ignore[import-not-found, unused-ignore]
+
+        if arr.ndim != 1:
+            raise ValueError("Only one-dimensional arrays can become columns")
+        kind, size = arr.dtype.kind, arr.dtype.itemsize
+        dtype = None
+        if kind == "b":
+            dtype = DataType.BOOL
+        elif kind == "i" and size in (4, 8):
+            dtype = DataType.INT32 if size == 4 else DataType.INT64
+        elif kind == "f" and size in (4, 8):
+            dtype = DataType.FLOAT32 if size == 4 else DataType.FLOAT64
+        if dtype is None:
+            return cls.from_pylist(arr.tolist())
+        if not arr.flags.c_contiguous or not arr.dtype.isnative:
+            arr = np.ascontiguousarray(arr, dtype=arr.dtype.newbyteorder("="))
+        return cls(dtype, memoryview(arr).cast("B").cast(TYPECODES[dtype]))  # type: ignore[call-overload]
+
+    @property
+    def typecode(self) -> Optional[str]:
+        """
+        The ``array`` type code of the values buffer, or None for list columns.
+        """
+        return TYPECODES.get(self.dtype)
+
+    @property
+    def null_count(self) -> int:
+        if self._null_count is None:
+            self._null_count = self.valid_mask().count(0)
+        return self._null_count
+
+    def valid_mask(self) -> bytes:
+        """
+        Returns one 0/1 byte per row, 1 where the value is valid.
+        """
+        if self._mask is None:
+            if self.validity is None:
+                self._mask = b"\x01" * len(self)
+            else:
+                self._mask = unpack_bits(self.validity, len(self))
+        return self._mask
+
+    @property
+    def chunks(self) -> list["Column"]:
+        """
+        The contiguous columns this column is made of (just itself unless chunked).
+        """
+        return [self]
+
+    def rechunk(self) -> "Column":
+        """
+        Returns the column with its values in one contiguous buffer.
+        """
+        return self
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Size of the column buffers in bytes (estimated for list columns).
+        """
+        size = len(self.validity) if self.validity is not None else 0
+        if self.dictionary is not None:
+            size += len(self.values) * typed_view(self.values).itemsize
+            return size + _dictionary_nbytes(self.dictionary)
+        if isinstance(self.values, list):
+            size += sys.getsizeof(self.values)
+            if self.values:
+                step = max(1, len(self.values) // 64)
+                sample = self.values[::step]
+                size += (
+                    sum(map(sys.getsizeof, sample)) * len(self.values) // len(sample)
+                )
+            return size
+        return size + len(self.values) * self.values.itemsize
+
+    def to_pylist(self) -> list[Any]:
+        """
+        Returns the values as Python objects, with None for nulls.
+        """
+        values: Iterable[Any] = self.values
+        if self.dtype == DataType.BOOL:
+            values = map(bool, values)
+        elif self.dictionary is not None:
+            values = map(self._decoder(), values)
+        if self.validity is None:
+            return list(values)
+        return [v if m else None for v, m in zip(values, self.valid_mask())]
+
+    def to_numpy(self) -> Any:
+        """
+        Returns the values as a NumPy array, sharing the buffer where possible.
+        Null slots hold the fill value; check ``valid_mask()`` for nulls.
+        """
+        import numpy as np
+
+        if self.dictionary is not None:
+            return np.array(self.to_pylist(), dtype=object)
+        if self.typecode is None:
+            return np.array(self.values, dtype=object)
+        arr = np.frombuffer(self.values, dtype=self.typecode)
+        return arr.astype(bool) if self.dtype == DataType.BOOL else arr
+
+    def slice(self, offset: int, length: int) -> "Column":
+        """
+        Returns rows ``[offset, offset + length)`` as a new column. Fixed-width
+        values and categorical codes are a ``memoryview`` of this column's
+        buffer, as is the validity bitmap when the slice starts and ends on a
+        byte boundary (or at the end of the column); list columns copy item
+        references only.
+        """
+        end = min(offset + length, len(self))
+        if isinstance(self.values, list):
+            values: Buffer = self.values[offset:end]
+        else:
+            values = memoryview(self.values)[offset:end]
+        validity: Optional[Union[bytes, memoryview]] = None
+        if self.validity is not None:
+            if offset & 7 or (end & 7 and end != len(self)):
+                validity = pack_bits(
+                    unpack_bits(self.validity, end - offset, offset), end - offset
+                )
+            else:
+                validity = memoryview(self.validity)[offset >> 3:(end + 7) >> 3]
+        return Column(self.dtype, values, validity, self.dictionary)
+
+    def filter(self, mask: Sequence[int]) -> "Column":
+        """
+        Keeps the rows whose ``mask`` byte is non-zero.
+        """
+        values = dispatch_kernel("select.filter", BackendType.CPU, self.values, mask)
+        validity = None
+        if self.validity is not None:
+            kept = bytes(compress(self.valid_mask(), mask))
+            if kept.count(0):
+                validity = pack_bits(kept, len(values))
+        return Column(self.dtype, values, validity, self.dictionary)
+
+    def take(self, indices: Sequence[int]) -> "Column":
+        """
+        Gathers the rows at ``indices`` (in that order, repeats allowed).
+        """
+        values = dispatch_kernel("select.take", BackendType.CPU, self.values, indices)
+        validity = None
+        if self.validity is not None:
+            mask = self.valid_mask()
+            kept = bytes(map(mask.__getitem__, indices))
+            if kept.count(0):
+                validity = pack_bits(kept, len(values))
+        return Column(self.dtype, values, validity, self.dictionary)
+
+    def _valid_values(self) -> Buffer:
+        if self.validity is None:
+            return self.values
+        values: Buffer = dispatch_kernel(
+            "select.filter", BackendType.CPU, self.values, self.valid_mask()
+        )
+        return values
+
+    def _check_numeric(self, func: str) -> None:
+        if self.typecode is None:
+            raise TypeError(f"Cannot compute {func} of a {self.dtype.value} column")
+
+    def count(self) -> int:
+        """
+        Number of non-null values.
+        """
+        return len(self) - self.null_count
+
+    def count_distinct(self) -> int:
+        """
+        Number of distinct non-null values, counting every NaN as one value.
+        """
+        distinct = set(key_values(self, codes=True))
+        distinct.discard(None)
+        return len(distinct)
+
+    def first(self) -> Any:
+        """
+        Value of the first row (None if it is null or the column is empty).
+        """
+        return self[0] if len(self) else None
+
+    def last(self) -> Any:
+        """
+        Value of the last row (None if it is null or the column is empty).
+        """
+        return self[-1] if len(self) else None
+
+    def sum(self) -> Any:
+        """
+        Sum of the non-null values (0 for an empty column).
+        """
+        self._check_numeric("sum")
+        return dispatch_kernel("reduce.sum", BackendType.CPU, self._valid_values())
+
+    def mean(self) -> Optional[float]:
+        """
+        Mean of the non-null values, or None when there are none.
+        """
+        self._check_numeric("mean")
+        count = self.count()
+        return self.sum() / count if count else None
+
+    def var(self) -> Optional[float]:
+        """
+        Sample variance of the non-null values, or None with fewer than two.
+        """
+        self._check_numeric("var")
+        values = self._valid_values()
+        if len(values) < 2:
+            return None
+        mean = math.fsum(values) / len(values)
+        return math.fsum((v - mean) ** 2 for v in values) / (len(values) - 1)
+
+    def std(self) -> Optional[float]:
+        """
+        Sample standard deviation of the non-null values, or None with fewer than two.
+        """
+        self._check_numeric("std")
+        variance = self.var()
+        return math.sqrt(variance) if variance is not None else None
+
+    def approx_count_distinct(self, precision: int = 14) -> int:
+        """
+        Number of distinct non-null values, estimated with a HyperLogLog sketch.
+        """
+        from .sketch import HyperLogLog
+
+        return HyperLogLog(precision).update(self).estimate()
+
+    def approx_quantile(self, q: float, compression: float = 200.0) -> Optional[float]:
+        """
+        The ``q``-quantile of the non-null values, estimated with a t-digest
+        (None when there are none).
+        """
+        from .sketch import TDigest
+
+        return TDigest(compression).update(self).quantile(q)
+
+    def heavy_hitters(self, k: int = 10, capacity: Optional[int] = None) -> list[Any]:
+        """
+        The ``k`` most frequent non-null values as ``(value, count)`` pairs,
+        found with a Misra-Gries summary of ``capacity`` counters (default ``10 * k``).
+        """
+        from .sketch import HeavyHitters
+
+        return HeavyHitters(capacity or 10 * k).update(self).top(k)
+
+    def min(self) -> Any:
+        """
+        Smallest non-null value, or None when there are none.
+        """
+        return self._extreme("min")
+
+    def max(self) -> Any:
+        """
+        Largest non-null value, or None when there are none.
+        """
+        return self._extreme("max")
+
+    def _extreme(self, func: str) -> Any:
+        if self.dtype == DataType.OBJECT:
+            raise TypeError(f"Cannot compute {func} of an object column")
+        if self.dictionary is not None:
+            used = set(self._valid_values())
+            return (
+                (min if func == "min" else max)(map(self.dictionary.__getitem__, used))
+                if used
+                else None
+            )
+        value = dispatch_kernel(f"reduce.{func}", BackendType.CPU, self._valid_values())
+        if value is not None and self.dtype == DataType.BOOL:
+            return bool(value)
+        return value
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, index: int) -> Any:
+        if index < 0:
+            index += len(self)
+        if (
+            self.validity is not None
+            and not (self.validity[index >> 3] >> (index & 7)) & 1
+        ):
+            return None
+        value = self.values[index]
+        if self.dictionary is not None:
+            return self.dictionary[value]
+        return bool(value) if self.dtype == DataType.BOOL else value
+
+    def __reduce__(self) -> Any:
+        # memoryview buffers (shared memory, mapped files) can't be pickled
+        values = self.values
+        if isinstance(values, memoryview):
+            values = array(values.format, values.tobytes())
+        validity = bytes(self.validity) if self.validity is not None else None
+        return (Column, (self.dtype, values, validity, self.dictionary))
+
+    def __repr__(self) -> str:
+        return (
+            f"Column(dtype={self.dtype.value}, length={len(self)}, "
+            f"nulls={self.null_count})"
+        )
+
+
+class ChunkedColumn(Column):
+    """
+    A column stored as a list of contiguous chunks of one dtype (categorical
+    chunks share one dictionary). Length, row access, slicing, concatenation,
+    ``to_pylist`` and the count/sum/min/max reductions work chunk by chunk; the
+    first access to ``values`` or ``validity`` joins the chunks into one buffer,
+    which then replaces them. Produced by ``concat_columns``.
+    """
+    def __init__(
+        self, chunks: Sequence[Column], lengths: Optional[Sequence[int]] = None
+    ):
+        """
+        Initialize a ChunkedColumn.
+
+        Args:
+            chunks: Non-empty sequence of contiguous columns of the same dtype.
+            lengths: The chunk lengths, when already known.
+        """
+        self.dtype = chunks[0].dtype
+        self.dictionary = chunks[0].dictionary
+        self._chunks: list[Column] = list(chunks)
+        self._offsets = list(
+            accumulate(
+                lengths if lengths is not None else map(len, self._chunks), initial=0
+            )
+        )
+        self._null_count = None
+        self._mask = None
+
+    @property
+    def chunks(self) -> list[Column]:
+        return list(self._chunks)
+
+    def rechunk(self) -> Column:
+        if len(self._chunks) > 1:
+            self._chunks = [_join_chunks(self._chunks)]
+            self._offsets = [0, len(self._chunks[0])]
+        return self._chunks[0]
+
+    @property
+    def values(self) -> Buffer:  # type: ignore[override]
+        return self.rechunk().values
+
+    @property
+    def validity(self) -> Optional[Union[bytes, bytearray, memoryview]]:  # type: ignore[override]
+        return self.rechunk().validity
+
+    @property
+    def null_count(self) -> int:
+        if self._null_count is None:
+            self._null_count = sum(c.null_count for c in self._chunks)
+        return self._null_count
+
+    def valid_mask(self) -> bytes:
+        if self._mask is None:
+            self._mask = b"".join(c.valid_mask() for c in self._chunks)
+        return self._mask
+
+    @property
+    def nbytes(self) -> int:
+        size = sum(c.nbytes for c in self._chunks)
+        if self.dictionary is not None:
+            size -= (len(self._chunks) - 1) * _dictionary_nbytes(self.dictionary)
+        return size
+
+    def to_pylist(self) -> list[Any]:
+        return list(chain.from_iterable(c.to_pylist() for c in self._chunks))
+
+    def slice(self, offset: int, length: int) -> Column:
+        end = min(offset + length, len(self))
+        offsets = self._offsets
+        parts = [
+            chunk.slice(max(offset - start, 0), min(end, stop) - max(offset, start))
+            for chunk, start, stop in zip(self._chunks, offsets, offsets[1:])
+            if start < end and offset < stop
+        ]
+        if not parts:
+            return self._chunks[0].slice(0, 0)
+        return parts[0] if len(parts) == 1 else ChunkedColumn(parts)
+
+    def sum(self) -> Any:
+        self._check_numeric("sum")
+        return sum(c.sum() for c in self._chunks)
+
+    def _extreme(self, func: str) -> Any:
+        found = [v for v in (getattr(c, func)() for c in self._chunks) if v is not None]
+        return (min if func == "min" else max)(found) if found else None
+
+    def __len__(self) -> int:
+        return self._offsets[-1]
+
+    def __getitem__(self, index: int) -> Any:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("column index out of range")
+        chunk = bisect_right(self._offsets, index) - 1
+        return self._chunks[chunk][index - self._offsets[chunk]]
+
+    def __repr__(self) -> str:
+        return (
+            f"ChunkedColumn(dtype={self.dtype.value}, length={len(self)}, "
+            f"chunks={len(self._chunks)})"
+        )
+
+
+def _dictionary_nbytes(dictionary: list[Any]) -> int:
+    return sum(map(sys.getsizeof, dictionary)) + sys.getsizeof(dictionary)
+
+
+# One shared NaN object, so NaN keys hash (and compare by identity) as one value
+_NAN = float("nan")
+
+
+def _shared_nan(key: Any) -> Any:
+    # ``key`` with NaNs (also inside tuple keys) replaced by the shared one
+    if isinstance(key, tuple):
+        return tuple(map(_shared_nan, key))
+    return _NAN if isinstance(key, float) and math.isnan(key) else key
+
+
+def key_values(column: Column, codes: bool = False) -> Sequence[Any]:
+    """
+    Returns hashable per-row values for use as grouping or join keys, with
+    None for nulls and every NaN replaced by one shared NaN object. With
+    ``codes``, categorical columns yield their integer codes instead of strings.
+    """
+    if codes and column.dictionary is not None:
+        if column.validity is None:
+            return column.values
+        return [c if m else None for c, m in zip(column.values, column.valid_mask())]
+    if column.validity is not None or column.dtype in (
+        DataType.BOOL,
+        DataType.CATEGORICAL,
+    ):
+        values: Sequence[Any] = column.to_pylist()
+    else:
+        values = column.values
+    if column.dtype in (DataType.FLOAT32, DataType.FLOAT64) and any(
+        map(math.isnan, filter(None, values))
+    ):
+        values = [_NAN if v is not None and math.isnan(v) else v for v in values]
+    return values
+
+
+def concat_columns(columns: Sequence[Column]) -> Column:
+    """
+    Concatenates columns without copying their buffers: the result stitches
+    together the chunks of every input (see ``ChunkedColumn``). Categorical
+    inputs with different dictionaries are re-coded into their merged
+    dictionary, and categorical inputs mixed with string ones are decoded;
+    other mixed dtypes (e.g. int64 and float64 batches) are re-inferred.
+    """
+    dtypes = {c.dtype for c in columns}
+    if dtypes == {DataType.STRING, DataType.CATEGORICAL}:
+        columns = [c.dictionary_decode() for c in columns]
+    elif len(dtypes) > 1:
+        return Column.from_pylist([v for c in columns for v in c.to_pylist()])
+    elif dtypes == {DataType.CATEGORICAL}:
+        columns = _share_dictionary(columns)
+    chunks: list[Column] = []
+    lengths: list[int] = []
+    for c in columns:
+        if isinstance(c, ChunkedColumn):
+            chunks += c._chunks
+            lengths += map(operator.sub, c._offsets[1:], c._offsets)
+        elif len(c):
+            chunks.append(c)
+            lengths.append(len(c))
+    if len(chunks) <= 1:
+        return chunks[0] if chunks else columns[0]
+    return ChunkedColumn(chunks, lengths)
+
+
+def _share_dictionary(columns: Sequence[Column]) -> Sequence[Column]:
+    """
+    Returns the chunks of categorical ``columns`` re-coded into one dictionary.
+    The merged dictionary starts with the first column's, so chunks coded
+    against that keep their buffers.
+    """
+    dictionary = columns[0].dictionary
+    if all(c.dictionary is dictionary for c in columns):
+        return columns
+    merged = list(
+        dict.fromkeys(chain.from_iterable(c.dictionary or () for c in columns))
+    )
+    lookup = dict(zip(merged, range(len(merged))))
+    shared = []
+    for chunk in chain.from_iterable(c.chunks for c in columns):
+        codes = chunk.values
+        if chunk.dictionary is not dictionary:
+            # An all-null part may have an empty dictionary; its (null) codes become 0
+            remap = [lookup[v] for v in chunk.dictionary or ()] or [0]
+            codes = array(code_typecode(len(merged)), map(remap.__getitem__, codes))
+        shared.append(Column(DataType.CATEGORICAL, codes, chunk.validity, merged))
+    return shared
+
+
+def _join_chunks(chunks: Sequence[Column]) -> Column:
+    """
+    Copies chunks of one dtype (and one dictionary) into a contiguous column.
+    """
+    dtype, dictionary = chunks[0].dtype, chunks[0].dictionary
+    if dictionary is not None:
+        typecode: Optional[str] = code_typecode(len(dictionary))
+    else:
+        typecode = TYPECODES.get(dtype)
+    if typecode is None:
+        values: Buffer = [v for c in chunks for v in c.values]
+    else:
+        values = array(typecode)
+        for c in chunks:
+            view = typed_view(c.values)
+            if view.format == typecode:
+                values.frombytes(view.cast("B"))
+            else:
+                # Codes of a narrower width than the merged dictionary needs
+                values.extend(view)
+    validity = None
+    if any(c.validity is not None for c in chunks):
+        validity = pack_bits(b"".join(c.valid_mask() for c in chunks), len(values))
+    return Column(dtype, values, validity, dictionary)
@@ -0,0 +1,686 @@
+"""
+Compressed columnar files with zone maps.
+
+A file holds a Table split into row groups. Each column of each row group is
+stored as one chunk, encoded with whichever lightweight scheme is smallest for
+its values:
+
+* ``plain``: the raw buffer (strings: int32/int64 offsets + UTF-8 data).
+* ``for``: frame of reference; integers minus the chunk minimum, stored in the
+  narrowest unsigned width (1, 2, 4 or 8 bytes) that fits.
+* ``delta``: differences between consecutive integers, frame-of-reference packed.
+* ``rle``: run values plus run lengths.
+* ``dictionary``: distinct values plus one narrow code per row. Categorical
+  columns are always stored this way, with the entries their rows use.
+* ``bitmap``: booleans bit-packed eight to a byte.
+
+Floats are encoded through their integer bit patterns, so every scheme is
+lossless (NaN payloads and signed zeros included). Widths are rounded to whole
+bytes so that decoding stays inside ``array`` conversions.
+
+The footer (JSON) records, per chunk, its location, encoding and zone map: the
+min/max of its valid values and its null count. ``ColumnarFile.read`` uses the
+zone maps to skip row groups a filter cannot match and decodes only the
+columns it needs.
+
+Indexes of the table (``Table.create_index``) are listed in the footer too;
+a sorted index also stores its row order, as a packed block after the row
+groups, so it is restored without sorting. Full reads reattach them.
+"""
+import json
+import math
+import mmap
+import operator
+import os
+import struct
+from array import array
+from collections.abc import Sequence
+from itertools import accumulate, chain, compress, islice, repeat
+from typing import Any, Optional, Union
+
+from corepy.backend.types import DataType
+from corepy.schema import Schema
+
+from .column import TYPECODES, Column, code_typecode, pack_bits, typed_view, unpack_bits
+from .expr import BinaryOp, ColumnRef, Expr, IsIn, IsNull, Literal
+
+MAGIC = b"CPCOL1"
+VERSION = 1
+ROW_GROUP_SIZE = 65_536
+
+# Integer view of each fixed-width dtype; floats are encoded as their bit patterns
+_INT_VIEWS = {
+    DataType.INT64: "q",
+    DataType.INT32: "i",
+    DataType.FLOAT64: "q",
+    DataType.FLOAT32: "i",
+    DataType.BOOL: "B",
+}
+_UNSIGNED = "BHIQ"
+_FLIPPED = {"lt": "gt", "le": "ge", "gt": "lt", "ge": "le", "eq": "eq", "ne": "ne"}
+
+Parts = list[Union[bytes, bytearray, memoryview]]
+
+
+def _width(span: int) -> str:
+    """
+    Narrowest unsigned typecode holding values in ``[0, span]``.
+    """
+    for typecode in _UNSIGNED:
+        if span < 1 << (8 * array(typecode).itemsize):
+            return typecode
+    raise OverflowError(f"{span} does not fit in 64 bits")
+
+
+def _int_view(column: Column) -> memoryview:
+    typecode = _INT_VIEWS[column.dtype]
+    view = typed_view(column.values)
+    if TYPECODES[column.dtype] == typecode:
+        return view
+    ints: memoryview = view.cast("B").cast(typecode)  # type: ignore[call-overload]
+    return ints
+
+
+def _from_int_view(ints: "array[Any]", dtype: DataType) -> "array[Any]":
+    if ints.typecode == TYPECODES[dtype]:
+        return ints
+    values = array(TYPECODES[dtype])
+    values.frombytes(memoryview(ints).cast("B"))
+    return values
+
+
+def _runs(values: Sequence[Any]) -> list[int]:
+    """
+    Start offsets of the runs of equal consecutive values.
+    """
+    if not len(values):
+        return []
+    return [0] + list(
+        compress(
+            range(1, len(values)), map(operator.ne, islice(values, 1, None), values)
+        )
+    )
+
+
+def _packed(values: Sequence[int], base: int, typecode: str) -> "array[Any]":
+    return array(typecode, map(operator.sub, values, repeat(base)))
+
+
+def _unpacked(raw: memoryview, typecode: str, base: int, out: str) -> "array[Any]":
+    packed = array(typecode)
+    packed.frombytes(raw)
+    return array(out, map(operator.add, packed, repeat(base)))
+
+
+# Plain encoding of strings, shared by the string dictionary and RLE schemes
+
+
+def _plain_strings(values: Sequence[str]) -> tuple[dict[str, Any], Parts]:
+    encoded = [v.encode("utf-8") for v in values]
+    offsets = list(accumulate(map(len, encoded), initial=0))
+    typecode = "q" if offsets[-1] > 0x7FFFFFFF else "i"
+    index = array(typecode, offsets)
+    return {"offsets": typecode, "count": len(values)}, [
+        index.tobytes(),
+        b"".join(encoded),
+    ]
+
+
+def _read_strings(params: dict[str, Any], raw: memoryview) -> tuple[list[str], int]:
+    """
+    Decodes plain strings; returns them and the number of bytes consumed.
+    """
+    offsets = array(params["offsets"])
+    split = (params["count"] + 1) * offsets.itemsize
+    offsets.frombytes(raw[:split])
+    data = bytes(raw[split:split + offsets[-1]])
+    text = data.decode("utf-8")
+    if len(text) == len(data):
+        # ASCII: byte offsets are character offsets
+        values = list(
+            map(text.__getitem__, map(slice, offsets, islice(offsets, 1, None)))
+        )
+    else:
+        values = [
+            data[a:b].decode("utf-8") for a, b in zip(offsets, islice(offsets, 1, None))
+        ]
+    return values, split + offsets[-1]
+
+
+# Encoders. Each returns (encoding, params, payload parts).
+
+
+def _encode_ints(
+    values: memoryview, typecode: str, is_bool: bool
+) -> tuple[str, dict[str, Any], Parts]:
+    n = len(values)
+    itemsize = array(typecode).itemsize
+    sizes: dict[str, int] = {"plain": n * itemsize}
+    if is_bool:
+        sizes["bitmap"] = (n + 7) // 8
+    lo, hi = min(values), max(values)
+    for_width = _width(hi - lo)
+    sizes["for"] = n * array(for_width).itemsize
+    starts = _runs(values)
+    run_width = _width(
+        max(map(operator.sub, chain(islice(starts, 1, None), [n]), starts))
+    )
+    sizes["rle"] = len(starts) * (itemsize + array(run_width).itemsize)
+    distinct: list[int] = list(dict.fromkeys(values))
+    code_width = _width(len(distinct) - 1)
+    sizes["dictionary"] = len(distinct) * itemsize + n * array(code_width).itemsize
+    deltas: list[int] = []
+    if n > 1 and not is_bool:
+        deltas = list(map(operator.sub, islice(values, 1, None), values))
+        delta_lo = min(deltas)
+        # Decoding rebuilds each delta as a value of the column's type, which
+        # differences of large (or float-view) values can overflow
+        bound = 1 << (itemsize * 8 - 1)
+        if -bound <= delta_lo and max(deltas) < bound:
+            delta_width = _width(max(deltas) - delta_lo)
+            sizes["delta"] = (n - 1) * array(delta_width).itemsize
+    encoding = min(sizes, key=sizes.__getitem__)
+
+    if encoding == "bitmap":
+        return encoding, {}, [pack_bits(values, n)]
+    if encoding == "for":
+        return (
+            encoding,
+            {"base": lo, "width": for_width},
+            [_packed(values, lo, for_width).tobytes()],
+        )
+    if encoding == "delta":
+        packed = _packed(deltas, delta_lo, delta_width)
+        return (
+            encoding,
+            {"first": values[0], "base": delta_lo, "width": delta_width},
+            [packed.tobytes()],
+        )
+    if encoding == "rle":
+        lengths = array(
+            run_width, map(operator.sub, chain(islice(starts, 1, None), [n]), starts)
+        )
+        run_values = array(typecode, map(values.__getitem__, starts))
+        return (
+            encoding,
+            {"runs": len(starts), "width": run_width},
+            [run_values.tobytes(), lengths.tobytes()],
+        )
+    if encoding == "dictionary":
+        lookup = dict(zip(distinct, range(len(distinct))))
+        codes = array(code_width, map(lookup.__getitem__, values))
+        return (
+            encoding,
+            {"size": len(distinct), "width": code_width},
+            [array(typecode, distinct).tobytes(), codes.tobytes()],
+        )
+    return "plain", {}, [memoryview(values).cast("B")]
+
+
+def _decode_ints(
+    encoding: str, params: dict[str, Any], raw: memoryview, n: int, typecode: str
+) -> "array[Any]":
+    if encoding == "plain":
+        values = array(typecode)
+        values.frombytes(raw)
+        return values
+    if encoding == "bitmap":
+        return array(typecode, unpack_bits(raw, n))
+    if encoding == "for":
+        return _unpacked(raw, params["width"], params["base"], typecode)
+    if encoding == "delta":
+        deltas = _unpacked(raw, params["width"], params["base"], typecode)
+        return (
+            array(typecode, accumulate(deltas, initial=params["first"]))
+            if n
+            else array(typecode)
+        )
+    if encoding == "rle":
+        split = params["runs"] * array(typecode).itemsize
+        run_values = array(typecode)
+        run_values.frombytes(raw[:split])
+        lengths = array(params["width"])
+        lengths.frombytes(raw[split:])
+        return array(typecode, chain.from_iterable(map(repeat, run_values, lengths)))
+    if encoding == "dictionary":
+        split = params["size"] * array(typecode).itemsize
+        distinct = array(typecode)
+        distinct.frombytes(raw[:split])
+        codes = array(params["width"])
+        codes.frombytes(raw[split:])
+        return array(typecode, map(distinct.__getitem__, codes))
+    raise ValueError(f"Unknown encoding '{encoding}'")
+
+
+def _encode_strings(values: Sequence[str]) -> tuple[str, dict[str, Any], Parts]:
+    n = len(values)
+    distinct = list(dict.fromkeys(values))
+    starts = _runs(values)
+    if len(distinct) <= n // 2 and len(distinct) <= len(starts):
+        lookup = dict(zip(distinct, range(len(distinct))))
+        width = _width(len(distinct) - 1)
+        params, parts = _plain_strings(distinct)
+        params["width"] = width
+        return (
+            "dictionary",
+            params,
+            parts + [array(width, map(lookup.__getitem__, values)).tobytes()],
+        )
+    if len(starts) <= n // 2:
+        lengths = list(map(operator.sub, chain(islice(starts, 1, None), [n]), starts))
+        width = _width(max(lengths))
+        params, parts = _plain_strings(list(map(values.__getitem__, starts)))
+        params["width"] = width
+        return "rle", params, parts + [array(width, lengths).tobytes()]
+    params, parts = _plain_strings(values)
+    return "plain", params, parts
+
+
+def _encode_categorical(column: Column) -> tuple[str, dict[str, Any], Parts]:
+    """
+    Stores a categorical chunk's own dictionary: the entries its codes use, in
+    order of first use, and the codes renumbered into them.
+    """
+    # Null slots may hold any code (even into an empty dictionary); they store 0
+    used = list(dict.fromkeys(column._valid_values()))
+    lookup = dict(zip(used, range(len(used))))
+    width = _width(max(len(used) - 1, 0))
+    assert column.dictionary is not None
+    params, parts = _plain_strings(list(map(column.dictionary.__getitem__, used)))
+    params["width"] = width
+    return (
+        "dictionary",
+        params,
+        parts + [array(width, map(lookup.get, column.values, repeat(0))).tobytes()],
+    )
+
+
+def _decode_strings(
+    encoding: str, params: dict[str, Any], raw: memoryview, n: int
+) -> list[str]:
+    values, used = _read_strings(params, raw)
+    if encoding == "plain":
+        return values
+    codes = array(params["width"])
+    codes.frombytes(raw[used:])
+    if encoding == "dictionary":
+        return list(map(values.__getitem__, codes))
+    if encoding == "rle":
+        return list(chain.from_iterable(map(repeat, values, codes)))
+    raise ValueError(f"Unknown encoding '{encoding}'")
+
+
+def _zone_map(column: Column) -> tuple[Any, Any]:
+    """
+    Min and max of the valid values (NaN excluded), or Nones when there are none.
+    """
+    if column.dictionary is not None:
+        return column.min(), column.max()
+    values = column._valid_values()
+    if column.dtype in (DataType.FLOAT32, DataType.FLOAT64) and any(
+        map(math.isnan, values)
+    ):
+        values = [v for v in values if not math.isnan(v)]
+    if not len(values):
+        return None, None
+    lo, hi = min(values), max(values)
+    if column.dtype == DataType.BOOL:
+        return bool(lo), bool(hi)
+    return lo, hi
+
+
+def _encode_chunk(column: Column) -> tuple[dict[str, Any], Parts]:
+    n = len(column)
+    validity = column.validity if column.null_count else None
+    params: dict[str, Any]
+    parts: Parts
+    if n == 0:
+        encoding, params, parts = "plain", {}, []
+    elif column.dtype == DataType.STRING:
+        strings = column.values
+        assert isinstance(strings, list)
+        if validity is not None:
+            strings = ["" if v is None else v for v in strings]
+        encoding, params, parts = _encode_strings(strings)
+    elif column.dtype == DataType.CATEGORICAL:
+        encoding, params, parts = _encode_categorical(column)
+    else:
+        encoding, params, parts = _encode_ints(
+            _int_view(column), _INT_VIEWS[column.dtype], column.dtype == DataType.BOOL
+        )
+    lo, hi = _zone_map(column)
+    meta = {
+        "encoding": encoding,
+        "params": params,
+        "null_count": column.null_count,
+        "validity": len(validity) if validity is not None else 0,
+        "min": lo,
+        "max": hi,
+    }
+    return meta, ([validity] if validity is not None else []) + parts
+
+
+def _decode_chunk(
+    meta: dict[str, Any], raw: memoryview, dtype: DataType, n: int
+) -> Column:
+    split = meta["validity"]
+    validity = bytes(raw[:split]) if split else None
+    raw = raw[split:]
+    if n == 0:
+        return Column.from_pylist([], dtype)
+    if dtype == DataType.STRING:
+        values: Any = _decode_strings(meta["encoding"], meta["params"], raw, n)
+        if validity is not None:
+            values = [
+                v if m else None for v, m in zip(values, unpack_bits(validity, n))
+            ]
+        return Column(dtype, values, validity)
+    if dtype == DataType.CATEGORICAL:
+        if meta["encoding"] != "dictionary":
+            raise ValueError(
+                f"Unknown encoding '{meta['encoding']}' for a categorical chunk"
+            )
+        dictionary, used = _read_strings(meta["params"], raw)
+        codes = array(meta["params"]["width"])
+        codes.frombytes(raw[used:])
+        return Column(
+            dtype, array(code_typecode(len(dictionary)), codes), validity, dictionary
+        )
+    ints = _decode_ints(meta["encoding"], meta["params"], raw, n, _INT_VIEWS[dtype])
+    return Column(dtype, _from_int_view(ints, dtype), validity)
+
+
+def write_columnar(
+    table: Any,
+    path: Union[str, "os.PathLike[str]"],
+    row_group_size: int = ROW_GROUP_SIZE,
+) -> None:
+    """
+    Writes ``table`` to ``path`` as a compressed columnar file. See
+    ``Table.write_columnar``.
+    """
+    if row_group_size < 1:
+        raise ValueError("row_group_size must be at least 1")
+    names = table.column_names
+    for name in names:
+        dtype = table.column(name).dtype
+        if dtype not in _INT_VIEWS and dtype not in (
+            DataType.STRING,
+            DataType.CATEGORICAL,
+        ):
+            raise TypeError(
+                f"Column '{name}' has dtype {dtype.value}, which cannot be stored in a "
+                "columnar file"
+            )
+    row_groups = []
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        for start in range(0, len(table), row_group_size):
+            rows = min(row_group_size, len(table) - start)
+            chunks = []
+            for name in names:
+                meta, parts = _encode_chunk(table.column(name).slice(start, rows))
+                meta["offset"] = f.tell()
+                for part in parts:
+                    f.write(part)
+                meta["length"] = f.tell() - meta["offset"]
+                chunks.append(meta)
+            row_groups.append({"num_rows": rows, "columns": chunks})
+        indexes = []
+        for name, index in table.indexes.items():
+            meta = {"column": name, "kind": index.kind}
+            if index.kind == "sorted":
+                typecode = _width(len(table))
+                meta.update(typecode=typecode, offset=f.tell())
+                f.write(_packed(index.order, 0, typecode))
+                meta["length"] = f.tell() - meta["offset"]
+            indexes.append(meta)
+        footer = {
+            "version": VERSION,
+            "num_rows": len(table),
+            "columns": [
+                {"name": name, "dtype": table.column(name).dtype.value}
+                for name in names
+            ],
+            "schema": table.schema.model_dump_json()
+            if table.schema is not None
+            else None,
+            "row_groups": row_groups,
+            "indexes": indexes,
+        }
+        data = json.dumps(footer, separators=(",", ":")).encode("utf-8")
+        f.write(data)
+        f.write(struct.pack("<I", len(data)))
+        f.write(MAGIC)
+
+
+def _literal_comparison(expr: BinaryOp) -> Optional[tuple[str, str, Any]]:
+    """
+    Returns (column, op, value) for ``col <op> literal`` in either order.
+    """
+    if isinstance(expr.left, ColumnRef) and isinstance(expr.right, Literal):
+        return expr.left.name, expr.op, expr.right.value
+    if isinstance(expr.left, Literal) and isinstance(expr.right, ColumnRef):
+        return expr.right.name, _FLIPPED[expr.op], expr.left.value
+    return None
+
+
+def may_match(predicate: Expr, stats: dict[str, dict[str, Any]], num_rows: int) -> bool:
+    """
+    Whether any row of a row group could satisfy ``predicate``, judging only by
+    per-column zone maps (``{"min", "max", "null_count"}`` keyed by column).
+    Returns True whenever the statistics cannot rule the group out.
+    """
+    zone: Optional[dict[str, Any]]
+    if isinstance(predicate, BinaryOp):
+        if predicate.op == "and":
+            return may_match(predicate.left, stats, num_rows) and may_match(
+                predicate.right, stats, num_rows
+            )
+        if predicate.op == "or":
+            return may_match(predicate.left, stats, num_rows) or may_match(
+                predicate.right, stats, num_rows
+            )
+        if predicate.op not in _FLIPPED:
+            return True
+        comparison = _literal_comparison(predicate)
+        if comparison is None or comparison[0] not in stats:
+            return True
+        name, op, value = comparison
+        zone = stats[name]
+        if zone["null_count"] == num_rows:
+            return False  # comparisons with null never hold
+        lo, hi = zone["min"], zone["max"]
+        if lo is None or value is None or op == "ne":
+            return True
+        try:
+            if op == "eq":
+                return bool(lo <= value <= hi)
+            if op == "lt":
+                return bool(lo < value)
+            if op == "le":
+                return bool(lo <= value)
+            if op == "gt":
+                return bool(hi > value)
+            return bool(hi >= value)
+        except TypeError:
+            return True
+    if isinstance(predicate, IsNull) and isinstance(predicate.operand, ColumnRef):
+        zone = stats.get(predicate.operand.name)
+        if zone is None:
+            return True
+        null_count: int = zone["null_count"]
+        return null_count < num_rows if predicate.negate else null_count > 0
+    if isinstance(predicate, IsIn) and isinstance(predicate.operand, ColumnRef):
+        zone = stats.get(predicate.operand.name)
+        if zone is None or zone["min"] is None:
+            return True
+        try:
+            return any(
+                zone["min"] <= v <= zone["max"]
+                for v in predicate.values
+                if v is not None
+            )
+        except TypeError:
+            return True
+    return True
+
+
+class ColumnarFile:
+    """
+    A compressed columnar file opened for reading.
+
+    Only the footer is parsed on open; column chunks are decoded on ``read``.
+    """
+    def __init__(self, path: Union[str, "os.PathLike[str]"]):
+        """
+        Open a columnar file.
+
+        Args:
+            path: A file written by ``Table.write_columnar``.
+        """
+        self.path = os.fspath(path)
+        with open(self.path, "rb") as f:
+            self._buffer = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        tail = len(MAGIC) + 4
+        if (
+            len(self._buffer) < len(MAGIC) + tail
+            or bytes(self._buffer[:len(MAGIC)]) != MAGIC
+            or bytes(self._buffer[-len(MAGIC):]) != MAGIC
+        ):
+            raise ValueError(f"{self.path} is not a corepy columnar file")
+        length = struct.unpack_from("<I", self._buffer, len(self._buffer) - tail)[0]
+        end = len(self._buffer) - tail
+        footer = json.loads(bytes(self._buffer[end - length:end]))
+        self.num_rows: int = footer["num_rows"]
+        self.dtypes: dict[str, DataType] = {
+            c["name"]: DataType(c["dtype"]) for c in footer["columns"]
+        }
+        self.schema = (
+            Schema.model_validate_json(footer["schema"]) if footer["schema"] else None
+        )
+        self.row_groups: list[dict[str, Any]] = footer["row_groups"]
+        self.indexes: dict[str, dict[str, Any]] = {
+            meta["column"]: meta for meta in footer.get("indexes", [])
+        }
+
+    @property
+    def column_names(self) -> list[str]:
+        return list(self.dtypes)
+
+    def statistics(self, row_group: int) -> dict[str, dict[str, Any]]:
+        """
+        Zone maps of one row group: ``{column: {"min", "max", "null_count"}}``.
+        """
+        chunks = self.row_groups[row_group]["columns"]
+        return {
+            name: {
+                "min": chunk["min"],
+                "max": chunk["max"],
+                "null_count": chunk["null_count"],
+            }
+            for name, chunk in zip(self.dtypes, chunks)
+        }
+
+    def matching_row_groups(self, filter: Optional[Expr] = None) -> list[int]:
+        """
+        Indices of the row groups whose zone maps don't rule out ``filter``.
+        """
+        if filter is None:
+            return list(range(len(self.row_groups)))
+        return [
+            i
+            for i, group in enumerate(self.row_groups)
+            if may_match(filter, self.statistics(i), group["num_rows"])
+        ]
+
+    def _read_group(self, index: int, names: Sequence[str]) -> Any:
+        from .table import Table
+
+        group = self.row_groups[index]
+        position = {name: i for i, name in enumerate(self.dtypes)}
+        columns = {}
+        for name in names:
+            chunk = group["columns"][position[name]]
+            raw = self._buffer[chunk["offset"]:chunk["offset"] + chunk["length"]]
+            columns[name] = _decode_chunk(
+                chunk, raw, self.dtypes[name], group["num_rows"]
+            )
+        return Table._from_columns(columns, None, group["num_rows"])
+
+    def read(
+        self, columns: Optional[Sequence[str]] = None, filter: Optional[Expr] = None
+    ) -> Any:
+        """
+        Reads the file into a Table.
+
+        Args:
+            columns: Optional subset of columns to return, in the order given.
+            filter: Optional boolean expression. Row groups whose zone maps
+                    rule it out are skipped without being decoded; rows of the
+                    remaining groups are filtered exactly.
+        """
+        from .table import Table, concat
+
+        selected = list(columns) if columns is not None else self.column_names
+        needed = list(
+            dict.fromkeys(
+                selected + (filter.referenced_columns() if filter is not None else [])
+            )
+        )
+        missing = [name for name in needed if name not in self.dtypes]
+        if missing:
+            raise KeyError(f"{self.path} has no column(s) {missing}")
+
+        parts = []
+        for index in self.matching_row_groups(filter):
+            part = self._read_group(index, needed)
+            if filter is not None:
+                part = part.filter(filter)
+            parts.append(part.select(*selected) if needed != selected else part)
+        if not parts:
+            empty = {
+                name: Column.from_pylist([], self.dtypes[name]) for name in selected
+            }
+            return Table._from_columns(empty, None, 0)
+        table = concat(parts)
+        if self.schema is not None and selected == self.column_names:
+            table = Table._from_columns(table._columns, self.schema, len(table))
+        if filter is None and self.indexes:
+            self._attach_indexes(table)
+        return table
+
+    def _attach_indexes(self, table: Any) -> None:
+        from .index import HashIndex, Index, SortedIndex
+
+        indexes: dict[str, Index] = {}
+        for name, meta in self.indexes.items():
+            if name not in table:
+                continue
+            column = table.column(name)
+            if meta["kind"] == "hash":
+                indexes[name] = HashIndex(column)
+            else:
+                raw = self._buffer[meta["offset"]:meta["offset"] + meta["length"]]
+                indexes[name] = SortedIndex(
+                    column, _unpacked(raw, meta["typecode"], 0, "q")
+                )
+        table._indexes = indexes
+
+    def __repr__(self) -> str:
+        return (
+            f"ColumnarFile({self.path!r}, rows={self.num_rows}, "
+            f"row_groups={len(self.row_groups)})"
+        )
+
+
+def read_columnar(
+    path: Union[str, "os.PathLike[str]"],
+    columns: Optional[Sequence[str]] = None,
+    filter: Optional[Expr] = None,
+) -> Any:
+    """
+    Reads a compressed columnar file, skipping row groups ``filter`` cannot
+    match and decoding only the columns needed. See ``ColumnarFile.read``.
+    """
+    return ColumnarFile(path).read(columns, filter)
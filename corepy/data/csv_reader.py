@@ -0,0 +1,466 @@
+"""
+Chunked CSV reading into typed Tables.
+
+The file is cut into byte ranges that end on row boundaries. Each range is
+parsed on its own (by the C ``csv`` module), transposed to columns and
+converted straight into typed column buffers, so ranges can be parsed in any
+order, by separate processes, or streamed one at a time.
+
+Column dtypes come from a ``Schema`` when given, otherwise they are inferred
+from a sample of the first rows; low-cardinality text columns are read as
+categoricals. Ranges are only cut at newlines outside quoted fields (an even
+number of quote characters precedes the cut), so quoted fields may span lines.
+Rows that come out with the wrong number of fields raise ``ValueError``
+rather than being misread.
+"""
+import csv
+import io
+import os
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass, field, replace
+from itertools import islice
+from operator import itemgetter
+from typing import Any, Optional, Union
+
+from corepy.backend.types import DataType
+from corepy.schema import Schema
+
+from .column import TYPECODES, Column, is_low_cardinality, pack_bits, resolve_dtype
+from .table import Table, concat
+from .validation import compile_schema
+
+DEFAULT_CHUNK_BYTES = 16 * 1024 * 1024
+
+_BOOL_TOKENS = {"true": 1, "false": 0, "True": 1, "False": 0, "TRUE": 1, "FALSE": 0}
+
+# Inferred columns widen along this chain when a later chunk doesn't fit
+_WIDENING = {
+    DataType.BOOL: DataType.STRING,
+    DataType.INT64: DataType.FLOAT64,
+    DataType.FLOAT64: DataType.STRING,
+}
+
+
+@dataclass
+class CsvLayout:
+    """
+    Everything a worker needs to parse one byte range of a CSV file.
+    """
+    path: str
+    names: list[str]
+    indices: list[int]
+    dtypes: list[DataType]
+    strict: list[bool]
+    width: int
+    delimiter: str = ","
+    quotechar: str = '"'
+    encoding: str = "utf-8"
+    null_values: frozenset[str] = field(default_factory=lambda: frozenset({""}))
+
+
+def _parser(dtype: DataType) -> Any:
+    if dtype in (DataType.INT64, DataType.INT32):
+        return int
+    if dtype in (DataType.FLOAT64, DataType.FLOAT32):
+        return float
+    if dtype == DataType.BOOL:
+        return _BOOL_TOKENS.__getitem__
+    return None
+
+
+def _check_separators(values: Sequence[str]) -> None:
+    # int() and float() accept "1_000"; CSV numbers don't use digit separators
+    if any("_" in v for v in values):
+        raise ValueError("digit separators ('_') are not numbers")
+
+
+def _infer(values: Sequence[str]) -> DataType:
+    """
+    Picks the narrowest dtype that parses every (non-null) sample value.
+    """
+    if not values:
+        return DataType.STRING
+    if all(v in _BOOL_TOKENS for v in values):
+        return DataType.BOOL
+    for dtype, parse in ((DataType.INT64, int), (DataType.FLOAT64, float)):
+        try:
+            _check_separators(values)
+            list(map(parse, values))
+            return dtype
+        except ValueError:
+            continue
+    return DataType.STRING
+
+
+def convert_column(
+    name: str,
+    values: Sequence[str],
+    dtype: DataType,
+    null_values: frozenset[str],
+    strict: bool = True,
+) -> Column:
+    """
+    Converts the text of one column into a typed Column. Values in
+    ``null_values`` become nulls. Non-strict (inferred) columns widen to
+    float64 or string instead of failing.
+    """
+    nulls = any(map(null_values.__contains__, values))
+    validity = None
+    if nulls:
+        valid = bytes(v not in null_values for v in values)
+        validity = pack_bits(valid, len(values))
+    if dtype == DataType.CATEGORICAL:
+        return Column.from_pylist(
+            [None if v in null_values else v for v in values] if nulls else values,
+            dtype,
+        )
+    if dtype not in TYPECODES:
+        if nulls:
+            return Column(
+                dtype, [None if v in null_values else v for v in values], validity
+            )
+        return Column(dtype, list(values), None)
+
+    text = values
+    if nulls:
+        # Substitute a parseable token for nulls; their slots are masked anyway
+        fill = "false" if dtype == DataType.BOOL else "0"
+        substitute = dict.fromkeys(null_values, fill)
+        text = list(map(substitute.get, values, values))
+    parse = _parser(dtype)
+    try:
+        if parse in (int, float):
+            _check_separators(text)
+        return Column(dtype, array(TYPECODES[dtype], map(parse, text)), validity)
+    except (ValueError, KeyError, OverflowError) as e:
+        if strict or dtype not in _WIDENING:
+            raise ValueError(
+                f"Column '{name}': cannot parse values as {dtype.value}: {e}"
+            ) from None
+        return convert_column(name, values, _WIDENING[dtype], null_values, strict=False)
+
+
+def _check_width(
+    rows: list[list[str]], width: int, layout: CsvLayout, begin: int
+) -> None:
+    if set(map(len, rows)) == {width}:
+        return
+    for number, row in enumerate(rows):
+        if len(row) != width:
+            raise ValueError(
+                f"{layout.path}: row {number} of the chunk at byte {begin} has "
+                f"{len(row)} fields, expected {width}"
+            )
+
+
+def parse_range(layout: CsvLayout, begin: int, end: int) -> Table:
+    """
+    Parses bytes ``[begin, end)`` of the file, which must start and end on row
+    boundaries.
+    """
+    with open(layout.path, "rb") as f:
+        f.seek(begin)
+        text = f.read(end - begin).decode(layout.encoding)
+    reader = csv.reader(
+        io.StringIO(text, newline=""),
+        delimiter=layout.delimiter,
+        quotechar=layout.quotechar,
+    )
+    rows = list(filter(None, reader))
+    _check_width(rows, layout.width, layout, begin)
+
+    if layout.indices == list(range(layout.width)):
+        fields: Iterable[Sequence[str]] = (
+            zip(*rows) if rows else ([] for _ in layout.indices)
+        )
+    else:
+        # Projection: only the selected fields are pulled out and converted
+        fields = (list(map(itemgetter(i), rows)) for i in layout.indices)
+
+    columns: dict[str, Column] = {}
+    for name, values, dtype, strict in zip(
+        layout.names, fields, layout.dtypes, layout.strict
+    ):
+        columns[name] = convert_column(name, values, dtype, layout.null_values, strict)
+    return Table._from_columns(columns, None, len(rows))
+
+
+def _parity(data: bytes, quote: bytes) -> int:
+    return data.count(quote) % 2 if quote else 0
+
+
+def _split(
+    path: str, start: int, chunk_bytes: int, quote: bytes = b'"'
+) -> list[tuple[int, int]]:
+    """
+    Cuts ``[start, size)`` into ranges of about ``chunk_bytes`` ending on
+    newlines outside quoted fields. A doubled (escaped) quote flips the
+    parity twice, so counting quotes is enough to tell.
+    """
+    size = os.path.getsize(path)
+    ranges = []
+    with open(path, "rb") as f:
+        begin = start
+        f.seek(begin)
+        while begin < size:
+            quoted = _parity(f.read(chunk_bytes), quote)
+            line = f.readline()
+            quoted ^= _parity(line, quote)
+            while quoted and line:
+                # The cut fell inside a quoted field: extend to its closing line
+                line = f.readline()
+                quoted ^= _parity(line, quote)
+            end = min(f.tell(), size)
+            ranges.append((begin, end))
+            begin = end
+    return ranges
+
+
+def _layout(
+    path: str,
+    schema: Optional[Schema],
+    columns: Optional[Sequence[str]],
+    has_header: bool,
+    delimiter: str,
+    quotechar: str,
+    encoding: str,
+    null_values: Iterable[str],
+    sample_rows: int,
+) -> tuple[CsvLayout, int]:
+    """
+    Reads the header and a sample of rows. Returns the layout and the byte
+    offset of the first data row.
+    """
+    with open(path, "rb") as f:
+        start = 0
+        header = None
+        if has_header:
+            header_line = f.readline()
+            start = f.tell()
+            header = next(
+                csv.reader(
+                    [header_line.decode(encoding)],
+                    delimiter=delimiter,
+                    quotechar=quotechar,
+                ),
+                [],
+            )
+        sample_text = b"".join(islice(f, sample_rows)).decode(encoding, errors="ignore")
+    sample = [
+        r
+        for r in csv.reader(
+            io.StringIO(sample_text, newline=""),
+            delimiter=delimiter,
+            quotechar=quotechar,
+        )
+        if r
+    ]
+
+    if header is not None:
+        names = header
+    elif schema is not None:
+        names = [f.name for f in schema.fields]
+    else:
+        width = len(sample[0]) if sample else 0
+        names = [f"column_{i}" for i in range(width)]
+
+    selected = list(columns) if columns is not None else names
+    missing = [name for name in selected if name not in names]
+    if missing:
+        raise KeyError(f"{path} has no column(s) {missing}")
+    position = {name: i for i, name in enumerate(names)}
+    indices = [position[name] for name in selected]
+
+    nulls = frozenset(null_values)
+    dtypes = []
+    strict = []
+    for name, index in zip(selected, indices):
+        schema_field = schema.get_field(name) if schema is not None else None
+        if schema_field is not None:
+            dtypes.append(resolve_dtype(schema_field.dtype))
+            strict.append(True)
+        else:
+            values = [
+                row[index]
+                for row in sample
+                if index < len(row) and row[index] not in nulls
+            ]
+            dtype = _infer(values)
+            if dtype == DataType.STRING and is_low_cardinality(values):
+                dtype = DataType.CATEGORICAL
+            dtypes.append(dtype)
+            strict.append(False)
+    layout = CsvLayout(
+        path,
+        selected,
+        indices,
+        dtypes,
+        strict,
+        len(names),
+        delimiter,
+        quotechar,
+        encoding,
+        nulls,
+    )
+    return layout, start
+
+
+def _plan(
+    path: str,
+    schema: Optional[Schema],
+    columns: Optional[Sequence[str]],
+    has_header: bool,
+    delimiter: str,
+    quotechar: str,
+    encoding: str,
+    null_values: Iterable[str],
+    sample_rows: int,
+    chunk_bytes: int,
+) -> tuple[CsvLayout, list[tuple[int, int]]]:
+    layout, start = _layout(
+        path,
+        schema,
+        columns,
+        has_header,
+        delimiter,
+        quotechar,
+        encoding,
+        null_values,
+        sample_rows,
+    )
+    return layout, _split(
+        path, start, max(1, chunk_bytes), (quotechar or "").encode(encoding)
+    )
+
+
+def _parse_all(
+    layout: CsvLayout, ranges: list[tuple[int, int]], pool: Optional[Any]
+) -> Iterator[Table]:
+    if not ranges:
+        empty = {
+            name: Column.from_pylist([], dtype)
+            for name, dtype in zip(layout.names, layout.dtypes)
+        }
+        yield Table._from_columns(empty, None, 0)
+    elif pool is not None:
+        yield from pool.imap_tables(parse_range, ((layout, b, e) for b, e in ranges))
+    else:
+        for begin, end in ranges:
+            yield parse_range(layout, begin, end)
+
+
+def _widest(layout: CsvLayout, parts: list[Table]) -> list[DataType]:
+    """
+    Returns, per column, the widest dtype any chunk ended up with.
+    """
+    dtypes = []
+    for name, dtype in zip(layout.names, layout.dtypes):
+        seen = {part.column(name).dtype for part in parts}
+        while dtype in _WIDENING and seen - {dtype}:
+            seen.discard(dtype)
+            dtype = _WIDENING[dtype]
+        dtypes.append(dtype)
+    return dtypes
+
+
+def iter_csv(
+    path: Union[str, "os.PathLike[str]"],
+    schema: Optional[Schema] = None,
+    columns: Optional[Sequence[str]] = None,
+    has_header: bool = True,
+    delimiter: str = ",",
+    quotechar: str = '"',
+    encoding: str = "utf-8",
+    null_values: Iterable[str] = ("",),
+    sample_rows: int = 1000,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    pool: Optional[Any] = None,
+) -> Iterator[Table]:
+    """
+    Reads a CSV file as a stream of Tables, one per chunk of about ``chunk_bytes``.
+    An inferred column whose values stop fitting the sampled dtype is widened
+    in that chunk only; ``read_csv`` reconciles chunks.
+
+    Args:
+        path: The CSV file.
+        schema: Optional schema; its field dtypes are enforced (unparseable
+                values raise).
+        columns: Optional subset of columns to read, in the order given.
+        has_header: Whether the first line holds the column names.
+        delimiter: Field separator.
+        quotechar: Quote character.
+        encoding: Text encoding.
+        null_values: Field values read as null.
+        sample_rows: Number of rows sampled to infer dtypes of columns not in
+                     ``schema``.
+        chunk_bytes: Approximate size of each chunk.
+        pool: Optional ``corepy.runtime.ProcessPool`` parsing chunks in parallel.
+    """
+    layout, ranges = _plan(
+        os.fspath(path),
+        schema,
+        columns,
+        has_header,
+        delimiter,
+        quotechar,
+        encoding,
+        null_values,
+        sample_rows,
+        chunk_bytes,
+    )
+    yield from _parse_all(layout, ranges, pool)
+
+
+def read_csv(
+    path: Union[str, "os.PathLike[str]"],
+    schema: Optional[Schema] = None,
+    columns: Optional[Sequence[str]] = None,
+    has_header: bool = True,
+    delimiter: str = ",",
+    quotechar: str = '"',
+    encoding: str = "utf-8",
+    null_values: Iterable[str] = ("",),
+    sample_rows: int = 1000,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    pool: Optional[Any] = None,
+) -> Table:
+    """
+    Reads a CSV file into a Table. Takes the same arguments as ``iter_csv``;
+    pass ``pool=ProcessPool()`` to parse chunks in parallel processes. The
+    result is checked against the constraints of ``schema`` (see ``Table.validate``).
+    """
+    layout, ranges = _plan(
+        os.fspath(path),
+        schema,
+        columns,
+        has_header,
+        delimiter,
+        quotechar,
+        encoding,
+        null_values,
+        sample_rows,
+        chunk_bytes,
+    )
+    parts = list(_parse_all(layout, ranges, pool))
+    dtypes = _widest(layout, parts)
+    if dtypes != layout.dtypes:
+        # Re-parse the chunks that kept a narrower dtype than a later chunk needed
+        layout = replace(layout, dtypes=dtypes)
+        parts = [
+            part
+            if part.dtypes == dict(zip(layout.names, dtypes))
+            else parse_range(layout, begin, end)
+            for part, (begin, end) in zip(parts, ranges)
+        ]
+    table = concat(parts)
+    if schema is not None:
+        read_fields = [f for f in schema.fields if f.name in layout.names]
+        compile_schema(Schema(fields=read_fields)).check(table)
+    if (
+        schema is not None
+        and columns is None
+        and table.column_names == [f.name for f in schema.fields]
+    ):
+        table = Table._from_columns(table._columns, schema, len(table))
+    return table
@@ -0,0 +1,929 @@
+"""
+Column expressions for Table queries.
+
+Expressions are small trees built with ``col`` and ``lit`` and the usual Python
+operators::
+
+    (col("price") * col("qty")).alias("total")
+    (col("price") > 10) & col("region").isin(["eu", "us"])
+
+Before running, a tree is compiled against the table dtypes: names and result
+types are resolved, constant sub-trees are folded and every node is bound to a
+buffer kernel from the Dispatcher. Evaluating the compiled tree then runs one
+kernel per node over whole column buffers; rows are never materialized.
+"""
+import math
+import operator
+from array import array
+from collections.abc import Iterable
+from itertools import repeat
+from typing import Any, Callable, NamedTuple, Optional, Union
+
+from corepy.backend.dispatch import Dispatcher
+from corepy.backend.types import BackendType, DataType
+
+from .column import TYPECODES, Column, lookup_codes, resolve_dtype, unpack_bits
+
+_FLOATS = (DataType.FLOAT32, DataType.FLOAT64)
+_NUMERIC = (DataType.BOOL, DataType.INT32, DataType.INT64) + _FLOATS
+
+_ARITHMETIC = {
+    "add": operator.add,
+    "sub": operator.sub,
+    "mul": operator.mul,
+    "truediv": operator.truediv,
+    "floordiv": operator.floordiv,
+    "mod": operator.mod,
+    "pow": operator.pow,
+}
+_COMPARISON = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "lt": operator.lt,
+    "le": operator.le,
+    "gt": operator.gt,
+    "ge": operator.ge,
+}
+_LOGICAL = {
+    "and": operator.and_,
+    "or": operator.or_,
+    "xor": operator.xor,
+}
+_SYMBOLS = {
+    "add": "+",
+    "sub": "-",
+    "mul": "*",
+    "truediv": "/",
+    "floordiv": "//",
+    "mod": "%",
+    "pow": "**",
+    "eq": "==",
+    "ne": "!=",
+    "lt": "<",
+    "le": "<=",
+    "gt": ">",
+    "ge": ">=",
+    "and": "&",
+    "or": "|",
+    "xor": "^",
+}
+
+# int64 results wrap around modulo 2**64, as in native integer arithmetic
+_INT64_BIAS = 1 << 63
+
+# Maps any non-zero byte to 1, so bool buffers can be combined with integer AND
+TRUTHY = bytes([0] + [1] * 255)
+# Swaps the 0/1 bytes of a mask
+FLIP = bytes([1, 0] + [0] * 254)
+
+
+class _Compiled(NamedTuple):
+    """
+    A compiled expression node. ``fn`` maps a Table to a Column, or to a plain
+    Python value when ``scalar`` is True.
+    """
+    dtype: DataType
+    fn: Callable[[Any], Any]
+    scalar: bool = False
+
+
+def _kernel(name: str) -> Callable[..., Any]:
+    return Dispatcher.get_kernel(name, BackendType.CPU)
+
+
+def _literal_dtype(value: Any) -> DataType:
+    if isinstance(value, bool):
+        return DataType.BOOL
+    if isinstance(value, int):
+        return DataType.INT64
+    if isinstance(value, float):
+        return DataType.FLOAT64
+    if isinstance(value, str):
+        return DataType.STRING
+    return DataType.OBJECT
+
+
+def _arithmetic_dtype(op: str, left: _Compiled, right: _Compiled) -> DataType:
+    ltype, rtype = left.dtype, right.dtype
+    if op == "add" and {ltype, rtype} <= {DataType.STRING, DataType.CATEGORICAL}:
+        return DataType.STRING
+    if ltype not in _NUMERIC or rtype not in _NUMERIC:
+        raise TypeError(
+            f"Cannot apply '{_SYMBOLS[op]}' to {ltype.value} and {rtype.value}"
+        )
+    # A scalar operand takes the column's float width (col_f32 * 2.0 stays float32)
+    if left.scalar and rtype in _FLOATS:
+        ltype = rtype
+    if right.scalar and ltype in _FLOATS:
+        rtype = ltype
+    if ltype == rtype == DataType.FLOAT32:
+        return DataType.FLOAT32
+    if op in ("truediv", "pow") or ltype in _FLOATS or rtype in _FLOATS:
+        return DataType.FLOAT64
+    return DataType.INT64
+
+
+def _float_op(op: str) -> Callable[[Any, Any], Any]:
+    """
+    ``op`` with IEEE 754 results: division by zero gives ±inf or nan and
+    overflow gives ±inf instead of raising.
+    """
+    py_op = _ARITHMETIC[op]
+
+    def apply(x: Any, y: Any) -> Any:
+        try:
+            value = py_op(x, y)
+        except ZeroDivisionError:
+            if op == "pow":
+                return math.inf
+            if op == "mod" or x == 0 or math.isnan(x):
+                return math.nan
+            return math.copysign(math.inf, x) * math.copysign(1.0, y)
+        except OverflowError:
+            return math.inf if x > 0 or y % 2 == 0 else -math.inf
+        if isinstance(value, complex):
+            return math.nan
+        try:
+            return float(value)
+        except OverflowError:
+            return math.inf if value > 0 else -math.inf
+
+    return apply
+
+
+def _int_op(op: str) -> Callable[[Any, Any], Any]:
+    """
+    ``op`` with int64 results that wrap around on overflow; an integer
+    division by zero is null.
+    """
+    py_op = _ARITHMETIC[op]
+
+    def apply(x: Any, y: Any) -> Any:
+        try:
+            value = py_op(x, y)
+        except ZeroDivisionError:
+            return None
+        return (value + _INT64_BIAS) % (2 * _INT64_BIAS) - _INT64_BIAS
+
+    return apply
+
+
+def _comparable(ltype: DataType, rtype: DataType) -> bool:
+    if ltype in _NUMERIC and rtype in _NUMERIC:
+        return True
+    if {ltype, rtype} <= {DataType.STRING, DataType.CATEGORICAL}:
+        return True
+    return ltype == rtype or DataType.OBJECT in (ltype, rtype)
+
+
+def _decoded(compiled: _Compiled) -> _Compiled:
+    """
+    Wraps a categorical operand so it evaluates to plain strings.
+    """
+    if compiled.dtype != DataType.CATEGORICAL:
+        return compiled
+    fn = compiled.fn
+    return _Compiled(DataType.STRING, lambda table: fn(table).dictionary_decode())
+
+
+def _categorical_compare(
+    op: Callable[[Any, Any], Any], column: _Compiled, value: Any
+) -> _Compiled:
+    """
+    Compares a categorical column with a constant by evaluating ``op`` once per
+    dictionary entry and mapping the codes through the results.
+    """
+    def evaluate(table: Any) -> Column:
+        operand = column.fn(table)
+        results = bytes(bool(op(entry, value)) for entry in operand.dictionary)
+        return Column(
+            DataType.BOOL,
+            _bool_buffer(lookup_codes(operand.values, results)),
+            operand.validity,
+        )
+
+    return _Compiled(DataType.BOOL, evaluate)
+
+
+def combine_validity(columns: Iterable[Column]) -> Optional[Any]:
+    """
+    ANDs the validity bitmaps of ``columns``; None when none of them has nulls.
+    """
+    bitmaps = [c.validity for c in columns if c.validity is not None]
+    if not bitmaps:
+        return None
+    if len(bitmaps) == 1:
+        return bitmaps[0]
+    merged = int.from_bytes(bitmaps[0], "little")
+    for bitmap in bitmaps[1:]:
+        merged &= int.from_bytes(bitmap, "little")
+    return merged.to_bytes(len(bitmaps[0]), "little")
+
+
+def _broadcast(compiled: _Compiled, value: Any, length: int) -> Column:
+    if not compiled.scalar:
+        column: Column = value
+        return column
+    return Column.from_pylist([value] * length, compiled.dtype)
+
+
+class Expr:
+    """
+    Base class of column expressions.
+    """
+    def _compile(self, dtypes: dict[str, DataType]) -> _Compiled:
+        raise NotImplementedError
+
+    def compile(self, dtypes: dict[str, DataType]) -> _Compiled:
+        """
+        Resolves the expression against a table's dtypes. The result is cached
+        per dtype layout, so re-running an expression on new batches of the same
+        table shape skips compilation.
+        """
+        key = tuple(dtypes.items())
+        cache: dict[Any, _Compiled] = self.__dict__.setdefault("_compiled", {})
+        compiled = cache.get(key)
+        if compiled is None:
+            compiled = cache[key] = self._compile(dtypes)
+        return compiled
+
+    def evaluate(self, table: Any) -> Column:
+        """
+        Evaluates the expression over ``table`` and returns the resulting column.
+        Scalar results are broadcast to the table length.
+        """
+        compiled = self.compile(table.dtypes)
+        return _broadcast(compiled, compiled.fn(table), len(table))
+
+    @property
+    def output_name(self) -> str:
+        """
+        Name of the column this expression produces.
+        """
+        raise NotImplementedError
+
+    @property
+    def children(self) -> tuple["Expr", ...]:
+        """
+        The sub-expressions this expression is built from.
+        """
+        return ()
+
+    def referenced_columns(self) -> list[str]:
+        """
+        Names of the columns the expression reads, in first-use order.
+        """
+        names: dict[str, None] = {}
+        for child in self.children:
+            names.update(dict.fromkeys(child.referenced_columns()))
+        return list(names)
+
+    def alias(self, name: str) -> "Expr":
+        return Alias(self, name)
+
+    def cast(self, dtype: Union[str, DataType]) -> "Expr":
+        return Cast(self, resolve_dtype(dtype))
+
+    def is_null(self) -> "Expr":
+        return IsNull(self, negate=False)
+
+    def is_not_null(self) -> "Expr":
+        return IsNull(self, negate=True)
+
+    def isin(self, values: Iterable[Any]) -> "Expr":
+        return IsIn(self, values)
+
+    def abs(self) -> "Expr":
+        return UnaryOp("abs", self)
+
+    # Aggregations
+    def sum(self) -> "AggExpr":
+        return AggExpr("sum", self)
+
+    def mean(self) -> "AggExpr":
+        return AggExpr("mean", self)
+
+    def std(self) -> "AggExpr":
+        return AggExpr("std", self)
+
+    def var(self) -> "AggExpr":
+        return AggExpr("var", self)
+
+    def min(self) -> "AggExpr":
+        return AggExpr("min", self)
+
+    def max(self) -> "AggExpr":
+        return AggExpr("max", self)
+
+    def count(self) -> "AggExpr":
+        return AggExpr("count", self)
+
+    def count_distinct(self) -> "AggExpr":
+        return AggExpr("count_distinct", self)
+
+    def approx_count_distinct(self, precision: int = 14) -> "AggExpr":
+        return AggExpr("approx_count_distinct", self, args=(precision,))
+
+    def approx_quantile(self, q: float, compression: float = 200.0) -> "AggExpr":
+        return AggExpr("approx_quantile", self, args=(q, compression))
+
+    def heavy_hitters(self, k: int = 10, capacity: Optional[int] = None) -> "AggExpr":
+        return AggExpr("heavy_hitters", self, args=(k, capacity))
+
+    def first(self) -> "AggExpr":
+        return AggExpr("first", self)
+
+    def last(self) -> "AggExpr":
+        return AggExpr("last", self)
+
+    # Operators
+    def _binary(self, op: str, other: Any, reflected: bool = False) -> "Expr":
+        other = other if isinstance(other, Expr) else Literal(other)
+        return BinaryOp(op, other, self) if reflected else BinaryOp(op, self, other)
+
+    def __add__(self, other: Any) -> "Expr":
+        return self._binary("add", other)
+
+    def __radd__(self, other: Any) -> "Expr":
+        return self._binary("add", other, reflected=True)
+
+    def __sub__(self, other: Any) -> "Expr":
+        return self._binary("sub", other)
+
+    def __rsub__(self, other: Any) -> "Expr":
+        return self._binary("sub", other, reflected=True)
+
+    def __mul__(self, other: Any) -> "Expr":
+        return self._binary("mul", other)
+
+    def __rmul__(self, other: Any) -> "Expr":
+        return self._binary("mul", other, reflected=True)
+
+    def __truediv__(self, other: Any) -> "Expr":
+        return self._binary("truediv", other)
+
+    def __rtruediv__(self, other: Any) -> "Expr":
+        return self._binary("truediv", other, reflected=True)
+
+    def __floordiv__(self, other: Any) -> "Expr":
+        return self._binary("floordiv", other)
+
+    def __rfloordiv__(self, other: Any) -> "Expr":
+        return self._binary("floordiv", other, reflected=True)
+
+    def __mod__(self, other: Any) -> "Expr":
+        return self._binary("mod", other)
+
+    def __rmod__(self, other: Any) -> "Expr":
+        return self._binary("mod", other, reflected=True)
+
+    def __pow__(self, other: Any) -> "Expr":
+        return self._binary("pow", other)
+
+    def __rpow__(self, other: Any) -> "Expr":
+        return self._binary("pow", other, reflected=True)
+
+    def __eq__(self, other: Any) -> "Expr":  # type: ignore[override]
+        return self._binary("eq", other)
+
+    def __ne__(self, other: Any) -> "Expr":  # type: ignore[override]
+        return self._binary("ne", other)
+
+    def __lt__(self, other: Any) -> "Expr":
+        return self._binary("lt", other)
+
+    def __le__(self, other: Any) -> "Expr":
+        return self._binary("le", other)
+
+    def __gt__(self, other: Any) -> "Expr":
+        return self._binary("gt", other)
+
+    def __ge__(self, other: Any) -> "Expr":
+        return self._binary("ge", other)
+
+    def __and__(self, other: Any) -> "Expr":
+        return self._binary("and", other)
+
+    def __rand__(self, other: Any) -> "Expr":
+        return self._binary("and", other, reflected=True)
+
+    def __or__(self, other: Any) -> "Expr":
+        return self._binary("or", other)
+
+    def __ror__(self, other: Any) -> "Expr":
+        return self._binary("or", other, reflected=True)
+
+    def __xor__(self, other: Any) -> "Expr":
+        return self._binary("xor", other)
+
+    def __rxor__(self, other: Any) -> "Expr":
+        return self._binary("xor", other, reflected=True)
+
+    def __invert__(self) -> "Expr":
+        return UnaryOp("not", self)
+
+    def __neg__(self) -> "Expr":
+        return UnaryOp("neg", self)
+
+    def __bool__(self) -> bool:
+        raise TypeError(
+            "Expressions have no truth value; combine conditions with & and | instead "
+            "of and/or"
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+
+class ColumnRef(Expr):
+    """
+    A reference to a table column.
+    """
+    def __init__(self, name: str):
+        self.name = name
+
+    @property
+    def output_name(self) -> str:
+        return self.name
+
+    def referenced_columns(self) -> list[str]:
+        return [self.name]
+
+    def _compile(self, dtypes: dict[str, DataType]) -> _Compiled:
+        if self.name not in dtypes:
+            raise KeyError(f"Table has no column '{self.name}'")
+        name = self.name
+        return _Compiled(dtypes[name], lambda table: table.column(name))
+
+    def __repr__(self) -> str:
+        return f"col({self.name!r})"
+
+
+class Literal(Expr):
+    """
+    A constant, broadcast against the columns it is combined with.
+    """
+    def __init__(self, value: Any):
+        self.value = value
+
+    @property
+    def output_name(self) -> str:
+        return "literal"
+
+    def _compile(self, dtypes: dict[str, DataType]) -> _Compiled:
+        value = self.value
+        return _Compiled(_literal_dtype(value), lambda table: value, scalar=True)
+
+    def __repr__(self) -> str:
+        return f"lit({self.value!r})"
+
+
+class BinaryOp(Expr):
+    """
+    An arithmetic, comparison or logical operator applied element-wise.
+    Rows where either operand is null are null in the result.
+
+    No row aborts the evaluation: float arithmetic follows IEEE 754
+    (``x / 0.0`` is ±inf or nan), int64 results wrap around on overflow and
+    an integer ``//`` or ``%`` by zero is null.
+    """
+    def __init__(self, op: str, left: Expr, right: Expr):
+        self.op = op
+        self.left = left
+        self.right = right
+
+    @property
+    def output_name(self) -> str:
+        if isinstance(self.left, Literal):
+            return self.right.output_name
+        return self.left.output_name
+
+    @property
+    def children(self) -> tuple[Expr, ...]:
+        return (self.left, self.right)
+
+    def _result_dtype(self, left: _Compiled, right: _Compiled) -> DataType:
+        if self.op in _ARITHMETIC:
+            return _arithmetic_dtype(self.op, left, right)
+        if self.op in _LOGICAL:
+            if left.dtype != DataType.BOOL or right.dtype != DataType.BOOL:
+                raise TypeError(
+                    f"'{_SYMBOLS[self.op]}' expects boolean operands, got "
+                    f"{left.dtype.value} and {right.dtype.value}"
+                )
+        elif not _comparable(left.dtype, right.dtype):
+            raise TypeError(
+                f"Cannot compare {left.dtype.value} with {right.dtype.value}"
+            )
+        return DataType.BOOL
+
+    def _compile(self, dtypes: dict[str, DataType]) -> _Compiled:
+        left = self.left._compile(dtypes)
+        right = self.right._compile(dtypes)
+        if (left.scalar and left.fn(None) is None) or (
+            right.scalar and right.fn(None) is None
+        ):
+            raise TypeError(
+                "Comparisons and arithmetic with None are undefined; use "
+                "is_null()/is_not_null()"
+            )
+        dtype = self._result_dtype(left, right)
+        py_op = (
+            _ARITHMETIC.get(self.op) or _COMPARISON.get(self.op) or _LOGICAL[self.op]
+        )
+        if self.op in _ARITHMETIC and dtype in _FLOATS:
+            py_op = _float_op(self.op)
+        elif self.op in _ARITHMETIC and dtype == DataType.INT64:
+            py_op = _int_op(self.op)
+        if (
+            self.op in _COMPARISON
+            and left.dtype == DataType.CATEGORICAL
+            and right.scalar
+        ):
+            return _categorical_compare(py_op, left, right.fn(None))
+        if (
+            self.op in _COMPARISON
+            and right.dtype == DataType.CATEGORICAL
+            and left.scalar
+        ):
+            return _categorical_compare(
+                lambda entry, value: py_op(value, entry), right, left.fn(None)
+            )
+        left, right = _decoded(left), _decoded(right)
+        if left.scalar and right.scalar:
+            # Constant folding
+            value = py_op(left.fn(None), right.fn(None))
+            return _Compiled(dtype, lambda table: value, scalar=True)
+
+        run: Callable[[Any, Any], Any]
+        if self.op in _ARITHMETIC:
+            kernel = _kernel(f"elementwise.{self.op}")
+            typecode = TYPECODES.get(dtype)
+            run = lambda a, b: kernel(a, b, typecode)  # noqa: E731
+        else:
+            kernel = _kernel(f"compare.{self.op}")
+            typecode = "B"
+            run = kernel
+        divides = self.op in ("truediv", "floordiv", "mod")
+
+        def evaluate(table: Any) -> Column:
+            a, b = left.fn(table), right.fn(table)
+            columns = [
+                c for c, compiled in ((a, left), (b, right)) if not compiled.scalar
+            ]
+            validity = combine_validity(columns)
+            lhs = a if left.scalar else a.values
+            rhs = b if right.scalar else b.values
+            typed = all(c.typecode is not None for c in columns)
+            if validity is None or (not divides and typed):
+                # Null slots hold harmless fill values; compute straight through
+                try:
+                    return Column(dtype, run(lhs, rhs), validity)
+                except (ZeroDivisionError, OverflowError):
+                    # Some row has no value in the kernel's type: go row by row
+                    pass
+            # Division by a null slot's fill value or ops on None must be skipped
+            n = len(columns[0])
+            mask = repeat(1, n) if validity is None else unpack_bits(validity, n)
+            lhs = repeat(lhs) if left.scalar else lhs
+            rhs = repeat(rhs) if right.scalar else rhs
+            values = [py_op(x, y) if m else None for x, y, m in zip(lhs, rhs, mask)]
+            return Column.from_pylist(values, dtype)
+
+        return _Compiled(dtype, evaluate)
+
+    def __repr__(self) -> str:
+        return f"({self.left!r} {_SYMBOLS[self.op]} {self.right!r})"
+
+
+class UnaryOp(Expr):
+    """
+    Negation, absolute value or logical not.
+    """
+    def __init__(self, op: str, operand: Expr):
+        self.op = op
+        self.operand = operand
+
+    @property
+    def output_name(self) -> str:
+        return self.operand.output_name
+
+    @property
+    def children(self) -> tuple[Expr, ...]:
+        return (self.operand,)
+
+    def _compile(self, dtypes: dict[str, DataType]) -> _Compiled:
+        operand = self.operand._compile(dtypes)
+        if self.op == "not":
+            if operand.dtype != DataType.BOOL:
+                raise TypeError(
+                    f"'~' expects a boolean operand, got {operand.dtype.value}"
+                )
+            dtype = DataType.BOOL
+        elif operand.dtype not in _NUMERIC:
+            raise TypeError(f"Cannot apply {self.op} to {operand.dtype.value}")
+        else:
+            dtype = DataType.INT64 if operand.dtype == DataType.BOOL else operand.dtype
+
+        unary: dict[str, Callable[[Any], Any]] = {
+            "not": operator.not_,
+            "neg": operator.neg,
+            "abs": abs,
+        }
+        py_op = unary[self.op]
+        if operand.scalar:
+            value = py_op(operand.fn(None))
+            return _Compiled(dtype, lambda table: value, scalar=True)
+
+        kernel = _kernel(f"elementwise.{self.op}")
+        typecode = TYPECODES[dtype]
+        if self.op == "not":
+            run = kernel
+        else:
+            run = lambda values: kernel(values, typecode)  # noqa: E731
+
+        def evaluate(table: Any) -> Column:
+            column = operand.fn(table)
+            try:
+                return Column(dtype, run(column.values), column.validity)
+            except OverflowError:
+                # Only the smallest int overflows; it wraps around to itself
+                low = -(1 << (8 * array(typecode).itemsize - 1))
+                values = (v if v == low else py_op(v) for v in column.values)
+                return Column(dtype, array(typecode, values), column.validity)
+
+        return _Compiled(dtype, evaluate)
+
+    def __repr__(self) -> str:
+        return f"{self.op}({self.operand!r})"
+
+
+class IsNull(Expr):
+    """
+    Tests each row for null (or, with ``negate``, for a valid value).
+    """
+    def __init__(self, operand: Expr, negate: bool = False):
+        self.operand = operand
+        self.negate = negate
+
+    @property
+    def output_name(self) -> str:
+        return self.operand.output_name
+
+    @property
+    def children(self) -> tuple[Expr, ...]:
+        return (self.operand,)
+
+    def _compile(self, dtypes: dict[str, DataType]) -> _Compiled:
+        operand = self.operand._compile(dtypes)
+        negate = self.negate
+        if operand.scalar:
+            value = (operand.fn(None) is None) != negate
+            return _Compiled(DataType.BOOL, lambda table: value, scalar=True)
+
+        def evaluate(table: Any) -> Column:
+            mask = operand.fn(table).valid_mask()
+            if not negate:
+                mask = mask.translate(FLIP)
+            return Column(DataType.BOOL, _bool_buffer(mask))
+
+        return _Compiled(DataType.BOOL, evaluate)
+
+    def __repr__(self) -> str:
+        return f"{self.operand!r}.{'is_not_null' if self.negate else 'is_null'}()"
+
+
+class IsIn(Expr):
+    """
+    Tests each row for membership in a fixed collection of values.
+    """
+    def __init__(self, operand: Expr, values: Iterable[Any]):
+        self.operand = operand
+        self.values = frozenset(values)
+
+    @property
+    def output_name(self) -> str:
+        return self.operand.output_name
+
+    @property
+    def children(self) -> tuple[Expr, ...]:
+        return (self.operand,)
+
+    def _compile(self, dtypes: dict[str, DataType]) -> _Compiled:
+        operand = self.operand._compile(dtypes)
+        contains = self.values.__contains__
+        if operand.scalar:
+            value = contains(operand.fn(None))
+            return _Compiled(DataType.BOOL, lambda table: value, scalar=True)
+
+        def evaluate(table: Any) -> Column:
+            column = operand.fn(table)
+            if column.dictionary is not None:
+                results = bytes(map(contains, column.dictionary))
+                return Column(
+                    DataType.BOOL,
+                    _bool_buffer(lookup_codes(column.values, results)),
+                    column.validity,
+                )
+            values = (
+                column.to_pylist() if column.dtype == DataType.BOOL else column.values
+            )
+            return Column(
+                DataType.BOOL, _bool_buffer(map(contains, values)), column.validity
+            )
+
+        return _Compiled(DataType.BOOL, evaluate)
+
+    def __repr__(self) -> str:
+        return f"{self.operand!r}.isin({sorted(map(repr, self.values))})"
+
+
+class Cast(Expr):
+    """
+    Converts an expression to another dtype.
+    """
+    def __init__(self, operand: Expr, dtype: DataType):
+        self.operand = operand
+        self.dtype = dtype
+
+    @property
+    def output_name(self) -> str:
+        return self.operand.output_name
+
+    @property
+    def children(self) -> tuple[Expr, ...]:
+        return (self.operand,)
+
+    def _compile(self, dtypes: dict[str, DataType]) -> _Compiled:
+        operand = self.operand._compile(dtypes)
+        dtype = self.dtype
+        if operand.scalar:
+            value = Column.from_pylist([operand.fn(None)], dtype)[0]
+            return _Compiled(dtype, lambda table: value, scalar=True)
+        if operand.dtype == dtype:
+            return _Compiled(dtype, operand.fn)
+
+        kernel = _kernel("cast")
+        typecode = TYPECODES.get(dtype)
+        as_str = dtype == DataType.STRING
+
+        def evaluate(table: Any) -> Column:
+            column = operand.fn(table)
+            if column.typecode is None or as_str:
+                # Strings and objects convert value by value, keeping nulls as None
+                try:
+                    values = [
+                        str(v) if as_str and v is not None else v
+                        for v in column.to_pylist()
+                    ]
+                    return Column.from_pylist(values, dtype)
+                except ValueError as e:
+                    raise TypeError(
+                        f"Cannot cast {column.dtype.value} to {dtype.value}: {e}"
+                    ) from e
+            if typecode is None:
+                return Column(dtype, column.to_pylist(), column.validity)
+            return Column(dtype, kernel(column.values, typecode), column.validity)
+
+        return _Compiled(dtype, evaluate)
+
+    def __repr__(self) -> str:
+        return f"{self.operand!r}.cast({self.dtype.value!r})"
+
+
+class Alias(Expr):
+    """
+    Renames the output of an expression.
+    """
+    def __init__(self, operand: Expr, name: str):
+        self.operand = operand
+        self.name = name
+
+    @property
+    def output_name(self) -> str:
+        return self.name
+
+    @property
+    def children(self) -> tuple[Expr, ...]:
+        return (self.operand,)
+
+    def _compile(self, dtypes: dict[str, DataType]) -> _Compiled:
+        return self.operand._compile(dtypes)
+
+    def __repr__(self) -> str:
+        return f"{self.operand!r}.alias({self.name!r})"
+
+
+class AggExpr:
+    """
+    An aggregation over an expression. Nulls are ignored, except by ``first``
+    and ``last`` which return the value of the first/last row as is.
+    ``count`` returns the number of valid rows, ``std`` the sample standard
+    deviation and ``var`` the sample variance. The ``approx_*`` and
+    ``heavy_hitters`` aggregations are computed with the mergeable sketches of
+    ``corepy.data.sketch``; ``args`` holds their parameters.
+    """
+    FUNCTIONS = (
+        "sum",
+        "mean",
+        "std",
+        "var",
+        "min",
+        "max",
+        "count",
+        "count_distinct",
+        "first",
+        "last",
+        "approx_count_distinct",
+        "approx_quantile",
+        "heavy_hitters",
+    )
+
+    def __init__(
+        self,
+        func: str,
+        operand: Expr,
+        name: Optional[str] = None,
+        args: tuple[Any, ...] = (),
+    ):
+        if func not in self.FUNCTIONS:
+            raise ValueError(
+                f"Unknown aggregation '{func}'. Expected one of {self.FUNCTIONS}"
+            )
+        self.func = func
+        self.operand = operand
+        self.name = name
+        self.args = tuple(args)
+
+    @property
+    def output_name(self) -> str:
+        return self.name if self.name is not None else self.operand.output_name
+
+    def alias(self, name: str) -> "AggExpr":
+        return AggExpr(self.func, self.operand, name, self.args)
+
+    def evaluate(self, table: Any) -> Any:
+        """
+        Aggregates ``table`` to a single value.
+        """
+        return getattr(self.operand.evaluate(table), self.func)(*self.args)
+
+    def __repr__(self) -> str:
+        suffix = f".alias({self.name!r})" if self.name is not None else ""
+        return (
+            f"{self.operand!r}.{self.func}({', '.join(map(repr, self.args))}){suffix}"
+        )
+
+
+def col(name: str) -> Expr:
+    """
+    References the column called ``name``.
+    """
+    return ColumnRef(name)
+
+
+def lit(value: Any) -> Expr:
+    """
+    Wraps a constant as an expression.
+    """
+    return Literal(value)
+
+
+def to_expr(value: Union[str, Expr]) -> Expr:
+    """
+    Accepts a column name or an expression.
+    """
+    return ColumnRef(value) if isinstance(value, str) else value
+
+
+def conjuncts(predicate: Expr) -> list[Expr]:
+    """
+    Splits ``a & b & c`` into ``[a, b, c]``. Filtering by each in turn keeps
+    the same rows, as a null conjunct drops the row either way.
+    """
+    if isinstance(predicate, BinaryOp) and predicate.op == "and":
+        return conjuncts(predicate.left) + conjuncts(predicate.right)
+    return [predicate]
+
+
+def _bool_buffer(values: Iterable[Any]) -> "array[Any]":
+    if isinstance(values, (bytes, bytearray)):
+        buf = array("B")
+        buf.frombytes(values)
+        return buf
+    return array("B", values)
+
+
+def mask_of(column: Column) -> bytes:
+    """
+    Converts a boolean column to a filter mask (one 0/1 byte per row).
+    Null rows are treated as False.
+    """
+    if column.dtype != DataType.BOOL:
+        raise TypeError(f"Filter predicate must be boolean, got {column.dtype.value}")
+    mask = bytes(column.values).translate(TRUTHY)
+    if column.validity is None:
+        return mask
+    valid = int.from_bytes(mask, "little") & int.from_bytes(
+        column.valid_mask(), "little"
+    )
+    return valid.to_bytes(len(mask), "little")
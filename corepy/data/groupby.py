@@ -0,0 +1,426 @@
+"""
+Hash group-by for Tables.
+
+Aggregation runs in three phases over row partitions:
+
+1. *Partial*: each partition maps its key tuples to dense group ids through a
+   hash table, orders its rows by group id once, and reduces every group's
+   contiguous segment with the ``reduce.*`` kernels into a partial state.
+2. *Merge*: partial states are combined per key, in partition order, so groups
+   keep the order in which they first appear.
+3. *Finalize*: states become result columns (e.g. mean = sum / count).
+
+Approximate aggregations keep one sketch per group as their state, so they
+merge across partitions like the exact ones.
+
+Partitions are independent, so phase 1 can run on a thread pool.
+"""
+import math
+import operator
+from array import array
+from collections import Counter
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from itertools import accumulate, compress, islice
+from typing import Any, Callable, Optional, Union
+
+from corepy.backend.dispatch import Dispatcher
+from corepy.backend.types import BackendType, DataType
+
+from .column import Column, _shared_nan, key_values
+from .expr import AggExpr
+from .sketch import HeavyHitters, HyperLogLog, TDigest, hash_column
+
+# Smallest partition worth handing to another thread
+MIN_PARTITION_ROWS = 65_536
+
+_FLOATS = (DataType.FLOAT32, DataType.FLOAT64)
+
+
+def _moments(values: Sequence[Any]) -> tuple[int, float, float]:
+    """
+    Returns the count, mean and sum of squared deviations of ``values``.
+    """
+    if not len(values):
+        return (0, 0.0, 0.0)
+    mean = math.fsum(values) / len(values)
+    return (len(values), mean, math.fsum((v - mean) ** 2 for v in values))
+
+
+def _output_dtype(func: str, dtype: DataType) -> DataType:
+    if func in ("count", "count_distinct", "approx_count_distinct"):
+        return DataType.INT64
+    if func in ("mean", "std", "var", "approx_quantile"):
+        return DataType.FLOAT64
+    if func == "heavy_hitters":
+        return DataType.OBJECT
+    if func == "sum":
+        return dtype if dtype in _FLOATS else DataType.INT64
+    return dtype
+
+
+class _Aggregation:
+    """
+    Partial-state functions for one aggregation over one input column.
+    """
+    def __init__(
+        self, func: str, column: Column, name: str, args: tuple[Any, ...] = ()
+    ):
+        if (
+            func in ("sum", "mean", "std", "var", "approx_quantile")
+            and column.typecode is None
+        ):
+            raise TypeError(f"Cannot compute {func} of a {column.dtype.value} column")
+        if func in ("min", "max") and column.dtype == DataType.OBJECT:
+            raise TypeError(f"Cannot compute {func} of an object column")
+        if func in ("min", "max") and column.dictionary is not None:
+            # Codes are not ordered like the strings they stand for
+            column = column.dictionary_decode()
+        self.func = func
+        self.name = name
+        self.args = args
+        self.dtype = _output_dtype(func, column.dtype)
+        if func == "approx_count_distinct":
+            # Groups sketch the row hashes
+            column = Column(DataType.OBJECT, hash_column(column), column.validity)
+        elif func == "heavy_hitters" and column.dictionary is not None:
+            column = column.dictionary_decode()
+        self.column = column
+        kernel = "sum" if func == "mean" else func
+        self._reduce: Optional[Callable[[Any], Any]] = None
+        if kernel in ("sum", "min", "max"):
+            self._reduce = Dispatcher.get_kernel(f"reduce.{kernel}", BackendType.CPU)
+
+    def partial(
+        self,
+        gather: Callable[[Column], tuple[Any, Optional[bytes]]],
+        bounds: Sequence[int],
+    ) -> list[Any]:
+        """
+        Computes one state per group of a partition. ``gather(column)`` returns
+        the partition's values (and 0/1 validity mask) ordered by group, and
+        ``bounds`` holds each group's offsets into them.
+        """
+        func = self.func
+        segments = list(zip(bounds, bounds[1:]))
+        if func == "count" and self.column.validity is None:
+            return [e - b for b, e in segments]
+        taken, mask = gather(self.column)
+
+        if func in ("first", "last"):
+            rows = [b if func == "first" else e - 1 for b, e in segments]
+            if mask is None:
+                return [taken[i] for i in rows]
+            return [taken[i] if mask[i] else None for i in rows]
+        if func == "count":
+            assert mask is not None  # counts without nulls returned above
+            return [mask.count(1, b, e) for b, e in segments]
+
+        typecode = self.column.typecode
+        if mask is None:
+            groups: Iterable[Any] = (taken[b:e] for b, e in segments)
+        elif typecode is not None:
+            groups = (
+                array(typecode, compress(taken[b:e], mask[b:e])) for b, e in segments
+            )
+        else:
+            groups = (list(compress(taken[b:e], mask[b:e])) for b, e in segments)
+
+        if func == "count_distinct":
+            if typecode in ("d", "f"):
+                # Every NaN as one value, as in key_values
+                return [set(map(_shared_nan, g)) for g in groups]
+            return [set(g) for g in groups]
+        if func == "approx_count_distinct":
+            return [HyperLogLog(*self.args).update_hashes(g) for g in groups]
+        if func == "approx_quantile":
+            return [TDigest(*self.args[1:]).update(g) for g in groups]
+        if func == "heavy_hitters":
+            k, capacity = self.args
+            return [HeavyHitters(capacity or 10 * k).update(g) for g in groups]
+        if func in ("std", "var"):
+            return [_moments(g) for g in groups]
+        reduce = self._reduce
+        assert reduce is not None
+        if func == "mean":
+            return [(reduce(g), len(g)) for g in groups]
+        return [reduce(g) for g in groups]
+
+    def merge(self, old: Any, new: Any) -> Any:
+        func = self.func
+        if func == "first":
+            return old
+        if func == "last":
+            return new
+        if func in ("sum", "count"):
+            return old + new
+        if func == "mean":
+            return (old[0] + new[0], old[1] + new[1])
+        if func == "count_distinct":
+            return old | new
+        if func in ("approx_count_distinct", "approx_quantile", "heavy_hitters"):
+            return old.merge(new)
+        if func in ("std", "var"):
+            # Chan et al.: combine counts, means and sums of squared deviations
+            (n, mean, m2), (n2, mean2, m22) = old, new
+            total = n + n2
+            if not total:
+                return old
+            delta = mean2 - mean
+            return (
+                total,
+                mean + delta * n2 / total,
+                m2 + m22 + delta * delta * n * n2 / total,
+            )
+        if old is None or new is None:
+            return new if old is None else old
+        # A NaN state comes from a partition of only NaNs; the kernels skip NaN
+        if new != new or old != old:
+            return old if new != new else new
+        return min(old, new) if func == "min" else max(old, new)
+
+    def finalize(self, states: list[Any]) -> Column:
+        if self.func == "mean":
+            states = [s / n if n else None for s, n in states]
+        elif self.func == "count_distinct":
+            states = list(map(len, states))
+        elif self.func == "std":
+            states = [math.sqrt(m2 / (n - 1)) if n > 1 else None for n, _, m2 in states]
+        elif self.func == "var":
+            states = [m2 / (n - 1) if n > 1 else None for n, _, m2 in states]
+        elif self.func == "approx_count_distinct":
+            states = [sketch.estimate() for sketch in states]
+        elif self.func == "approx_quantile":
+            states = [digest.quantile(self.args[0]) for digest in states]
+        elif self.func == "heavy_hitters":
+            states = [summary.top(self.args[0]) for summary in states]
+        elif self.func in ("first", "last") and self.column.dictionary is not None:
+            # The states are codes
+            return Column.from_codes(states, self.column.dictionary)
+        return Column.from_pylist(states, self.dtype)
+
+
+def merge_states(
+    index: dict[Any, int],
+    groups: list[Any],
+    states: list[list[Any]],
+    aggregations: list[_Aggregation],
+    part_groups: Sequence[Any],
+    part_states: list[list[Any]],
+) -> None:
+    """
+    Folds the groups and states of a partition into ``groups``/``states`` (with
+    ``index`` mapping each group to its position), appending new groups.
+    """
+    for position, group in enumerate(part_groups):
+        gid = index.get(group)
+        if gid is None:
+            index[group] = len(groups)
+            groups.append(group)
+            for merged, part in zip(states, part_states):
+                merged.append(part[position])
+        else:
+            for agg, merged, part in zip(aggregations, states, part_states):
+                merged[gid] = agg.merge(merged[gid], part[position])
+
+
+class GroupBy:
+    """
+    A table grouped by one or more key columns. Create with ``Table.group_by``.
+    """
+    def __init__(self, table: Any, keys: Sequence[str], workers: int = 1):
+        """
+        Initialize a GroupBy.
+
+        Args:
+            table: The table to group.
+            keys: Names of the key columns.
+            workers: Number of threads computing partial aggregates. Rows are
+                     split into at most ``workers`` partitions of at least
+                     ``MIN_PARTITION_ROWS`` rows.
+        """
+        if not keys:
+            raise ValueError("group_by needs at least one key column")
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        for key in keys:
+            table.column(key)
+        self.table = table
+        self.keys = list(keys)
+        self.workers = workers
+
+    def _partitions(self) -> list[tuple[int, int]]:
+        rows = len(self.table)
+        count = max(1, min(self.workers, rows // MIN_PARTITION_ROWS))
+        step = -(-rows // count) if rows else 0
+        return (
+            [(start, min(start + step, rows)) for start in range(0, rows, step)]
+            if rows
+            else [(0, 0)]
+        )
+
+    def _partial(
+        self, keys: list[Sequence[Any]], aggs: list[_Aggregation], start: int, stop: int
+    ) -> tuple[list[Any], list[list[Any]]]:
+        if len(keys) == 1:
+            key_rows: Sequence[Any] = keys[0][start:stop]
+        else:
+            key_rows = list(zip(*(k[start:stop] for k in keys)))
+        groups = dict.fromkeys(key_rows)
+        ids = dict(zip(groups, range(len(groups))))
+        group_ids = list(map(ids.__getitem__, key_rows))
+        sizes = Counter(group_ids)
+        bounds = list(accumulate(map(sizes.__getitem__, range(len(groups))), initial=0))
+
+        # Rows already clustered by key (e.g. sorted input) need no reordering
+        order: Optional[list[int]] = None
+        if not all(map(operator.le, group_ids, islice(group_ids, 1, None))):
+            order = sorted(range(len(group_ids)), key=group_ids.__getitem__)
+        take = Dispatcher.get_kernel("select.take", BackendType.CPU)
+        gathered: dict[int, tuple[Any, Optional[bytes]]] = {}
+
+        def gather(column: Column) -> tuple[Any, Optional[bytes]]:
+            # Aggregations over the same input column share one gather
+            cached = gathered.get(id(column))
+            if cached is None:
+                values = column.values[start:stop]
+                mask = (
+                    column.valid_mask()[start:stop]
+                    if column.validity is not None
+                    else None
+                )
+                if order is not None:
+                    values = take(values, order)
+                    mask = bytes(take(mask, order)) if mask is not None else None
+                cached = gathered[id(column)] = (values, mask)
+            return cached
+
+        return list(groups), [agg.partial(gather, bounds) for agg in aggs]
+
+    def _states(
+        self, keys: list[Sequence[Any]], aggregations: list[_Aggregation]
+    ) -> tuple[list[Any], list[list[Any]]]:
+        """
+        Runs the partial and merge phases: returns the groups in order of first
+        appearance and, per aggregation, the merged state of each group.
+        """
+        partitions = self._partitions()
+        if len(partitions) == 1:
+            partials = [self._partial(keys, aggregations, *partitions[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=len(partitions)) as pool:
+                partials = list(
+                    pool.map(
+                        lambda bounds: self._partial(keys, aggregations, *bounds),
+                        partitions,
+                    )
+                )
+
+        groups, states = partials[0]
+        index: dict[Any, int] = dict(zip(groups, range(len(groups))))
+        for part_groups, part_states in partials[1:]:
+            merge_states(index, groups, states, aggregations, part_groups, part_states)
+        return groups, states
+
+    def agg(self, *aggs: AggExpr, **named: AggExpr) -> Any:
+        """
+        Aggregates each group. Returns a table with the key columns followed by
+        one column per aggregation, with groups in order of first appearance.
+        Tables whose working set exceeds the session's memory budget are
+        aggregated one spilled partition at a time (see ``corepy.data.spill``).
+
+        Args:
+            *aggs: Aggregations named by their ``output_name``.
+            **named: Aggregations keyed by the name of the column they produce.
+        """
+        from .spill import over_budget, spill_group_by
+
+        specs = [(agg.output_name, agg) for agg in aggs] + list(named.items())
+        if over_budget(self.table):
+            return spill_group_by(self.table, self.keys, specs, self.workers)
+        return self._aggregate(specs)
+
+    def _aggregate(self, specs: list[tuple[str, AggExpr]]) -> Any:
+        """
+        Runs ``agg`` in memory.
+        """
+        from .table import Table
+
+        aggregations = [
+            _Aggregation(agg.func, agg.operand.evaluate(self.table), name, agg.args)
+            for name, agg in specs
+        ]
+        key_columns = [self.table.column(key) for key in self.keys]
+        # Categorical keys group on their integer codes
+        keys = [key_values(column, codes=True) for column in key_columns]
+
+        groups, states = self._states(keys, aggregations)
+
+        columns: dict[str, Column] = {}
+        key_rows = (
+            [groups]
+            if len(self.keys) == 1
+            else [list(k) for k in zip(*groups)] or [[] for _ in self.keys]
+        )
+        for name, column, values in zip(self.keys, key_columns, key_rows):
+            if column.dictionary is not None:
+                columns[name] = Column.from_codes(values, column.dictionary)
+            else:
+                columns[name] = Column.from_pylist(values, column.dtype)
+        for agg, values in zip(aggregations, states):
+            columns[agg.name] = agg.finalize(values)
+        return Table._from_columns(columns, None, len(groups))
+
+    def materialize(self, *aggs: AggExpr, **named: AggExpr) -> Any:
+        """
+        Returns a ``MaterializedAggregate`` of these aggregations, seeded with
+        the table's rows; ``update`` it with appended batches instead of
+        re-aggregating the whole table.
+        """
+        from .materialized import MaterializedAggregate
+
+        specs = {agg.output_name: agg for agg in aggs}
+        specs.update(named)
+        return MaterializedAggregate(self.keys, specs, workers=self.workers).update(
+            self.table
+        )
+
+    def rolling(
+        self,
+        window: Union[int, float, str],
+        on: Optional[str] = None,
+        min_periods: int = 1,
+        time_unit: str = "ns",
+    ) -> Any:
+        """
+        Trailing windows within each group. See ``Table.rolling``.
+        """
+        from .window import Rolling
+
+        return Rolling(
+            self.table,
+            window,
+            on=on,
+            by=self.keys,
+            min_periods=min_periods,
+            time_unit=time_unit,
+        )
+
+    def window(
+        self,
+        every: Union[int, float, str],
+        period: Union[int, float, str, None] = None,
+        on: Optional[str] = None,
+        time_unit: str = "ns",
+    ) -> Any:
+        """
+        Tumbling or sliding windows within each group. See ``Table.window``.
+        """
+        from .window import Windows
+
+        return Windows(
+            self.table, every, period=period, on=on, by=self.keys, time_unit=time_unit
+        )
+
+    def __repr__(self) -> str:
+        return f"GroupBy(keys={self.keys}, workers={self.workers})"
@@ -0,0 +1,290 @@
+"""
+Secondary indexes on Table columns.
+
+``Table.create_index`` builds one of two kinds of index over a column:
+
+* ``HashIndex``: a dict from each key to its row (and, for keys that repeat,
+  to the list of their rows). Answers equality and ``isin`` lookups with one
+  dict probe per value, and serves joins as a prebuilt build side.
+* ``SortedIndex``: the row numbers ordered by key. Answers equality, ``isin``
+  and range predicates by bisecting the sorted keys.
+
+Nulls are never indexed (they match no predicate), nor are NaNs. Lookups
+return row numbers in ascending order, so taking them keeps table order.
+
+``index_scan`` lets ``Table.filter`` answer a predicate from an index: it
+picks the indexed conjunct matching the fewest rows and leaves the other
+conjuncts to be evaluated over those rows only.
+"""
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from collections.abc import Iterable, Sequence
+from functools import reduce
+from itertools import chain, compress
+from operator import and_, eq
+from typing import Any, Optional, Union
+
+from .column import _NAN, Column, key_values
+from .columnar import _literal_comparison
+from .expr import BinaryOp, ColumnRef, Expr, IsIn, conjuncts
+
+INDEX_KINDS = ("hash", "sorted")
+
+# Predicates a sorted index can answer; a hash index only answers eq and isin
+_RANGE_OPS = ("eq", "lt", "le", "gt", "ge")
+
+
+def _is_nan(value: Any) -> bool:
+    return isinstance(value, float) and math.isnan(value)
+
+
+def _lookup_values(values: Iterable[Any]) -> list[Any]:
+    # Null and NaN never compare equal to a row
+    return [v for v in set(values) if v is not None and not _is_nan(v)]
+
+
+class HashIndex:
+    """
+    Maps each key of a column to the rows holding it.
+
+    Attributes:
+        first: The first row of every key.
+        repeated: All rows of the keys that occur more than once.
+    """
+    kind = "hash"
+
+    def __init__(self, column: Column):
+        """
+        Index the values of ``column``.
+        """
+        keys = key_values(column)
+        n = len(keys)
+        # Built back to front, so each key keeps its first row
+        first: dict[Any, int] = dict(zip(keys[::-1], range(n - 1, -1, -1)))
+        first.pop(None, None)
+        # key_values gives every NaN one shared object
+        nans = keys.count(_NAN) if first.pop(_NAN, None) is not None else 0
+        repeated: dict[Any, list[int]] = {}
+        if len(first) < n - column.null_count - nans:
+            counts = Counter(keys)
+            dups = {key for key, count in counts.items() if count > 1}
+            dups -= {None, _NAN}
+            for row in compress(range(n), map(dups.__contains__, keys)):
+                repeated.setdefault(keys[row], []).append(row)
+        self.first = first
+        self.repeated = repeated
+        self.num_rows = n
+
+    def lookup(self, value: Any) -> list[int]:
+        """
+        Rows holding ``value``.
+        """
+        if value is None or _is_nan(value):
+            return []
+        rows = self.repeated.get(value)
+        if rows is not None:
+            return list(rows)
+        row = self.first.get(value)
+        return [] if row is None else [row]
+
+    def lookup_many(self, values: Iterable[Any]) -> list[int]:
+        """
+        Rows holding any of ``values``, in ascending order.
+        """
+        values = _lookup_values(values)
+        rows = [row for row in map(self.first.get, values) if row is not None]
+        if self.repeated:
+            # The first row of each repeated key is already in
+            rest = (self.repeated.get(v, ())[1:] for v in values)
+            rows.extend(chain.from_iterable(rest))
+        rows.sort()
+        return rows
+
+    def rows(self, op: str, value: Any) -> Optional[list[int]]:
+        """
+        Rows where ``column <op> value`` holds (``op`` may be ``"isin"``), or
+        None when this index cannot answer ``op``.
+        """
+        if op == "eq":
+            return self.lookup(value)
+        if op == "isin":
+            return self.lookup_many(value)
+        return None
+
+    def __contains__(self, value: Any) -> bool:
+        return value in self.first
+
+    def __len__(self) -> int:
+        return len(self.first)
+
+    def __repr__(self) -> str:
+        return f"HashIndex(keys={len(self)}, rows={self.num_rows})"
+
+
+class SortedIndex:
+    """
+    The rows of a column ordered by value.
+
+    Attributes:
+        keys: The non-null, non-NaN values in ascending order.
+        order: The row of each entry of ``keys``; equal keys keep row order.
+    """
+    kind = "sorted"
+
+    def __init__(self, column: Column, order: Optional[Sequence[int]] = None):
+        """
+        Index the values of ``column``.
+
+        Args:
+            column: The column to index.
+            order: The rows already sorted by value (e.g. loaded from a
+                   columnar file); computed when omitted.
+        """
+        keys = key_values(column)
+        if order is None:
+            rows: Sequence[int] = range(len(keys))
+            if column.validity is not None:
+                rows = list(compress(rows, column.valid_mask()))
+            if column.typecode in ("d", "f"):
+                # NaN is the one value unequal to itself
+                values = list(map(keys.__getitem__, rows))
+                rows = list(compress(rows, map(eq, values, values)))
+            order = sorted(rows, key=keys.__getitem__)
+        self.order = array("q", order)
+        self.keys = list(map(keys.__getitem__, self.order))
+        self.num_rows = len(keys)
+
+    def _rows(self, start: int, end: int) -> list[int]:
+        return sorted(self.order[start:end])
+
+    def lookup(self, value: Any) -> list[int]:
+        """
+        Rows holding ``value``, in ascending order.
+        """
+        if value is None or _is_nan(value):
+            return []
+        return self._rows(bisect_left(self.keys, value), bisect_right(self.keys, value))
+
+    def lookup_many(self, values: Iterable[Any]) -> list[int]:
+        """
+        Rows holding any of ``values``, in ascending order.
+        """
+        keys = self.keys
+        spans = (
+            (bisect_left(keys, v), bisect_right(keys, v))
+            for v in _lookup_values(values)
+        )
+        rows = list(chain.from_iterable(self.order[a:b] for a, b in spans))
+        rows.sort()
+        return rows
+
+    def range(
+        self,
+        lower: Any = None,
+        upper: Any = None,
+        lower_inclusive: bool = True,
+        upper_inclusive: bool = True,
+    ) -> list[int]:
+        """
+        Rows whose value lies between ``lower`` and ``upper`` (either may be
+        None for an open end), in ascending order.
+        """
+        keys = self.keys
+        start = (
+            0
+            if lower is None
+            else (bisect_left if lower_inclusive else bisect_right)(keys, lower)
+        )
+        end = (
+            len(keys)
+            if upper is None
+            else (bisect_right if upper_inclusive else bisect_left)(keys, upper)
+        )
+        return self._rows(start, max(start, end))
+
+    def rows(self, op: str, value: Any) -> Optional[list[int]]:
+        """
+        Rows where ``column <op> value`` holds (``op`` may be ``"isin"``), or
+        None when this index cannot answer ``op``.
+        """
+        if op == "isin":
+            return self.lookup_many(value)
+        if op not in _RANGE_OPS:
+            return None
+        if value is None or _is_nan(value):
+            return []
+        if op == "eq":
+            return self.lookup(value)
+        if op in ("lt", "le"):
+            return self.range(upper=value, upper_inclusive=op == "le")
+        return self.range(lower=value, lower_inclusive=op == "ge")
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __repr__(self) -> str:
+        return f"SortedIndex(rows={self.num_rows}, indexed={len(self)})"
+
+
+Index = Union[HashIndex, SortedIndex]
+
+
+def build_index(column: Column, kind: str = "hash") -> Index:
+    """
+    Builds an index of ``kind`` (``"hash"`` or ``"sorted"``) over ``column``.
+    """
+    if kind not in INDEX_KINDS:
+        raise ValueError(f"Unknown index kind '{kind}'. Expected one of {INDEX_KINDS}")
+    return HashIndex(column) if kind == "hash" else SortedIndex(column)
+
+
+def indexed_condition(
+    predicate: Expr, indexes: dict[str, Index]
+) -> Optional[tuple[Index, str, Any]]:
+    """
+    Returns (index, op, value) when ``predicate`` compares an indexed column
+    with a literal in a way the index answers, else None.
+    """
+    if isinstance(predicate, IsIn) and isinstance(predicate.operand, ColumnRef):
+        index = indexes.get(predicate.operand.name)
+        return (index, "isin", predicate.values) if index is not None else None
+    if isinstance(predicate, BinaryOp) and predicate.op in _RANGE_OPS:
+        comparison = _literal_comparison(predicate)
+        if comparison is None or comparison[0] not in indexes:
+            return None
+        name, op, value = comparison
+        index = indexes[name]
+        if index.kind == "hash" and op != "eq":
+            return None
+        return index, op, value
+    return None
+
+
+def index_scan(
+    predicate: Expr, indexes: dict[str, Index]
+) -> Optional[tuple[list[int], Optional[Expr]]]:
+    """
+    Answers the most selective indexed conjunct of ``predicate`` from its
+    index. Returns the matching rows and the remaining conjuncts (None when
+    there are none), or None when no conjunct can use an index.
+    """
+    parts = conjuncts(predicate)
+    best: Optional[tuple[list[int], int]] = None
+    for position, part in enumerate(parts):
+        condition = indexed_condition(part, indexes)
+        if condition is None:
+            continue
+        index, op, value = condition
+        try:
+            rows = index.rows(op, value)
+        except TypeError:
+            # The literal doesn't compare with the column values; leave it to the scan
+            continue
+        if rows is not None and (best is None or len(rows) < len(best[0])):
+            best = (rows, position)
+    if best is None:
+        return None
+    rest = parts[:best[1]] + parts[best[1] + 1:]
+    return best[0], reduce(and_, rest) if rest else None
@@ -0,0 +1,677 @@
+"""
+Arrow IPC file format for Tables.
+
+``write_ipc`` stores a Table as an Arrow IPC file (the "Feather v2" layout): a
+Schema message, one RecordBatch whose column buffers start on 64-byte
+boundaries, and a footer indexing them. ``read_ipc`` maps the file and wraps
+the fixed-width buffers and validity bitmaps as typed ``memoryview`` casts, so
+loading does no parsing or copying and processes that map the same file share
+its page-cache pages. Bool columns (bit-packed in Arrow) and string columns
+(offsets + UTF-8 data) are decoded on load. Categorical columns are stored as
+Arrow dictionary-encoded utf8: one DictionaryBatch per column holds the unique
+strings, and the codes are mapped in place like any fixed-width buffer.
+
+The flatbuffer metadata is written and read by the small helpers below, which
+cover the subset of ``Schema.fbs``/``Message.fbs``/``File.fbs`` used here.
+Files written by other Arrow implementations can be read when their columns
+are int32/int64, float32/float64, bool, utf8 or large_utf8 (optionally
+dictionary-encoded with integer indices), and their batches are uncompressed
+and not dictionary deltas.
+"""
+import mmap as _mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+from itertools import accumulate
+from typing import Any, Optional, Union
+
+from corepy.backend.types import DataType
+from corepy.schema import Schema
+
+from .column import TYPECODES, Column, pack_bits, typed_view, unpack_bits
+
+MAGIC = b"ARROW1"
+ALIGNMENT = 64
+SCHEMA_METADATA_KEY = "corepy.schema"
+
+_CONTINUATION = 0xFFFFFFFF
+_METADATA_V5 = 4
+_HEADER_SCHEMA = 1
+_HEADER_DICTIONARY_BATCH = 2
+_HEADER_RECORD_BATCH = 3
+_LITTLE, _BIG = 0, 1
+
+# Arrow ``Type`` union tags
+_TYPE_INT = 2
+_TYPE_FLOAT = 3
+_TYPE_UTF8 = 5
+_TYPE_BOOL = 6
+_TYPE_LARGE_UTF8 = 20
+
+_PRECISIONS = {DataType.FLOAT32: 1, DataType.FLOAT64: 2}
+# Dictionary index typecodes by (bitWidth, is_signed)
+_INDEX_TYPECODES = {
+    (8, 1): "b", (16, 1): "h", (32, 1): "i", (64, 1): "q",
+    (8, 0): "B", (16, 0): "H", (32, 0): "I", (64, 0): "Q",
+}
+_BLOCK = struct.Struct("<qi4xq")
+_PAIR = struct.Struct("<qq")
+
+Field = tuple[int, str, Any]
+
+
+def _align(n: int, to: int = ALIGNMENT) -> int:
+    return (n + to - 1) // to * to
+
+
+class _FlatBuilder:
+    """
+    Writes a flatbuffer front to back: each table is followed by the objects
+    it references, so every offset points forward as the format requires.
+
+    Tables are lists of ``(slot, kind, value)`` where kind is a ``struct``
+    format for scalars, or ``"table"``, ``"str"``, ``"tables"`` (vector of
+    tables) or ``"structs"`` (``(count, raw bytes)`` of 8-byte aligned structs).
+    """
+    def __init__(self) -> None:
+        self.buf = bytearray(4)
+
+    def _pad(self, to: int, extra: int = 0) -> None:
+        self.buf += bytes(-(len(self.buf) + extra) % to)
+
+    def _patch(self, at: int, target: int) -> None:
+        struct.pack_into("<I", self.buf, at, target - at)
+
+    def finish(self, root: list[Field]) -> bytes:
+        self._patch(0, self.table(root))
+        self._pad(8)
+        return bytes(self.buf)
+
+    def table(self, fields: list[Field]) -> int:
+        layout = []
+        size = 4
+        for slot, kind, value in fields:
+            fmt = "I" if kind in ("table", "str", "tables", "structs") else kind
+            width = struct.calcsize(fmt)
+            size += -size % width
+            layout.append((slot, kind, value, fmt, size))
+            size += width
+        slots = [0] * (max((f[0] for f in fields), default=-1) + 1)
+        for slot, _, _, _, offset in layout:
+            slots[slot] = offset
+
+        self._pad(2)
+        vtable = len(self.buf)
+        self.buf += struct.pack(f"<HH{len(slots)}H", 4 + 2 * len(slots), size, *slots)
+        self._pad(8)
+        start = len(self.buf)
+        self.buf += bytes(size)
+        struct.pack_into("<i", self.buf, start, start - vtable)
+        for _, _, value, fmt, offset in layout:
+            if fmt != "I":
+                struct.pack_into("<" + fmt, self.buf, start + offset, value)
+        for _, kind, value, fmt, offset in layout:
+            if fmt == "I":
+                self._patch(start + offset, self._object(kind, value))
+        return start
+
+    def _object(self, kind: str, value: Any) -> int:
+        if kind == "table":
+            return self.table(value)
+        if kind == "str":
+            data = value.encode("utf-8")
+            self._pad(4)
+            start = len(self.buf)
+            self.buf += struct.pack("<I", len(data)) + data + b"\0"
+            return start
+        if kind == "structs":
+            count, raw = value
+            self._pad(8, extra=4)
+            start = len(self.buf)
+            self.buf += struct.pack("<I", count) + raw
+            return start
+        # Vector of tables
+        self._pad(4)
+        start = len(self.buf)
+        self.buf += struct.pack("<I", len(value)) + bytes(4 * len(value))
+        for i, child in enumerate(value):
+            self._patch(start + 4 + 4 * i, self.table(child))
+        return start
+
+
+class _FlatTable:
+    """
+    Read access to one flatbuffer table.
+    """
+    __slots__ = ("buf", "pos", "vtable", "vsize")
+
+    def __init__(self, buf: Any, pos: int):
+        self.buf = buf
+        self.pos = pos
+        self.vtable = pos - struct.unpack_from("<i", buf, pos)[0]
+        self.vsize = struct.unpack_from("<H", buf, self.vtable)[0]
+
+    @classmethod
+    def root(cls, buf: Any, pos: int = 0) -> "_FlatTable":
+        return cls(buf, pos + struct.unpack_from("<I", buf, pos)[0])
+
+    def _offset(self, slot: int) -> int:
+        at = 4 + 2 * slot
+        if at >= self.vsize:
+            return 0
+        offset: int = struct.unpack_from("<H", self.buf, self.vtable + at)[0]
+        return offset
+
+    def scalar(self, slot: int, fmt: str, default: Any = 0) -> Any:
+        offset = self._offset(slot)
+        return (
+            struct.unpack_from("<" + fmt, self.buf, self.pos + offset)[0]
+            if offset
+            else default
+        )
+
+    def _target(self, slot: int) -> Optional[int]:
+        offset = self._offset(slot)
+        if not offset:
+            return None
+        at = self.pos + offset
+        target: int = at + struct.unpack_from("<I", self.buf, at)[0]
+        return target
+
+    def table(self, slot: int) -> Optional["_FlatTable"]:
+        target = self._target(slot)
+        return None if target is None else _FlatTable(self.buf, target)
+
+    def string(self, slot: int) -> Optional[str]:
+        target = self._target(slot)
+        if target is None:
+            return None
+        length = struct.unpack_from("<I", self.buf, target)[0]
+        return bytes(self.buf[target + 4:target + 4 + length]).decode("utf-8")
+
+    def tables(self, slot: int) -> list["_FlatTable"]:
+        target = self._target(slot)
+        if target is None:
+            return []
+        count = struct.unpack_from("<I", self.buf, target)[0]
+        return [_FlatTable.root(self.buf, target + 4 + 4 * i) for i in range(count)]
+
+    def structs(self, slot: int, layout: struct.Struct) -> list[tuple[Any, ...]]:
+        target = self._target(slot)
+        if target is None:
+            return []
+        count = struct.unpack_from("<I", self.buf, target)[0]
+        start = target + 4
+        return list(layout.iter_unpack(self.buf[start:start + count * layout.size]))
+
+
+def _field_type(dtype: DataType, name: str, large: bool) -> tuple[int, list[Field]]:
+    if dtype in (DataType.INT32, DataType.INT64):
+        return _TYPE_INT, [(0, "i", 32 if dtype == DataType.INT32 else 64), (1, "B", 1)]
+    if dtype in _PRECISIONS:
+        return _TYPE_FLOAT, [(0, "h", _PRECISIONS[dtype])]
+    if dtype == DataType.BOOL:
+        return _TYPE_BOOL, []
+    if dtype in (DataType.STRING, DataType.CATEGORICAL):
+        # A categorical field's type is that of its dictionary values
+        return (_TYPE_LARGE_UTF8 if large else _TYPE_UTF8), []
+    raise TypeError(
+        f"Column '{name}' has dtype {dtype.value}, which has no Arrow IPC "
+        "representation"
+    )
+
+
+def _schema_table(
+    names: Sequence[str],
+    columns: Sequence[Column],
+    large: Sequence[bool],
+    schema: Optional[Schema],
+) -> list[Field]:
+    fields = []
+    for i, (name, column, is_large) in enumerate(zip(names, columns, large)):
+        type_id, type_table = _field_type(column.dtype, name, is_large)
+        field = [
+            (0, "str", name),
+            (1, "B", 1),
+            (2, "B", type_id),
+            (3, "table", type_table),
+            (5, "tables", []),
+        ]
+        if column.dictionary is not None:
+            # DictionaryEncoding: the dictionary id is the column position
+            index_type = [(0, "i", 8 * typed_view(column.values).itemsize), (1, "B", 1)]
+            field.append(
+                (4, "table", [(0, "q", i), (1, "table", index_type), (2, "B", 0)])
+            )
+        fields.append(field)
+    table: list[Field] = [
+        (0, "h", _LITTLE if sys.byteorder == "little" else _BIG),
+        (1, "tables", fields),
+    ]
+    if schema is not None:
+        table.append(
+            (
+                2,
+                "tables",
+                [
+                    [
+                        (0, "str", SCHEMA_METADATA_KEY),
+                        (1, "str", schema.model_dump_json()),
+                    ]
+                ],
+            )
+        )
+    return table
+
+
+def _message(header_type: int, header: list[Field], body_length: int) -> bytes:
+    return _FlatBuilder().finish(
+        [
+            (0, "h", _METADATA_V5),
+            (1, "B", header_type),
+            (2, "table", header),
+            (3, "q", body_length),
+        ]
+    )
+
+
+def _column_buffers(name: str, column: Column) -> tuple[list[Any], bool]:
+    """
+    Returns the Arrow buffers of ``column`` (validity first) and whether string
+    offsets need 64 bits. A categorical column's buffers hold its codes; the
+    dictionary goes into a separate batch.
+    """
+    _field_type(column.dtype, name, False)
+    validity = column.validity if column.null_count else b""
+    if column.dtype == DataType.CATEGORICAL:
+        return [validity, typed_view(column.values).cast("B")], False
+    if column.dtype == DataType.BOOL:
+        return [validity, pack_bits(column.values, len(column))], False
+    if column.dtype == DataType.STRING:
+        strings = column.values
+        assert isinstance(strings, list)
+        encoded = [b"" if v is None else v.encode("utf-8") for v in strings]
+        offsets = list(accumulate(map(len, encoded), initial=0))
+        large = offsets[-1] > 0x7FFFFFFF
+        return [
+            validity,
+            array("q" if large else "i", offsets),
+            b"".join(encoded),
+        ], large
+    return [validity, typed_view(column.values).cast("B")], False
+
+
+def _write_message(f: Any, metadata: bytes) -> tuple[int, int]:
+    """
+    Writes an encapsulated message header, padded so the body that follows
+    starts on an ``ALIGNMENT`` boundary. Returns (message offset, metadata length).
+    """
+    offset = f.tell()
+    length = _align(offset + 8 + len(metadata)) - offset - 8
+    f.write(struct.pack("<Ii", _CONTINUATION, length))
+    f.write(metadata)
+    f.write(bytes(length - len(metadata)))
+    return offset, 8 + length
+
+
+def _record_batch(
+    names: Sequence[str], columns: Sequence[Column]
+) -> tuple[list[Field], list[memoryview], int, list[bool]]:
+    """
+    Lays out a RecordBatch: returns its header, body buffers, body length and
+    which columns need 64-bit string offsets.
+    """
+    nodes = []
+    buffers: list[memoryview] = []
+    large = []
+    for name, column in zip(names, columns):
+        column_buffers, is_large = _column_buffers(name, column)
+        nodes.append(_PAIR.pack(len(column), column.null_count))
+        buffers.extend(memoryview(b).cast("B") for b in column_buffers)
+        large.append(is_large)
+    spans = []
+    body_length = 0
+    for buf in buffers:
+        spans.append(_PAIR.pack(body_length, buf.nbytes))
+        body_length = _align(body_length + buf.nbytes)
+    header = [
+        (0, "q", len(columns[0]) if columns else 0),
+        (1, "structs", (len(nodes), b"".join(nodes))),
+        (2, "structs", (len(spans), b"".join(spans))),
+    ]
+    return header, buffers, body_length, large
+
+
+def _write_batch(
+    f: Any,
+    header_type: int,
+    header: list[Field],
+    buffers: list[memoryview],
+    body_length: int,
+) -> bytes:
+    """
+    Writes one message and its body. Returns the footer ``Block`` for it.
+    """
+    offset, metadata_length = _write_message(
+        f, _message(header_type, header, body_length)
+    )
+    for buf in buffers:
+        f.write(buf)
+        f.write(bytes(-buf.nbytes % ALIGNMENT))
+    return _BLOCK.pack(offset, metadata_length, body_length)
+
+
+def write_ipc(table: Any, path: Union[str, "os.PathLike[str]"]) -> None:
+    """
+    Writes ``table`` to ``path`` as an Arrow IPC file. See ``Table.write_ipc``.
+    """
+    names = table.column_names
+    columns = [table.column(name) for name in names]
+    batch, buffers, body_length, large = _record_batch(names, columns)
+    dictionaries = []
+    for i, (name, column) in enumerate(zip(names, columns)):
+        if column.dictionary is not None:
+            values = Column(DataType.STRING, column.dictionary)
+            data, data_buffers, data_length, data_large = _record_batch(
+                [name], [values]
+            )
+            dictionaries.append(
+                (
+                    [(0, "q", i), (1, "table", data), (2, "B", 0)],
+                    data_buffers,
+                    data_length,
+                )
+            )
+            large[i] = data_large[0]
+
+    schema_table = _schema_table(names, columns, large, table.schema)
+    with open(path, "wb") as f:
+        f.write(MAGIC + b"\0\0")
+        _write_message(f, _message(_HEADER_SCHEMA, schema_table, 0))
+        dictionary_blocks = [
+            _write_batch(f, _HEADER_DICTIONARY_BATCH, header, data_buffers, data_length)
+            for header, data_buffers, data_length in dictionaries
+        ]
+        block = _write_batch(f, _HEADER_RECORD_BATCH, batch, buffers, body_length)
+        f.write(struct.pack("<Ii", _CONTINUATION, 0))
+
+        footer_table: list[Field] = [(0, "h", _METADATA_V5), (1, "table", schema_table)]
+        if dictionary_blocks:
+            footer_table.append(
+                (2, "structs", (len(dictionary_blocks), b"".join(dictionary_blocks)))
+            )
+        footer_table.append((3, "structs", (1, block)))
+        footer = _FlatBuilder().finish(footer_table)
+        f.write(footer)
+        f.write(struct.pack("<i", len(footer)))
+        f.write(MAGIC)
+
+
+def _read_field(
+    field: _FlatTable,
+) -> tuple[str, DataType, bool, Optional[tuple[int, str]]]:
+    """
+    Returns the name, dtype, whether offsets are 64-bit and, for a
+    dictionary-encoded field, its dictionary id and index typecode.
+    """
+    name = field.string(0) or ""
+    type_id = field.scalar(2, "B")
+    type_table = field.table(3)
+    encoding = field.table(4)
+    if encoding is not None:
+        index_type = encoding.table(1)
+        # The index type defaults to int32 when omitted
+        index = (
+            (32, 1)
+            if index_type is None
+            else (index_type.scalar(0, "i"), index_type.scalar(1, "B"))
+        )
+        if (
+            type_id not in (_TYPE_UTF8, _TYPE_LARGE_UTF8)
+            or index not in _INDEX_TYPECODES
+        ):
+            raise ValueError(
+                f"Column '{name}' has a dictionary encoding read_ipc does not support"
+            )
+        return (
+            name,
+            DataType.CATEGORICAL,
+            type_id == _TYPE_LARGE_UTF8,
+            (encoding.scalar(0, "q"), _INDEX_TYPECODES[index]),
+        )
+    if type_id == _TYPE_INT and type_table is not None:
+        width, signed = type_table.scalar(0, "i"), type_table.scalar(1, "B")
+        if (width, signed) == (64, 1):
+            return name, DataType.INT64, False, None
+        if width == 32 and signed:
+            return name, DataType.INT32, False, None
+    elif type_id == _TYPE_FLOAT and type_table is not None:
+        precision = type_table.scalar(0, "h")
+        for dtype, value in _PRECISIONS.items():
+            if precision == value:
+                return name, dtype, False, None
+    elif type_id == _TYPE_BOOL:
+        return name, DataType.BOOL, False, None
+    elif type_id in (_TYPE_UTF8, _TYPE_LARGE_UTF8):
+        return name, DataType.STRING, type_id == _TYPE_LARGE_UTF8, None
+    raise ValueError(
+        f"Column '{name}' has an Arrow type read_ipc does not support (type id "
+        f"{type_id})"
+    )
+
+
+def _decode_strings(offsets: Any, data: memoryview) -> list[str]:
+    starts = offsets[:-1]
+    stops = offsets[1:]
+    raw = bytes(data[offsets[0]:offsets[-1]]) if len(offsets) else b""
+    text = raw.decode("utf-8")
+    base = offsets[0] if len(offsets) else 0
+    if len(text) == len(raw):
+        # ASCII: byte offsets are character offsets, slice the decoded text
+        return [text[a - base:b - base] for a, b in zip(starts, stops)]
+    return [raw[a - base:b - base].decode("utf-8") for a, b in zip(starts, stops)]
+
+
+def _read_column(
+    body: memoryview,
+    dtype: DataType,
+    large: bool,
+    node: tuple[int, int],
+    spans: list[tuple[int, int]],
+    copy: bool,
+    dictionary: Optional[tuple[str, list[str]]] = None,
+) -> Column:
+    length, null_count = node
+    views = [body[offset:offset + size] for offset, size in spans]
+    validity: Any = None
+    if null_count:
+        validity = bytes(views[0]) if copy else views[0]
+    if dtype == DataType.BOOL:
+        return Column(dtype, array("B", unpack_bits(views[1], length)), validity)
+    if dtype == DataType.STRING:
+        offsets = views[1].cast("q" if large else "i")[:length + 1]
+        values: list[Any] = _decode_strings(offsets, views[2]) if length else []
+        if null_count:
+            values = [
+                v if m else None for v, m in zip(values, unpack_bits(views[0], length))
+            ]
+        return Column(dtype, values, validity)
+    typecode, strings = (
+        dictionary if dictionary is not None else (TYPECODES[dtype], None)
+    )
+    data = views[1][:length * struct.calcsize(typecode)]
+    if copy:
+        buffer = array(typecode)
+        buffer.frombytes(data)
+        return Column(dtype, buffer, validity, strings)
+    return Column(dtype, data.cast(typecode), validity, strings)  # type: ignore[call-overload]
+
+
+def _read_message(
+    buf: memoryview, path: Any, block: tuple[int, int, int], header_type: int
+) -> tuple[_FlatTable, _FlatTable, memoryview]:
+    """
+    Reads the message at a footer ``Block``. Returns its header, the
+    RecordBatch it holds (the header itself, or a DictionaryBatch's data) and
+    its body.
+    """
+    offset, metadata_length, body_length = block
+    prefix = 8 if struct.unpack_from("<I", buf, offset)[0] == _CONTINUATION else 4
+    message = _FlatTable.root(buf, offset + prefix)
+    header = message.table(2)
+    if message.scalar(1, "B") != header_type or header is None:
+        raise ValueError(f"{os.fspath(path)}: unexpected message type at byte {offset}")
+    batch = header if header_type == _HEADER_RECORD_BATCH else header.table(1)
+    if batch is None or batch.table(3) is not None:
+        raise ValueError(
+            f"{os.fspath(path)}: compressed record batches are not supported"
+        )
+    return (
+        header,
+        batch,
+        buf[offset + metadata_length:offset + metadata_length + body_length],
+    )
+
+
+def _open(
+    path: Union[str, "os.PathLike[str]"], mmap: bool
+) -> tuple[memoryview, _FlatTable, _FlatTable]:
+    """
+    Maps (or reads) an IPC file and returns its buffer, footer and schema.
+    """
+    with open(path, "rb") as f:
+        if mmap:
+            buf = memoryview(_mmap.mmap(f.fileno(), 0, access=_mmap.ACCESS_READ))
+        else:
+            buf = memoryview(f.read())
+    if (
+        len(buf) < 2 * len(MAGIC) + 4
+        or bytes(buf[:6]) != MAGIC
+        or bytes(buf[-6:]) != MAGIC
+    ):
+        raise ValueError(f"{os.fspath(path)} is not an Arrow IPC file")
+
+    footer_length = struct.unpack_from("<i", buf, len(buf) - 10)[0]
+    footer = _FlatTable.root(buf, len(buf) - 10 - footer_length)
+    schema_table = footer.table(1)
+    if schema_table is None:
+        raise ValueError(f"{os.fspath(path)} has no schema")
+    if schema_table.scalar(0, "h", _LITTLE) != (
+        _LITTLE if sys.byteorder == "little" else _BIG
+    ):
+        raise ValueError(f"{os.fspath(path)} was written with a different byte order")
+    return buf, footer, schema_table
+
+
+def ipc_column_names(path: Union[str, "os.PathLike[str]"]) -> list[str]:
+    """
+    Returns the column names of an Arrow IPC file from its footer, without
+    loading any data.
+    """
+    _, _, schema_table = _open(path, mmap=True)
+    return [field.string(0) or "" for field in schema_table.tables(1)]
+
+
+def read_ipc(
+    path: Union[str, "os.PathLike[str]"],
+    columns: Optional[Sequence[str]] = None,
+    mmap: bool = True,
+) -> Any:
+    """
+    Loads an Arrow IPC file written by ``Table.write_ipc`` (or another Arrow writer).
+
+    Args:
+        path: The file to read.
+        columns: Optional subset of columns to load, in the order given.
+        mmap: Map the file and reference its buffers in place (no copy; pages
+              are shared with other processes mapping the file). With False the
+              fixed-width buffers are read into private arrays.
+    """
+    from .table import Table, concat
+
+    buf, footer, schema_table = _open(path, mmap)
+    fields = [_read_field(field) for field in schema_table.tables(1)]
+    names = [name for name, _, _, _ in fields]
+    selected = list(columns) if columns is not None else names
+    missing = [name for name in selected if name not in names]
+    if missing:
+        raise KeyError(f"{os.fspath(path)} has no column(s) {missing}")
+    position = {name: i for i, name in enumerate(names)}
+
+    schema = None
+    for entry in schema_table.tables(2):
+        if entry.string(0) == SCHEMA_METADATA_KEY and columns is None:
+            schema = Schema.model_validate_json(entry.string(1) or "")
+
+    # Dictionary values by id, decoded once and shared by every batch
+    large_by_id = {
+        encoding[0]: large for _, _, large, encoding in fields if encoding is not None
+    }
+    dictionaries: dict[int, list[str]] = {}
+    for block in footer.structs(2, _BLOCK):
+        header, batch, body = _read_message(buf, path, block, _HEADER_DICTIONARY_BATCH)
+        dictionary_id = header.scalar(0, "q")
+        if header.scalar(2, "B") or dictionary_id in dictionaries:
+            raise ValueError(f"{os.fspath(path)}: dictionary deltas are not supported")
+        node = batch.structs(1, _PAIR)[0]
+        if node[1]:
+            raise ValueError(
+                f"{os.fspath(path)}: dictionary {dictionary_id} contains nulls"
+            )
+        strings = _read_column(
+            body,
+            DataType.STRING,
+            large_by_id.get(dictionary_id, False),
+            node,
+            batch.structs(2, _PAIR),
+            True,
+        ).values
+        assert isinstance(strings, list)
+        dictionaries[dictionary_id] = strings
+
+    batches = []
+    for block in footer.structs(3, _BLOCK):
+        _, batch, body = _read_message(buf, path, block, _HEADER_RECORD_BATCH)
+        nodes = batch.structs(1, _PAIR)
+        spans = batch.structs(2, _PAIR)
+        # Buffers per column: validity + data, plus offsets for strings
+        first = list(
+            accumulate(
+                (3 if dtype == DataType.STRING else 2 for _, dtype, _, _ in fields),
+                initial=0,
+            )
+        )
+        out: dict[str, Column] = {}
+        for name in selected:
+            i = position[name]
+            _, dtype, large, encoding = fields[i]
+            dictionary = None
+            if encoding is not None:
+                if encoding[0] not in dictionaries:
+                    raise ValueError(
+                        f"{os.fspath(path)}: column '{name}' references missing "
+                        f"dictionary {encoding[0]}"
+                    )
+                dictionary = (encoding[1], dictionaries[encoding[0]])
+            out[name] = _read_column(
+                body,
+                dtype,
+                large,
+                nodes[i],
+                spans[first[i]:first[i + 1]],
+                not mmap,
+                dictionary,
+            )
+        batches.append(Table._from_columns(out, None, batch.scalar(0, "q")))
+
+    if not batches:
+        empty = {
+            name: Column.from_pylist([], fields[position[name]][1]) for name in selected
+        }
+        batches.append(Table._from_columns(empty, None, 0))
+    table = concat(batches)
+    if schema is not None:
+        table = Table._from_columns(table._columns, schema, len(table))
+    return table
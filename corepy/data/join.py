@@ -0,0 +1,371 @@
+"""
+Joins between Tables.
+
+Two strategies produce the matching (left row, right row) index pairs:
+
+* **Hash join** (default). The build side, the input with fewer rows for inner
+  joins and the right input otherwise, is loaded into a dict keyed by join key
+  and the other side probes it. When build keys are unique (the usual
+  dimension-table case) build and probe both run inside C iterators. With
+  ``workers > 1`` both sides are radix-partitioned by key hash and the
+  partitions are joined on a thread pool.
+* **Merge join**, used when both key columns are already sorted and the right
+  keys repeat. Runs of equal keys are located with ``bisect``; no hash table is
+  built.
+* **Index probe**: when the right table has a hash index on the (single) join
+  key (``Table.create_index``), the index is the build side and only the left
+  keys are hashed.
+
+Result rows follow left-table order; each left row's matches follow right-table
+order. Null and NaN keys never match. Categorical key columns on both sides match on
+their integer codes.
+"""
+import operator
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from itertools import accumulate, compress, islice, repeat
+from typing import Any, Optional
+
+from corepy.backend.types import DataType
+
+from .column import _NAN, Column, key_values, pack_bits, unpack_bits
+from .expr import FLIP, combine_validity
+
+JOIN_TYPES = ("inner", "left", "semi", "anti")
+STRATEGIES = ("auto", "hash", "merge")
+
+# Smallest build + probe size worth radix-partitioning across threads
+MIN_PARTITION_ROWS = 65_536
+
+# Probe rows and their build rows (None for an unmatched outer row)
+Pairs = tuple[list[int], list[Optional[int]]]
+
+
+def _key_columns(left: Column, right: Column) -> tuple[Sequence[Any], Sequence[Any]]:
+    """
+    Returns per-row key values of one join column on each side. When both are
+    categorical they are matched on codes, with the right codes translated into
+    the left dictionary (values missing from it get codes no left row has).
+    """
+    if left.dictionary is None or right.dictionary is None:
+        return key_values(left), key_values(right)
+    right_codes = key_values(right, codes=True)
+    if right.dictionary is not left.dictionary:
+        lookup = dict(zip(left.dictionary, range(len(left.dictionary))))
+        translate = [lookup.get(v, ~i) for i, v in enumerate(right.dictionary)]
+        right_codes = [None if c is None else translate[c] for c in right_codes]
+    return key_values(left, codes=True), right_codes
+
+
+def _join_keys(columns: Sequence[Column], values: Sequence[Sequence[Any]]) -> list[Any]:
+    """
+    Returns one hashable key per row (a tuple for multi-column keys), with None
+    for rows where any key column is null or NaN.
+    """
+    # key_values gives every NaN one shared object; NaN equals nothing, so
+    # like a null it never matches
+    floats = (DataType.FLOAT32, DataType.FLOAT64)
+    nans = any(c.dtype in floats and _NAN in v for c, v in zip(columns, values))
+    if len(columns) == 1:
+        keys = list(values[0])
+        return [None if k is _NAN else k for k in keys] if nans else keys
+    keys = list(zip(*values))
+    validity = combine_validity(columns)
+    if validity is not None:
+        keys = [
+            k if m else None for k, m in zip(keys, unpack_bits(validity, len(keys)))
+        ]
+    if nans:
+        keys = [None if k is None or _NAN in k else k for k in keys]
+    return keys
+
+
+def _is_sorted(keys: Sequence[Any]) -> bool:
+    try:
+        return all(map(operator.le, keys, islice(keys, 1, None)))
+    except TypeError:
+        # Nulls or mixed key types: not mergeable
+        return False
+
+
+def _hash_pairs(
+    build: Sequence[Any], probe: Sequence[Any], outer: bool = False
+) -> Pairs:
+    """
+    Returns matching (probe row, build row) pairs, ordered by probe row and then
+    build row. With ``outer``, probe rows without a match are paired with None.
+    """
+    index: dict[Any, Any] = dict(zip(build, range(len(build))))
+    index.pop(None, None)
+    if len(index) == len(build) - build.count(None):
+        # Unique build keys: one dict lookup per probe row, no Python-level loop
+        return _unique_pairs(list(map(index.get, probe)), outer)
+
+    rows: dict[Any, list[int]] = {}
+    for i, key in enumerate(build):
+        if key is not None:
+            rows.setdefault(key, []).append(i)
+    probe_rows: list[int] = []
+    build_rows: list[Any] = []
+    for i, matched in enumerate(map(rows.get, probe)):
+        if matched:
+            probe_rows.extend(repeat(i, len(matched)))
+            build_rows.extend(matched)
+        elif outer:
+            probe_rows.append(i)
+            build_rows.append(None)
+    return probe_rows, build_rows
+
+
+def _unique_pairs(matches: list[Any], outer: bool) -> Pairs:
+    """
+    Pairs each probe row with its single match (None when it has none).
+    """
+    if outer:
+        return list(range(len(matches))), matches
+    found = list(map(operator.is_not, matches, repeat(None)))
+    return list(compress(range(len(matches)), found)), list(compress(matches, found))
+
+
+def _index_pairs(index: Any, probe: Sequence[Any], outer: bool = False) -> Pairs:
+    """
+    Like ``_hash_pairs``, with a prebuilt ``HashIndex`` of the right table as
+    the build side.
+    """
+    matches = list(map(index.first.get, probe))
+    repeated = index.repeated
+    if not repeated:
+        return _unique_pairs(matches, outer)
+    probe_rows: list[int] = []
+    build_rows: list[Any] = []
+    for i, (key, match) in enumerate(zip(probe, matches)):
+        rows = repeated.get(key) if match is not None else None
+        if rows:
+            probe_rows.extend(repeat(i, len(rows)))
+            build_rows.extend(rows)
+        elif match is not None or outer:
+            probe_rows.append(i)
+            build_rows.append(match)
+    return probe_rows, build_rows
+
+
+def _partition(keys: Sequence[Any], parts: int) -> tuple[list[int], list[int]]:
+    """
+    Radix-partitions row numbers by the low bits of the key hash. Returns the
+    rows grouped by partition and the partition offsets.
+    """
+    ids = list(map(operator.and_, map(hash, keys), repeat(parts - 1)))
+    sizes = Counter(ids)
+    order = sorted(range(len(keys)), key=ids.__getitem__)
+    return order, list(accumulate(map(sizes.__getitem__, range(parts)), initial=0))
+
+
+def _partitioned_hash_pairs(
+    build: Sequence[Any], probe: Sequence[Any], workers: int, outer: bool
+) -> Pairs:
+    parts = 1 << (workers - 1).bit_length()
+    build_order, build_bounds = _partition(build, parts)
+    probe_order, probe_bounds = _partition(probe, parts)
+
+    def join_partition(p: int) -> Pairs:
+        build_rows = build_order[build_bounds[p]:build_bounds[p + 1]]
+        probe_rows = probe_order[probe_bounds[p]:probe_bounds[p + 1]]
+        local_probe, local_build = _hash_pairs(
+            [build[i] for i in build_rows], [probe[i] for i in probe_rows], outer
+        )
+        return [probe_rows[i] for i in local_probe], [
+            None if i is None else build_rows[i] for i in local_build
+        ]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(join_partition, range(parts)))
+    probe_rows = [i for part, _ in results for i in part]
+    build_rows = [i for _, part in results for i in part]
+    return _ordered(probe_rows, build_rows)
+
+
+def _ordered(first: list[Any], second: list[Any]) -> Pairs:
+    """
+    Stable-sorts index pairs by the first index. Every pair source emits the
+    matches of one row in ascending order of the other, so that order is kept.
+    """
+    order = sorted(range(len(first)), key=first.__getitem__)
+    return list(map(first.__getitem__, order)), list(map(second.__getitem__, order))
+
+
+def _merge_pairs(
+    left: Sequence[Any], right: Sequence[Any], outer: bool = False
+) -> Pairs:
+    """
+    Matches two sorted key lists run by run. With ``outer``, left rows without
+    a match are paired with None.
+    """
+    left_rows: list[int] = []
+    right_rows: list[Any] = []
+    i, j, n = 0, 0, len(left)
+    while i < n:
+        key = left[i]
+        run_end = bisect_right(left, key, i)
+        j = bisect_left(right, key, j)
+        match_end = bisect_right(right, key, j)
+        if match_end > j:
+            matches = range(j, match_end)
+            for row in range(i, run_end):
+                left_rows.extend(repeat(row, len(matches)))
+                right_rows.extend(matches)
+        elif outer:
+            left_rows.extend(range(i, run_end))
+            right_rows.extend(repeat(None, run_end - i))
+        i = run_end
+    return left_rows, right_rows
+
+
+def _take_or_null(column: Column, rows: list[Optional[int]]) -> Column:
+    """
+    Gathers ``rows`` from ``column``, producing nulls where the row is None.
+    """
+    present = list(map(operator.is_not, rows, repeat(None)))
+    if len(column) == 0:
+        return Column.from_pylist([None] * len(rows), column.dtype)
+    if all(present):
+        return column.take(rows)  # type: ignore[arg-type]
+    taken = column.take([0 if r is None else r for r in rows])
+    valid = bytes(map(operator.and_, taken.valid_mask(), present))
+    return Column(
+        column.dtype, taken.values, pack_bits(valid, len(rows)), column.dictionary
+    )
+
+
+def join(
+    left: Any,
+    right: Any,
+    on: Sequence[str],
+    how: str = "inner",
+    strategy: str = "auto",
+    workers: int = 1,
+    suffix: str = "_right",
+) -> Any:
+    """
+    Joins two tables on equal key columns. See ``Table.join``.
+    """
+    if how not in JOIN_TYPES:
+        raise ValueError(f"Unknown join type '{how}'. Expected one of {JOIN_TYPES}")
+    if strategy not in STRATEGIES:
+        raise ValueError(
+            f"Unknown join strategy '{strategy}'. Expected one of {STRATEGIES}"
+        )
+    if not on:
+        raise ValueError("join needs at least one key column")
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+
+    left_columns = [left.column(name) for name in on]
+    right_columns = [right.column(name) for name in on]
+    index = right.indexes.get(on[0]) if len(on) == 1 and strategy != "merge" else None
+    if index is not None and index.kind == "hash":
+        # The right keys are already hashed: probe the index instead of building a table
+        probe = key_values(left_columns[0])
+        if how in ("semi", "anti"):
+            found = bytes(map(index.__contains__, probe))
+            return left.filter(
+                Column(
+                    DataType.BOOL,
+                    array("B", found.translate(FLIP) if how == "anti" else found),
+                )
+            )
+        left_rows, right_rows = _index_pairs(index, probe, outer=how == "left")
+        return _joined(left, right, on, left_rows, right_rows, suffix)
+
+    pairs = [_key_columns(a, b) for a, b in zip(left_columns, right_columns)]
+    left_keys = _join_keys(left_columns, [keys for keys, _ in pairs])
+    right_keys = _join_keys(right_columns, [keys for _, keys in pairs])
+
+    if how in ("semi", "anti"):
+        present = set(right_keys)
+        present.discard(None)
+        found = bytes(map(present.__contains__, left_keys))
+        if how == "anti":
+            found = found.translate(FLIP)
+        return left.filter(Column(DataType.BOOL, array("B", found)))
+
+    outer = how == "left"
+    sorted_inputs = (
+        strategy != "hash" and _is_sorted(left_keys) and _is_sorted(right_keys)
+    )
+    if strategy == "merge" and not sorted_inputs:
+        raise ValueError(
+            "strategy='merge' requires both inputs to be sorted by the join keys, "
+            "without nulls"
+        )
+    if sorted_inputs and (
+        strategy == "merge" or len(set(right_keys)) < len(right_keys)
+    ):
+        left_rows, right_rows = _merge_pairs(left_keys, right_keys, outer)
+    elif not outer and len(left_keys) < len(right_keys):
+        # Build on the smaller input, then restore left order
+        matches = _pairs(left_keys, right_keys, workers, outer=False)
+        left_rows, right_rows = _ordered(matches[1], matches[0])
+    else:
+        left_rows, right_rows = _pairs(right_keys, left_keys, workers, outer)
+
+    return _joined(left, right, on, left_rows, right_rows, suffix)
+
+
+def right_output_names(
+    left: Sequence[str], right: Sequence[str], on: Sequence[str], suffix: str
+) -> dict[str, str]:
+    """
+    Output name of each non-key right column: its own, or with ``suffix``
+    appended (again, if need be) until it clashes with no other column.
+    """
+    taken = set(left)
+    names: dict[str, str] = {}
+    for name in right:
+        if name in on:
+            continue
+        out = name
+        while out in taken:
+            if not suffix:
+                raise ValueError(
+                    f"Column '{name}' is on both sides of the join; pass a suffix"
+                )
+            out += suffix
+        taken.add(out)
+        names[name] = out
+    return names
+
+
+def _joined(
+    left: Any,
+    right: Any,
+    on: Sequence[str],
+    left_rows: list[int],
+    right_rows: list[Any],
+    suffix: str,
+) -> Any:
+    """
+    Gathers the joined table from matching (left row, right row) pairs.
+    """
+    from .table import Table
+
+    columns: dict[str, Column] = {
+        name: column.take(left_rows) for name, column in left._columns.items()
+    }
+    names = right_output_names(left.column_names, right.column_names, on, suffix)
+    for name, out in names.items():
+        columns[out] = _take_or_null(right.column(name), right_rows)
+    return Table._from_columns(columns, None, len(left_rows))
+
+
+def _pairs(
+    build: Sequence[Any], probe: Sequence[Any], workers: int, outer: bool
+) -> Pairs:
+    """
+    Hash-joins ``probe`` against ``build`` and returns (probe rows, build rows).
+    """
+    if workers > 1 and len(build) + len(probe) >= MIN_PARTITION_ROWS:
+        return _partitioned_hash_pairs(build, probe, workers, outer)
+    return _hash_pairs(build, probe, outer)
@@ -0,0 +1,880 @@
+"""
+Lazy query plans over Tables and files.
+
+``Table.lazy()`` and the ``scan_*`` functions return a ``LazyTable``, which
+records operations as a tree of logical plan nodes instead of running them.
+``collect()`` optimizes the tree and then executes it:
+
+* Filters are split into their ``&``-ed conjuncts and pushed down through
+  maps, sorts, joins (to the side whose columns they read) and aggregations
+  (when they only test group keys) into the scan. A columnar scan hands them
+  to the reader, which skips row groups by zone map; a CSV scan filters each
+  chunk as it is parsed. A scan of an indexed Table lets the index answer its
+  most selective indexed conjunct (see ``Table.create_index``).
+* The conjuncts of a filter run one after the other, most selective first,
+  so later ones see fewer rows. Selectivity is estimated from the predicate
+  shape (equality is more selective than a range, which is more selective
+  than an inequality).
+* Adjacent ``select``/``with_columns`` steps fuse into one map, and derived
+  columns nothing downstream reads are never computed.
+* Scans only read the columns some operator uses.
+* ``sort`` followed by ``head`` becomes a top-k selection.
+
+``explain()`` returns the plan as indented text, before or after optimization.
+"""
+import os
+from collections.abc import Sequence
+from dataclasses import dataclass, field, replace
+from functools import reduce
+from typing import Any, Optional, Union
+
+from .expr import (
+    AggExpr,
+    BinaryOp,
+    ColumnRef,
+    Expr,
+    IsIn,
+    IsNull,
+    UnaryOp,
+    conjuncts,
+    to_expr,
+)
+from .index import indexed_condition
+from .join import right_output_names
+from .table import Table, concat
+
+# Estimated fraction of rows a predicate keeps, by operator
+_SELECTIVITY = {"eq": 0.05, "lt": 0.3, "le": 0.3, "gt": 0.3, "ge": 0.3, "ne": 0.9}
+_DEFAULT_SELECTIVITY = 0.5
+
+Stage = list[tuple[str, Expr]]
+
+
+def _refs(expr: Union[Expr, AggExpr]) -> set[str]:
+    if isinstance(expr, AggExpr):
+        expr = expr.operand
+    return set(expr.referenced_columns())
+
+
+def _selectivity(predicate: Expr) -> float:
+    """
+    Estimates the fraction of rows ``predicate`` keeps, from its shape alone.
+    """
+    if isinstance(predicate, BinaryOp):
+        if predicate.op == "and":
+            return _selectivity(predicate.left) * _selectivity(predicate.right)
+        if predicate.op == "or":
+            a, b = _selectivity(predicate.left), _selectivity(predicate.right)
+            return a + b - a * b
+        return _SELECTIVITY.get(predicate.op, _DEFAULT_SELECTIVITY)
+    if isinstance(predicate, IsIn):
+        return min(1.0, _SELECTIVITY["eq"] * len(predicate.values))
+    if isinstance(predicate, IsNull):
+        return 0.9 if predicate.negate else 0.1
+    if isinstance(predicate, UnaryOp) and predicate.op == "not":
+        return 1.0 - _selectivity(predicate.operand)
+    return _DEFAULT_SELECTIVITY
+
+
+def _ordered(predicates: list[Expr]) -> list[Expr]:
+    return sorted(predicates, key=_selectivity)
+
+
+def _apply(table: Table, predicates: Sequence[Expr]) -> Table:
+    if table.indexes and len(predicates) > 1:
+        # Filter once, so the most selective indexed conjunct picks the rows
+        return table.filter(reduce(lambda a, b: a & b, predicates))
+    for predicate in predicates:
+        table = table.filter(predicate)
+    return table
+
+
+def _list(exprs: Sequence[Any]) -> str:
+    return ", ".join(map(repr, exprs))
+
+
+class PlanNode:
+    """
+    A logical plan operator. ``inputs`` holds its child nodes.
+    """
+    @property
+    def inputs(self) -> tuple["PlanNode", ...]:
+        return ()
+
+    def with_inputs(self, *inputs: "PlanNode") -> "PlanNode":
+        return self
+
+    def columns(self) -> list[str]:
+        """
+        Names of the columns this node produces, in order.
+        """
+        raise NotImplementedError
+
+    def describe(self) -> str:
+        raise NotImplementedError
+
+    def execute(self) -> Table:
+        raise NotImplementedError
+
+
+@dataclass(eq=False)
+class Scan(PlanNode):
+    """
+    Reads a Table or a file. ``projection`` and ``predicates`` are filled in by
+    the optimizer.
+    """
+    kind: str
+    source: Any
+    options: dict[str, Any] = field(default_factory=dict)
+    projection: Optional[list[str]] = None
+    predicates: list[Expr] = field(default_factory=list)
+    # Column names of the source, read on first use and carried over by ``replace``
+    names: Optional[list[str]] = None
+
+    def _source_columns(self) -> list[str]:
+        cached = self.names
+        if cached is None:
+            if self.kind == "table":
+                cached = self.source.column_names
+            elif self.kind == "columnar":
+                from .columnar import ColumnarFile
+
+                cached = ColumnarFile(self.source).column_names
+            elif self.kind == "ipc":
+                from .ipc import ipc_column_names
+
+                cached = ipc_column_names(self.source)
+            else:
+                cached = _csv_column_names(self.source, self.options)
+            self.names = cached
+        return cached
+
+    def columns(self) -> list[str]:
+        if self.projection is not None:
+            return list(self.projection)
+        return self._source_columns()
+
+    def describe(self) -> str:
+        where = (
+            f"table rows={len(self.source)}"
+            if self.kind == "table"
+            else f"{self.kind} {os.fspath(self.source)!r}"
+        )
+        text = f"Scan {where}"
+        if self.projection is not None:
+            text += f" columns={self.projection}"
+        if self.predicates:
+            text += f" filter=[{_list(self.predicates)}]"
+            if self.kind == "table":
+                indexed = [
+                    p
+                    for p in self.predicates
+                    if indexed_condition(p, self.source.indexes) is not None
+                ]
+                if indexed:
+                    text += f" index=[{_list(indexed)}]"
+        return text
+
+    def execute(self) -> Table:
+        needed: Optional[list[str]] = None
+        if self.projection is not None:
+            extra = set().union(*map(_refs, self.predicates)) - set(self.projection)
+            needed = self.projection + [
+                name for name in self._source_columns() if name in extra
+            ]
+        if self.kind == "table":
+            table = _apply(
+                self.source.select(*needed) if needed is not None else self.source,
+                self.predicates,
+            )
+        elif self.kind == "columnar":
+            from .columnar import read_columnar
+
+            predicate = (
+                reduce(lambda a, b: a & b, self.predicates) if self.predicates else None
+            )
+            table = read_columnar(self.source, columns=needed, filter=predicate)
+        elif self.kind == "ipc":
+            from .ipc import read_ipc
+
+            table = _apply(
+                read_ipc(self.source, columns=needed, **self.options), self.predicates
+            )
+        elif self.predicates:
+            from .csv_reader import iter_csv
+
+            # Filter each chunk as it is parsed instead of materializing the file
+            table = concat(
+                [
+                    _apply(chunk, self.predicates)
+                    for chunk in iter_csv(self.source, columns=needed, **self.options)
+                ]
+            )
+        else:
+            from .csv_reader import read_csv
+
+            table = read_csv(self.source, columns=needed, **self.options)
+        if self.projection is not None and table.column_names != self.projection:
+            table = table.select(*self.projection)
+        return table
+
+
+def _csv_column_names(path: Any, options: dict[str, Any]) -> list[str]:
+    from .csv_reader import _layout
+
+    layout, _ = _layout(
+        os.fspath(path),
+        options.get("schema"),
+        None,
+        options.get("has_header", True),
+        options.get("delimiter", ","),
+        options.get("quotechar", '"'),
+        options.get("encoding", "utf-8"),
+        options.get("null_values", ("",)),
+        1,
+    )
+    return layout.names
+
+
+@dataclass(eq=False)
+class Filter(PlanNode):
+    """
+    Keeps the rows where every predicate holds, applying them in order.
+    """
+    input: PlanNode
+    predicates: list[Expr]
+
+    @property
+    def inputs(self) -> tuple[PlanNode, ...]:
+        return (self.input,)
+
+    def with_inputs(self, *inputs: PlanNode) -> PlanNode:
+        return replace(self, input=inputs[0])
+
+    def columns(self) -> list[str]:
+        return self.input.columns()
+
+    def describe(self) -> str:
+        return f"Filter [{_list(self.predicates)}]"
+
+    def execute(self) -> Table:
+        return _apply(self.input.execute(), self.predicates)
+
+
+@dataclass(eq=False)
+class Map(PlanNode):
+    """
+    Derives columns in stages, each evaluated against the previous stage's
+    output like one ``with_columns`` call, then optionally projects to ``output``.
+    """
+    input: PlanNode
+    stages: list[Stage]
+    output: Optional[list[str]] = None
+
+    @property
+    def inputs(self) -> tuple[PlanNode, ...]:
+        return (self.input,)
+
+    def with_inputs(self, *inputs: PlanNode) -> PlanNode:
+        return replace(self, input=inputs[0])
+
+    def assigned(self) -> set[str]:
+        return {name for stage in self.stages for name, _ in stage}
+
+    def columns(self) -> list[str]:
+        if self.output is not None:
+            return list(self.output)
+        names = self.input.columns()
+        for stage in self.stages:
+            names += [name for name, _ in stage if name not in names]
+        return names
+
+    def describe(self) -> str:
+        steps = [
+            f"with_columns({', '.join(f'{name}={expr!r}' for name, expr in stage)})"
+            for stage in self.stages
+        ]
+        if self.output is not None:
+            steps.append(f"select({', '.join(self.output)})")
+        return "Map " + " -> ".join(steps)
+
+    def execute(self) -> Table:
+        table = self.input.execute()
+        for stage in self.stages:
+            table = table.with_columns(**dict(stage))
+        return table.select(*self.output) if self.output is not None else table
+
+
+@dataclass(eq=False)
+class Join(PlanNode):
+    """
+    Joins two inputs on equal key columns. See ``Table.join``.
+    """
+    left: PlanNode
+    right: PlanNode
+    on: list[str]
+    how: str = "inner"
+    strategy: str = "auto"
+    workers: int = 1
+    suffix: str = "_right"
+    # Output names of the right columns, fixed when the join is planned:
+    # pruning either input must not change which names get the suffix
+    names: dict[str, str] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        if not self.names:
+            self.names = right_output_names(
+                self.left.columns(), self.right.columns(), self.on, self.suffix
+            )
+
+    @property
+    def inputs(self) -> tuple[PlanNode, ...]:
+        return (self.left, self.right)
+
+    def with_inputs(self, *inputs: PlanNode) -> PlanNode:
+        return replace(self, left=inputs[0], right=inputs[1])
+
+    def right_names(self) -> dict[str, str]:
+        """
+        Output name of each non-key right column.
+        """
+        if self.how in ("semi", "anti"):
+            return {}
+        names = self.names
+        return {name: names[name] for name in self.right.columns() if name in names}
+
+    def columns(self) -> list[str]:
+        return self.left.columns() + list(self.right_names().values())
+
+    def describe(self) -> str:
+        return f"Join {self.how} on={self.on}"
+
+    def execute(self) -> Table:
+        left, right = self.left.execute(), self.right.execute()
+        table = left.join(
+            right,
+            on=self.on,
+            how=self.how,
+            strategy=self.strategy,
+            workers=self.workers,
+            suffix=self.suffix,
+        )
+        if self.how in ("semi", "anti"):
+            return table
+        # Pruned inputs may clash less than the planned ones did
+        actual = right_output_names(
+            left.column_names, right.column_names, self.on, self.suffix
+        )
+        renamed = {
+            actual[name]: self.names[name]
+            for name in actual
+            if actual[name] != self.names[name]
+        }
+        if not renamed:
+            return table
+        columns = {renamed.get(n, n): table.column(n) for n in table.column_names}
+        return Table._from_columns(columns, None, len(table))
+
+
+@dataclass(eq=False)
+class Aggregate(PlanNode):
+    """
+    Groups by ``keys`` and aggregates; with no keys, aggregates the whole input
+    to one row.
+    """
+    input: PlanNode
+    keys: list[str]
+    aggs: list[tuple[str, AggExpr]]
+    workers: int = 1
+
+    @property
+    def inputs(self) -> tuple[PlanNode, ...]:
+        return (self.input,)
+
+    def with_inputs(self, *inputs: PlanNode) -> PlanNode:
+        return replace(self, input=inputs[0])
+
+    def columns(self) -> list[str]:
+        return self.keys + [name for name, _ in self.aggs]
+
+    def describe(self) -> str:
+        aggs = ", ".join(f"{name}={agg!r}" for name, agg in self.aggs)
+        return f"Aggregate keys={self.keys} [{aggs}]"
+
+    def execute(self) -> Table:
+        table = self.input.execute()
+        if self.keys:
+            grouped: Table = table.group_by(*self.keys, workers=self.workers).agg(
+                **dict(self.aggs)
+            )
+            return grouped
+        return Table.from_pydict(
+            {name: [agg.evaluate(table)] for name, agg in self.aggs}
+        )
+
+
+@dataclass(eq=False)
+class Sort(PlanNode):
+    """
+    Sorts by key columns. See ``Table.sort``.
+    """
+    input: PlanNode
+    by: list[str]
+    descending: list[bool]
+    nulls_last: bool = True
+
+    @property
+    def inputs(self) -> tuple[PlanNode, ...]:
+        return (self.input,)
+
+    def with_inputs(self, *inputs: PlanNode) -> PlanNode:
+        return replace(self, input=inputs[0])
+
+    def columns(self) -> list[str]:
+        return self.input.columns()
+
+    def describe(self) -> str:
+        return f"Sort by={self.by} descending={self.descending}"
+
+    def execute(self) -> Table:
+        return self.input.execute().sort(self.by, self.descending, self.nulls_last)
+
+
+@dataclass(eq=False)
+class TopK(PlanNode):
+    """
+    The first ``k`` rows of a sort, selected without sorting everything. See
+    ``Table.top_k``.
+    """
+    input: PlanNode
+    k: int
+    by: list[str]
+    descending: list[bool]
+    nulls_last: bool = True
+
+    @property
+    def inputs(self) -> tuple[PlanNode, ...]:
+        return (self.input,)
+
+    def with_inputs(self, *inputs: PlanNode) -> PlanNode:
+        return replace(self, input=inputs[0])
+
+    def columns(self) -> list[str]:
+        return self.input.columns()
+
+    def describe(self) -> str:
+        return f"TopK k={self.k} by={self.by} descending={self.descending}"
+
+    def execute(self) -> Table:
+        return self.input.execute().top_k(
+            self.k, self.by, self.descending, self.nulls_last
+        )
+
+
+@dataclass(eq=False)
+class Limit(PlanNode):
+    """
+    Keeps the first ``n`` rows.
+    """
+    input: PlanNode
+    n: int
+
+    @property
+    def inputs(self) -> tuple[PlanNode, ...]:
+        return (self.input,)
+
+    def with_inputs(self, *inputs: PlanNode) -> PlanNode:
+        return replace(self, input=inputs[0])
+
+    def columns(self) -> list[str]:
+        return self.input.columns()
+
+    def describe(self) -> str:
+        return f"Limit {self.n}"
+
+    def execute(self) -> Table:
+        return self.input.execute().slice(0, self.n)
+
+
+# Optimizer passes. Each returns a new tree and leaves its input untouched.
+
+
+def _fuse(node: PlanNode) -> PlanNode:
+    """
+    Merges adjacent filters and maps, and turns a limited sort into a top-k.
+    """
+    node = node.with_inputs(*map(_fuse, node.inputs))
+    if isinstance(node, Filter):
+        predicates = [c for p in node.predicates for c in conjuncts(p)]
+        if isinstance(node.input, Filter):
+            return Filter(node.input.input, node.input.predicates + predicates)
+        return Filter(node.input, predicates)
+    if isinstance(node, Map) and isinstance(node.input, Map):
+        inner = node.input
+        stages = [list(stage) for stage in inner.stages]
+        for stage in node.stages:
+            # A stage that reads nothing the previous one derives can run in the
+            # same pass
+            derived = {n for n, _ in stages[-1]} if stages else set()
+            if stages and not set().union(*(_refs(e) for _, e in stage)) & derived:
+                merged = dict(stages[-1])
+                merged.update(stage)
+                stages[-1] = list(merged.items())
+            else:
+                stages.append(list(stage))
+        output = node.output
+        if output is None and inner.output is not None:
+            output = list(inner.output)
+            for stage in node.stages:
+                output += [name for name, _ in stage if name not in output]
+        return Map(inner.input, stages, output)
+    if isinstance(node, Limit):
+        if isinstance(node.input, Sort):
+            sort = node.input
+            return TopK(sort.input, node.n, sort.by, sort.descending, sort.nulls_last)
+        if isinstance(node.input, TopK):
+            return replace(node.input, k=min(node.n, node.input.k))
+    return node
+
+
+def _push_filters(node: PlanNode, pending: list[Expr]) -> PlanNode:
+    """
+    Moves each pending conjunct as far down the tree as it stays correct;
+    whatever cannot go further becomes a Filter above ``node``.
+    """
+    def stay(child: PlanNode, kept: list[Expr]) -> PlanNode:
+        return Filter(child, kept) if kept else child
+
+    if isinstance(node, Filter):
+        return _push_filters(node.input, pending + node.predicates)
+    if isinstance(node, Scan):
+        return replace(node, predicates=node.predicates + pending) if pending else node
+    if isinstance(node, Sort):
+        return node.with_inputs(_push_filters(node.input, pending))
+    if isinstance(node, Map):
+        assigned = node.assigned()
+        down = [p for p in pending if not _refs(p) & assigned]
+        kept = [p for p in pending if _refs(p) & assigned]
+        return stay(node.with_inputs(_push_filters(node.input, down)), kept)
+    if isinstance(node, Aggregate):
+        # A global aggregate yields one row even from no input rows, so
+        # nothing filters below it (e.g. a constant-false predicate)
+        keys = set(node.keys)
+        down = [p for p in pending if keys and _refs(p) <= keys]
+        kept = [p for p in pending if not (keys and _refs(p) <= keys)]
+        return stay(node.with_inputs(_push_filters(node.input, down)), kept)
+    if isinstance(node, Join):
+        left_names = set(node.left.columns())
+        # Right columns that keep their name in the output
+        right_names = {name for name, out in node.right_names().items() if name == out}
+        left, right, kept = [], [], []
+        for predicate in pending:
+            refs = _refs(predicate)
+            if refs <= left_names:
+                left.append(predicate)
+                if node.how == "inner" and refs <= set(node.on):
+                    right.append(predicate)
+            elif node.how == "inner" and refs <= right_names | set(node.on):
+                right.append(predicate)
+            else:
+                kept.append(predicate)
+        pushed = node.with_inputs(
+            _push_filters(node.left, left), _push_filters(node.right, right)
+        )
+        return stay(pushed, kept)
+    # Limit and TopK: filtering before them would change which rows are kept
+    return stay(
+        node.with_inputs(*(_push_filters(child, []) for child in node.inputs)), pending
+    )
+
+
+def _prune(node: PlanNode, required: Optional[set[str]]) -> PlanNode:
+    """
+    Restricts every node to the columns something above it reads (``None``: all).
+    """
+    if isinstance(node, Scan):
+        if required is None:
+            return node
+        names = [name for name in node.columns() if name in required]
+        # Keep one column so the row count survives
+        return replace(node, projection=names or node.columns()[:1])
+    if isinstance(node, Filter):
+        needed = (
+            None
+            if required is None
+            else required | set().union(*map(_refs, node.predicates))
+        )
+        return node.with_inputs(_prune(node.input, needed))
+    if isinstance(node, Map):
+        output = node.output
+        if output is not None and required is not None:
+            output = [name for name in output if name in required] or output[:1]
+        needed = set(output) if output is not None else required
+        stages = node.stages
+        if needed is not None:
+            # Walk the stages backwards, keeping only assignments read later on
+            live: list[Stage] = []
+            for stage in reversed(stages):
+                kept = [(name, expr) for name, expr in stage if name in needed]
+                needed = (needed - {name for name, _ in kept}).union(
+                    *(_refs(expr) for _, expr in kept)
+                )
+                if kept:
+                    live.insert(0, kept)
+            stages = live
+        child = _prune(node.input, needed)
+        if not stages and (output is None or output == child.columns()):
+            # Nothing left to derive or reorder
+            return child
+        return Map(child, stages, output)
+    if isinstance(node, Join):
+        if required is None:
+            return node.with_inputs(_prune(node.left, None), _prune(node.right, None))
+        on = set(node.on)
+        left = (required & set(node.left.columns())) | on
+        outputs = node.right_names().items()
+        right = {name for name, out in outputs if out in required} | on
+        return node.with_inputs(_prune(node.left, left), _prune(node.right, right))
+    if isinstance(node, Aggregate):
+        aggs = (
+            node.aggs
+            if required is None
+            else [(name, agg) for name, agg in node.aggs if name in required]
+        )
+        if not node.keys and not aggs:
+            # A global aggregate still needs one column to produce its row
+            aggs = node.aggs[:1]
+        needed = set(node.keys).union(*(_refs(agg) for _, agg in aggs))
+        return replace(node, input=_prune(node.input, needed), aggs=aggs)
+    if isinstance(node, (Sort, TopK)):
+        return node.with_inputs(
+            _prune(node.input, None if required is None else required | set(node.by))
+        )
+    return node.with_inputs(*(_prune(child, required) for child in node.inputs))
+
+
+def _order_filters(node: PlanNode) -> PlanNode:
+    node = node.with_inputs(*map(_order_filters, node.inputs))
+    if isinstance(node, (Filter, Scan)) and len(node.predicates) > 1:
+        return replace(node, predicates=_ordered(node.predicates))
+    return node
+
+
+def optimize(plan: PlanNode) -> PlanNode:
+    """
+    Rewrites a logical plan: pushes filters and projections toward the scans,
+    orders conjuncts by selectivity and fuses adjacent operators.
+    """
+    plan = _fuse(plan)
+    plan = _fuse(_push_filters(plan, []))
+    plan = _prune(plan, None)
+    return _order_filters(plan)
+
+
+def _explain(node: PlanNode, depth: int = 0) -> list[str]:
+    lines = ["  " * depth + node.describe()]
+    for child in node.inputs:
+        lines += _explain(child, depth + 1)
+    return lines
+
+
+class LazyTable:
+    """
+    A query over a Table or file, recorded as a logical plan and run by
+    ``collect()``. Create with ``Table.lazy()`` or ``scan_csv``/``scan_ipc``/
+    ``scan_columnar``. Methods mirror ``Table`` and return new LazyTables.
+    """
+    def __init__(self, plan: PlanNode):
+        """
+        Wrap a logical plan.
+
+        Args:
+            plan: The root plan node.
+        """
+        self.plan = plan
+
+    @property
+    def columns(self) -> list[str]:
+        """
+        Names of the columns the query produces.
+        """
+        return self.plan.columns()
+
+    def _check(self, names: set[str]) -> None:
+        missing = sorted(names - set(self.columns))
+        if missing:
+            raise KeyError(f"Query has no column(s) {missing}")
+
+    def select(self, *columns: Union[str, Expr]) -> "LazyTable":
+        """
+        Keeps only the given columns or expressions, in order. See ``Table.select``.
+        """
+        exprs = list(map(to_expr, columns))
+        self._check(set().union(*map(_refs, exprs)))
+        stage = [
+            (e.output_name, e)
+            for e in exprs
+            if not (isinstance(e, ColumnRef) and e.name == e.output_name)
+        ]
+        return LazyTable(
+            Map(self.plan, [stage] if stage else [], [e.output_name for e in exprs])
+        )
+
+    def with_columns(self, *exprs: Expr, **named: Expr) -> "LazyTable":
+        """
+        Adds or replaces derived columns. See ``Table.with_columns``.
+        """
+        stage = [(e.output_name, e) for e in exprs] + [
+            (name, to_expr(e)) for name, e in named.items()
+        ]
+        self._check(set().union(*(_refs(e) for _, e in stage)))
+        return LazyTable(Map(self.plan, [stage]))
+
+    def filter(self, predicate: Expr) -> "LazyTable":
+        """
+        Keeps the rows where ``predicate`` is true. See ``Table.filter``.
+        """
+        self._check(_refs(predicate))
+        return LazyTable(Filter(self.plan, [predicate]))
+
+    def join(
+        self,
+        other: Union["LazyTable", Table],
+        on: Union[str, Sequence[str]],
+        how: str = "inner",
+        strategy: str = "auto",
+        workers: int = 1,
+        suffix: str = "_right",
+    ) -> "LazyTable":
+        """
+        Joins another query or Table on equal key columns. See ``Table.join``.
+        """
+        right = other if isinstance(other, LazyTable) else other.lazy()
+        keys = [on] if isinstance(on, str) else list(on)
+        self._check(set(keys))
+        right._check(set(keys))
+        return LazyTable(
+            Join(self.plan, right.plan, keys, how, strategy, workers, suffix)
+        )
+
+    def group_by(self, *keys: str, workers: int = 1) -> "LazyGroupBy":
+        """
+        Groups by key columns; finish with ``.agg(...)``. See ``Table.group_by``.
+        """
+        if not keys:
+            raise ValueError("group_by needs at least one key column")
+        self._check(set(keys))
+        return LazyGroupBy(self, list(keys), workers)
+
+    def agg(self, *aggs: AggExpr, **named: AggExpr) -> "LazyTable":
+        """
+        Aggregates the whole input into a one-row table. See ``Table.agg``.
+        """
+        specs = [(agg.output_name, agg) for agg in aggs] + list(named.items())
+        self._check(set().union(*(_refs(agg) for _, agg in specs)))
+        return LazyTable(Aggregate(self.plan, [], specs))
+
+    def sort(
+        self,
+        by: Union[str, Sequence[str]],
+        descending: Union[bool, Sequence[bool]] = False,
+        nulls_last: bool = True,
+    ) -> "LazyTable":
+        """
+        Sorts by key columns. See ``Table.sort``.
+        """
+        names = [by] if isinstance(by, str) else list(by)
+        flags = (
+            [descending] * len(names)
+            if isinstance(descending, bool)
+            else list(descending)
+        )
+        if len(flags) != len(names):
+            raise ValueError(
+                f"Got {len(flags)} descending flags for {len(names)} sort keys"
+            )
+        self._check(set(names))
+        return LazyTable(Sort(self.plan, names, flags, nulls_last))
+
+    def top_k(
+        self,
+        k: int,
+        by: Union[str, Sequence[str]],
+        descending: Union[bool, Sequence[bool]] = True,
+        nulls_last: bool = True,
+    ) -> "LazyTable":
+        """
+        The first ``k`` rows of ``sort(by, descending)``. See ``Table.top_k``.
+        """
+        return self.sort(by, descending, nulls_last).head(k)
+
+    def head(self, n: int) -> "LazyTable":
+        """
+        Keeps the first ``n`` rows.
+        """
+        if n < 0:
+            raise ValueError("n must be non-negative")
+        return LazyTable(Limit(self.plan, n))
+
+    def optimized_plan(self) -> PlanNode:
+        return optimize(self.plan)
+
+    def explain(self, optimized: bool = True) -> str:
+        """
+        Returns the plan as indented text, one operator per line, inputs below
+        the operator that consumes them.
+
+        Args:
+            optimized: Show the plan ``collect`` will run rather than the one recorded.
+        """
+        return "\n".join(_explain(self.optimized_plan() if optimized else self.plan))
+
+    def collect(self) -> Table:
+        """
+        Optimizes and runs the query.
+        """
+        return self.optimized_plan().execute()
+
+    def __repr__(self) -> str:
+        return f"LazyTable(\n{self.explain(optimized=False)}\n)"
+
+
+class LazyGroupBy:
+    """
+    A lazy query grouped by key columns. Create with ``LazyTable.group_by``.
+    """
+    def __init__(self, query: LazyTable, keys: list[str], workers: int = 1):
+        self.query = query
+        self.keys = keys
+        self.workers = workers
+
+    def agg(self, *aggs: AggExpr, **named: AggExpr) -> LazyTable:
+        """
+        Aggregates each group. See ``GroupBy.agg``.
+        """
+        specs = [(agg.output_name, agg) for agg in aggs] + list(named.items())
+        self.query._check(set().union(*(_refs(agg) for _, agg in specs)))
+        return LazyTable(Aggregate(self.query.plan, self.keys, specs, self.workers))
+
+
+def scan_csv(path: Union[str, "os.PathLike[str]"], **options: Any) -> LazyTable:
+    """
+    Starts a lazy query over a CSV file. ``options`` are passed to ``read_csv``
+    (e.g. ``schema``, ``delimiter``, ``pool``); columns come from the query.
+    """
+    return LazyTable(Scan("csv", path, options))
+
+
+def scan_ipc(path: Union[str, "os.PathLike[str]"], mmap: bool = True) -> LazyTable:
+    """
+    Starts a lazy query over an Arrow IPC file. See ``read_ipc``.
+    """
+    return LazyTable(Scan("ipc", path, {"mmap": mmap}))
+
+
+def scan_columnar(path: Union[str, "os.PathLike[str]"]) -> LazyTable:
+    """
+    Starts a lazy query over a columnar file; filters reach its zone maps. See
+    ``read_columnar``.
+    """
+    return LazyTable(Scan("columnar", path))
@@ -0,0 +1,251 @@
+"""
+Incrementally maintained group-by aggregates.
+
+A ``MaterializedAggregate`` holds the merged partial states of a group-by
+query (the states ``GroupBy`` builds per partition: sums and counts, Chan
+moments for std/var, sketches for the approximate aggregations, ...). Each
+appended batch is aggregated on its own and merged into them, so a refresh
+costs O(new rows) instead of re-reading the whole table; ``snapshot()``
+finalizes the current states into a Table at any time.
+
+The states can be checkpointed to disk and restored into an aggregate
+defined by the same query.
+"""
+import os
+import pickle
+from collections.abc import Mapping, Sequence
+from typing import Any, Optional, Union
+
+from corepy.backend.types import DataType
+
+from .column import Column, _shared_nan, key_values
+from .expr import AggExpr
+from .groupby import GroupBy, _Aggregation, merge_states
+
+Aggregations = Union[Sequence[AggExpr], Mapping[str, AggExpr]]
+
+CHECKPOINT_VERSION = 1
+
+_NUMERIC = (DataType.INT32, DataType.INT64, DataType.FLOAT32, DataType.FLOAT64)
+
+# Aggregates the nulls of a column whose dtype is not known yet, as nothing
+_UNTYPED = DataType.INT64
+
+
+def _common_dtype(name: str, old: DataType, new: DataType) -> DataType:
+    if old == new or {old, new} == {DataType.STRING, DataType.CATEGORICAL}:
+        return old
+    if old in _NUMERIC and new in _NUMERIC:
+        floats = (DataType.FLOAT32, DataType.FLOAT64)
+        return DataType.FLOAT64 if old in floats or new in floats else DataType.INT64
+    raise TypeError(
+        f"Column '{name}' changed dtype from {old.value} to {new.value} between batches"
+    )
+
+
+class MaterializedAggregate:
+    """
+    A group-by aggregation kept up to date over an append-only stream of
+    batches, e.g. ``MaterializedAggregate("user", [col("amount").sum()])``.
+
+    Groups appear in order of first appearance across all batches, as if the
+    batches had been concatenated and aggregated at once. Categorical columns
+    are aggregated by value, so batches may carry different dictionaries.
+    """
+    def __init__(
+        self, keys: Union[str, Sequence[str]], aggs: Aggregations, workers: int = 1
+    ):
+        """
+        Initialize an empty MaterializedAggregate.
+
+        Args:
+            keys: Name(s) of the key column(s).
+            aggs: Aggregations, named by their ``output_name`` or keyed by the
+                  name of the column they produce.
+            workers: Number of threads aggregating each batch (see ``GroupBy``).
+        """
+        self.keys = [keys] if isinstance(keys, str) else list(keys)
+        if not self.keys:
+            raise ValueError("MaterializedAggregate needs at least one key column")
+        self.specs: list[tuple[str, AggExpr]] = (
+            list(aggs.items())
+            if isinstance(aggs, Mapping)
+            else [(a.output_name, a) for a in aggs]
+        )
+        self.workers = workers
+        self.rows = 0
+        self._index: dict[Any, int] = {}
+        self._groups: list[Any] = []
+        self._states: list[list[Any]] = [[] for _ in self.specs]
+        # Dtypes of the key and aggregated columns, fixed by the first batch;
+        # None for a column that has only held nulls so far
+        self._key_dtypes: Optional[list[Optional[DataType]]] = None
+        self._input_dtypes: Optional[list[Optional[DataType]]] = None
+        self._snapshot: Any = None
+
+    def update(self, batch: Any) -> "MaterializedAggregate":
+        """
+        Aggregates ``batch`` (a Table of newly appended rows) into the state.
+        """
+        group_by = GroupBy(batch, self.keys, workers=self.workers)
+        key_columns = [batch.column(key) for key in self.keys]
+        # Categorical codes index each batch's own dictionary, so aggregate by value
+        columns = [
+            agg.operand.evaluate(batch).dictionary_decode() for _, agg in self.specs
+        ]
+        if not len(batch):
+            return self
+        key_columns, key_dtypes = self._conform(
+            self.keys, key_columns, self._key_dtypes or [None] * len(self.keys)
+        )
+        columns, input_dtypes = self._conform(
+            [name for name, _ in self.specs],
+            columns,
+            self._input_dtypes or [None] * len(self.specs),
+        )
+        aggregations = [
+            _Aggregation(agg.func, column, name, agg.args)
+            for (name, agg), column in zip(self.specs, columns)
+        ]
+        groups, states = group_by._states(
+            [key_values(column) for column in key_columns], aggregations
+        )
+        # A batch rejected above leaves the dtypes as they were
+        self._key_dtypes, self._input_dtypes = key_dtypes, input_dtypes
+        merge_states(
+            self._index, self._groups, self._states, aggregations, groups, states
+        )
+        self.rows += len(batch)
+        self._snapshot = None
+        return self
+
+    @staticmethod
+    def _conform(
+        names: list[str], columns: list[Column], dtypes: list[Optional[DataType]]
+    ) -> tuple[list[Column], list[Optional[DataType]]]:
+        """
+        Checks the columns of a batch against the dtypes seen so far. Returns
+        the columns and the dtypes after the batch: set by the first batch with
+        values, widened where a batch brings floats to an int column; ``dtypes``
+        itself is left untouched.
+        """
+        conformed = []
+        widened = list(dtypes)
+        for position, (name, column) in enumerate(zip(names, columns)):
+            dtype = dtypes[position]
+            if dtype is None:
+                if column.null_count == len(column) and column.dtype == DataType.OBJECT:
+                    # Only nulls so far: object is just what they infer as
+                    column = Column.from_pylist([None] * len(column), _UNTYPED)
+                else:
+                    widened[position] = column.dtype
+            elif column.dtype != dtype and column.null_count == len(column):
+                # An all-null batch infers as object
+                column = Column.from_pylist([None] * len(column), dtype)
+            else:
+                widened[position] = _common_dtype(name, dtype, column.dtype)
+            conformed.append(column)
+        return conformed, widened
+
+    def snapshot(self) -> Any:
+        """
+        The current result: the key columns followed by one column per
+        aggregation, as ``group_by(*keys).agg(...)`` over every batch so far.
+        Repeated reads between updates return the same Table.
+        """
+        from .table import Table
+
+        if self._snapshot is not None:
+            return self._snapshot
+        groups = self._groups
+        columns: dict[str, Column] = {}
+        key_dtypes, input_dtypes = self._key_dtypes, self._input_dtypes
+        if key_dtypes is None or input_dtypes is None:
+            for name in [*self.keys, *(name for name, _ in self.specs)]:
+                columns[name] = Column.from_pylist([], DataType.OBJECT)
+            return Table._from_columns(columns, None, 0)
+        key_rows = (
+            [groups]
+            if len(self.keys) == 1
+            else [list(k) for k in zip(*groups)] or [[] for _ in self.keys]
+        )
+        for name, dtype, values in zip(self.keys, key_dtypes, key_rows):
+            columns[name] = Column.from_pylist(values, dtype)
+        for (name, agg), dtype, states in zip(self.specs, input_dtypes, self._states):
+            # Finalizing only needs the function and the input dtype
+            columns[name] = _Aggregation(
+                agg.func, Column.from_pylist([], dtype or _UNTYPED), name, agg.args
+            ).finalize(list(states))
+        self._snapshot = Table._from_columns(columns, None, len(groups))
+        return self._snapshot
+
+    def __len__(self) -> int:
+        return len(self._groups)
+
+    def _signature(self) -> list[tuple[str, str]]:
+        return [(name, repr(agg)) for name, agg in self.specs]
+
+    def checkpoint(self, path: str) -> None:
+        """
+        Writes the aggregation state to ``path``, replacing the file atomically.
+        """
+        state = {
+            "version": CHECKPOINT_VERSION,
+            "keys": self.keys,
+            "aggs": self._signature(),
+            "rows": self.rows,
+            "groups": self._groups,
+            "states": self._states,
+            "key_dtypes": self._key_dtypes,
+            "input_dtypes": self._input_dtypes,
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            # On disk before the rename, so a crash cannot leave an empty file
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def restore(
+        cls,
+        path: str,
+        keys: Union[str, Sequence[str]],
+        aggs: Aggregations,
+        workers: int = 1,
+    ) -> "MaterializedAggregate":
+        """
+        Rebuilds an aggregate from a checkpoint written by ``checkpoint``. The
+        query (``keys`` and ``aggs``) must match the one checkpointed.
+        """
+        aggregate = cls(keys, aggs, workers=workers)
+        with open(path, "rb") as f:
+            state = pickle.load(f)
+        if state.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version {state.get('version')!r}")
+        if state["keys"] != aggregate.keys or state["aggs"] != aggregate._signature():
+            raise ValueError(
+                f"Checkpoint holds the query keys={state['keys']} "
+                f"aggs={state['aggs']}, not keys={aggregate.keys} "
+                f"aggs={aggregate._signature()}"
+            )
+        aggregate.rows = state["rows"]
+        # key_values uses one NaN object for every NaN; unpickled values hold copies
+        aggregate._groups = list(map(_shared_nan, state["groups"]))
+        aggregate._index = dict(zip(aggregate._groups, range(len(aggregate._groups))))
+        aggregate._states = [
+            [set(map(_shared_nan, s)) for s in states]
+            if agg.func == "count_distinct"
+            else states
+            for (_, agg), states in zip(aggregate.specs, state["states"])
+        ]
+        aggregate._key_dtypes = state["key_dtypes"]
+        aggregate._input_dtypes = state["input_dtypes"]
+        return aggregate
+
+    def __repr__(self) -> str:
+        return (
+            f"MaterializedAggregate(keys={self.keys}, aggs={len(self.specs)}, "
+            f"groups={len(self)}, rows={self.rows})"
+        )
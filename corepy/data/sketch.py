@@ -0,0 +1,527 @@
+"""
+Approximate aggregates in bounded memory.
+
+Each sketch summarizes any number of values in a fixed-size state that can be
+updated batch by batch, merged with sketches built elsewhere (other batches,
+threads or processes) and serialized with ``to_bytes``/``from_bytes``:
+
+* ``HyperLogLog`` estimates distinct counts (``approx_count_distinct``).
+* ``TDigest`` estimates quantiles (``approx_quantile``).
+* ``HeavyHitters`` finds the most frequent values (Misra-Gries summary).
+
+Values are hashed to 64 bits deterministically (unlike ``hash()``, the result
+does not change between processes), so sketches of the same data agree
+wherever they were built.
+"""
+import json
+import math
+import struct
+import sys
+import zlib
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from collections.abc import Iterable, Sequence
+from itertools import accumulate, compress, repeat
+from operator import and_, eq, mul, ne, sub
+from typing import Any, Optional, Union
+
+from corepy.backend.dispatch import dispatch_kernel
+from corepy.backend.types import BackendType, DataType
+
+from .column import Column
+
+MASK64 = (1 << 64) - 1
+
+
+def _hash_strings(values: Iterable[str]) -> list[int]:
+    encoded = [v.encode("utf-8") for v in values]
+    return list(
+        map(
+            int.__or__,
+            map(int.__lshift__, map(zlib.crc32, encoded), repeat(32)),
+            map(zlib.adler32, encoded),
+        )
+    )
+
+
+def hash_column(column: Column) -> list[int]:
+    """
+    Returns a 64-bit hash of every row of ``column`` (null rows included, with
+    arbitrary hashes). Equal values hash equally in every process.
+    """
+    dtype = column.dtype
+    if column.dictionary is not None:
+        hashes = _hash_strings(column.dictionary)
+        return list(map(hashes.__getitem__, column.values))
+    if dtype in (DataType.FLOAT64, DataType.FLOAT32):
+        # Hash the bit patterns of the doubles (-0.0 counts as 0.0)
+        floats = array("d", map(float.__add__, map(float, column.values), repeat(0.0)))
+        keys: Iterable[int] = memoryview(floats).cast("B").cast("Q")
+    elif column.typecode is not None:
+        keys = map(and_, column.values, repeat(MASK64))
+    elif dtype == DataType.STRING:
+        strings = column.values
+        assert isinstance(strings, list)
+        keys = _hash_strings(v if v is not None else "" for v in strings)
+    else:
+        keys = _hash_strings(map(repr, column.values))
+    mixed: list[int] = dispatch_kernel("hash.mix64", BackendType.CPU, keys)
+    return mixed
+
+
+def _valid_hashes(values: Union[Column, Iterable[Any]]) -> list[int]:
+    column = values if isinstance(values, Column) else Column.from_pylist(list(values))
+    hashes = hash_column(column)
+    if column.validity is not None:
+        hashes = list(compress(hashes, column.valid_mask()))
+    return hashes
+
+
+def _check_magic(data: bytes, magic: bytes) -> None:
+    if data[:4] != magic:
+        raise ValueError(
+            f"Not a serialized sketch of this type (expected magic {magic!r})"
+        )
+
+
+def _little_endian(buffer: "array[Any]") -> "array[Any]":
+    if sys.byteorder == "big":
+        buffer.byteswap()
+    return buffer
+
+
+def _sigma(x: float) -> float:
+    if x == 1.0:
+        return math.inf
+    y, z = 1.0, x
+    while True:
+        x *= x
+        previous, z = z, z + x * y
+        y += y
+        if z == previous:
+            return z
+
+
+def _tau(x: float) -> float:
+    if x in (0.0, 1.0):
+        return 0.0
+    y, z = 1.0, 1.0 - x
+    while True:
+        x = math.sqrt(x)
+        y *= 0.5
+        previous, z = z, z - (1.0 - x) ** 2 * y
+        if z == previous:
+            return z / 3.0
+
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct-count sketch.
+
+    ``2 ** precision`` registers hold the longest run of leading zero bits seen
+    among the hashes routed to them; the relative standard error of
+    ``estimate()`` is about ``1.04 / sqrt(2 ** precision)`` (0.8% at the
+    default precision, in 16 KiB). Small sketches keep only the registers that
+    are set.
+    """
+    MAGIC = b"CPHL"
+
+    def __init__(self, precision: int = 14):
+        """
+        Initialize an empty HyperLogLog.
+
+        Args:
+            precision: Number of hash bits selecting a register, from 4 to 18.
+        """
+        if not 4 <= precision <= 18:
+            raise ValueError(f"precision must be between 4 and 18, got {precision}")
+        self.precision = precision
+        # Registers set so far, until the sketch turns dense (then empty)
+        self._sparse: dict[int, int] = {}
+        self._registers: Optional[bytearray] = None
+
+    @property
+    def registers(self) -> int:
+        return 1 << self.precision
+
+    def update(self, values: Union[Column, Iterable[Any]]) -> "HyperLogLog":
+        """
+        Adds the non-null values of a column (or any iterable of values).
+        """
+        return self.update_hashes(_valid_hashes(values))
+
+    def update_hashes(self, hashes: Sequence[int]) -> "HyperLogLog":
+        """
+        Adds values already hashed to 64 bits by ``hash_column``.
+        """
+        if len(hashes):
+            self._update_ranks(
+                dispatch_kernel(
+                    "sketch.hll_ranks", BackendType.CPU, hashes, self.precision
+                )
+            )
+        return self
+
+    def _update_ranks(self, ranks: dict[int, int]) -> None:
+        registers = self._registers
+        if registers is None:
+            sparse = self._sparse
+            for register, rank in ranks.items():
+                if rank > sparse.get(register, 0):
+                    sparse[register] = rank
+            if len(sparse) > self.registers // 64:
+                self._densify()
+            return
+        for register, rank in ranks.items():
+            if rank > registers[register]:
+                registers[register] = rank
+
+    def _densify(self) -> bytearray:
+        registers = bytearray(self.registers)
+        for register, rank in self._sparse.items():
+            registers[register] = rank
+        self._registers = registers
+        self._sparse = {}
+        return registers
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """
+        Folds ``other`` (of the same precision) into this sketch and returns it.
+        """
+        if not isinstance(other, HyperLogLog):
+            raise TypeError(f"Cannot merge a HyperLogLog with {type(other).__name__}")
+        if other.precision != self.precision:
+            raise ValueError(
+                f"Cannot merge HyperLogLogs of precision {self.precision} and "
+                f"{other.precision}"
+            )
+        if other._registers is None:
+            self._update_ranks(other._sparse)
+            return self
+        registers = self._registers if self._registers is not None else self._densify()
+        self._registers = bytearray(map(max, registers, other._registers))
+        return self
+
+    def estimate(self) -> int:
+        """
+        Estimated number of distinct values added.
+        """
+        m = self.registers
+        if self._registers is None:
+            histogram = Counter(self._sparse.values())
+            histogram[0] = m - len(self._sparse)
+        else:
+            histogram = Counter(self._registers)
+        if histogram[0] == m:
+            return 0
+        # Ertl's improved estimator: corrects both the small- and large-range bias
+        q = 64 - self.precision
+        z = m * _tau(1.0 - histogram[q + 1] / m)
+        for k in range(q, 0, -1):
+            z = 0.5 * (z + histogram[k])
+        z += m * _sigma(histogram[0] / m)
+        return round(m * m / (2 * math.log(2) * z))
+
+    def to_bytes(self) -> bytes:
+        """
+        Serializes the sketch; restore it with ``HyperLogLog.from_bytes``.
+        """
+        registers = self._registers
+        header = self.MAGIC + struct.pack("<BB", self.precision, registers is not None)
+        if registers is not None:
+            return header + bytes(registers)
+        pairs = array(
+            "I",
+            sorted(
+                map(
+                    int.__or__,
+                    map(int.__lshift__, self._sparse, repeat(6)),
+                    self._sparse.values(),
+                )
+            ),
+        )
+        return header + _little_endian(pairs).tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "HyperLogLog":
+        _check_magic(data, cls.MAGIC)
+        precision, dense = struct.unpack_from("<BB", data, 4)
+        sketch = cls(precision)
+        payload = data[6:]
+        if dense:
+            sketch._registers = bytearray(payload)
+        else:
+            pairs = _little_endian(array("I", payload))
+            sketch._sparse = {pair >> 6: pair & 63 for pair in pairs}
+        return sketch
+
+    def __repr__(self) -> str:
+        return f"HyperLogLog(precision={self.precision}, estimate={self.estimate()})"
+
+
+class TDigest:
+    """
+    t-digest quantile sketch.
+
+    Values are summarized by at most about ``compression / 2`` weighted
+    centroids; the k1 scale function keeps centroids small near the tails, so
+    extreme quantiles such as p99 stay accurate. New values are buffered and
+    merged into the centroids in sorted batches.
+    """
+    MAGIC = b"CPTD"
+    BUFFER_FACTOR = 5
+
+    def __init__(self, compression: float = 200.0):
+        """
+        Initialize an empty TDigest.
+
+        Args:
+            compression: Accuracy/size trade-off (at least 10). Higher keeps
+                         more centroids.
+        """
+        if compression < 10:
+            raise ValueError(f"compression must be at least 10, got {compression}")
+        self.compression = float(compression)
+        self._means = array("d")
+        self._weights = array("d")
+        self._buffer = array("d")
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, values: Union[Column, Iterable[float]]) -> "TDigest":
+        """
+        Adds the non-null, non-NaN values of a numeric column (or any iterable
+        of numbers).
+        """
+        if isinstance(values, Column):
+            values._check_numeric("approx_quantile")
+            values = values._valid_values()
+        values = array("d", values)
+        if values != values:
+            # Only NaN is unequal to itself
+            values = array("d", compress(values, map(eq, values, values)))
+        if not len(values):
+            return self
+        self.count += len(values)
+        self.min = min(self.min, min(values))
+        self.max = max(self.max, max(values))
+        self._buffer.extend(values)
+        if len(self._buffer) > self.BUFFER_FACTOR * self.compression:
+            self._compress()
+        return self
+
+    def _compress(
+        self, means: Sequence[float] = (), weights: Sequence[float] = ()
+    ) -> None:
+        buffer = self._buffer
+        if not len(buffer) and not len(means):
+            return
+        pairs = sorted(
+            zip(
+                [*self._means, *means, *buffer],
+                [*self._weights, *weights, *repeat(1.0, len(buffer))],
+            )
+        )
+        self._buffer = array("d")
+        values, counts = [p[0] for p in pairs], [p[1] for p in pairs]
+        total = math.fsum(counts)
+        # Centroid of each input: k1 scale of its quantile, one unit per centroid
+        scale = self.compression / (2 * math.pi)
+        centers = map(sub, accumulate(counts), map(mul, counts, repeat(0.5)))
+        ids = [
+            math.floor(scale * math.asin(min(1.0, max(-1.0, 2.0 * c / total - 1.0))))
+            for c in centers
+        ]
+        bounds = [0, *compress(range(1, len(ids)), map(ne, ids, ids[1:])), len(ids)]
+        new_means, new_weights = array("d"), array("d")
+        for start, end in zip(bounds, bounds[1:]):
+            weight = math.fsum(counts[start:end])
+            new_weights.append(weight)
+            new_means.append(
+                math.fsum(map(mul, values[start:end], counts[start:end])) / weight
+            )
+        self._means, self._weights = new_means, new_weights
+
+    def merge(self, other: "TDigest") -> "TDigest":
+        """
+        Folds ``other`` into this digest and returns it.
+        """
+        if not isinstance(other, TDigest):
+            raise TypeError(f"Cannot merge a TDigest with {type(other).__name__}")
+        if not other.count:
+            return self
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._buffer.extend(other._buffer)
+        self._compress(other._means, other._weights)
+        return self
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimated ``q``-quantile (``0 <= q <= 1``) of the values added, or None
+        when there are none.
+        """
+        if not 0.0 <= q <= 1.0:
+            raise ValueError(f"quantile must be between 0 and 1, got {q}")
+        self._compress()
+        if not self.count:
+            return None
+        if q == 0.0:
+            return self.min
+        if q == 1.0:
+            return self.max
+        means, weights = self._means, self._weights
+        # Interpolate between centroid centers, with min/max pinned at the ends
+        centers = [
+            0.0,
+            *map(sub, accumulate(weights), map(mul, weights, repeat(0.5))),
+            self.count,
+        ]
+        points = [self.min, *means, self.max]
+        target = q * self.count
+        i = min(bisect_right(centers, target), len(centers) - 1)
+        left, right = centers[i - 1], centers[i]
+        if right == left:
+            return points[i]
+        rise = (points[i] - points[i - 1]) * (target - left)
+        value: float = points[i - 1] + rise / (right - left)
+        return value
+
+    def to_bytes(self) -> bytes:
+        """
+        Serializes the digest; restore it with ``TDigest.from_bytes``.
+        """
+        self._compress()
+        header = self.MAGIC + struct.pack(
+            "<dQIdd", self.compression, self.count, len(self._means), self.min, self.max
+        )
+        return (
+            header
+            + _little_endian(array("d", self._means)).tobytes()
+            + _little_endian(array("d", self._weights)).tobytes()
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "TDigest":
+        _check_magic(data, cls.MAGIC)
+        compression, count, size, low, high = struct.unpack_from("<dQIdd", data, 4)
+        digest = cls(compression)
+        payload = data[4 + struct.calcsize("<dQIdd"):]
+        digest._means = _little_endian(array("d", payload[:8 * size]))
+        digest._weights = _little_endian(array("d", payload[8 * size:]))
+        digest.count, digest.min, digest.max = count, low, high
+        return digest
+
+    def __repr__(self) -> str:
+        return (
+            f"TDigest(compression={self.compression:g}, count={self.count}, "
+            f"centroids={len(self._means)})"
+        )
+
+
+class HeavyHitters:
+    """
+    Misra-Gries frequent-items summary.
+
+    Keeps at most ``capacity`` counters; every value occurring more than
+    ``count / (capacity + 1)`` times is guaranteed to be among them. Counts
+    are lower bounds, each short by at most ``error``.
+    """
+    MAGIC = b"CPHH"
+
+    def __init__(self, capacity: int = 1000):
+        """
+        Initialize an empty summary.
+
+        Args:
+            capacity: Maximum number of values tracked.
+        """
+        if capacity < 1:
+            raise ValueError(f"capacity must be at least 1, got {capacity}")
+        self.capacity = capacity
+        self.counters: Counter[Any] = Counter()
+        self.count = 0
+        self.error = 0
+
+    def update(self, values: Union[Column, Iterable[Any]]) -> "HeavyHitters":
+        """
+        Adds the non-null values of a column (or any iterable of hashable values).
+        """
+        if isinstance(values, Column):
+            column = values
+            batch = Counter(column._valid_values())
+            if column.dictionary is not None:
+                batch = Counter(
+                    dict(zip(map(column.dictionary.__getitem__, batch), batch.values()))
+                )
+            elif column.dtype == DataType.BOOL:
+                batch = Counter(dict(zip(map(bool, batch), batch.values())))
+        else:
+            batch = Counter(values)
+        self.count += sum(batch.values())
+        self.counters.update(batch)
+        self._prune()
+        return self
+
+    def _prune(self) -> None:
+        counters = self.counters
+        if len(counters) <= self.capacity:
+            return
+        # Subtracting the (capacity + 1)-th largest count leaves at most capacity
+        # counters
+        threshold = sorted(counters.values(), reverse=True)[self.capacity]
+        self.counters = Counter(
+            {v: c - threshold for v, c in counters.items() if c > threshold}
+        )
+        self.error += threshold
+
+    def merge(self, other: "HeavyHitters") -> "HeavyHitters":
+        """
+        Folds ``other`` into this summary and returns it.
+        """
+        if not isinstance(other, HeavyHitters):
+            raise TypeError(f"Cannot merge a HeavyHitters with {type(other).__name__}")
+        self.count += other.count
+        self.error += other.error
+        self.counters.update(other.counters)
+        self._prune()
+        return self
+
+    def top(self, n: Optional[int] = None) -> list[tuple[Any, int]]:
+        """
+        The ``n`` most frequent values (all tracked values by default) with
+        their counts, most frequent first.
+        """
+        return self.counters.most_common(n)
+
+    def to_bytes(self) -> bytes:
+        """
+        Serializes the summary as JSON; the tracked values must be JSON-serializable.
+        """
+        state = {
+            "capacity": self.capacity,
+            "count": self.count,
+            "error": self.error,
+            "items": self.top(),
+        }
+        return self.MAGIC + json.dumps(state).encode("utf-8")
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "HeavyHitters":
+        _check_magic(data, cls.MAGIC)
+        state = json.loads(data[4:].decode("utf-8"))
+        summary = cls(state["capacity"])
+        summary.count, summary.error = state["count"], state["error"]
+        summary.counters = Counter(
+            {(tuple(v) if isinstance(v, list) else v): c for v, c in state["items"]}
+        )
+        return summary
+
+    def __repr__(self) -> str:
+        return (
+            f"HeavyHitters(capacity={self.capacity}, count={self.count}, "
+            f"tracked={len(self.counters)})"
+        )
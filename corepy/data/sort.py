@@ -0,0 +1,129 @@
+"""
+Row ordering for Tables.
+
+Each key column is turned into a sequence the ``argsort``/``top_k`` kernels can
+order directly: the column buffer itself when it has no nulls or NaNs (for
+categorical columns, the rank of each code's dictionary entry), otherwise
+dense integer ranks that encode its direction, null placement and
+NaN as the largest value.
+
+Multi-key sorts run one stable pass per key, least significant first. Top-k
+over several keys combines the per-column ranks into one integer per row so
+a single partial selection suffices.
+"""
+import math
+import operator
+from collections.abc import Sequence
+from itertools import repeat
+from typing import Any, Optional
+
+from corepy.backend.dispatch import Dispatcher
+from corepy.backend.types import BackendType, DataType
+
+from .column import _NAN, Column, key_values
+
+
+def _has_nan(column: Column) -> bool:
+    if column.dtype not in (DataType.FLOAT32, DataType.FLOAT64):
+        return False
+    return any(map(math.isnan, column.values))
+
+
+def _ranks(column: Column, descending: bool, nulls_last: bool) -> tuple[list[int], int]:
+    """
+    Returns a dense rank per row, in ascending sort order, and the number of
+    distinct ranks.
+    """
+    values = key_values(column)
+    distinct = set(values)
+    has_nan = _NAN in distinct
+    distinct.discard(None)
+    distinct.discard(_NAN)
+    ordered: list[Any] = sorted(distinct, reverse=descending)
+    # NaN sorts above every number
+    if has_nan and descending:
+        ordered.insert(0, _NAN)
+    elif has_nan:
+        ordered.append(_NAN)
+    offset = 0 if nulls_last else 1
+    rank = dict(zip(ordered, range(offset, len(ordered) + offset)))
+    rank[None] = len(ordered) if nulls_last else 0
+    return list(map(rank.__getitem__, values)), len(ordered) + 1
+
+
+def column_key(
+    column: Column, descending: bool, nulls_last: bool = True
+) -> tuple[Sequence[Any], bool]:
+    """
+    Returns a sortable key per row of ``column`` and whether the keys must be
+    sorted in descending order.
+    """
+    if column.dictionary is not None and column.validity is None:
+        # Rank the dictionary once, then map every code to its entry's rank
+        order = sorted(range(len(column.dictionary)), key=column.dictionary.__getitem__)
+        rank = [0] * len(order)
+        for position, code in enumerate(order):
+            rank[code] = position
+        return list(map(rank.__getitem__, column.values)), descending
+    if column.validity is None and not _has_nan(column):
+        return column.values, descending
+    return _ranks(column, descending, nulls_last)[0], False
+
+
+def combined_key(
+    columns: Sequence[Column], descending: Sequence[bool], nulls_last: bool = True
+) -> tuple[Sequence[Any], bool]:
+    """
+    Returns one key per row ordering rows by all ``columns`` at once.
+    """
+    if len(columns) == 1:
+        return column_key(columns[0], descending[0], nulls_last)
+    keys: list[int] = []
+    for column, desc in zip(columns, descending):
+        ranks, base = _ranks(column, desc, nulls_last)
+        keys = (
+            ranks
+            if not keys
+            else list(map(operator.add, map(operator.mul, keys, repeat(base)), ranks))
+        )
+    return keys, False
+
+
+def argsort(keys: Sequence[Any], descending: bool) -> list[int]:
+    """
+    Stable argsort of ``keys``.
+    """
+    argsort = Dispatcher.get_kernel("argsort", BackendType.CPU)
+    order: list[int] = argsort(keys, descending)
+    return order
+
+
+def sort_indices(
+    columns: Sequence[Column], descending: Sequence[bool], nulls_last: bool = True
+) -> list[int]:
+    """
+    Returns the permutation stably ordering rows by ``columns`` (most
+    significant first).
+    """
+    order: Optional[list[int]] = None
+    for column, desc in reversed(list(zip(columns, descending))):
+        keys, reverse = column_key(column, desc, nulls_last)
+        if order is None:
+            order = argsort(keys, reverse)
+        else:
+            order.sort(key=keys.__getitem__, reverse=reverse)
+    return order if order is not None else []
+
+
+def top_k(
+    columns: Sequence[Column],
+    k: int,
+    descending: Sequence[bool],
+    nulls_last: bool = True,
+) -> list[int]:
+    """
+    Indices of the first ``k`` rows in sorted order, via partial selection.
+    """
+    keys, reverse = combined_key(columns, descending, nulls_last)
+    top: list[int] = Dispatcher.get_kernel("top_k", BackendType.CPU)(keys, k, reverse)
+    return top
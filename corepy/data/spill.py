@@ -0,0 +1,418 @@
+"""
+Out-of-core sort, group-by and join.
+
+``Table.sort``, ``GroupBy.agg`` and ``Table.join`` estimate their working set
+(input and output buffers plus the Python objects of keys and row
+permutations, see ``working_set``) and, when it exceeds the session's
+``memory_budget``, run one of the operators below instead. Each writes its
+intermediate tables to a private directory under the session's
+``spill_dir``, removed when the operator returns:
+
+* ``external_sort``: sorts runs of rows that fit the budget, spills each
+  sorted run in small blocks, then k-way merges the runs with
+  ``heapq.merge``, reading one block per run at a time (stable:
+  ties come from earlier runs first).
+* ``spill_group_by``: hash-partitions the rows by key, spills the partitions
+  and aggregates them one at a time (a group lives in exactly one partition).
+* ``spill_join``: hash-partitions both inputs by key (a "grace" hash join)
+  and joins matching partitions one at a time.
+
+Results are the same as the in-memory operators', in the same order. Spilled
+tables are written as Arrow IPC files and mapped back, or pickled when they
+hold object columns. Every spill is counted in ``Session.spill_stats``.
+"""
+import heapq
+import logging
+import os
+import pickle
+import shutil
+import tempfile
+from array import array
+from collections.abc import Iterator, Sequence
+from itertools import repeat
+from operator import itemgetter
+from typing import Any, Optional
+
+from corepy.backend.session import get_session
+from corepy.backend.types import DataType
+
+from .column import Column, key_values
+from .expr import AggExpr, ColumnRef
+from .ipc import read_ipc, write_ipc
+from .join import _partition
+from .sort import sort_indices
+
+logger = logging.getLogger("corepy.data.spill")
+
+# Bytes of Python objects (keys, row numbers) an operator holds per input row
+ROW_OVERHEAD = 72
+
+# Smallest sorted run, so a tiny budget doesn't produce one file per row
+MIN_RUN_ROWS = 1024
+
+# Most rows of each spilled run block
+MERGE_BLOCK_ROWS = 4096
+
+# Fewest rows of a spilled run block, so many runs don't mean tiny files
+MIN_BLOCK_ROWS = 64
+
+# Hidden column carrying input row numbers through partitioned operators
+_ROW = "__spill_row__"
+
+
+def working_set(*tables: Any) -> int:
+    """
+    Estimated peak memory, in bytes, of sorting, grouping or joining ``tables``.
+    """
+    return sum(2 * table.nbytes + ROW_OVERHEAD * len(table) for table in tables)
+
+
+def over_budget(*tables: Any) -> bool:
+    """
+    Whether an operator over ``tables`` should spill under the session budget.
+    """
+    budget = get_session().memory_budget
+    return budget is not None and working_set(*tables) > budget
+
+
+def _partitions(*tables: Any) -> int:
+    # A power of two, as ``_partition`` masks the key hash
+    budget = max(1, get_session().memory_budget or 1)
+    needed = -(-working_set(*tables) // budget)
+    return 1 << max(1, (needed - 1).bit_length())
+
+
+class SpillDirectory:
+    """
+    A temporary directory for the intermediate tables of one operator, removed on exit.
+    """
+    def __init__(self, operation: str):
+        session = get_session()
+        os.makedirs(session.spill_dir, exist_ok=True)
+        prefix = f"corepy-{operation}-"
+        self.path = tempfile.mkdtemp(prefix=prefix, dir=session.spill_dir)
+        self.stats = session.spill_stats
+        self.stats["operations"] += 1
+        self._count = 0
+
+    def write(self, table: Any) -> str:
+        """
+        Spills ``table`` to a new file and returns its path.
+        """
+        self._count += 1
+        if any(column.dtype == DataType.OBJECT for column in table._columns.values()):
+            path = os.path.join(self.path, f"{self._count}.pkl")
+            with open(path, "wb") as f:
+                pickle.dump(
+                    {
+                        name: (column.dtype, column.to_pylist())
+                        for name, column in table._columns.items()
+                    },
+                    f,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+        else:
+            path = os.path.join(self.path, f"{self._count}.arrow")
+            write_ipc(table, path)
+        self.stats["files"] += 1
+        self.stats["bytes"] += os.path.getsize(path)
+        self.stats["rows"] += len(table)
+        return path
+
+    @staticmethod
+    def read(path: str) -> Any:
+        """
+        Loads a table written by ``write``.
+        """
+        from .table import Table
+
+        if path.endswith(".arrow"):
+            return read_ipc(path)
+        with open(path, "rb") as f:
+            columns = pickle.load(f)
+        num_rows = len(next(iter(columns.values()))[1]) if columns else 0
+        return Table._from_columns(
+            {
+                name: Column.from_pylist(values, dtype)
+                for name, (dtype, values) in columns.items()
+            },
+            None,
+            num_rows,
+        )
+
+    def __enter__(self) -> "SpillDirectory":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+class _Descending:
+    """
+    Wraps a sort key so that larger values compare smaller.
+    """
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __lt__(self, other: "_Descending") -> bool:
+        less: bool = other.value < self.value
+        return less
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Descending) and self.value == other.value
+
+
+def _merge_keys(
+    column: Column, descending: bool, nulls_last: bool
+) -> list[tuple[Any, ...]]:
+    """
+    Per-row keys of ``column`` that compare across runs in ``Table.sort``
+    order: values in the requested direction, NaN above every number and
+    nulls first or last.
+    """
+    null = (2,) if nulls_last else (0,)
+    # NaN is the largest value: last ascending, first descending
+    nan = (1, 0) if descending else (1, 2)
+    keys: list[tuple[Any, ...]] = []
+    for value in key_values(column):
+        if value is None:
+            keys.append(null)
+        elif value != value:
+            keys.append(nan)
+        else:
+            keys.append((1, 1, _Descending(value) if descending else value))
+    return keys
+
+
+def _run_rows(
+    paths: Sequence[str],
+    position: int,
+    loaded: dict[tuple[int, int], Any],
+    names: Sequence[str],
+    flags: Sequence[bool],
+    nulls_last: bool,
+) -> Iterator[tuple[Any, tuple[int, int], int]]:
+    """
+    Yields (merge key, (run position, block), row) for every row of a sorted
+    run spilled as the blocks ``paths``. Each block is read when the merge
+    reaches it and kept in ``loaded`` until the caller has gathered its rows.
+    """
+    for index, path in enumerate(paths):
+        block = loaded[position, index] = SpillDirectory.read(path)
+        keys = zip(
+            *(
+                _merge_keys(block.column(name), desc, nulls_last)
+                for name, desc in zip(names, flags)
+            )
+        )
+        yield from zip(keys, repeat((position, index)), range(len(block)))
+
+
+def _gather(
+    blocks: dict[tuple[int, int], Any], picks: list[tuple[Any, tuple[int, int], int]]
+) -> Any:
+    """
+    Gathers the rows ``picks`` (merge key, block, row) from ``blocks``, in that order.
+    """
+    from .table import concat
+
+    by_block: dict[tuple[int, int], list[int]] = {}
+    slots: dict[tuple[int, int], list[int]] = {}
+    for slot, (_, block, row) in enumerate(picks):
+        by_block.setdefault(block, []).append(row)
+        slots.setdefault(block, []).append(slot)
+    order = sorted(by_block)
+    taken = concat([blocks[block].take(by_block[block]) for block in order])
+    # Row i of ``taken`` belongs at slot positions[i] of the output
+    positions = [slot for block in order for slot in slots[block]]
+    inverse = [0] * len(positions)
+    for i, slot in enumerate(positions):
+        inverse[slot] = i
+    return taken.take(inverse)
+
+
+def external_sort(
+    table: Any,
+    by: Sequence[str],
+    descending: Sequence[bool],
+    nulls_last: bool = True,
+) -> Any:
+    """
+    Sorts ``table`` like ``Table.sort`` while holding at most one run of rows
+    (plus the output) in memory: runs that fit the budget are sorted and
+    spilled, then merged back a block of each run at a time.
+    """
+    from .table import Table, concat
+
+    budget = get_session().memory_budget or working_set(table)
+    per_row = max(1, working_set(table) // max(1, len(table)))
+    run_size = max(MIN_RUN_ROWS, budget // per_row)
+    # The merge holds up to two blocks of every run: together about one run
+    runs_needed = -(-len(table) // run_size)
+    block_rows = run_size // (2 * runs_needed)
+    block_rows = min(MERGE_BLOCK_ROWS, max(MIN_BLOCK_ROWS, block_rows))
+    with SpillDirectory("sort") as spill:
+        runs = []
+        for start in range(0, len(table), run_size):
+            run = table.slice(start, run_size)
+            keys = [run.column(name) for name in by]
+            order = sort_indices(keys, descending, nulls_last)
+            run = run.take(order)
+            starts = range(0, len(run), block_rows)
+            runs.append([spill.write(run.slice(at, block_rows)) for at in starts])
+            del run, keys, order
+        logger.info("Sorting %d rows in %d spilled runs", len(table), len(runs))
+        loaded: dict[tuple[int, int], Any] = {}
+        merged = heapq.merge(
+            *(
+                _run_rows(paths, i, loaded, by, descending, nulls_last)
+                for i, paths in enumerate(runs)
+            ),
+            key=itemgetter(0),
+        )
+        chunks = []
+        while True:
+            picks = [pick for _, pick in zip(range(block_rows * len(runs)), merged)]
+            if not picks:
+                break
+            chunks.append(_gather(loaded, picks))
+            # Only the block each run is currently in can still be picked from
+            current: dict[int, int] = {}
+            for position, index in loaded:
+                current[position] = max(index, current.get(position, index))
+            for key in [key for key in loaded if key[1] < current[key[0]]]:
+                del loaded[key]
+        result = concat(chunks) if chunks else table.slice(0, 0)
+    return Table._from_columns(dict(result._columns), table.schema, len(table))
+
+
+def spill_group_by(
+    table: Any,
+    keys: Sequence[str],
+    specs: Sequence[tuple[str, AggExpr]],
+    workers: int = 1,
+) -> Any:
+    """
+    Aggregates ``table`` like ``GroupBy.agg`` one key-hash partition at a time.
+    Groups come out in order of first appearance.
+    """
+    from .groupby import GroupBy
+    from .table import Table, concat
+
+    # Aggregate inputs are evaluated up front so partitions carry plain columns
+    inputs = {
+        f"__spill_agg{i}__": agg.operand.evaluate(table)
+        for i, (_, agg) in enumerate(specs)
+    }
+    columns = {key: table.column(key) for key in keys}
+    columns.update(inputs)
+    columns[_ROW] = Column(DataType.INT64, array("q", range(len(table))))
+    narrow = Table._from_columns(columns, None, len(table))
+    key_rows = [
+        key_values(column, codes=True) for column in (table.column(key) for key in keys)
+    ]
+    hashed: Sequence[Any] = key_rows[0] if len(keys) == 1 else list(zip(*key_rows))
+    parts = _partitions(narrow)
+    order, bounds = _partition(hashed, parts)
+    del key_rows, hashed
+
+    aggs = {
+        name: AggExpr(agg.func, ColumnRef(input_name), name, agg.args)
+        for (name, agg), input_name in zip(specs, inputs)
+    }
+    aggs[_ROW] = AggExpr("min", ColumnRef(_ROW), _ROW)
+    results = []
+    with SpillDirectory("groupby") as spill:
+        paths = [
+            spill.write(narrow.take(order[a:b]))
+            for a, b in zip(bounds, bounds[1:])
+            if b > a
+        ]
+        del order, narrow
+        logger.info("Grouping %d rows in %d spilled partitions", len(table), len(paths))
+        for path in paths:
+            results.append(
+                GroupBy(spill.read(path), keys, workers)._aggregate(list(aggs.items()))
+            )
+        merged = concat(results)
+        # Groups of different partitions interleave; restore first-appearance order
+        first = merged.column(_ROW).to_pylist()
+        result = merged.take(sorted(range(len(first)), key=first.__getitem__))
+    names = [*keys, *(name for name, _ in specs)]
+    return Table._from_columns(
+        {name: result.column(name) for name in names}, None, len(result)
+    )
+
+
+def spill_join(
+    left: Any,
+    right: Any,
+    on: Sequence[str],
+    how: str = "inner",
+    strategy: str = "auto",
+    workers: int = 1,
+    suffix: str = "_right",
+) -> Any:
+    """
+    Joins like ``Table.join``, one pair of key-hash partitions at a time.
+    Rows follow left order and each left row's matches follow right order.
+    """
+    from .join import join
+    from .table import Table, concat
+
+    def hashed(table: Any) -> Sequence[Any]:
+        # Decoded values, so categorical keys hash alike on both sides
+        values = [key_values(table.column(name)) for name in on]
+        return values[0] if len(on) == 1 else list(zip(*values))
+
+    columns = dict(left._columns)
+    columns[_ROW] = Column(DataType.INT64, array("q", range(len(left))))
+    numbered = Table._from_columns(columns, None, len(left))
+    parts = _partitions(left, right)
+    left_order, left_bounds = _partition(hashed(left), parts)
+    right_order, right_bounds = _partition(hashed(right), parts)
+
+    results = []
+    with SpillDirectory("join") as spill:
+        pairs: list[tuple[str, Optional[str]]] = []
+        for p in range(parts):
+            left_rows = left_order[left_bounds[p]:left_bounds[p + 1]]
+            right_rows = right_order[right_bounds[p]:right_bounds[p + 1]]
+            if not left_rows:
+                continue
+            right_path = spill.write(right.take(right_rows)) if right_rows else None
+            pairs.append((spill.write(numbered.take(left_rows)), right_path))
+        del left_order, right_order, numbered
+        logger.info(
+            "Joining %d x %d rows in %d spilled partitions",
+            len(left),
+            len(right),
+            len(pairs),
+        )
+        empty_right = right.take([])
+        for left_path, right_path in pairs:
+            part = spill.read(right_path) if right_path is not None else empty_right
+            results.append(
+                join(
+                    spill.read(left_path),
+                    part,
+                    on,
+                    how=how,
+                    strategy=strategy,
+                    workers=workers,
+                    suffix=suffix,
+                )
+            )
+        if not results:
+            return join(left.slice(0, 0), empty_right, on, how=how, suffix=suffix)
+        merged = concat(results)
+        rows = merged.column(_ROW).to_pylist()
+        # A stable sort keeps each left row's matches in right order
+        result = merged.take(sorted(range(len(rows)), key=rows.__getitem__))
+    names = [name for name in result.column_names if name != _ROW]
+    schema = left.schema if how in ("semi", "anti") else None
+    return Table._from_columns(
+        {name: result.column(name) for name in names}, schema, len(result)
+    )
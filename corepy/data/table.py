@@ -1,22 +1,194 @@
-from typing import Any, Dict, List, Optional
+import os
+from collections.abc import Iterable, Mapping, Sequence
+from operator import methodcaller
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+
+from corepy.backend.types import DataType
 from corepy.schema import Schema
 
+from .column import TYPECODES, Column, concat_columns, resolve_dtype
+from .columnar import ROW_GROUP_SIZE, write_columnar
+from .expr import AggExpr, Expr, mask_of, to_expr
+from .groupby import GroupBy
+from .index import Index, build_index, index_scan
+from .ipc import write_ipc
+from .join import join
+from .sort import sort_indices, top_k
+from .spill import external_sort, over_budget, spill_join
+from .tensors import table_to_tensor
+from .validation import Violation, compile_schema
+
+if TYPE_CHECKING:
+    from corepy.tensor import Tensor
+
+    from .lazy import LazyTable
+    from .window import Rolling, Windows
+
 class Table:
     """
     A unified data container for tabular data.
+
+    Data is stored column-major: one typed contiguous buffer per column (see
+    ``Column``), with dtypes taken from the schema when one is given and
+    inferred from the values otherwise.
+
+    Columns can carry secondary indexes (see ``create_index``), which
+    ``filter`` and ``join`` use automatically.
     """
-    def __init__(self, data: List[Dict[str, Any]], schema: Optional[Schema] = None):
-        self._data = data
+    def __init__(
+        self,
+        data: Union[
+            list[dict[str, Any]], Mapping[str, Union[Sequence[Any], Column]], None
+        ] = None,
+        schema: Optional[Schema] = None,
+    ):
+        """
+        Initialize a Table.
+
+        Args:
+            data: Either a list of row dictionaries or a mapping of column name
+                  to a sequence of values (or a Column). Missing keys and None
+                  values become nulls.
+            schema: Optional schema. Its field dtypes decide the column types,
+                    and the data is checked against its constraints.
+        """
         self._schema = schema
+        self._indexes: dict[str, Index] = {}
+        if data is None:
+            data = []
+        if isinstance(data, Mapping):
+            self._columns, self._num_rows = self._columns_from_mapping(data, schema)
+        else:
+            self._columns, self._num_rows = self._columns_from_rows(data, schema)
         self._validate()
 
+    @staticmethod
+    def _field_dtype(schema: Optional[Schema], name: str) -> Optional[DataType]:
+        if schema is None:
+            return None
+        field = schema.get_field(name)
+        return resolve_dtype(field.dtype) if field is not None else None
+
+    @classmethod
+    def _columns_from_rows(
+        cls, rows: list[dict[str, Any]], schema: Optional[Schema]
+    ) -> tuple[dict[str, Column], int]:
+        names: dict[str, None] = {}
+        if schema is not None:
+            names.update((field.name, None) for field in schema.fields)
+        for row in rows:
+            names.update(dict.fromkeys(row))
+        columns = {
+            name: Column.from_pylist(
+                list(map(methodcaller("get", name), rows)),
+                cls._field_dtype(schema, name),
+            )
+            for name in names
+        }
+        return columns, len(rows)
+
+    @classmethod
+    def _columns_from_mapping(
+        cls,
+        data: Mapping[str, Union[Sequence[Any], Column]],
+        schema: Optional[Schema],
+    ) -> tuple[dict[str, Column], int]:
+        columns: dict[str, Column] = {}
+        for name, values in data.items():
+            dtype = cls._field_dtype(schema, name)
+            if isinstance(values, Column):
+                column = values
+                # Categorical columns stay encoded under a string field
+                if (
+                    dtype is not None
+                    and column.dtype != dtype
+                    and (dtype, column.dtype) != (DataType.STRING, DataType.CATEGORICAL)
+                ):
+                    column = Column.from_pylist(column.to_pylist(), dtype)
+            else:
+                column = Column.from_pylist(values, dtype)
+            columns[name] = column
+        lengths = {len(c) for c in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Columns have different lengths: {sorted(lengths)}")
+        num_rows = lengths.pop() if lengths else 0
+        if schema is not None:
+            for field in schema.fields:
+                if field.name not in columns:
+                    columns[field.name] = Column.from_pylist(
+                        [None] * num_rows, resolve_dtype(field.dtype)
+                    )
+        return columns, num_rows
+
+    @classmethod
+    def from_rows(
+        cls, rows: list[dict[str, Any]], schema: Optional[Schema] = None
+    ) -> "Table":
+        """
+        Builds a table from a list of row dictionaries.
+        """
+        return cls(rows, schema=schema)
+
+    @classmethod
+    def from_pydict(
+        cls, data: Mapping[str, Sequence[Any]], schema: Optional[Schema] = None
+    ) -> "Table":
+        """
+        Builds a table from a mapping of column name to values.
+        """
+        return cls(dict(data), schema=schema)
+
+    @classmethod
+    def from_numpy(
+        cls, arrays: Mapping[str, Any], schema: Optional[Schema] = None
+    ) -> "Table":
+        """
+        Builds a table from a mapping of column name to one-dimensional NumPy
+        array. Contiguous numeric and bool arrays are shared without copying.
+        """
+        return cls(
+            {name: Column.from_numpy(arr) for name, arr in arrays.items()},
+            schema=schema,
+        )
+
+    @classmethod
+    def _from_columns(
+        cls,
+        columns: dict[str, Column],
+        schema: Optional[Schema] = None,
+        num_rows: Optional[int] = None,
+    ) -> "Table":
+        """
+        Wraps existing columns without copying or validating them.
+        """
+        table = cls.__new__(cls)
+        table._schema = schema
+        table._columns = columns
+        table._indexes = {}
+        if num_rows is None:
+            num_rows = len(next(iter(columns.values()))) if columns else 0
+        table._num_rows = num_rows
+        return table
+
     def _validate(self) -> None:
         """
-        Validates data against the schema if provided.
+        Validates data against the schema if provided. Every violation is
+        collected and raised together as a ``SchemaValidationError``.
         """
-        if self._schema:
-            # perform basic validation
-            pass
+        if self._schema is not None:
+            compile_schema(self._schema).check(self)
+
+    def validate(self, schema: Optional[Schema] = None) -> list[Violation]:
+        """
+        Checks the table against a schema and returns every violation found.
+        Field metadata may constrain values with ``nullable``, ``min``, ``max``
+        and ``enum``.
+
+        Args:
+            schema: The schema to check against (default: the table's own).
+        """
+        schema = schema if schema is not None else self._schema
+        return compile_schema(schema).validate(self) if schema is not None else []
 
     @property
     def schema(self) -> Optional[Schema]:
@@ -25,14 +197,572 @@ class Table:
         """
         return self._schema
 
+    @property
+    def column_names(self) -> list[str]:
+        """
+        Returns the column names in order.
+        """
+        return list(self._columns)
+
+    @property
+    def dtypes(self) -> dict[str, DataType]:
+        """
+        Returns the DataType of each column.
+        """
+        return {name: column.dtype for name, column in self._columns.items()}
+
+    def column(self, name: str) -> Column:
+        """
+        Returns the column called ``name``.
+        """
+        try:
+            return self._columns[name]
+        except KeyError:
+            raise KeyError(f"Table has no column '{name}'") from None
+
+    def __getitem__(self, name: str) -> Column:
+        return self.column(name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._columns
+
     def to_list(self) -> List[Dict[str, Any]]:
         """
         Returns the data as a list of dictionaries.
         """
-        return self._data
+        if not self._columns:
+            return [{} for _ in range(self._num_rows)]
+        names = list(self._columns)
+        values = [column.to_pylist() for column in self._columns.values()]
+        return [dict(zip(names, row)) for row in zip(*values)]
+
+    def to_pydict(self) -> dict[str, list[Any]]:
+        """
+        Returns the data as a mapping of column name to a list of values.
+        """
+        return {name: column.to_pylist() for name, column in self._columns.items()}
+
+    def slice(self, offset: int, length: Optional[int] = None) -> "Table":
+        """
+        Returns rows ``[offset, offset + length)`` as a new table. The result is
+        a view: its columns share this table's buffers (see ``Column.slice``).
+        """
+        offset = max(0, min(offset, self._num_rows))
+        end = (
+            self._num_rows
+            if length is None
+            else min(self._num_rows, offset + max(0, length))
+        )
+        columns = {
+            name: column.slice(offset, end - offset)
+            for name, column in self._columns.items()
+        }
+        return Table._from_columns(columns, self._schema, end - offset)
+
+    def head(self, n: int = 5) -> "Table":
+        """
+        Returns a view of the first ``n`` rows.
+        """
+        return self.slice(0, n)
+
+    def tail(self, n: int = 5) -> "Table":
+        """
+        Returns a view of the last ``n`` rows.
+        """
+        return self.slice(max(0, self._num_rows - max(0, n)))
+
+    def rechunk(self) -> "Table":
+        """
+        Returns the table with every column in one contiguous buffer. Tables
+        built by ``concat`` keep their inputs' buffers as chunks, which kernels
+        join on first use; call this to pay that copy up front, once.
+        """
+        columns = {name: column.rechunk() for name, column in self._columns.items()}
+        table = Table._from_columns(columns, self._schema, self._num_rows)
+        table._indexes = dict(self._indexes)
+        return table
+
+    def _keep_indexes(self, table: "Table") -> "Table":
+        """
+        Carries this table's indexes over to ``table`` (which has the same rows)
+        for the columns it shares unchanged.
+        """
+        table._indexes = {
+            name: index
+            for name, index in self._indexes.items()
+            if table._columns.get(name) is self._columns[name]
+        }
+        return table
+
+    @property
+    def indexes(self) -> dict[str, Index]:
+        """
+        The secondary indexes of this table, keyed by column name.
+        """
+        return dict(self._indexes)
+
+    def create_index(self, column: str, kind: str = "hash") -> Index:
+        """
+        Builds an index over ``column`` (replacing any existing one) and
+        returns it. Filters comparing the column with literals and joins on it
+        then look rows up in the index instead of scanning. Indexes stay valid
+        for tables sharing the column unchanged (``select``, ``with_columns``,
+        ``rechunk``) and are saved by ``write_columnar``.
+
+        Args:
+            column: Name of the column to index.
+            kind: ``"hash"`` for equality and ``isin`` lookups (and joins), or
+                  ``"sorted"`` for range predicates as well.
+        """
+        index = build_index(self.column(column), kind)
+        self._indexes = {**self._indexes, column: index}
+        return index
+
+    def drop_index(self, column: str) -> None:
+        """
+        Removes the index of ``column``.
+        """
+        if column not in self._indexes:
+            raise KeyError(f"Column '{column}' has no index")
+        self._indexes = {
+            name: index for name, index in self._indexes.items() if name != column
+        }
+
+    def lookup(self, column: str, value: Any) -> "Table":
+        """
+        Returns the rows whose ``column`` equals ``value``, through the
+        column's index when it has one.
+        """
+        index = self._indexes.get(column)
+        if index is None:
+            return self.filter(to_expr(column) == value)
+        return self.take(index.lookup(value))
+
+    def select(self, *columns: Union[str, Expr]) -> "Table":
+        """
+        Returns a table with only the given columns or expressions, in order.
+        Plain column references share their buffers with this table.
+
+        Args:
+            *columns: Column names or expressions (see ``corepy.data.col``).
+        """
+        selected: dict[str, Column] = {}
+        for expr in map(to_expr, columns):
+            selected[expr.output_name] = expr.evaluate(self)
+        return self._keep_indexes(
+            Table._from_columns(
+                selected, self._projected_schema(selected), self._num_rows
+            )
+        )
+
+    def with_columns(self, *exprs: Expr, **named: Expr) -> "Table":
+        """
+        Returns a table with derived columns added, or replacing columns of the
+        same name. Expressions are evaluated against this table, not against
+        each other.
+
+        Args:
+            *exprs: Expressions named by their ``output_name``.
+            **named: Expressions keyed by the name of the column they produce.
+        """
+        derived = {expr.output_name: expr.evaluate(self) for expr in exprs}
+        derived.update(
+            (name, to_expr(expr).evaluate(self)) for name, expr in named.items()
+        )
+        columns = dict(self._columns)
+        columns.update(derived)
+        return self._keep_indexes(
+            Table._from_columns(
+                columns, self._projected_schema(columns), self._num_rows
+            )
+        )
+
+    def filter(self, predicate: Union[Expr, Column, Sequence[bool]]) -> "Table":
+        """
+        Returns the rows where ``predicate`` is true. Null predicate values
+        count as false.
+        When a conjunct of the expression compares an indexed column with a
+        literal, the index supplies the candidate rows and the remaining
+        conjuncts are evaluated over those rows only.
+
+        Args:
+            predicate: A boolean expression, boolean Column or sequence of bools.
+        """
+        if isinstance(predicate, Expr):
+            scan = None
+            if self._indexes:
+                # Compiling checks the predicate as a scan would (missing columns,
+                # dtypes)
+                predicate.compile(self.dtypes)
+                scan = index_scan(predicate, self._indexes)
+            if scan is not None:
+                rows, residual = scan
+                table = self.take(rows)
+                return table.filter(residual) if residual is not None else table
+            predicate = predicate.evaluate(self)
+        elif not isinstance(predicate, Column):
+            predicate = Column.from_pylist(list(predicate), DataType.BOOL)
+        if len(predicate) != self._num_rows:
+            raise ValueError(
+                f"Filter mask has {len(predicate)} rows, table has {self._num_rows}"
+            )
+        mask = mask_of(predicate)
+        kept = mask.count(1)
+        if kept == self._num_rows:
+            return self
+        columns = {name: column.filter(mask) for name, column in self._columns.items()}
+        return Table._from_columns(columns, self._schema, kept)
+
+    def _sort_columns(
+        self, by: Union[str, Sequence[str]], descending: Union[bool, Sequence[bool]]
+    ) -> Any:
+        names = [by] if isinstance(by, str) else list(by)
+        if not names:
+            raise ValueError("Sorting needs at least one key column")
+        flags = (
+            [descending] * len(names)
+            if isinstance(descending, bool)
+            else list(descending)
+        )
+        if len(flags) != len(names):
+            raise ValueError(
+                f"Got {len(flags)} descending flags for {len(names)} sort keys"
+            )
+        return [self.column(name) for name in names], flags
+
+    def take(self, indices: Sequence[int]) -> "Table":
+        """
+        Returns the rows at ``indices``, in that order.
+        """
+        columns = {name: column.take(indices) for name, column in self._columns.items()}
+        return Table._from_columns(columns, self._schema, len(indices))
+
+    def sort(
+        self,
+        by: Union[str, Sequence[str]],
+        descending: Union[bool, Sequence[bool]] = False,
+        nulls_last: bool = True,
+    ) -> "Table":
+        """
+        Returns the rows stably sorted by one or more key columns. NaN sorts
+        above every number.
+
+        Args:
+            by: Key column name(s), most significant first.
+            descending: One flag for all keys or one per key.
+            nulls_last: Place nulls after (True) or before (False) all values.
+
+        Tables whose working set exceeds the session's memory budget are
+        sorted in runs spilled to disk (see ``corepy.data.spill``).
+        """
+        columns, flags = self._sort_columns(by, descending)
+        if over_budget(self):
+            names = [by] if isinstance(by, str) else list(by)
+            spilled: Table = external_sort(self, names, flags, nulls_last)
+            return spilled
+        return self.take(sort_indices(columns, flags, nulls_last))
+
+    def top_k(
+        self,
+        k: int,
+        by: Union[str, Sequence[str]],
+        descending: Union[bool, Sequence[bool]] = True,
+        nulls_last: bool = True,
+    ) -> "Table":
+        """
+        Returns the first ``k`` rows of ``sort(by, descending)`` (by default the
+        ``k`` largest) without sorting the whole table.
+        """
+        if k < 0:
+            raise ValueError("k must be non-negative")
+        columns, flags = self._sort_columns(by, descending)
+        return self.take(top_k(columns, k, flags, nulls_last))
+
+    def to_tensor(
+        self,
+        columns: Union[str, Sequence[str], None] = None,
+        layout: str = "row",
+        dtype: Optional[DataType] = None,
+    ) -> "Tensor":
+        """
+        Converts numeric columns to a Tensor without going through Python
+        lists: a single column of the tensor dtype shares its buffer, and
+        several columns are interleaved into one buffer. See
+        ``corepy.data.tensors``.
+
+        Args:
+            columns: A column name for a 1-D tensor, or names for a 2-D one
+                     (default: all columns).
+            layout: ``"row"`` for a (rows, columns) tensor, ``"col"`` for
+                    (columns, rows).
+            dtype: Tensor dtype; by default the promotion of the columns'
+                   dtypes (as declared by the schema, if any).
+        """
+        tensor: Tensor = table_to_tensor(self, columns, layout, dtype)
+        return tensor
+
+    def lazy(self) -> "LazyTable":
+        """
+        Starts a lazy query over this table: operations are recorded and run,
+        optimized, by ``collect()``. See ``corepy.data.lazy``.
+        """
+        from .lazy import LazyTable, Scan
+
+        return LazyTable(Scan("table", self))
+
+    def group_by(self, *keys: str, workers: int = 1) -> "GroupBy":
+        """
+        Groups rows by the values of one or more key columns, e.g.
+        ``table.group_by("user").agg(col("amount").sum(), n=col("event").count())``.
+
+        Args:
+            *keys: Names of the key columns.
+            workers: Number of threads aggregating row partitions in parallel.
+        """
+        return GroupBy(self, keys, workers=workers)
+
+    def rolling(
+        self,
+        window: Union[int, float, str],
+        on: Optional[str] = None,
+        min_periods: int = 1,
+        time_unit: str = "ns",
+    ) -> "Rolling":
+        """
+        Trailing windows ending at every row, e.g.::
+
+            table.rolling("1s", on="ts").agg(
+                col("price").mean(), vol=col("price").std()
+            )
+
+        See ``corepy.data.window``.
+
+        Args:
+            window: Without ``on``, the number of rows per window. With ``on``,
+                    a duration: a number in the units of the ``on`` values or a
+                    string such as ``"500ms"`` or ``"5m"``.
+            on: Ascending time column. The window of a row at time ``t`` holds
+                the rows in ``(t - window, t]``.
+            min_periods: Fewest non-null values a window needs to produce a result.
+            time_unit: Unit of the ``on`` values, for string durations.
+        """
+        from .window import Rolling
+
+        return Rolling(
+            self, window, on=on, min_periods=min_periods, time_unit=time_unit
+        )
+
+    def window(
+        self,
+        every: Union[int, float, str],
+        period: Union[int, float, str, None] = None,
+        on: Optional[str] = None,
+        time_unit: str = "ns",
+    ) -> "Windows":
+        """
+        Tumbling (or, with a ``period`` longer than ``every``, sliding) windows
+        starting at multiples of ``every``, e.g.
+        ``table.window("1m", on="ts").agg(col("price").max())``.
+
+        Args:
+            every: Distance between window starts, in rows without ``on`` and as
+                   a duration (see ``rolling``) with it.
+            period: Window length, ``every`` by default.
+            on: Ascending time column.
+            time_unit: Unit of the ``on`` values, for string durations.
+        """
+        from .window import Windows
+
+        return Windows(self, every, period=period, on=on, time_unit=time_unit)
+
+    def ewm_mean(
+        self,
+        *columns: Union[str, Expr],
+        alpha: Optional[float] = None,
+        span: Optional[float] = None,
+        half_life: Union[int, float, str, None] = None,
+        on: Optional[str] = None,
+        by: Union[str, Sequence[str], None] = None,
+        time_unit: str = "ns",
+    ) -> "Table":
+        """
+        Exponentially weighted moving averages of ``columns``, one row per input
+        row (with the ``by`` and ``on`` columns first). See ``EwmAggregator``
+        for the parameters.
+        """
+        from .window import EwmAggregator
+
+        return EwmAggregator(columns, alpha, span, half_life, on, by, time_unit).update(
+            self
+        )
+
+    def join(
+        self,
+        other: "Table",
+        on: Union[str, Sequence[str]],
+        how: str = "inner",
+        strategy: str = "auto",
+        workers: int = 1,
+        suffix: str = "_right",
+    ) -> "Table":
+        """
+        Joins ``other`` on equal values of the key columns. Rows come out in this
+        table's order; null keys never match.
+
+        Args:
+            other: The right-hand table.
+            on: Key column name(s), present in both tables.
+            how: ``"inner"``, ``"left"`` (unmatched rows get nulls), ``"semi"``
+                 (rows with a match, left columns only) or ``"anti"`` (rows
+                 without one).
+            strategy: ``"hash"``, ``"merge"`` (inputs must be sorted by the keys)
+                      or ``"auto"``, which merges when both inputs are sorted and
+                      the right keys repeat, and hashes otherwise.
+            workers: Threads for the radix-partitioned hash join.
+            suffix: Appended to right column names that clash with left ones
+                    (repeatedly, until the name is unique).
+
+        Joins whose working set exceeds the session's memory budget spill
+        both tables in key-hash partitions and join them one pair at a time.
+        """
+        keys = [on] if isinstance(on, str) else list(on)
+        run = spill_join if over_budget(self, other) else join
+        joined: Table = run(
+            self,
+            other,
+            keys,
+            how=how,
+            strategy=strategy,
+            workers=workers,
+            suffix=suffix,
+        )
+        return joined
+
+    def agg(self, *aggs: AggExpr, **named: AggExpr) -> dict[str, Any]:
+        """
+        Computes aggregations over the whole table, e.g.
+        ``table.agg(col("price").mean(), n=col("id").count())``.
+        """
+        results = {agg.output_name: agg.evaluate(self) for agg in aggs}
+        results.update((name, agg.evaluate(self)) for name, agg in named.items())
+        return results
+
+    def _aggregate(self, func: str, names: Iterable[str]) -> dict[str, Any]:
+        return {name: getattr(self._columns[name], func)() for name in names}
+
+    def _numeric_columns(self) -> list[str]:
+        return [
+            name for name, column in self._columns.items() if column.dtype in TYPECODES
+        ]
+
+    def sum(self) -> dict[str, Any]:
+        """
+        Sum of each numeric column.
+        """
+        return self._aggregate("sum", self._numeric_columns())
+
+    def mean(self) -> dict[str, Any]:
+        """
+        Mean of each numeric column.
+        """
+        return self._aggregate("mean", self._numeric_columns())
+
+    def min(self) -> dict[str, Any]:
+        """
+        Minimum of each column (object columns are skipped).
+        """
+        return self._aggregate(
+            "min", [n for n, c in self._columns.items() if c.dtype != DataType.OBJECT]
+        )
+
+    def max(self) -> dict[str, Any]:
+        """
+        Maximum of each column (object columns are skipped).
+        """
+        return self._aggregate(
+            "max", [n for n, c in self._columns.items() if c.dtype != DataType.OBJECT]
+        )
+
+    def count(self) -> dict[str, int]:
+        """
+        Number of non-null values in each column.
+        """
+        return self._aggregate("count", self._columns)
+
+    def _projected_schema(self, columns: Mapping[str, Column]) -> Optional[Schema]:
+        """
+        Keeps the schema only while the column set and dtypes still match it.
+        """
+        if self._schema is None:
+            return None
+        fields = [field.name for field in self._schema.fields]
+        if fields != list(columns):
+            return None
+        if any(
+            self._field_dtype(self._schema, n) != c.dtype for n, c in columns.items()
+        ):
+            return None
+        return self._schema
+
+    def write_ipc(self, path: Union[str, "os.PathLike[str]"]) -> None:
+        """
+        Writes the table to ``path`` in the Arrow IPC file format, with every
+        column buffer 64-byte aligned. Load it with ``corepy.read_ipc``, which
+        maps the file instead of parsing it. Columns of dtype ``object`` have
+        no Arrow representation and raise ``TypeError``.
+        """
+        write_ipc(self, path)
+
+    def write_columnar(
+        self, path: Union[str, "os.PathLike[str]"], row_group_size: int = ROW_GROUP_SIZE
+    ) -> None:
+        """
+        Writes the table to ``path`` as a compressed columnar file: row groups
+        of ``row_group_size`` rows, each column chunk encoded with the smallest
+        of plain, frame-of-reference, delta, run-length, dictionary or bitmap
+        encoding, and min/max/null-count zone maps per chunk. Read it back with
+        ``corepy.read_columnar``, which can skip row groups and columns. The
+        table's indexes are saved with it and restored by full reads.
+        """
+        write_columnar(self, path, row_group_size)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Size of the table buffers in bytes (estimated for string/object columns).
+        """
+        return sum(column.nbytes for column in self._columns.values())
 
     def __len__(self) -> int:
-        return len(self._data)
+        return self._num_rows
 
     def __repr__(self) -> str:
         return f"Table(rows={len(self)}, schema={self._schema})"
+
+
+def concat(tables: Sequence[Table]) -> Table:
+    """
+    Concatenates tables row-wise without copying column buffers: each result
+    column is chunked over the inputs' columns (see ``Table.rechunk``). Columns
+    missing from a table are filled with nulls.
+    """
+    tables = list(tables)
+    if not tables:
+        return Table()
+    if len(tables) == 1:
+        return tables[0]
+    names: dict[str, None] = {}
+    for table in tables:
+        names.update(dict.fromkeys(table.column_names))
+    columns = {}
+    for name in names:
+        dtype = next(t.column(name).dtype for t in tables if name in t)
+        parts = []
+        for table in tables:
+            if name in table:
+                parts.append(table.column(name))
+            else:
+                parts.append(Column.from_pylist([None] * len(table), dtype))
+        columns[name] = concat_columns(parts)
+    schema = next((t.schema for t in tables if t.schema is not None), None)
+    return Table._from_columns(columns, schema, sum(len(t) for t in tables))
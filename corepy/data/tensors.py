@@ -0,0 +1,239 @@
+"""
+Conversion between Tables and Tensors.
+
+``Table.to_tensor`` turns numeric columns into a Tensor backed by a typed
+buffer (an ``array``/``memoryview``), never by Python lists:
+
+* One column whose dtype already is the tensor dtype, without nulls, is
+  shared: the tensor views the column buffer and nothing is copied.
+* Several columns become a 2-D tensor, ``(rows, columns)`` with
+  ``layout="row"`` (each row one record, the usual model input) or
+  ``(columns, rows)`` with ``layout="col"``. The output buffer is allocated
+  once and each column is copied into it with one strided slice assignment.
+
+The tensor dtype is the promotion (``promote_dtypes``) of the columns' dtypes,
+taken from the table's schema where it declares them, unless one is given
+(float columns then need a float dtype). Nulls become NaN in float tensors;
+integer and bool tensors cannot hold them.
+
+``Tensor.to_table`` goes the other way: 1-D tensors and the rows of a
+``layout="col"`` tensor become columns viewing the tensor buffer, while the
+columns of a ``layout="row"`` tensor are gathered with one strided copy each.
+"""
+import math
+from array import array
+from collections.abc import Sequence
+from itertools import compress
+from operator import not_
+from typing import Any, Optional, Union
+
+from corepy.backend.types import DataType
+
+from .column import TYPECODES, Column, typed_view
+
+LAYOUTS = ("row", "col")
+
+# Promotion order among the dtypes a tensor can hold
+_RANKS = {
+    DataType.BOOL: 0,
+    DataType.INT32: 1,
+    DataType.INT64: 2,
+    DataType.FLOAT32: 3,
+    DataType.FLOAT64: 4,
+}
+
+_FLOATS = (DataType.FLOAT32, DataType.FLOAT64)
+
+# Buffer-protocol formats (numpy included) by the dtype they hold
+_FORMATS = {
+    "d": DataType.FLOAT64,
+    "f": DataType.FLOAT32,
+    "i": DataType.INT32,
+    "B": DataType.BOOL,
+    "?": DataType.BOOL,
+}
+
+
+def promote_dtypes(dtypes: Sequence[DataType]) -> DataType:
+    """
+    The dtype a tensor holding values of all ``dtypes`` takes: the widest
+    of them, except that int64 mixed with float32 needs float64 to keep its
+    values exact.
+    """
+    for dtype in dtypes:
+        if dtype not in _RANKS:
+            raise TypeError(
+                f"A tensor cannot hold {dtype.value} values; only numeric and bool "
+                "columns convert"
+            )
+    if not dtypes:
+        raise ValueError("Need at least one column to build a tensor")
+    widest = max(dtypes, key=_RANKS.__getitem__)
+    if widest == DataType.FLOAT32 and DataType.INT64 in dtypes:
+        return DataType.FLOAT64
+    return widest
+
+
+def _buffer(column: Column, name: str, dtype: DataType) -> Any:
+    """
+    The values of ``column`` as a contiguous buffer of ``dtype``, with nulls as NaN.
+    """
+    typecode = TYPECODES[dtype]
+    values = column.values
+    if typed_view(values).format == typecode:
+        if not column.null_count:
+            return values
+        out: array[Any] = array(typecode)
+        out.frombytes(typed_view(values).cast("B"))
+    else:
+        out = array(typecode, values)
+    if column.null_count:
+        if dtype not in _FLOATS:
+            raise ValueError(
+                f"Column '{name}' has nulls, which a {dtype.value} tensor cannot hold"
+            )
+        for row in compress(range(len(column)), map(not_, column.valid_mask())):
+            out[row] = math.nan
+    return out
+
+
+def _shaped(buffer: Any, typecode: str, shape: Sequence[int]) -> Any:
+    if 0 in shape:
+        # memoryview cannot take a shape with a zero extent
+        return array(typecode)
+    return memoryview(buffer).cast("B").cast(typecode, list(shape))  # type: ignore[call-overload]
+
+
+def table_to_tensor(
+    table: Any,
+    columns: Union[str, Sequence[str], None] = None,
+    layout: str = "row",
+    dtype: Optional[DataType] = None,
+) -> Any:
+    """
+    Converts columns of ``table`` to a Tensor. See ``Table.to_tensor``.
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout '{layout}'. Expected one of {LAYOUTS}")
+    names = (
+        list(table.column_names)
+        if columns is None
+        else [columns]
+        if isinstance(columns, str)
+        else list(columns)
+    )
+    selected = [table.column(name) for name in names]
+    declared = [
+        table._field_dtype(table.schema, name) or column.dtype
+        for name, column in zip(names, selected)
+    ]
+    promoted = promote_dtypes(declared)
+    if dtype is None:
+        dtype = promoted
+    elif promote_dtypes([dtype]) not in _FLOATS and promoted in _FLOATS:
+        # Narrowing float64 to float32 is fine for model inputs; dropping fractions is
+        # not
+        raise TypeError(
+            f"Cannot convert {promoted.value} columns to a {dtype.value} tensor"
+        )
+    typecode = TYPECODES[dtype]
+    rows, width = len(table), len(names)
+
+    buffers = [_buffer(column, name, dtype) for name, column in zip(names, selected)]
+    if isinstance(columns, str):
+        return _tensor(buffers[0], typecode, (rows,), dtype)
+    if width == 1:
+        shape = (rows, 1) if layout == "row" else (1, rows)
+        return _tensor(buffers[0], typecode, shape, dtype)
+
+    out = array(typecode, bytes(rows * width * memoryview(buffers[0]).itemsize))
+    for position, buffer in enumerate(buffers):
+        source = (
+            buffer
+            if isinstance(buffer, array)
+            else array(typecode, memoryview(buffer).cast("B").tobytes())
+        )
+        if layout == "row":
+            out[position::width] = source
+        else:
+            out[position * rows:(position + 1) * rows] = source
+    return _tensor(
+        out, typecode, (rows, width) if layout == "row" else (width, rows), dtype
+    )
+
+
+def _tensor(buffer: Any, typecode: str, shape: Sequence[int], dtype: DataType) -> Any:
+    from corepy.tensor import Tensor
+
+    tensor = Tensor(_shaped(buffer, typecode, shape), dtype=dtype)
+    tensor._shape = tuple(shape)
+    return tensor
+
+
+def _format_dtype(view: memoryview) -> Optional[DataType]:
+    """
+    The dtype of a buffer's element format, or None for formats tables cannot hold.
+    """
+    if view.format in _FORMATS:
+        return _FORMATS[view.format]
+    if view.format in ("q", "l") and view.itemsize == 8:
+        return DataType.INT64
+    return None
+
+
+def _flat(data: Any, dtype: DataType) -> Any:
+    """
+    A 1-D typed view of a tensor's backing data, and the dtype it holds.
+    """
+    if isinstance(data, (list, tuple)):
+        column = Column.from_pylist(list(data), dtype)
+        return column.values, column.dtype
+    view = memoryview(data)
+    held = _format_dtype(view)
+    if held is None:
+        raise TypeError(
+            f"Cannot convert a tensor of buffer format '{view.format}' to a table"
+        )
+    if not view.c_contiguous:
+        view = memoryview(view.tobytes())
+    return view.cast("B").cast(TYPECODES[held]), held  # type: ignore[call-overload]
+
+
+def tensor_to_table(
+    tensor: Any, names: Union[str, Sequence[str], None] = None, layout: str = "row"
+) -> Any:
+    """
+    Converts a 1-D or 2-D Tensor to a Table. See ``Tensor.to_table``.
+    """
+    from .table import Table
+
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout '{layout}'. Expected one of {LAYOUTS}")
+    shape = tuple(tensor.shape)
+    if len(shape) > 2:
+        raise ValueError(
+            f"Only 1-D and 2-D tensors convert to tables, got shape {shape}"
+        )
+    flat, dtype = _flat(tensor._backing_data, tensor.dtype)
+    if len(shape) == 1:
+        rows, width = len(flat), 1
+    else:
+        rows, width = shape if layout == "row" else shape[::-1]
+    if names is None:
+        names = [f"column_{i}" for i in range(width)]
+    elif isinstance(names, str):
+        names = [names]
+    if len(names) != width:
+        raise ValueError(f"Got {len(names)} names for a tensor with {width} columns")
+
+    typecode = TYPECODES[dtype]
+    columns: dict[str, Column] = {}
+    for position, name in enumerate(names):
+        if width == 1:
+            values: Any = flat
+        elif layout == "col":
+            values = flat[position * rows:(position + 1) * rows]
+        else:
+            values = array(typecode, flat[position::width].tobytes())
+        columns[name] = Column(dtype, values)
+    return Table._from_columns(columns, None, rows)
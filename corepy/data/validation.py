@@ -0,0 +1,199 @@
+"""
+Bulk validation of Tables against a Schema.
+
+``compile_schema`` turns a Schema into one check per field: dtype
+conformance, nullability, and the ``min``/``max``/``enum`` constraints of the
+field metadata. Constraints become expressions, compiled once and evaluated
+over whole column buffers by the vectorized kernels; bounds are first tested
+against the column's min/max reductions and enums against its distinct
+values, so conforming columns never build a per-row mask. Violations are
+reported in bulk, with a count and the first offending rows for each rule.
+"""
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Optional
+
+from corepy.backend.types import DataType
+from corepy.schema import Schema
+
+from .column import Column, resolve_dtype
+from .expr import Expr, col, mask_of
+
+MAX_REPORTED_ROWS = 10
+
+# Dtypes that satisfy a field of the same logical type
+_EQUIVALENT = {
+    DataType.STRING: DataType.CATEGORICAL,
+    DataType.CATEGORICAL: DataType.STRING,
+}
+_INVERT = bytes.maketrans(b"\0\1", b"\1\0")
+
+
+@dataclass
+class Violation:
+    """
+    One rule broken by one column: how many rows break it and the first few of them.
+    """
+    column: str
+    rule: str
+    count: int
+    rows: list[int] = field(default_factory=list)
+    detail: str = ""
+
+    def __str__(self) -> str:
+        rows = ""
+        if self.rows:
+            more = ", ..." if self.count > len(self.rows) else ""
+            rows = f" (rows {', '.join(map(str, self.rows))}{more})"
+        return f"'{self.column}': {self.detail}{rows}"
+
+
+class SchemaValidationError(ValueError):
+    """
+    Raised when a Table does not match its schema; ``violations`` lists every
+    broken rule.
+    """
+    def __init__(self, violations: list[Violation]):
+        self.violations = violations
+        super().__init__(
+            "Table does not match its schema: " + "; ".join(map(str, violations))
+        )
+
+
+def _offending_rows(mask: bytes) -> tuple[int, list[int]]:
+    """
+    Counts the 1s of a 0/1 byte mask and returns the positions of the first few.
+    """
+    count = mask.count(1)
+    rows: list[int] = []
+    at = mask.find(1)
+    while at >= 0 and len(rows) < MAX_REPORTED_ROWS:
+        rows.append(at)
+        at = mask.find(1, at + 1)
+    return count, rows
+
+
+class _FieldCheck:
+    """
+    The compiled checks of one schema field.
+    """
+    def __init__(self, name: str, dtype: DataType, metadata: dict[str, Any]):
+        self.name = name
+        self.dtype = dtype
+        self.nullable = bool(metadata.get("nullable", True))
+        self.min = metadata.get("min")
+        self.max = metadata.get("max")
+        enum = metadata.get("enum")
+        self.enum = frozenset(enum) if enum is not None else None
+        ref = col(name)
+        self.below: Optional[Expr] = ref < self.min if self.min is not None else None
+        self.above: Optional[Expr] = ref > self.max if self.max is not None else None
+        self.outside: Optional[Expr] = (
+            ~ref.isin(self.enum) if self.enum is not None else None
+        )
+
+    def _rule(
+        self, table: Any, rule: str, predicate: Expr, detail: str
+    ) -> list[Violation]:
+        count, rows = _offending_rows(mask_of(predicate.evaluate(table)))
+        return (
+            [Violation(self.name, rule, count, rows, f"{count} {detail}")]
+            if count
+            else []
+        )
+
+    def check(self, table: Any, column: Column) -> list[Violation]:
+        if column.dtype != self.dtype and _EQUIVALENT.get(column.dtype) != self.dtype:
+            detail = (
+                f"dtype is {column.dtype.value}, schema requires {self.dtype.value}"
+            )
+            return [Violation(self.name, "dtype", len(column), [], detail)]
+        violations = []
+        if not self.nullable and column.null_count:
+            count, rows = _offending_rows(column.valid_mask().translate(_INVERT))
+            violations.append(
+                Violation(
+                    self.name,
+                    "nullable",
+                    count,
+                    rows,
+                    f"{count} null values in a non-nullable field",
+                )
+            )
+        if column.null_count == len(column):
+            return violations
+        # A column inside its bounds needs no per-row pass (a NaN extreme proves
+        # nothing)
+        if self.below is not None and not column.min() >= self.min:
+            violations += self._rule(
+                table, "min", self.below, f"values below min {self.min!r}"
+            )
+        if self.above is not None and not column.max() <= self.max:
+            violations += self._rule(
+                table, "max", self.above, f"values above max {self.max!r}"
+            )
+        enum = self.enum
+        if self.outside is not None and enum is not None and not enum.issuperset(
+            column.dictionary
+            if column.dictionary is not None
+            else column._valid_values()
+        ):
+            violations += self._rule(
+                table, "enum", self.outside, "values outside the allowed set"
+            )
+        return violations
+
+
+class CompiledSchema:
+    """
+    A Schema compiled into column checks. Create with ``compile_schema``.
+    """
+    def __init__(self, schema: Schema):
+        """
+        Compile the checks of every field of ``schema``.
+
+        Args:
+            schema: The schema to enforce.
+        """
+        self.checks = [
+            _FieldCheck(f.name, resolve_dtype(f.dtype), f.metadata)
+            for f in schema.fields
+        ]
+
+    def validate(self, table: Any) -> list[Violation]:
+        """
+        Runs every check over ``table`` and returns all violations (empty when
+        it conforms).
+        """
+        violations: list[Violation] = []
+        names = set(table.column_names)
+        for check in self.checks:
+            if check.name not in names:
+                violations.append(
+                    Violation(
+                        check.name, "missing", len(table), [], "column is missing"
+                    )
+                )
+                continue
+            violations += check.check(table, table.column(check.name))
+        return violations
+
+    def check(self, table: Any) -> None:
+        """
+        Raises ``SchemaValidationError`` listing every violation, if there are any.
+        """
+        violations = self.validate(table)
+        if violations:
+            raise SchemaValidationError(violations)
+
+
+@lru_cache(maxsize=64)
+def _compile(schema_json: str) -> CompiledSchema:
+    return CompiledSchema(Schema.model_validate_json(schema_json))
+
+
+def compile_schema(schema: Schema) -> CompiledSchema:
+    """
+    Returns the compiled checks of ``schema``, reusing them for equal schemas.
+    """
+    return _compile(schema.model_dump_json())
@@ -0,0 +1,936 @@
+"""
+Windowed aggregations over ordered Tables.
+
+* **Rolling** windows trail every row: the last ``window`` rows or, with an
+  ``on`` column, the rows whose ``on`` value lies in ``(t - window, t]``.
+* **Tumbling / sliding** windows cover ``[k * every, k * every + period)`` of
+  the ``on`` values (or of the row numbers), one result row per non-empty
+  window. ``period`` defaults to ``every`` (tumbling); a longer period makes
+  windows overlap.
+* **EWMA**: exponentially weighted moving averages, decaying per row or, with
+  a half-life and an ``on`` column, per elapsed time.
+
+Window bounds only move forward, so every aggregation keeps a running state
+that each row enters and leaves once: compensated running sums for
+sum/mean/std/var, monotonic deques for min/max and per-value counts for
+count_distinct. The state lives across batches: ``RollingAggregator``,
+``WindowAggregator`` and ``EwmAggregator`` consume a stream of batches and
+return the results of each as it arrives, keeping only the rows that open
+windows still need. ``Table.rolling``, ``Table.window`` and
+``Table.ewm_mean`` run them over a single table.
+"""
+import math
+import operator
+from bisect import bisect_left, bisect_right
+from collections import deque
+from collections.abc import Mapping, Sequence
+from fractions import Fraction
+from functools import partial
+from itertools import islice, repeat
+from typing import Any, Optional, Union
+
+from corepy.backend.types import DataType
+
+from .column import TYPECODES, Column, _shared_nan, key_values
+from .expr import AggExpr, Expr, to_expr
+from .groupby import _output_dtype
+from .table import Table, concat
+
+# Nanoseconds per duration unit
+_UNITS = {
+    "ns": 1,
+    "us": 1_000,
+    "ms": 1_000_000,
+    "s": 10**9,
+    "m": 60 * 10**9,
+    "h": 3_600 * 10**9,
+    "d": 86_400 * 10**9,
+}
+
+_FLOATS = (DataType.FLOAT32, DataType.FLOAT64)
+
+# Aggregations with an incremental window implementation (sketches have none)
+_WINDOW_FUNCTIONS = (
+    "sum",
+    "mean",
+    "std",
+    "var",
+    "min",
+    "max",
+    "count",
+    "count_distinct",
+    "first",
+    "last",
+)
+
+_present = partial(operator.is_not, None)
+
+Duration = Union[int, float, str]
+Aggregations = Union[Sequence[AggExpr], Mapping[str, AggExpr]]
+
+
+def parse_duration(duration: Duration, time_unit: str = "ns") -> Union[int, float]:
+    """
+    Converts a duration such as ``"250ms"``, ``"1.5s"`` or ``"5m"`` (units ns,
+    us, ms, s, m, h, d) into ``time_unit`` units. Numbers are returned as is.
+    """
+    if time_unit not in _UNITS:
+        raise ValueError(
+            f"Unknown time unit '{time_unit}'. Expected one of {tuple(_UNITS)}"
+        )
+    if not isinstance(duration, str):
+        return duration
+    text = duration.strip()
+    unit = next(
+        (u for u in ("ns", "us", "ms", "s", "m", "h", "d") if text.endswith(u)), None
+    )
+    try:
+        amount = Fraction(text[:-len(unit)].strip()) if unit else None
+    except ValueError:
+        amount = None
+    if unit is None or amount is None or amount <= 0:
+        raise ValueError(
+            f"Invalid duration '{duration}'. Expected a positive amount and a unit, "
+            "e.g. '500ms' or '5m'"
+        )
+    value = amount * _UNITS[unit] / _UNITS[time_unit]
+    return int(value) if value.denominator == 1 else float(value)
+
+
+def _aggregation_specs(aggs: Aggregations) -> list[tuple[str, AggExpr]]:
+    if isinstance(aggs, Mapping):
+        return list(aggs.items())
+    return [(agg.output_name, agg) for agg in aggs]
+
+
+class _RunningSum:
+    """
+    A sum that values enter and leave. Float sums carry a Neumaier
+    compensation term, so long streams don't drift. NaN and infinities are
+    counted instead of added (``add_special``): once added, they could never
+    be subtracted out of the total again.
+    """
+    __slots__ = ("total", "compensation", "exact", "nans", "infs", "neg_infs")
+
+    def __init__(self, exact: bool):
+        self.exact = exact
+        self.total: Any = 0
+        self.compensation = 0.0
+        self.nans = self.infs = self.neg_infs = 0
+
+    def add_special(self, value: float, sign: int) -> None:
+        """
+        Counts a NaN or infinite ``value`` entering (sign 1) or leaving (-1).
+        """
+        if value != value:
+            self.nans += sign
+        elif value > 0:
+            self.infs += sign
+        else:
+            self.neg_infs += sign
+
+    @property
+    def finite(self) -> bool:
+        return not (self.nans or self.infs or self.neg_infs)
+
+    def add(self, value: Any) -> None:
+        if self.exact:
+            self.total += value
+            return
+        total = self.total + value
+        if abs(self.total) >= abs(value):
+            self.compensation += (self.total - total) + value
+        else:
+            self.compensation += (value - total) + self.total
+        self.total = total
+
+    @property
+    def value(self) -> Any:
+        if self.exact:
+            return self.total
+        if not self.finite:
+            if self.nans or (self.infs and self.neg_infs):
+                return math.nan
+            return math.inf if self.infs else -math.inf
+        return self.total + self.compensation
+
+
+class _WindowAggregation:
+    """
+    Running state of one aggregation over a window that only moves forward.
+    ``slide`` walks the window through global row ranges ``[lo, hi)``, adding
+    the rows that enter and removing the rows that leave, and returns one
+    result per range.
+    """
+    def __init__(self, func: str, dtype: DataType, min_periods: int):
+        self.func = func
+        self.dtype = _output_dtype(func, dtype)
+        self.min_periods = min_periods
+        self.lo = self.hi = 0
+        self.n = 0
+        self._reset()
+
+    def _reset(self) -> None:
+        pass
+
+    def _add(self, rows: list[Any], start: int) -> None:
+        pass
+
+    def _remove(self, rows: list[Any], start: int) -> None:
+        pass
+
+    def _value(self, values: list[Any], base: int) -> Any:
+        raise NotImplementedError
+
+    def slide(
+        self, values: list[Any], base: int, bounds: Sequence[tuple[int, int]]
+    ) -> list[Any]:
+        """
+        Returns the aggregate of each ``[lo, hi)`` in ``bounds``. ``values``
+        holds the rows from global row ``base`` on, with None for nulls.
+        """
+        out: list[Any] = []
+        for lo, hi in bounds:
+            if lo >= self.hi:
+                # Disjoint from the previous window: start over
+                self.n = 0
+                self._reset()
+                self.lo = self.hi = lo
+            if hi > self.hi:
+                rows = values[self.hi - base:hi - base]
+                self.n += len(rows) - rows.count(None)
+                self._add(rows, self.hi)
+                self.hi = hi
+            if lo > self.lo:
+                rows = values[self.lo - base:lo - base]
+                self.n -= len(rows) - rows.count(None)
+                self._remove(rows, self.lo)
+                self.lo = lo
+            if self.n < self.min_periods and self.func != "count":
+                out.append(None)
+            else:
+                out.append(self._value(values, base))
+        return out
+
+    def finalize(self, results: list[Any]) -> Column:
+        return Column.from_pylist(results, self.dtype)
+
+
+class _Moments(_WindowAggregation):
+    """
+    sum, mean, count, std and var. These keep sums of the values minus the first
+    value seen, which avoids cancellation when values sit far from zero.
+    """
+    def __init__(self, func: str, dtype: DataType, min_periods: int):
+        self.exact = dtype not in _FLOATS
+        super().__init__(func, dtype, min_periods)
+
+    def _reset(self) -> None:
+        self.sum = _RunningSum(self.exact)
+        self.squares = _RunningSum(self.exact)
+        self.shift: Any = None
+
+    def _update(self, rows: list[Any], sign: int) -> None:
+        func = self.func
+        if func == "count":
+            return
+        if len(rows) == 1:
+            # Rolling windows move one row at a time
+            value = rows[0]
+            if value is None:
+                return
+            if not self.exact and not math.isfinite(value):
+                self.sum.add_special(value, sign)
+                return
+            if func in ("std", "var"):
+                if self.shift is None:
+                    self.shift = value
+                value -= self.shift
+                self.squares.add(sign * value * value)
+            self.sum.add(sign * value)
+            return
+        present = list(filter(_present, rows))
+        if not self.exact:
+            finite = list(filter(math.isfinite, present))
+            if len(finite) < len(present):
+                for value in present:
+                    if not math.isfinite(value):
+                        self.sum.add_special(value, sign)
+                present = finite
+        if func not in ("std", "var"):
+            total = sum(present) if self.exact else math.fsum(present)
+            self.sum.add(sign * total)
+            return
+        if not present:
+            return
+        if self.shift is None:
+            self.shift = present[0]
+        shifted = list(map(operator.sub, present, repeat(self.shift)))
+        total = sum if self.exact else math.fsum
+        self.sum.add(sign * total(shifted))
+        self.squares.add(sign * total(map(operator.mul, shifted, shifted)))
+
+    def _add(self, rows: list[Any], start: int) -> None:
+        self._update(rows, 1)
+
+    def _remove(self, rows: list[Any], start: int) -> None:
+        self._update(rows, -1)
+
+    def _value(self, values: list[Any], base: int) -> Any:
+        n = self.n
+        if self.func == "count":
+            return n
+        if self.func == "sum":
+            return self.sum.value
+        if self.func == "mean":
+            return self.sum.value / n if n else None
+        if n < 2:
+            return None
+        if not self.sum.finite:
+            return math.nan
+        total = self.sum.value
+        variance = max(self.squares.value - total * total / n, 0) / (n - 1)
+        return math.sqrt(variance) if self.func == "std" else variance
+
+
+class _Extreme(_WindowAggregation):
+    """
+    min or max through a monotonic deque of (row, value): each row is pushed
+    and popped at most once. NaN compares with nothing, so it is counted
+    instead of pushed (it would evict every candidate) and is the result only
+    when the window holds nothing else, as for the min/max kernels.
+    """
+    def _reset(self) -> None:
+        self.window: deque[tuple[int, Any]] = deque()
+        # The deque keeps values strictly better than every later one
+        self.dominates = operator.lt if self.func == "min" else operator.gt
+        self.nans = 0
+
+    def _add(self, rows: list[Any], start: int) -> None:
+        window, dominates = self.window, self.dominates
+        for row, value in enumerate(rows, start):
+            if value is None:
+                continue
+            if value != value:
+                self.nans += 1
+                continue
+            while window and not dominates(window[-1][1], value):
+                window.pop()
+            window.append((row, value))
+
+    def _remove(self, rows: list[Any], start: int) -> None:
+        window, end = self.window, start + len(rows)
+        while window and window[0][0] < end:
+            window.popleft()
+        if self.nans:
+            self.nans -= sum(1 for value in filter(_present, rows) if value != value)
+
+    def _value(self, values: list[Any], base: int) -> Any:
+        if self.window:
+            return self.window[0][1]
+        return math.nan if self.nans else None
+
+
+class _Ends(_WindowAggregation):
+    """
+    first or last: the value of the window's first or last row, as is.
+    """
+    def _value(self, values: list[Any], base: int) -> Any:
+        return values[(self.lo if self.func == "first" else self.hi - 1) - base]
+
+
+class _Distinct(_WindowAggregation):
+    """
+    count_distinct through per-value counts, with every NaN as one value.
+    """
+    def _reset(self) -> None:
+        self.counts: dict[Any, int] = {}
+
+    def _add(self, rows: list[Any], start: int) -> None:
+        counts = self.counts
+        for value in map(_shared_nan, filter(_present, rows)):
+            counts[value] = counts.get(value, 0) + 1
+
+    def _remove(self, rows: list[Any], start: int) -> None:
+        counts = self.counts
+        for value in map(_shared_nan, filter(_present, rows)):
+            left = counts[value] - 1
+            if left:
+                counts[value] = left
+            else:
+                del counts[value]
+
+    def _value(self, values: list[Any], base: int) -> Any:
+        return len(self.counts)
+
+
+def _window_aggregation(
+    func: str, column: Column, min_periods: int
+) -> _WindowAggregation:
+    dtype = column.dtype
+    if func not in _WINDOW_FUNCTIONS:
+        raise ValueError(
+            f"Aggregation '{func}' is not supported over windows. Expected one of "
+            f"{_WINDOW_FUNCTIONS}"
+        )
+    if func in ("sum", "mean", "std", "var") and dtype not in TYPECODES:
+        raise TypeError(f"Cannot compute {func} of a {dtype.value} column")
+    if func in ("min", "max") and dtype == DataType.OBJECT:
+        raise TypeError(f"Cannot compute {func} of an object column")
+    if func in ("min", "max"):
+        return _Extreme(func, dtype, min_periods)
+    if func in ("first", "last"):
+        return _Ends(func, dtype, min_periods)
+    if func == "count_distinct":
+        return _Distinct(func, dtype, min_periods)
+    return _Moments(func, dtype, min_periods)
+
+
+def _is_sorted(values: Sequence[Any]) -> bool:
+    return all(map(operator.le, values, islice(values, 1, None)))
+
+
+class _State:
+    """
+    The rows of one stream (or one key of a grouped stream) that windows may
+    still need, from global row ``base`` on: their ``on`` values and the
+    evaluated aggregation inputs.
+    """
+    def __init__(
+        self, on: Optional[str], specs: list[tuple[str, AggExpr]], min_periods: int
+    ):
+        self.on = on
+        self.specs = specs
+        self.min_periods = min_periods
+        self.base = 0
+        self.size = 0
+        self.times: list[Any] = []
+        self.values: list[list[Any]] = [[] for _ in specs]
+        self.aggs: Optional[list[_WindowAggregation]] = None
+
+    def append(self, batch: Any) -> None:
+        if self.on is not None:
+            column = batch.column(self.on)
+            if column.null_count:
+                raise ValueError(f"Window column '{self.on}' contains nulls")
+            times = column.to_pylist()
+            if not _is_sorted(self.times[-1:] + times):
+                raise ValueError(
+                    f"Window column '{self.on}' must be sorted in ascending order"
+                )
+            self.times += times
+        columns = [agg.operand.evaluate(batch) for _, agg in self.specs]
+        if self.aggs is None:
+            self.aggs = [
+                _window_aggregation(agg.func, c, self.min_periods)
+                for (_, agg), c in zip(self.specs, columns)
+            ]
+        for values, column in zip(self.values, columns):
+            values += column.to_pylist()
+        self.size += len(batch)
+
+    def time(self, row: int) -> Any:
+        return self.times[row - self.base] if self.on is not None else row
+
+    def search(self, value: Any) -> int:
+        """
+        Global position of the first buffered row whose time is at least ``value``.
+        """
+        position: int
+        if self.on is None:
+            position = min(max(math.ceil(value), self.base), self.size)
+        else:
+            position = self.base + bisect_left(self.times, value)
+        return position
+
+    def aggregate(self, bounds: Sequence[tuple[int, int]]) -> dict[str, Column]:
+        assert self.aggs is not None
+        columns = {
+            name: agg.finalize(agg.slide(values, self.base, bounds))
+            for (name, _), agg, values in zip(self.specs, self.aggs, self.values)
+        }
+        if bounds:
+            self.trim(bounds[-1][0])
+        return columns
+
+    def trim(self, lo: int) -> None:
+        """
+        Drops the rows before global row ``lo`` once they make up half the buffer.
+        """
+        dead = lo - self.base
+        if dead > 0 and 2 * dead >= self.size - self.base:
+            del self.times[:dead]
+            for values in self.values:
+                del values[:dead]
+            self.base = lo
+
+
+class _RollingState(_State):
+    def __init__(
+        self,
+        window: Union[int, float],
+        on: Optional[str],
+        specs: list[tuple[str, AggExpr]],
+        min_periods: int,
+    ):
+        super().__init__(on, specs, min_periods)
+        self.window = window
+
+    def update(self, batch: Any, final: bool = False) -> dict[str, Column]:
+        start = self.size
+        self.append(batch)
+        ends = range(start + 1, self.size + 1)
+        if self.on is None:
+            starts: Any = (max(end - self.window, 0) for end in ends)
+        else:
+            # (t - window, t]: skip the rows at or before t - window
+            cutoffs = map(
+                operator.sub,
+                islice(self.times, start - self.base, None),
+                repeat(self.window),
+            )
+            starts = map(
+                operator.add,
+                map(partial(bisect_right, self.times), cutoffs),
+                repeat(self.base),
+            )
+        columns = {self.on: batch.column(self.on)} if self.on is not None else {}
+        columns.update(self.aggregate(list(zip(starts, ends))))
+        return columns
+
+
+class _WindowState(_State):
+    def __init__(
+        self,
+        every: Union[int, float],
+        period: Union[int, float],
+        on: Optional[str],
+        specs: list[tuple[str, AggExpr]],
+    ):
+        super().__init__(on, specs, 1)
+        self.every = every
+        self.period = period
+        self.next: Optional[int] = None
+
+    def update(self, batch: Any, final: bool = False) -> dict[str, Column]:
+        self.append(batch)
+        return self.emit(final)
+
+    def emit(self, final: bool) -> dict[str, Column]:
+        """
+        Aggregates the windows that no later row can fall in (all of them when
+        ``final``).
+        """
+        every, period = self.every, self.period
+        bounds: list[tuple[int, int]] = []
+        starts: list[Any] = []
+        k = self.next
+        while True:
+            first = self.base if k is None else self.search(k * every)
+            if first >= self.size:
+                break
+            # Jump over empty windows to the first one holding row `first`
+            earliest = int((self.time(first) - period) // every) + 1
+            k = earliest if k is None else max(k, earliest)
+            start = k * every
+            end = start + period
+            closed = end <= self.size if self.on is None else end <= self.times[-1]
+            if not (closed or final):
+                break
+            lo, hi = self.search(start), self.search(end)
+            if lo < hi:
+                bounds.append((lo, hi))
+                starts.append(start)
+            k += 1
+        self.next = k
+        if self.aggs is None:
+            return {}
+        integral = isinstance(every, int) and isinstance(self.time(self.base), int)
+        columns = {
+            self.on or "row": Column.from_pylist(
+                starts, DataType.INT64 if integral else DataType.FLOAT64
+            )
+        }
+        columns.update(self.aggregate(bounds))
+        return columns
+
+
+class _EwmState:
+    def __init__(
+        self,
+        exprs: list[tuple[str, Expr]],
+        alpha: Optional[float],
+        half_life: Optional[Union[int, float]],
+        on: Optional[str],
+    ):
+        self.exprs = exprs
+        self.alpha = alpha
+        self.half_life = half_life
+        self.on = on
+        # Per expression: the current average and the time of its last observation
+        self.averages: list[Optional[float]] = [None] * len(exprs)
+        self.times: list[Any] = [None] * len(exprs)
+        self.last: list[Any] = []
+
+    def update(self, batch: Any, final: bool = False) -> dict[str, Column]:
+        times: Optional[list[Any]] = None
+        columns: dict[str, Column] = {}
+        if self.on is not None:
+            column = batch.column(self.on)
+            if column.null_count:
+                raise ValueError(f"Window column '{self.on}' contains nulls")
+            times = column.to_pylist()
+            if not _is_sorted(self.last + times):
+                raise ValueError(
+                    f"Window column '{self.on}' must be sorted in ascending order"
+                )
+            self.last = times[-1:] or self.last
+            columns[self.on] = column
+        for i, (name, expr) in enumerate(self.exprs):
+            column = expr.evaluate(batch)
+            if column.typecode is None:
+                raise TypeError(
+                    f"Cannot compute ewm_mean of a {column.dtype.value} column"
+                )
+            average, seen = self.averages[i], self.times[i]
+            keep = 1.0 - self.alpha if self.alpha is not None else 0.0
+            # Half-life decay only runs on a time column
+            stamps = times if times is not None else []
+            out = []
+            for row, value in enumerate(column.to_pylist()):
+                if value is not None:
+                    if average is None:
+                        average = value
+                    else:
+                        if self.alpha is None:
+                            # Weight of the old average halves every half-life
+                            keep = 0.5 ** ((stamps[row] - seen) / self.half_life)
+                        average = value + keep * (average - value)
+                    if times is not None:
+                        seen = times[row]
+                out.append(average)
+            self.averages[i], self.times[i] = average, seen
+            columns[name] = Column.from_pylist(out, DataType.FLOAT64)
+        return columns
+
+
+class _Streaming:
+    """
+    Routes the rows of each batch to the state of their ``by`` key (one shared
+    state without keys) and assembles the results, keys first.
+    """
+    # Whether results line up with input rows (rolling, EWMA) or are one row per window
+    ALIGNED = True
+
+    def __init__(self, on: Optional[str], by: Union[str, Sequence[str], None]):
+        self.on = on
+        self.by = [by] if isinstance(by, str) else list(by or ())
+        self._states: dict[Any, Any] = {}
+        self._keys: dict[Any, Table] = {}
+
+    def _new_state(self) -> Any:
+        raise NotImplementedError
+
+    def _state(self, key: Any, batch: Any) -> Any:
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = self._new_state()
+            if self.by:
+                self._keys[key] = batch.select(*self.by).slice(0, 1)
+        return state
+
+    def _result(self, key: Any, columns: dict[str, Column], batch: Any) -> Table:
+        if not self.by:
+            return Table._from_columns(columns)
+        if self.ALIGNED:
+            keys = {name: batch.column(name) for name in self.by}
+        else:
+            rows = len(next(iter(columns.values()))) if columns else 0
+            keys = {
+                name: column.take([0] * rows)
+                for name, column in self._keys[key]._columns.items()
+            }
+        return Table._from_columns({**keys, **columns})
+
+    def update(self, batch: Any) -> Table:
+        """
+        Feeds the next batch of the stream (sorted by ``on`` within each key)
+        and returns the results it completes.
+        """
+        return self._feed(batch, final=False)
+
+    def _feed(self, batch: Any, final: bool) -> Table:
+        if not self.by:
+            return self._result(
+                None, self._state(None, batch).update(batch, final), batch
+            )
+        values = [key_values(batch.column(name)) for name in self.by]
+        keys = values[0] if len(values) == 1 else list(zip(*values))
+        groups: dict[Any, list[int]] = {}
+        for row, key in enumerate(keys):
+            groups.setdefault(key, []).append(row)
+        parts = []
+        for key, rows in groups.items():
+            part = batch if len(groups) == 1 else batch.take(rows)
+            parts.append(
+                self._result(key, self._state(key, part).update(part, final), part)
+            )
+        result = concat(parts)
+        if self.ALIGNED and len(groups) > 1:
+            # Back to input row order
+            order = [row for rows in groups.values() for row in rows]
+            result = result.take(sorted(range(len(order)), key=order.__getitem__))
+        return result
+
+
+class RollingAggregator(_Streaming):
+    """
+    Rolling (trailing) window aggregations over a stream of batches. Each
+    ``update`` returns one result row per input row; the window state carries
+    over from the previous batches.
+    """
+    def __init__(
+        self,
+        window: Duration,
+        aggs: Aggregations,
+        on: Optional[str] = None,
+        by: Union[str, Sequence[str], None] = None,
+        min_periods: int = 1,
+        time_unit: str = "ns",
+    ):
+        """
+        Initialize a RollingAggregator.
+
+        Args:
+            window: Without ``on``, the number of rows per window. With ``on``,
+                    a duration: a number in the units of the ``on`` values or a
+                    string such as ``"500ms"`` or ``"5m"``.
+            aggs: Aggregations, named by their ``output_name`` or keyed by the
+                  name of the column they produce.
+            on: Column holding the (ascending) time of each row. The window of
+                a row at time ``t`` holds the rows in ``(t - window, t]``.
+            by: Key column(s); each key has its own windows.
+            min_periods: Fewest non-null values a window needs to produce a
+                         result; smaller windows produce null (count excepted).
+            time_unit: Unit of the ``on`` values, for string durations.
+        """
+        super().__init__(on, by)
+        self.window = parse_duration(window, time_unit)
+        if on is None and (
+            isinstance(window, str) or not float(self.window).is_integer()
+        ):
+            raise ValueError(
+                "A duration window needs an `on` column; without one, window is a row "
+                "count"
+            )
+        if self.window <= 0:
+            raise ValueError("window must be positive")
+        if min_periods < 0:
+            raise ValueError("min_periods must not be negative")
+        self.specs = _aggregation_specs(aggs)
+        self.min_periods = min_periods
+
+    def _new_state(self) -> _RollingState:
+        return _RollingState(
+            self.window if self.on is not None else int(self.window),
+            self.on,
+            self.specs,
+            self.min_periods,
+        )
+
+
+class WindowAggregator(_Streaming):
+    """
+    Tumbling or sliding window aggregations over a stream of batches. Each
+    ``update`` returns the windows the batch closes (those no later row can
+    fall in); ``flush`` returns the rest at the end of the stream. Result rows
+    hold the window start (in column ``on``, or ``row`` for row windows)
+    followed by the aggregations.
+    """
+    ALIGNED = False
+
+    def __init__(
+        self,
+        every: Duration,
+        aggs: Aggregations,
+        period: Optional[Duration] = None,
+        on: Optional[str] = None,
+        by: Union[str, Sequence[str], None] = None,
+        time_unit: str = "ns",
+    ):
+        """
+        Initialize a WindowAggregator.
+
+        Args:
+            every: Distance between window starts: a number of rows without
+                   ``on``, else a duration (a number in ``on`` units or a string
+                   such as ``"1m"``). Windows start at multiples of ``every``.
+            aggs: Aggregations, named by their ``output_name`` or keyed by the
+                  name of the column they produce.
+            period: Window length, ``every`` by default (tumbling windows).
+            on: Column holding the (ascending) time of each row.
+            by: Key column(s); each key has its own windows.
+            time_unit: Unit of the ``on`` values, for string durations.
+        """
+        super().__init__(on, by)
+        self.every = parse_duration(every, time_unit)
+        self.period = (
+            parse_duration(period, time_unit) if period is not None else self.every
+        )
+        if self.every <= 0 or self.period <= 0:
+            raise ValueError("every and period must be positive")
+        if on is None and any(isinstance(d, str) for d in (every, period)):
+            raise ValueError(
+                "A duration window needs an `on` column; without one, every and period "
+                "are row counts"
+            )
+        self.specs = _aggregation_specs(aggs)
+
+    def _new_state(self) -> _WindowState:
+        return _WindowState(self.every, self.period, self.on, self.specs)
+
+    def flush(self) -> Table:
+        """
+        Returns the windows still open, ending the stream.
+        """
+        parts = [
+            self._result(key, state.emit(final=True), None)
+            for key, state in self._states.items()
+        ]
+        return concat(parts)
+
+
+class EwmAggregator(_Streaming):
+    """
+    Exponentially weighted moving averages over a stream of batches: each row
+    moves the average towards its value by ``alpha``. Null values leave the
+    average unchanged. Each ``update`` returns one result row per input row.
+    """
+    def __init__(
+        self,
+        columns: Sequence[Union[str, Expr]],
+        alpha: Optional[float] = None,
+        span: Optional[float] = None,
+        half_life: Optional[Duration] = None,
+        on: Optional[str] = None,
+        by: Union[str, Sequence[str], None] = None,
+        time_unit: str = "ns",
+    ):
+        """
+        Initialize an EwmAggregator. Give exactly one of ``alpha``, ``span`` and
+        ``half_life``.
+
+        Args:
+            columns: Columns or expressions to average.
+            alpha: Smoothing factor in ``(0, 1]``.
+            span: Sets ``alpha = 2 / (span + 1)``.
+            half_life: Rows (or, with ``on``, elapsed time) after which an
+                       observation's weight halves, so unevenly spaced ticks
+                       decay by the time between them.
+            on: Column holding the (ascending) time of each row.
+            by: Key column(s); each key has its own averages.
+            time_unit: Unit of the ``on`` values, for a string half-life.
+        """
+        super().__init__(on, by)
+        if sum(p is not None for p in (alpha, span, half_life)) != 1:
+            raise ValueError("Give exactly one of alpha, span and half_life")
+        if span is not None:
+            if span < 1:
+                raise ValueError("span must be at least 1")
+            alpha = 2 / (span + 1)
+        self.half_life: Optional[Union[int, float]] = None
+        if half_life is not None:
+            self.half_life = parse_duration(half_life, time_unit)
+            if self.half_life <= 0:
+                raise ValueError("half_life must be positive")
+            if on is None:
+                alpha = 1 - 0.5 ** (1 / self.half_life)
+        if alpha is not None and not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1]")
+        self.alpha = alpha
+        self.exprs = [(e.output_name, e) for e in map(to_expr, columns)]
+
+    def _new_state(self) -> _EwmState:
+        return _EwmState(self.exprs, self.alpha, self.half_life, self.on)
+
+
+class Rolling:
+    """
+    Rolling windows over a table. Create with ``Table.rolling`` or ``GroupBy.rolling``.
+    """
+    def __init__(
+        self,
+        table: Any,
+        window: Duration,
+        on: Optional[str] = None,
+        by: Sequence[str] = (),
+        min_periods: int = 1,
+        time_unit: str = "ns",
+    ):
+        self.table = table
+        self.window = window
+        self.on = on
+        self.by = list(by)
+        self.min_periods = min_periods
+        self.time_unit = time_unit
+
+    def agg(self, *aggs: AggExpr, **named: AggExpr) -> Table:
+        """
+        Aggregates the window of every row. Returns a table with the key
+        columns, the ``on`` column and one column per aggregation, in input row order.
+
+        Args:
+            *aggs: Aggregations named by their ``output_name``.
+            **named: Aggregations keyed by the name of the column they produce.
+        """
+        specs = dict(_aggregation_specs(aggs), **named)
+        aggregator = RollingAggregator(
+            self.window, specs, self.on, self.by, self.min_periods, self.time_unit
+        )
+        return aggregator.update(self.table)
+
+    def __repr__(self) -> str:
+        return f"Rolling(window={self.window!r}, on={self.on!r}, by={self.by})"
+
+
+class Windows:
+    """
+    Tumbling or sliding windows over a table. Create with ``Table.window`` or
+    ``GroupBy.window``.
+    """
+    def __init__(
+        self,
+        table: Any,
+        every: Duration,
+        period: Optional[Duration] = None,
+        on: Optional[str] = None,
+        by: Sequence[str] = (),
+        time_unit: str = "ns",
+    ):
+        self.table = table
+        self.every = every
+        self.period = period
+        self.on = on
+        self.by = list(by)
+        self.time_unit = time_unit
+
+    def agg(self, *aggs: AggExpr, **named: AggExpr) -> Table:
+        """
+        Aggregates every non-empty window. Returns a table with the key
+        columns, the window start and one column per aggregation.
+
+        Args:
+            *aggs: Aggregations named by their ``output_name``.
+            **named: Aggregations keyed by the name of the column they produce.
+        """
+        specs = dict(_aggregation_specs(aggs), **named)
+        aggregator = WindowAggregator(
+            self.every, specs, self.period, self.on, self.by, self.time_unit
+        )
+        return aggregator._feed(self.table, final=True)
+
+    def __repr__(self) -> str:
+        return (
+            f"Windows(every={self.every!r}, period={self.period!r}, "
+            f"on={self.on!r}, by={self.by})"
+        )
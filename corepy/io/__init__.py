@@ -0,0 +1,7 @@
+"""
+File input: the parallel prefetching ``DataLoader`` and ``.npy`` support.
+"""
+from .loader import FORMATS, BufferPool, DataLoader, glob
+from .npy import read_npy, write_npy
+
+__all__ = ["FORMATS", "BufferPool", "DataLoader", "glob", "read_npy", "write_npy"]
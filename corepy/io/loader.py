@@ -0,0 +1,442 @@
+"""
+Parallel, prefetching file loader for training and preprocessing.
+
+``DataLoader`` turns a list of files into a stream of batches:
+
+* ``.npy`` files (one sample each) and raw binary record files become Tensor
+  batches of shape ``(batch, *sample_shape)``. A pool of I/O threads reads the
+  samples with ``readinto`` straight into the batch buffer; the interpreter
+  releases the GIL for each read, so the reads overlap with each other and with
+  the consumer.
+* Columnar, Arrow IPC and CSV files become Table batches of ``batch_size``
+  rows, each file read by one I/O thread.
+
+Up to ``prefetch`` batches are in flight ahead of the consumer. Tensor batch
+buffers come from a ``BufferPool`` and are reused once nothing references a
+yielded batch anymore, so a steady stream allocates a handful of buffers in
+total. Shuffling and sharding are deterministic functions of ``seed``, the
+epoch and the shard, so every process of a job sees the same permutation and
+takes a disjoint share of it.
+"""
+import glob as _glob
+import os
+import random
+from array import array
+from collections import deque
+from collections.abc import Iterator, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Optional, Union
+
+from corepy.backend.types import DataType
+from corepy.data.column import TYPECODES
+from corepy.data.tensors import _tensor
+
+from .npy import MAGIC as NPY_MAGIC
+from .npy import NpyHeader, read_header, read_into
+
+FORMATS = ("npy", "raw", "columnar", "ipc", "csv")
+
+_TENSOR_FORMATS = ("npy", "raw")
+
+# Leading bytes identifying each self-describing format
+_MAGICS = {NPY_MAGIC: "npy", b"ARROW1": "ipc", b"CPCOL1": "columnar"}
+
+Path = Union[str, "os.PathLike[str]"]
+
+
+def glob(pattern: str, recursive: bool = False) -> list[str]:
+    """
+    The paths matching ``pattern``, sorted so that loaders built from them
+    are reproducible.
+    """
+    return sorted(_glob.glob(pattern, recursive=recursive))
+
+
+def _detect_format(path: Path) -> str:
+    with open(path, "rb") as file:
+        head = file.read(8)
+    for magic, name in _MAGICS.items():
+        if head.startswith(magic):
+            return name
+    if os.fspath(path).lower().endswith(".csv"):
+        return "csv"
+    raise ValueError(
+        f"Cannot tell the format of {path}; pass format= (raw records also need dtype=)"
+    )
+
+
+def _exported(buffer: "array[Any]") -> bool:
+    """
+    Whether a memoryview of ``buffer`` is still alive. An array cannot change
+    size while it is exported, and popping then re-appending the last element
+    never reallocates, so this probe costs nothing otherwise.
+    """
+    try:
+        last = buffer.pop()
+    except BufferError:
+        return True
+    buffer.append(last)
+    return False
+
+
+class BufferPool:
+    """
+    Recycles batch buffers: a buffer handed out with ``lend`` returns to the
+    pool once no Tensor (or other view) of it is left, and ``acquire`` reuses
+    it for a later batch of the same size.
+    """
+    def __init__(self, capacity: int = 4):
+        """
+        Initialize a BufferPool.
+
+        Args:
+            capacity: Free buffers kept per (typecode, length); extra ones are dropped.
+        """
+        self.capacity = capacity
+        self.allocations = 0
+        self._free: dict[tuple[str, int], list[array[Any]]] = {}
+        self._lent: list[array[Any]] = []
+
+    def acquire(self, typecode: str, count: int) -> "array[Any]":
+        """
+        A buffer of ``count`` elements of ``typecode``, reused when one is free.
+        Its contents are unspecified.
+        """
+        self._reclaim()
+        free = self._free.get((typecode, count))
+        if free:
+            return free.pop()
+        self.allocations += 1
+        return array(typecode, bytes(count * array(typecode).itemsize))
+
+    def lend(self, buffer: "array[Any]") -> None:
+        """
+        Marks ``buffer`` as handed to the consumer.
+        """
+        if len(buffer):
+            self._lent.append(buffer)
+
+    def _reclaim(self) -> None:
+        lent = []
+        for buffer in self._lent:
+            if _exported(buffer):
+                lent.append(buffer)
+                continue
+            free = self._free.setdefault((buffer.typecode, len(buffer)), [])
+            if len(free) < self.capacity:
+                free.append(buffer)
+        self._lent = lent
+
+
+def _read_samples(
+    items: Sequence[tuple[str, int]], buffer: "array[Any]", sample: NpyHeader
+) -> None:
+    """
+    I/O task: reads whole ``.npy`` files into their slots of ``buffer``.
+    """
+    target = memoryview(buffer).cast("B")
+    for path, slot in items:
+        with open(path, "rb", buffering=0) as file:
+            header = read_header(file, path)
+            if header.dtype != sample.dtype or header.shape != sample.shape:
+                raise ValueError(
+                    f"{path} holds {header.dtype.value}{list(header.shape)}, "
+                    f"but the batch expects {sample.dtype.value}{list(sample.shape)}"
+                )
+            read_into(file, target[slot * sample.nbytes:(slot + 1) * sample.nbytes])
+
+
+def _read_records(
+    items: Sequence[tuple[str, int, int]], buffer: "array[Any]", record_bytes: int
+) -> None:
+    """
+    I/O task: reads fixed-size records into their slots of ``buffer``, one
+    read per run of consecutive records of a file.
+    """
+    target = memoryview(buffer).cast("B")
+    files: dict[str, Any] = {}
+    try:
+        start = 0
+        while start < len(items):
+            path, record, slot = items[start]
+            end = start + 1
+            while end < len(items) and items[end] == (
+                path,
+                record + end - start,
+                slot + end - start,
+            ):
+                end += 1
+            if path not in files:
+                files[path] = open(path, "rb", buffering=0)
+            file = files[path]
+            file.seek(record * record_bytes)
+            read_into(
+                file, target[slot * record_bytes:(slot + end - start) * record_bytes]
+            )
+            start = end
+    finally:
+        for file in files.values():
+            file.close()
+
+
+class DataLoader:
+    """
+    Iterates over batches read from ``paths`` by a pool of I/O threads,
+    keeping ``prefetch`` batches in flight.
+
+    Tensor formats (``npy``, ``raw``) yield Tensors of shape
+    ``(batch, *sample_shape)``. Their batch buffers are pooled: a buffer is
+    reused only after every reference to the batch that used it is gone.
+    Table formats (``columnar``, ``ipc``, ``csv``) yield Tables of
+    ``batch_size`` rows; shuffling permutes the file order and the rows
+    within each file.
+
+    Each pass over the loader is one epoch. With ``shuffle=True`` the order is
+    a function of ``seed`` and the epoch number (which advances after each
+    pass, or is set with ``set_epoch``). ``shard=(index, count)`` keeps every
+    ``count``-th item of that order starting at ``index``; processes using the
+    same seed and distinct indexes read disjoint shares.
+    """
+    def __init__(
+        self,
+        paths: Union[str, Sequence[Path]],
+        batch_size: int = 32,
+        format: Optional[str] = None,
+        dtype: Optional[DataType] = None,
+        record_shape: Sequence[int] = (),
+        columns: Optional[Sequence[str]] = None,
+        shuffle: bool = False,
+        seed: int = 0,
+        shard: Optional[tuple[int, int]] = None,
+        drop_last: bool = False,
+        workers: int = 4,
+        prefetch: int = 2,
+    ):
+        """
+        Initialize a DataLoader.
+
+        Args:
+            paths: Files to read, or a glob pattern.
+            batch_size: Samples (records, rows) per batch.
+            format: One of ``FORMATS``. By default it is detected from the first
+                    file, and is ``raw`` when ``dtype`` is given.
+            dtype: Element type of raw records.
+            record_shape: Shape of one raw record (default: a single value).
+            columns: Columns to read from table formats (default: all).
+            shuffle: Read samples in a seeded random order.
+            seed: Seed of the shuffle.
+            shard: ``(index, count)``: read only this process's share.
+            drop_last: Skip the final batch when it is smaller than ``batch_size``.
+            workers: Number of I/O threads.
+            prefetch: Number of batches read ahead of the consumer.
+        """
+        self.paths = (
+            glob(paths)
+            if isinstance(paths, str)
+            else [os.fspath(path) for path in paths]
+        )
+        if not self.paths:
+            raise ValueError("DataLoader needs at least one file")
+        if batch_size < 1 or workers < 1 or prefetch < 1:
+            raise ValueError("batch_size, workers and prefetch must be positive")
+        if format is None:
+            format = "raw" if dtype is not None else _detect_format(self.paths[0])
+        if format not in FORMATS:
+            raise ValueError(f"Unknown format '{format}'. Expected one of {FORMATS}")
+        if shard is not None and not 0 <= shard[0] < shard[1]:
+            raise ValueError(
+                f"Invalid shard {shard}: expected (index, count) with 0 <= index < "
+                "count"
+            )
+        self.batch_size = batch_size
+        self.format = format
+        self.columns = columns
+        self.shuffle = shuffle
+        self.seed = seed
+        self.shard = shard
+        self.drop_last = drop_last
+        self.workers = workers
+        self.prefetch = prefetch
+        self.epoch = 0
+        self.pool = BufferPool(capacity=prefetch + 2)
+
+        self._sample: Optional[NpyHeader] = None
+        self._records: list[tuple[str, int]] = []
+        if format == "npy":
+            with open(self.paths[0], "rb") as file:
+                self._sample = read_header(file, self.paths[0])
+        elif format == "raw":
+            if dtype not in TYPECODES:
+                raise TypeError(
+                    f"Raw records need a numeric or bool dtype, got {dtype}"
+                )
+            self._sample = NpyHeader(dtype, tuple(record_shape), 0)
+            record_bytes = self._sample.nbytes
+            for path in self.paths:
+                size = os.path.getsize(path)
+                if not record_bytes or size % record_bytes:
+                    raise ValueError(
+                        f"{path} is {size} bytes, not a whole number of "
+                        f"{record_bytes}-byte records"
+                    )
+                self._records.extend(
+                    (path, record) for record in range(size // record_bytes)
+                )
+
+    def set_epoch(self, epoch: int) -> None:
+        """
+        Sets the epoch number that, with the seed, determines the next pass's order.
+        """
+        self.epoch = epoch
+
+    def _order(self, count: int, epoch: int) -> list[int]:
+        order = list(range(count))
+        if self.shuffle:
+            random.Random(f"{self.seed}:{epoch}").shuffle(order)
+        if self.shard is not None:
+            index, shards = self.shard
+            order = order[index::shards]
+        return order
+
+    def _items(self, epoch: int) -> list[Any]:
+        if self.format == "raw":
+            return [self._records[i] for i in self._order(len(self._records), epoch)]
+        return [self.paths[i] for i in self._order(len(self.paths), epoch)]
+
+    def __len__(self) -> int:
+        """
+        Batches per epoch. Only known up front for tensor formats.
+        """
+        if self.format not in _TENSOR_FORMATS:
+            raise TypeError(
+                f"The number of {self.format} batches depends on the files' row counts"
+            )
+        count = len(
+            self._order(
+                len(self._records) if self.format == "raw" else len(self.paths), 0
+            )
+        )
+        return (
+            count // self.batch_size if self.drop_last else -(-count // self.batch_size)
+        )
+
+    def __iter__(self) -> Iterator[Any]:
+        epoch, self.epoch = self.epoch, self.epoch + 1
+        items = self._items(epoch)
+        executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="corepy-io"
+        )
+        try:
+            if self.format in _TENSOR_FORMATS:
+                yield from self._tensor_batches(executor, items)
+            else:
+                yield from self._table_batches(executor, items, epoch)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _tensor_batches(
+        self, executor: ThreadPoolExecutor, items: list[Any]
+    ) -> Iterator[Any]:
+        sample = self._sample
+        assert sample is not None
+        typecode = sample.typecode
+        batches = [
+            items[i:i + self.batch_size]
+            for i in range(0, len(items), self.batch_size)
+        ]
+        if self.drop_last and batches and len(batches[-1]) < self.batch_size:
+            batches.pop()
+
+        def submit(batch: list[Any]) -> tuple["array[Any]", int, list["Future[None]"]]:
+            buffer = self.pool.acquire(typecode, len(batch) * sample.count)
+            # Split the batch so that its reads spread over all workers
+            step = -(-len(batch) // self.workers)
+            futures = []
+            for start in range(0, len(batch), step):
+                if self.format == "npy":
+                    samples = [
+                        (path, slot)
+                        for slot, path in enumerate(batch[start:start + step], start)
+                    ]
+                    futures.append(
+                        executor.submit(_read_samples, samples, buffer, sample)
+                    )
+                else:
+                    records = [
+                        (path, record, slot)
+                        for slot, (path, record) in enumerate(
+                            batch[start:start + step], start
+                        )
+                    ]
+                    futures.append(
+                        executor.submit(_read_records, records, buffer, sample.nbytes)
+                    )
+            return buffer, len(batch), futures
+
+        pending: deque[tuple[array[Any], int, list[Future[None]]]] = deque()
+        upcoming = iter(batches)
+        for batch in upcoming:
+            pending.append(submit(batch))
+            if len(pending) == self.prefetch:
+                break
+        while pending:
+            buffer, rows, futures = pending.popleft()
+            for future in futures:
+                future.result()
+            for batch in upcoming:
+                pending.append(submit(batch))
+                break
+            self.pool.lend(buffer)
+            yield _tensor(buffer, typecode, (rows,) + sample.shape, sample.dtype)
+
+    def _read_table(self, path: str, epoch: int) -> Any:
+        """
+        I/O task: reads one file of a table format, with its rows shuffled.
+        """
+        from corepy.data import read_columnar, read_csv, read_ipc
+
+        if self.format == "columnar":
+            table = read_columnar(path, self.columns)
+        elif self.format == "ipc":
+            table = read_ipc(path, self.columns)
+        else:
+            table = read_csv(path, columns=self.columns)
+        if self.shuffle:
+            order = list(range(len(table)))
+            random.Random(f"{self.seed}:{epoch}:{path}").shuffle(order)
+            table = table.take(order)
+        return table
+
+    def _table_batches(
+        self, executor: ThreadPoolExecutor, items: list[str], epoch: int
+    ) -> Iterator[Any]:
+        from corepy.data import concat
+
+        upcoming = iter(items)
+        pending: deque[Future[Any]] = deque(
+            executor.submit(self._read_table, path, epoch)
+            for _, path in zip(range(self.prefetch), upcoming)
+        )
+        carry = None
+        while pending:
+            table = pending.popleft().result()
+            for path in upcoming:
+                pending.append(executor.submit(self._read_table, path, epoch))
+                break
+            if carry is not None:
+                table = concat([carry, table])
+            offset = 0
+            while len(table) - offset >= self.batch_size:
+                yield table.slice(offset, self.batch_size)
+                offset += self.batch_size
+            carry = table.slice(offset) if offset < len(table) else None
+        if carry is not None and not self.drop_last:
+            yield carry
+
+    def __repr__(self) -> str:
+        return (
+            f"DataLoader(files={len(self.paths)}, format={self.format!r}, "
+            f"batch_size={self.batch_size}, "
+            f"shuffle={self.shuffle}, shard={self.shard}, workers={self.workers}, "
+            f"prefetch={self.prefetch})"
+        )
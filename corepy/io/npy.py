@@ -0,0 +1,141 @@
+"""
+Reading and writing ``.npy`` files without numpy.
+
+Only the header is parsed in Python; the data is read with ``readinto``
+straight into the destination buffer (the interpreter releases the GIL for the
+read). Little-endian C-ordered arrays of the Tensor dtypes are supported:
+``<f8``, ``<f4``, ``<i8``, ``<i4`` and ``|b1``.
+"""
+import ast
+import io
+import os
+import struct
+from array import array
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Optional, Union
+
+from corepy.backend.types import DataType
+from corepy.data.column import TYPECODES
+
+MAGIC = b"\x93NUMPY"
+
+DESCRS: dict[str, DataType] = {
+    "<f8": DataType.FLOAT64,
+    "<f4": DataType.FLOAT32,
+    "<i8": DataType.INT64,
+    "<i4": DataType.INT32,
+    "|b1": DataType.BOOL,
+}
+
+_NAMES = {dtype: descr for descr, dtype in DESCRS.items()}
+
+
+@dataclass(frozen=True)
+class NpyHeader:
+    """
+    The layout of an ``.npy`` file: element type, shape and where the data starts.
+    """
+    dtype: DataType
+    shape: tuple[int, ...]
+    offset: int
+
+    @property
+    def typecode(self) -> str:
+        return TYPECODES[self.dtype]
+
+    @property
+    def count(self) -> int:
+        count = 1
+        for extent in self.shape:
+            count *= extent
+        return count
+
+    @property
+    def nbytes(self) -> int:
+        return self.count * array(self.typecode).itemsize
+
+
+def read_header(file: BinaryIO, path: Any = "<file>") -> NpyHeader:
+    """
+    Parses the header of an open ``.npy`` file, leaving it positioned at the data.
+    """
+    prefix = file.read(len(MAGIC) + 2)
+    if prefix[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} is not a .npy file")
+    major = prefix[len(MAGIC)]
+    size_format = "<H" if major == 1 else "<I"
+    size = struct.unpack(size_format, file.read(struct.calcsize(size_format)))[0]
+    header = ast.literal_eval(file.read(size).decode("latin1" if major < 3 else "utf8"))
+    descr = header["descr"]
+    if descr not in DESCRS:
+        raise TypeError(
+            f"{path}: unsupported .npy dtype {descr!r}; expected one of "
+            f"{sorted(DESCRS)}"
+        )
+    shape = tuple(header["shape"])
+    if header["fortran_order"] and len(shape) > 1:
+        raise ValueError(f"{path}: Fortran-ordered arrays are not supported")
+    return NpyHeader(DESCRS[descr], shape, file.tell())
+
+
+def read_into(file: io.RawIOBase, target: memoryview) -> None:
+    """
+    Fills ``target`` (a byte view) from ``file``, an unbuffered binary file
+    that must hold enough data.
+    """
+    filled = 0
+    while filled < target.nbytes:
+        read = file.readinto(target[filled:])
+        if not read:
+            raise ValueError(
+                f"Unexpected end of file after {filled} of {target.nbytes} bytes"
+            )
+        filled += read
+
+
+def read_npy(path: Union[str, "os.PathLike[str]"]) -> Any:
+    """
+    Loads a ``.npy`` file into a Tensor of the same shape and dtype.
+    """
+    from corepy.data.tensors import _tensor
+
+    with open(path, "rb", buffering=0) as file:
+        header = read_header(file, path)
+        out = array(header.typecode, bytes(header.nbytes))
+        read_into(file, memoryview(out).cast("B"))
+    return _tensor(out, header.typecode, header.shape, header.dtype)
+
+
+def write_npy(
+    path: Union[str, "os.PathLike[str]"],
+    tensor: Any,
+    shape: Optional[Sequence[int]] = None,
+) -> None:
+    """
+    Saves a Tensor (or a typed ``array``/``memoryview``) as a ``.npy`` file.
+
+    Args:
+        path: The file to write.
+        tensor: A Tensor backed by a typed buffer, or the buffer itself.
+        shape: The shape to record (default: the tensor's or buffer's shape).
+    """
+    from corepy.data.tensors import _flat
+
+    data = getattr(tensor, "_backing_data", tensor)
+    flat, dtype = _flat(data, getattr(tensor, "dtype", DataType.FLOAT64))
+    shape = tuple(
+        shape if shape is not None else getattr(tensor, "shape", (len(flat),))
+    )
+    header = repr({"descr": _NAMES[dtype], "fortran_order": False, "shape": shape})
+    # Pad so the data starts at a multiple of 64 bytes, as numpy does
+    length = len(MAGIC) + 4 + len(header) + 1
+    header = header + " " * (-length % 64) + "\n"
+    with open(path, "wb") as file:
+        file.write(
+            MAGIC
+            + b"\x01\x00"
+            + struct.pack("<H", len(header))
+            + header.encode("latin1")
+        )
+        file.write(memoryview(flat).cast("B"))
@@ -1,16 +1,84 @@
-from ..backend.dispatch import register_kernel
-from ..backend.types import BackendType
+import operator
+from array import array
+from collections.abc import Sequence
 from typing import Any
 
+from ..backend.dispatch import Dispatcher, register_kernel
+from ..backend.types import BackendType
+
 # We'll use a simple list implementation for now since we don't have numpy dependency yet
 # In a real scenario, this would import numpy
 
+# Promotion order of typed-buffer formats
+_RANKS = {"?": 0, "B": 0, "i": 1, "l": 2, "q": 2, "f": 3, "d": 4}
+
+
+def _typed(value: Any) -> bool:
+    return isinstance(value, (array, memoryview))
+
+
+def _flat(value: Any) -> "memoryview[Any]":
+    """
+    A 1-D view of a typed buffer of any shape, copied if not contiguous.
+    """
+    view = memoryview(value)
+    if not view.c_contiguous:
+        view = memoryview(view.tobytes()).cast(view.format)  # type: ignore[call-overload]
+    flat: memoryview[Any] = view.cast("B").cast(view.format)  # type: ignore[call-overload]
+    return flat
+
+
+def _format(value: Any) -> str:
+    if _typed(value):
+        return memoryview(value).format
+    values = value if isinstance(value, (list, tuple)) else [value]
+    return "d" if any(isinstance(v, float) for v in values) else "q"
+
+
+def _result_typecode(*operands: Any) -> str:
+    """
+    The typecode holding the result of arithmetic on ``operands``: the widest
+    of theirs, with int64 and float32 together needing float64.
+    """
+    formats = [_format(value) for value in operands]
+    widest = max(formats, key=lambda code: _RANKS.get(code, 4))
+    if widest == "f" and any(code in ("l", "q") for code in formats):
+        return "d"
+    return "q" if _RANKS.get(widest) == 0 else widest
+
+
+def _shape(value: Any) -> Sequence[int]:
+    if _typed(value):
+        return memoryview(value).shape or ()
+    return (len(value),)
+
+
+def _buffer_arithmetic(op: str, a: Any, b: Any) -> Any:
+    """
+    ``a <op> b`` where either side is a typed buffer (e.g. a tensor bridged
+    from a Table), computed by the ``elementwise`` column kernels. The result
+    is a buffer of the promoted type, shaped like the typed operand.
+    """
+    operands = [v for v in (a, b) if _typed(v) or isinstance(v, (list, tuple))]
+    shape = tuple(_shape(next(value for value in operands if _typed(value))))
+    if any(tuple(_shape(value)) != shape for value in operands):
+        raise ValueError(f"Shape mismatch for cpu_{op}")
+    typecode = _result_typecode(a, b)
+    kernel = Dispatcher.get_kernel(f"elementwise.{op}", BackendType.CPU)
+    out = kernel(*(_flat(v) if _typed(v) else v for v in (a, b)), typecode)
+    if len(shape) > 1 and 0 not in shape:
+        return memoryview(out).cast("B").cast(typecode, list(shape))  # type: ignore[call-overload]
+    return out
+
+
 @register_kernel("add", BackendType.CPU)
 def cpu_add(a: Any, b: Any) -> Any:
     """
     Element-wise addition for CPU.
-    Accepts lists or raw data.
+    Accepts lists, typed buffers (``array``/``memoryview``) or raw data.
     """
+    if _typed(a) or _typed(b):
+        return _buffer_arithmetic("add", a, b)
     # Simplified implementation assuming basic lists or scalars
     # If a and b are lists, element-wise add
     # If scalar, error (for now) or broadcast
@@ -27,12 +95,58 @@ def cpu_add(a: Any, b: Any) -> Any:
         # Scalar + Scalar
         return a + b
 
+@register_kernel("mul", BackendType.CPU)
+def cpu_mul(a: Any, b: Any) -> Any:
+    """
+    Element-wise multiplication for CPU, with the operands ``cpu_add`` takes.
+    """
+    if _typed(a) or _typed(b):
+        return _buffer_arithmetic("mul", a, b)
+    if isinstance(a, list) and isinstance(b, list):
+        if len(a) != len(b):
+            raise ValueError("Shape mismatch for cpu_mul")
+        return [x * y for x, y in zip(a, b)]
+    if isinstance(a, list):
+        return [x * b for x in a]
+    if isinstance(b, list):
+        return [a * x for x in b]
+    return a * b
+
+
+def _rows(value: Any) -> list[list[Any]]:
+    shape = _shape(value)
+    if len(shape) != 2:
+        raise ValueError(f"matmul needs 2-D operands, got shape {tuple(shape)}")
+    flat = _flat(value).tolist()
+    return [flat[i * shape[1]:(i + 1) * shape[1]] for i in range(shape[0])]
+
+
+def _buffer_matmul(a: Any, b: Any) -> Any:
+    """
+    Naive O(N^3) product of two 2-D typed buffers, as a 2-D buffer.
+    """
+    left, right = _rows(a), _rows(b)
+    if _shape(a)[1] != len(right):
+        raise ValueError("Shape mismatch for cpu_matmul")
+    columns = _shape(b)[1]
+    typecode = _result_typecode(a, b)
+    by_column = list(zip(*right)) if right else [()] * columns
+    cells = (sum(map(operator.mul, r, c)) for r in left for c in by_column)
+    out = array(typecode, cells)
+    if not left or not columns:
+        return out
+    return memoryview(out).cast("B").cast(typecode, [len(left), columns])  # type: ignore[call-overload]
+
+
 @register_kernel("matmul", BackendType.CPU)
 def cpu_matmul(a: Any, b: Any) -> Any:
     """
     Simple Matrix Multiplication (Naive O(N^3)) for CPU Demo.
-    Assumes inputs are 2D lists (List[List[float]]).
+    Computes the product of 2-D typed buffers (e.g. tensors bridged from a
+    Table); other inputs are assumed to be 2D lists (List[List[float]]).
     """
+    if _typed(a) and _typed(b):
+        return _buffer_matmul(a, b)
     # Assuming a and b are 2D lists
     # A is (m x k), B is (k x n) -> Result is (m x n)
     
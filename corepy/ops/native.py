@@ -0,0 +1,207 @@
+"""
+Native (C++) CPU kernels, registered over the pure-Python ones in ``vector``.
+
+When the ``_corepy_cpp`` extension is built, the elementwise arithmetic,
+comparison, unary, cast and reduction kernels run as compiled loops over the
+buffers' memory (with the GIL released), vectorized for the best instruction
+set the CPU offers (``simd_level()``). Each native kernel keeps the kernel it
+replaced as its fallback and hands over to it when:
+
+* an operand is not a typed buffer or numeric scalar (lists, strings, objects),
+  or the result is not a typed buffer (``typecode=None``);
+* there is no native loop for the operation and types (``pow``, float
+  ``floordiv``/``mod``, float sums, which stay exactly rounded by ``math.fsum``);
+* the machine result would differ from Python's: integer overflow, division by
+  zero, a value the output type cannot hold. Python then raises (or computes
+  exactly) as it would have without the extension.
+
+Results are therefore identical with and without the extension.
+"""
+from array import array
+from functools import partial
+from typing import Any, Callable, Optional
+
+from ..backend.dispatch import Dispatcher, register_kernel
+from ..backend.types import BackendType
+
+# The kernels replaced below, which each native kernel falls back to
+from . import vector as _vector  # noqa: F401
+
+try:
+    from .. import _corepy_cpp as _native
+except ImportError:
+    _native = None
+
+# Buffer formats the native kernels take
+_TYPECODES = ("d", "f", "q", "i", "B")
+
+_INT64 = (-(1 << 63), (1 << 63) - 1)
+
+_OK = 0
+
+BINARY_OPS = ("add", "sub", "mul", "truediv", "floordiv", "mod")
+COMPARE_OPS = ("eq", "ne", "lt", "le", "gt", "ge", "and", "or", "xor")
+UNARY_OPS = ("neg", "abs", "not")
+REDUCE_OPS = ("sum", "min", "max")
+
+
+def available() -> bool:
+    """
+    Whether the native kernels are loaded.
+    """
+    return _native is not None
+
+
+def simd_level() -> Optional[str]:
+    """
+    The instruction set the native kernels run with on this CPU ("avx512",
+    "avx2", "sse2", "neon" or "scalar"), or None without the extension.
+    """
+    return _native.simd_level() if _native is not None else None
+
+
+def _buffer(value: Any) -> Any:
+    """
+    ``value`` as a 1-D typed buffer the native kernels take (a scalar as a
+    one-element buffer, which broadcasts), or None.
+    """
+    if isinstance(value, array):
+        return value if value.typecode in _TYPECODES else None
+    if isinstance(value, memoryview):
+        return (
+            value
+            if value.format in _TYPECODES and value.ndim == 1 and value.c_contiguous
+            else None
+        )
+    if isinstance(value, float):
+        return array("d", (value,))
+    if isinstance(value, int) and _INT64[0] <= value <= _INT64[1]:
+        return array("q", (value,))
+    return None
+
+
+def _operands(a: Any, b: Any) -> Any:
+    """
+    Both operands as native buffers and the output length, or None.
+    """
+    lhs, rhs = _buffer(a), _buffer(b)
+    if lhs is None or rhs is None:
+        return None
+    sizes = [len(value) for value in (a, b) if isinstance(value, (array, memoryview))]
+    if not sizes or min(sizes) != max(sizes):
+        return None
+    return lhs, rhs, sizes[0]
+
+
+def _empty(typecode: str, n: int) -> "array[Any]":
+    return array(typecode, bytes(n * array(typecode).itemsize))
+
+
+def _binary_kernel(op: str, fallback: Callable[..., Any]) -> Callable[..., Any]:
+    def kernel(a: Any, b: Any, typecode: Optional[str] = None) -> Any:
+        operands = _operands(a, b) if typecode in _TYPECODES else None
+        if operands is not None and typecode is not None:
+            lhs, rhs, n = operands
+            out = _empty(typecode, n)
+            if _native.binary(op, lhs, rhs, out) == _OK:
+                return out
+        return fallback(a, b, typecode)
+
+    return kernel
+
+
+def _compare_kernel(op: str, fallback: Callable[..., Any]) -> Callable[..., Any]:
+    def kernel(a: Any, b: Any) -> Any:
+        operands = _operands(a, b)
+        if operands is not None:
+            lhs, rhs, n = operands
+            out = _empty("B", n)
+            if _native.compare(op, lhs, rhs, out) == _OK:
+                return out
+        return fallback(a, b)
+
+    return kernel
+
+
+def _unary_kernel(op: str, fallback: Callable[..., Any]) -> Callable[..., Any]:
+    def kernel(a: Any, typecode: Optional[str] = None) -> Any:
+        source = (
+            _buffer(a)
+            if typecode in _TYPECODES and isinstance(a, (array, memoryview))
+            else None
+        )
+        if source is not None and typecode is not None:
+            out = _empty(typecode, len(source))
+            if _native.unary(op, source, out) == _OK:
+                return out
+        return fallback(a, typecode)
+
+    return kernel
+
+
+def _not_kernel(fallback: Callable[..., Any]) -> Callable[..., Any]:
+    def kernel(a: Any) -> Any:
+        source = _buffer(a) if isinstance(a, (array, memoryview)) else None
+        if source is not None:
+            out = _empty("B", len(source))
+            if _native.unary("not", source, out) == _OK:
+                return out
+        return fallback(a)
+
+    return kernel
+
+
+def _cast_kernel(fallback: Callable[..., Any]) -> Callable[..., Any]:
+    def kernel(a: Any, typecode: Optional[str]) -> Any:
+        source = (
+            _buffer(a)
+            if typecode in _TYPECODES and isinstance(a, (array, memoryview))
+            else None
+        )
+        if source is not None and typecode is not None:
+            out = _empty(typecode, len(source))
+            if _native.cast(source, out) == _OK:
+                return out
+        return fallback(a, typecode)
+
+    return kernel
+
+
+def _reduce_kernel(op: str, fallback: Callable[..., Any]) -> Callable[..., Any]:
+    def kernel(values: Any) -> Any:
+        source = _buffer(values) if isinstance(values, (array, memoryview)) else None
+        if source is not None:
+            result = _native.reduce(op, source)
+            if result is not None:
+                return result
+        return fallback(values)
+
+    return kernel
+
+
+def _replace(
+    name: str, make: Callable[[Callable[..., Any]], Callable[..., Any]]
+) -> None:
+    fallback = Dispatcher.get_kernel(name, BackendType.CPU)
+    register_kernel(name, BackendType.CPU, replace=True)(make(fallback))
+
+
+def register() -> None:
+    """
+    Registers the native kernels as the CPU kernels. Called on import when
+    the extension is available.
+    """
+    for _op in BINARY_OPS:
+        _replace(f"elementwise.{_op}", partial(_binary_kernel, _op))
+    for _op in COMPARE_OPS:
+        _replace(f"compare.{_op}", partial(_compare_kernel, _op))
+    for _op in ("neg", "abs"):
+        _replace(f"elementwise.{_op}", partial(_unary_kernel, _op))
+    _replace("elementwise.not", _not_kernel)
+    _replace("cast", _cast_kernel)
+    for _op in REDUCE_OPS:
+        _replace(f"reduce.{_op}", partial(_reduce_kernel, _op))
+
+
+if _native is not None:
+    register()
@@ -0,0 +1,52 @@
+"""
+Ordering kernels: argsort, sort, top-k selection and binary search.
+
+All sorts are stable. The CPU implementations use the interpreter's timsort
+and heap selection, which run in C; native backends can register radix sorts
+for fixed-width keys under the same names.
+"""
+import heapq
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from typing import Any
+
+from ..backend.dispatch import register_kernel
+from ..backend.types import BackendType
+
+
+@register_kernel("argsort", BackendType.CPU)
+def cpu_argsort(values: Sequence[Any], descending: bool = False) -> list[int]:
+    """
+    Returns the permutation that stably sorts ``values``.
+    """
+    return sorted(range(len(values)), key=values.__getitem__, reverse=descending)
+
+
+@register_kernel("sort", BackendType.CPU)
+def cpu_sort(values: Sequence[Any], descending: bool = False) -> list[Any]:
+    return sorted(values, reverse=descending)
+
+
+@register_kernel("top_k", BackendType.CPU)
+def cpu_top_k(values: Sequence[Any], k: int, descending: bool = True) -> list[int]:
+    """
+    Returns the indices of the ``k`` largest (or smallest) values, in order.
+    Uses heap selection, O(n log k), instead of a full sort.
+    """
+    select = heapq.nlargest if descending else heapq.nsmallest
+    return select(k, range(len(values)), key=values.__getitem__)
+
+
+@register_kernel("searchsorted", BackendType.CPU)
+def cpu_searchsorted(
+    values: Sequence[Any], needles: Sequence[Any], side: str = "left"
+) -> list[int]:
+    """
+    Returns, for each needle, the insertion point that keeps ``values`` (sorted
+    ascending) sorted. ``side`` picks the position before ("left") or after
+    ("right") existing equal values.
+    """
+    if side not in ("left", "right"):
+        raise ValueError(f"side must be 'left' or 'right', got '{side}'")
+    search = bisect_left if side == "left" else bisect_right
+    return [search(values, needle) for needle in needles]
@@ -0,0 +1,216 @@
+"""
+Flat-buffer kernels behind Table column operations.
+
+Kernels take contiguous typed buffers (``array.array`` / typed ``memoryview``),
+Python lists for string and object columns, or scalars (broadcast). They never
+see nulls: callers pass validity separately and combine it themselves. The
+implementations here are the portable CPU path; loops run inside C iterators
+(``map``/``compress``) rather than Python bytecode.
+"""
+import math
+import operator
+from array import array
+from collections.abc import Iterable, Sequence
+from itertools import compress, repeat
+from typing import Any, Callable, Optional
+
+from ..backend.dispatch import register_kernel
+from ..backend.types import BackendType
+
+_BINARY = {
+    "add": operator.add,
+    "sub": operator.sub,
+    "mul": operator.mul,
+    "truediv": operator.truediv,
+    "floordiv": operator.floordiv,
+    "mod": operator.mod,
+    "pow": operator.pow,
+}
+
+_COMPARE = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "lt": operator.lt,
+    "le": operator.le,
+    "gt": operator.gt,
+    "ge": operator.ge,
+    "and": operator.and_,
+    "or": operator.or_,
+    "xor": operator.xor,
+}
+
+# murmur3 fmix64 constants
+_MASK64 = (1 << 64) - 1
+_FMIX = (0xFF51AFD7ED558CCD, 0xC4CEB9FE1A85EC53)
+
+_UNARY: dict[str, Callable[[Any], Any]] = {
+    "neg": operator.neg,
+    "abs": abs,
+}
+
+
+def typecode_of(values: Any) -> Optional[str]:
+    """
+    Returns the element type code of a typed buffer, or None for lists.
+    """
+    if isinstance(values, array):
+        return values.typecode
+    if isinstance(values, memoryview):
+        return values.format
+    return None
+
+
+def _is_buffer(value: Any) -> bool:
+    return isinstance(value, (array, memoryview, list, tuple))
+
+
+def _operands(a: Any, b: Any) -> Any:
+    return (a if _is_buffer(a) else repeat(a)), (b if _is_buffer(b) else repeat(b))
+
+
+def _to_buffer(values: Any, typecode: Optional[str]) -> Any:
+    return array(typecode, values) if typecode else list(values)
+
+
+def _binary_kernel(op: Callable[[Any, Any], Any]) -> Callable[..., Any]:
+    def kernel(a: Any, b: Any, typecode: Optional[str] = None) -> Any:
+        lhs, rhs = _operands(a, b)
+        return _to_buffer(map(op, lhs, rhs), typecode)
+    return kernel
+
+
+def _compare_kernel(op: Callable[[Any, Any], Any]) -> Callable[..., Any]:
+    def kernel(a: Any, b: Any) -> "array[int]":
+        lhs, rhs = _operands(a, b)
+        return array("B", map(op, lhs, rhs))
+    return kernel
+
+
+def _unary_kernel(op: Callable[[Any], Any]) -> Callable[..., Any]:
+    def kernel(a: Any, typecode: Optional[str] = None) -> Any:
+        return _to_buffer(map(op, a), typecode)
+    return kernel
+
+
+for _name, _op in _BINARY.items():
+    register_kernel(f"elementwise.{_name}", BackendType.CPU)(_binary_kernel(_op))
+for _name, _op in _COMPARE.items():
+    register_kernel(f"compare.{_name}", BackendType.CPU)(_compare_kernel(_op))
+for _name, _fn in _UNARY.items():
+    register_kernel(f"elementwise.{_name}", BackendType.CPU)(_unary_kernel(_fn))
+
+
+@register_kernel("elementwise.not", BackendType.CPU)
+def cpu_not(a: Any) -> "array[int]":
+    """
+    Logical negation of a 0/1 buffer.
+    """
+    return array("B", map(operator.not_, a))
+
+
+@register_kernel("cast", BackendType.CPU)
+def cpu_cast(a: Any, typecode: Optional[str]) -> Any:
+    """
+    Converts a buffer to ``typecode`` (None for a list). Floats are truncated
+    toward zero when cast to integers.
+    """
+    if typecode in ("q", "i") and typecode_of(a) in ("d", "f"):
+        a = map(int, a)
+    elif typecode == "B":
+        a = map(bool, a)
+    return _to_buffer(a, typecode)
+
+
+@register_kernel("select.filter", BackendType.CPU)
+def cpu_filter(values: Any, mask: Sequence[int]) -> Any:
+    """
+    Keeps the elements whose mask byte is non-zero.
+    """
+    return _to_buffer(compress(values, mask), typecode_of(values))
+
+
+@register_kernel("select.take", BackendType.CPU)
+def cpu_take(values: Any, indices: Sequence[int]) -> Any:
+    """
+    Gathers ``values[i]`` for each ``i`` in ``indices``.
+    """
+    if len(indices) < 2:
+        return _to_buffer([values[i] for i in indices], typecode_of(values))
+    return _to_buffer(operator.itemgetter(*indices)(values), typecode_of(values))
+
+
+@register_kernel("reduce.sum", BackendType.CPU)
+def cpu_sum(values: Any) -> Any:
+    """
+    Sum of a buffer. Floating-point sums are exactly rounded (``math.fsum``).
+    """
+    if typecode_of(values) in ("d", "f"):
+        return math.fsum(values)
+    return sum(values)
+
+
+def _extreme(pick: Callable[..., Any], values: Any) -> Any:
+    # NaN compares false both ways, so min/max would keep or drop it depending
+    # on where it sits: skip it, as sorting (NaN last) and zone maps do
+    if typecode_of(values) in ("d", "f") or isinstance(values, list):
+        kept = [v for v in values if v == v]
+        if len(kept) < len(values):
+            return pick(kept) if kept else values[0]
+    return pick(values, default=None)
+
+
+@register_kernel("reduce.min", BackendType.CPU)
+def cpu_min(values: Any) -> Any:
+    """
+    Smallest value of a buffer, ignoring NaN (NaN only when every value is).
+    """
+    return _extreme(min, values)
+
+
+@register_kernel("reduce.max", BackendType.CPU)
+def cpu_max(values: Any) -> Any:
+    """
+    Largest value of a buffer, ignoring NaN (NaN only when every value is).
+    """
+    return _extreme(max, values)
+
+
+@register_kernel("hash.mix64", BackendType.CPU)
+def cpu_mix64(keys: Iterable[int]) -> list[int]:
+    """
+    Scrambles 64-bit keys (ints in ``[0, 2**64)``) with murmur3's finalizer,
+    so every output bit depends on every input bit.
+    """
+    h = list(keys)
+    for multiplier in _FMIX:
+        h = list(map(operator.xor, h, map(operator.rshift, h, repeat(33))))
+        products = map(operator.mul, h, repeat(multiplier))
+        h = list(map(operator.and_, products, repeat(_MASK64)))
+    return list(map(operator.xor, h, map(operator.rshift, h, repeat(33))))
+
+
+@register_kernel("sketch.hll_ranks", BackendType.CPU)
+def cpu_hll_ranks(hashes: Sequence[int], precision: int) -> dict[int, int]:
+    """
+    Returns the highest HyperLogLog rank of each register that 64-bit
+    ``hashes`` touch: the register is the top ``precision`` bits of a hash and
+    the rank the position of the first 1 bit after them.
+    """
+    shift = 64 - precision
+    ranks = map(
+        operator.sub,
+        repeat(shift + 1),
+        map(int.bit_length, map(operator.and_, hashes, repeat((1 << shift) - 1))),
+    )
+    registers = map(
+        operator.lshift, map(operator.rshift, hashes, repeat(shift)), repeat(6)
+    )
+    # (register << 6 | rank) pairs in ascending order: the highest rank of a register
+    # is set last
+    pairs = sorted(set(map(operator.or_, registers, ranks)))
+    return dict(
+        zip(
+            map(operator.rshift, pairs, repeat(6)),
+            map(operator.and_, pairs, repeat(63)),
+        )
+    )
@@ -1,3 +1,6 @@
+from .batching import AdaptiveBatchSizer
+from .cache import StepCache
+from .executor import ProcessPool
 from .pipeline import Pipeline
 
-__all__ = ["Pipeline"]
+__all__ = ["Pipeline", "StepCache", "ProcessPool", "AdaptiveBatchSizer"]
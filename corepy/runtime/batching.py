@@ -0,0 +1,192 @@
+import logging
+from dataclasses import dataclass
+from typing import Any, Optional
+
+logger = logging.getLogger("corepy.runtime.batching")
+
+
+@dataclass
+class StageStats:
+    """
+    Accumulated timings of one pipeline stage during streaming.
+    """
+    name: str
+    batches: int = 0
+    rows: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        return self.seconds / self.batches if self.batches else 0.0
+
+
+class AdaptiveBatchSizer:
+    """
+    Picks streaming batch sizes from measured throughput and latency.
+
+    Two modes are supported:
+
+    * ``target_latency`` set: the per-row cost of recent batches (smoothed) is
+      used to size the next batch so that it takes about ``target_latency``
+      seconds end to end.
+    * ``target_latency`` unset: throughput is maximized by growing the batch
+      while rows/sec keeps improving, then settling on the best size seen.
+
+    In both modes the batch is capped so that its estimated footprint stays
+    within ``memory_budget`` bytes. A size is reported as settled once it has
+    stayed within ``tolerance`` for ``settle_after`` consecutive batches.
+    """
+    def __init__(
+        self,
+        initial: int = 1024,
+        min_size: int = 1,
+        max_size: int = 1_000_000,
+        target_latency: Optional[float] = None,
+        memory_budget: Optional[int] = None,
+        growth: float = 2.0,
+        tolerance: float = 0.1,
+        settle_after: int = 3,
+        smoothing: float = 0.5,
+    ):
+        """
+        Initialize an AdaptiveBatchSizer.
+
+        Args:
+            initial: Size of the first batch.
+            min_size: Smallest batch size allowed.
+            max_size: Largest batch size allowed.
+            target_latency: Desired end-to-end seconds per batch, or None to
+                            maximize throughput.
+            memory_budget: Optional upper bound on the bytes of one input batch.
+            growth: Largest factor by which the size may change between batches.
+            tolerance: Relative change below which the size counts as stable.
+            settle_after: Number of stable batches before the size is reported
+                          as settled.
+            smoothing: Weight of the newest measurement in the moving averages.
+        """
+        if not 1 <= min_size <= max_size:
+            raise ValueError("Expected 1 <= min_size <= max_size")
+        if growth <= 1.0:
+            raise ValueError("growth must be greater than 1")
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_latency = target_latency
+        self.memory_budget = memory_budget
+        self.growth = growth
+        self.tolerance = tolerance
+        self.settle_after = settle_after
+        self.smoothing = smoothing
+
+        self._seconds_per_row: Optional[float] = None
+        self._bytes_per_row: Optional[float] = None
+        self._size = self._clamp(initial)
+        self._stable = 0
+        # Throughput-mode hill climbing: best (rows/sec, size) seen so far
+        self._best: Optional[tuple[float, int]] = None
+        self._climbing = True
+        self.stages: dict[str, StageStats] = {}
+        self.history: list[int] = []
+
+    def _clamp(self, size: float) -> int:
+        size = int(max(self.min_size, min(self.max_size, size)))
+        if self.memory_budget is not None and self._bytes_per_row:
+            size = min(
+                size, max(self.min_size, int(self.memory_budget / self._bytes_per_row))
+            )
+        return size
+
+    def _ema(self, old: Optional[float], new: float) -> float:
+        return new if old is None else self.smoothing * new + (1 - self.smoothing) * old
+
+    @property
+    def batch_size(self) -> int:
+        """
+        The size of the next batch.
+        """
+        return self._size
+
+    @property
+    def settled(self) -> bool:
+        """
+        True once the batch size has stopped changing.
+        """
+        return self._stable >= self.settle_after
+
+    def record_stage(self, name: str, rows: int, seconds: float) -> None:
+        """
+        Records the time one stage spent on a batch.
+        """
+        stats = self.stages.setdefault(name, StageStats(name))
+        stats.batches += 1
+        stats.rows += rows
+        stats.seconds += seconds
+
+    def observe(self, rows: int, seconds: float, nbytes: Optional[int] = None) -> int:
+        """
+        Feeds back the measurements of a completed batch and returns the next size.
+
+        Args:
+            rows: Number of input rows in the batch.
+            seconds: End-to-end time spent on the batch.
+            nbytes: Estimated size of the input batch in bytes.
+        """
+        self.history.append(rows)
+        if rows <= 0:
+            return self._size
+        if nbytes is not None:
+            self._bytes_per_row = self._ema(self._bytes_per_row, nbytes / rows)
+        self._seconds_per_row = self._ema(
+            self._seconds_per_row, max(seconds, 1e-9) / rows
+        )
+
+        if self.target_latency is not None:
+            proposed = self.target_latency / self._seconds_per_row
+        else:
+            proposed = self._climb(rows, rows / max(seconds, 1e-9))
+
+        # Bound the step so a single noisy measurement can't swing the size wildly
+        proposed = max(
+            self._size / self.growth, min(self._size * self.growth, proposed)
+        )
+        new_size = self._clamp(proposed)
+
+        if abs(new_size - self._size) <= self.tolerance * self._size:
+            self._stable += 1
+            new_size = self._size
+        else:
+            self._stable = 0
+        if new_size != self._size:
+            logger.debug(f"Batch size {self._size} -> {new_size}")
+        self._size = new_size
+        return self._size
+
+    def _climb(self, rows: int, throughput: float) -> float:
+        if self._best is None or throughput > self._best[0] * (1 + self.tolerance):
+            self._best = (throughput, rows)
+            if self._climbing and rows >= self._size:
+                return rows * self.growth
+        else:
+            # Growing stopped paying off: fall back to the best size seen
+            self._climbing = False
+        return self._best[1]
+
+    def report(self) -> dict[str, Any]:
+        """
+        Summarizes the current batch size and per-stage throughput.
+        """
+        return {
+            "batch_size": self._size,
+            "settled": self.settled,
+            "batches": len(self.history),
+            "stages": {
+                name: {"rows_per_sec": s.rows_per_sec, "mean_latency": s.mean_latency}
+                for name, s in self.stages.items()
+            },
+        }
+
+    def __repr__(self) -> str:
+        return f"AdaptiveBatchSizer(batch_size={self._size}, settled={self.settled})"
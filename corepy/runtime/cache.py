@@ -0,0 +1,388 @@
+import functools
+import hashlib
+import logging
+import operator
+import os
+import pickle
+import re
+import threading
+import types
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+from corepy.data import Table
+
+logger = logging.getLogger("corepy.runtime.cache")
+
+# Values of these types are hashed as they are; other values a step reads
+# (globals, closures, attributes) are hashed by content, see _fingerprint_value.
+_PARAMETER_TYPES = (bool, int, float, complex, str, bytes, type(None))
+
+# Default reprs embed the object's address, which differs on every run
+_ADDRESS = re.compile(r" at 0x[0-9a-fA-F]+>")
+
+_MISSING = object()
+
+# Protocol 4 opcodes that build sets and frozensets
+_SET_OPCODES = (pickle.EMPTY_SET, pickle.FROZENSET)
+
+
+class _Unfingerprintable(Exception):
+    """
+    A step or table holds a value without a stable fingerprint.
+    """
+
+
+def _digest(*parts: bytes) -> str:
+    h = hashlib.blake2b(digest_size=20)
+    for part in parts:
+        h.update(len(part).to_bytes(8, "little"))
+        h.update(part)
+    return h.hexdigest()
+
+
+class _Members(tuple[Any, ...]):
+    """
+    The type name and sorted elements of a set or frozenset.
+    """
+
+
+def _ordered(value: Any) -> Any:
+    """
+    ``value`` with its sets and frozensets, also inside tuples, lists and
+    dicts, replaced by ``_Members``. Set order follows string hashes, which
+    PYTHONHASHSEED changes from one process to the next.
+    """
+    kind = type(value)
+    if isinstance(value, (set, frozenset)):
+        items = list(map(_ordered, value))
+        try:
+            items.sort()
+        except TypeError:
+            items.sort(key=repr)
+        return _Members((kind.__qualname__, *items))
+    if kind is tuple or kind is list:
+        items = list(map(_ordered, value))
+        return value if all(map(operator.is_, items, value)) else kind(items)
+    if kind is dict:
+        pairs = [(_ordered(k), _ordered(v)) for k, v in value.items()]
+        if all(k is a and v is b for (k, v), (a, b) in zip(pairs, value.items())):
+            return value
+        return dict(pairs)
+    return value
+
+
+def _value_bytes(value: Any) -> bytes:
+    """
+    Serializes a parameter value for hashing, with sets in sorted order.
+    Falls back to repr() for objects that cannot be pickled, unless the repr
+    is address-based and so would never match again.
+    """
+    try:
+        data = pickle.dumps(value, protocol=4)
+        if any(opcode in data for opcode in _SET_OPCODES):
+            data = pickle.dumps(_ordered(value), protocol=4)
+        return data
+    except Exception:
+        text = repr(_ordered(value))
+        if _ADDRESS.search(text):
+            raise _Unfingerprintable(type(value).__qualname__) from None
+        return text.encode()
+
+
+def _code_bytes(code: types.CodeType) -> bytes:
+    parts = [
+        code.co_code,
+        repr(code.co_names).encode(),
+        repr(code.co_varnames).encode(),
+    ]
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            parts.append(_code_bytes(const))
+        else:
+            # e.g. the frozenset of ``x in {"a", "b"}``
+            parts.append(repr(_ordered(const)).encode())
+    return b"\x00".join(parts)
+
+
+def _global_names(code: types.CodeType) -> dict[str, None]:
+    """
+    Names ``code`` may read as globals, including inside comprehensions and
+    other nested code objects.
+    """
+    names = dict.fromkeys(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names.update(_global_names(const))
+    return names
+
+
+def _function_parts(func: types.FunctionType, seen: set[int]) -> bytes:
+    if id(func) in seen:
+        return func.__qualname__.encode()
+    seen.add(id(func))
+
+    parts = [func.__qualname__.encode(), _code_bytes(func.__code__)]
+    parts.append(_value_bytes(func.__defaults__))
+    parts.append(_value_bytes(func.__kwdefaults__))
+    for cell in func.__closure__ or ():
+        try:
+            contents = cell.cell_contents
+        except ValueError:  # empty cell
+            continue
+        parts.append(_fingerprint_value(contents, seen))
+
+    # Helpers, classes, constants and other values referenced as globals are
+    # part of the step: editing a helper or a module-level dict must
+    # invalidate every step that reads it. Modules are not hashed.
+    for name in _global_names(func.__code__):
+        value = func.__globals__.get(name, _MISSING)
+        if value is _MISSING or isinstance(value, types.ModuleType):
+            continue
+        if isinstance(value, type):
+            part = _class_parts(value, seen, func.__module__)
+        else:
+            part = _fingerprint_value(value, seen)
+        parts.append(name.encode() + b"=" + part)
+    return b"\x00".join(parts)
+
+
+def _class_parts(cls: type, seen: set[int], module: str) -> bytes:
+    """
+    A class is hashed by its code when it is defined next to the step
+    (``module``); classes imported from elsewhere are hashed by name.
+    """
+    parts = [cls.__module__.encode(), cls.__qualname__.encode()]
+    if cls.__module__ != module or id(cls) in seen:
+        return b"\x00".join(parts)
+    seen.add(id(cls))
+    for name, attr in vars(cls).items():
+        if isinstance(attr, (staticmethod, classmethod)):
+            attr = attr.__func__
+        elif isinstance(attr, property):
+            attr = attr.fget
+        if isinstance(attr, types.FunctionType):
+            parts.append(name.encode() + b"=" + _function_parts(attr, seen))
+        elif isinstance(attr, _PARAMETER_TYPES) and not name.startswith("__"):
+            parts.append(name.encode() + b"=" + _value_bytes(attr))
+    return b"\x00".join(parts)
+
+
+def _fingerprint_value(value: Any, seen: set[int]) -> bytes:
+    if isinstance(value, types.FunctionType):
+        return _function_parts(value, seen)
+    if isinstance(value, types.MethodType):
+        return _fingerprint_value(value.__func__, seen) + _fingerprint_value(
+            value.__self__, seen
+        )
+    if isinstance(value, functools.partial):
+        return b"\x00".join(
+            [
+                _fingerprint_value(value.func, seen),
+                _fingerprint_value(value.args, seen),
+                _fingerprint_value(value.keywords, seen),
+            ]
+        )
+    if isinstance(value, (tuple, list)):
+        return b"\x00".join(_fingerprint_value(v, seen) for v in value)
+    if isinstance(value, dict):
+        return b"\x00".join(
+            _value_bytes(k) + b"=" + _fingerprint_value(v, seen)
+            for k, v in value.items()
+        )
+    if callable(value) and hasattr(value, "__dict__") and not isinstance(value, type):
+        # Callable object: its class code plus its attributes are the parameters.
+        call = type(value).__call__
+        parts = [type(value).__qualname__.encode()]
+        if isinstance(call, types.FunctionType):
+            parts.append(_function_parts(call, seen))
+        parts.append(_fingerprint_value(vars(value), seen))
+        return b"\x00".join(parts)
+    return _value_bytes(value)
+
+
+def fingerprint_step(step: Callable[[Table], Table]) -> Optional[str]:
+    """
+    Returns a stable fingerprint of a step's code and parameters.
+
+    Covers the function bytecode and constants, default arguments, closure
+    variables, ``functools.partial`` arguments, attributes of callable objects,
+    and the helper functions, classes, constants and other values (dicts,
+    lists, objects, hashed by content) the step reads from module globals.
+    Returns None when the step holds a value that has no stable fingerprint
+    (it can neither be pickled nor has a meaningful repr): such a step must
+    not be cached.
+    """
+    try:
+        return _digest(_fingerprint_value(step, set()))
+    except _Unfingerprintable:
+        return None
+
+
+def fingerprint_table(table: Table) -> Optional[str]:
+    """
+    Returns a content fingerprint of a table's data and schema, or None when
+    an object column holds values without a stable fingerprint.
+    Fixed-width column buffers are hashed in place, without conversion.
+    """
+    try:
+        return _table_digest(table)
+    except _Unfingerprintable:
+        return None
+
+
+def _table_digest(table: Table) -> str:
+    h = hashlib.blake2b(digest_size=20)
+    h.update(
+        table.schema.model_dump_json().encode() if table.schema is not None else b""
+    )
+    h.update(len(table).to_bytes(8, "little"))
+    for name in table.column_names:
+        column = table.column(name)
+        h.update(_value_bytes((name, column.dtype.value)))
+        values = column.values
+        h.update(_value_bytes(values) if isinstance(values, list) else values)
+        if column.dictionary is not None:
+            h.update(_value_bytes(column.dictionary))
+        if column.validity is not None:
+            h.update(b"validity")
+            h.update(column.validity)
+    return h.hexdigest()
+
+
+def chain_key(parent_key: str, step_fingerprint: str) -> str:
+    """
+    Derives the cache key of a step's output from its input key and its fingerprint.
+    """
+    return _digest(parent_key.encode(), step_fingerprint.encode())
+
+
+class StepCache:
+    """
+    A content-addressed cache of Pipeline step results.
+
+    Entries are keyed by the fingerprint of the step's code, parameters and input
+    table, and stored as serialized snapshots so that downstream steps mutating
+    a returned table can never corrupt the cache. The in-memory store is an LRU
+    bounded by entry count and (optionally) total bytes. When ``spill_dir`` is
+    set, evicted entries are written there and loaded back on lookup, which also
+    lets separate processes share results.
+    """
+    def __init__(
+        self,
+        max_entries: int = 128,
+        max_bytes: Optional[int] = None,
+        spill_dir: Optional[str] = None,
+    ):
+        """
+        Initialize a StepCache.
+
+        Args:
+            max_entries: Maximum number of results kept in memory.
+            max_bytes: Optional bound on the total size of in-memory results.
+            spill_dir: Optional directory where evicted results are persisted.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._nbytes = 0
+        self.stats: dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "spills": 0,
+        }
+        # Async pipelines look entries up from executor threads
+        self._lock = threading.RLock()
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Total size of the in-memory results in bytes.
+        """
+        return self._nbytes
+
+    def _spill_path(self, key: str) -> str:
+        assert self.spill_dir is not None
+        return os.path.join(self.spill_dir, f"{key}.pkl")
+
+    def __contains__(self, key: str) -> bool:
+        if key in self._entries:
+            return True
+        return bool(self.spill_dir) and os.path.exists(self._spill_path(key))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Table]:
+        """
+        Returns a copy of the cached table for ``key``, or None on a miss.
+        """
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+            elif self.spill_dir and os.path.exists(self._spill_path(key)):
+                with open(self._spill_path(key), "rb") as f:
+                    payload = f.read()
+                self._insert(key, payload)
+            if payload is None:
+                self.stats["misses"] += 1
+                return None
+            self.stats["hits"] += 1
+        table: Table = pickle.loads(payload)
+        return table
+
+    def put(self, key: str, table: Table) -> bool:
+        """
+        Stores a snapshot of ``table`` under ``key``.
+        Returns False if the table cannot be serialized and was not cached.
+        """
+        try:
+            payload = pickle.dumps(table, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.warning(f"Step result for {key} is not cacheable: {e}")
+            return False
+        with self._lock:
+            if key in self._entries:
+                self._nbytes -= len(self._entries.pop(key))
+            self._insert(key, payload)
+        return True
+
+    def _insert(self, key: str, payload: bytes) -> None:
+        self._entries[key] = payload
+        self._nbytes += len(payload)
+        while len(self._entries) > self.max_entries or (
+            self.max_bytes is not None and self._nbytes > self.max_bytes
+        ):
+            self._evict()
+
+    def _evict(self) -> None:
+        key, payload = self._entries.popitem(last=False)
+        self._nbytes -= len(payload)
+        self.stats["evictions"] += 1
+        if self.spill_dir and not os.path.exists(self._spill_path(key)):
+            tmp_path = self._spill_path(key) + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, self._spill_path(key))
+            self.stats["spills"] += 1
+
+    def clear(self) -> None:
+        """
+        Drops all in-memory results. Spilled files are left in place.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"StepCache(entries={len(self)}, bytes={self._nbytes}, "
+            f"spill_dir={self.spill_dir!r})"
+        )
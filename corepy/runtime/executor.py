@@ -0,0 +1,201 @@
+import multiprocessing
+import os
+from collections import deque
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from multiprocessing import resource_tracker
+from typing import Any, Callable, Optional
+
+from corepy.data import Table, concat
+
+from .shm import TableDescriptor, attach_table, export_table, import_table, release
+
+
+def _warm_worker(_: int) -> int:
+    return os.getpid()
+
+
+def _run_partition(
+    steps: list[Callable[[Table], Table]], descriptor: TableDescriptor
+) -> TableDescriptor:
+    """
+    Worker entry point: maps the input partition, runs the steps and publishes
+    the result into a new shared-memory block owned by the parent from now on.
+    """
+    block, result = attach_table(descriptor)
+    for step in steps:
+        result = step(result)
+    shm, out = export_table(result)
+    shm.close()
+    # The input columns are views into the block; drop them before unmapping it
+    del result
+    try:
+        block.close()
+    except BufferError:
+        # A step kept a reference to an input column: leave the mapping to the GC
+        pass
+    return out
+
+
+def _produce_table(func: Callable[..., Table], args: Sequence[Any]) -> TableDescriptor:
+    """
+    Worker entry point: builds a table and publishes it into shared memory.
+    """
+    shm, out = export_table(func(*args))
+    shm.close()
+    return out
+
+
+def _receive(future: "Future[TableDescriptor]") -> Table:
+    out = future.result()
+    try:
+        return import_table(out)
+    finally:
+        release(out)
+
+
+def _discard(futures: Iterable["Future[TableDescriptor]"]) -> None:
+    """
+    Cancels pending tasks and frees the result blocks of tasks that already finished.
+    """
+    for future in futures:
+        if future.cancel():
+            continue
+        try:
+            release(future.result())
+        except Exception:
+            pass
+
+
+class ProcessPool:
+    """
+    A warm pool of worker processes for CPU-bound Pipeline steps.
+
+    Workers are started on first use (or by ``warmup``) and reused across runs
+    until ``shutdown``. Tables travel to and from workers through shared memory,
+    so only small descriptors and the step callables are pickled. Steps must
+    therefore be picklable (e.g. module-level functions).
+    """
+    def __init__(
+        self, max_workers: Optional[int] = None, mp_context: Optional[Any] = None
+    ):
+        """
+        Initialize a ProcessPool.
+
+        Args:
+            max_workers: Number of worker processes (default: CPU count).
+            mp_context: Optional multiprocessing context (e.g.
+                        ``get_context("spawn")``).
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._mp_context = mp_context
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Workers must share the parent's resource tracker: blocks are
+            # created on one side of the pool and unlinked on the other.
+            resource_tracker.ensure_running()
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=self._mp_context or multiprocessing.get_context(),
+            )
+        return self._executor
+
+    def warmup(self) -> None:
+        """
+        Starts all worker processes ahead of the first run.
+        """
+        pool = self._pool()
+        list(pool.map(_warm_worker, range(self.max_workers)))
+
+    def run(
+        self,
+        steps: list[Callable[[Table], Table]],
+        data: Table,
+        partitions: Optional[int] = None,
+    ) -> Table:
+        """
+        Runs ``steps`` over ``data`` split into row partitions, one task per partition.
+
+        Steps must be row-partitionable: applying them to each slice of rows and
+        concatenating the results must equal applying them to the whole table.
+        """
+        partitions = max(1, min(partitions or self.max_workers, len(data)))
+        if not len(data) or not steps:
+            result = data
+            for step in steps:
+                result = step(result)
+            return result
+
+        bounds = [len(data) * i // partitions for i in range(partitions + 1)]
+        inputs = []
+        futures = []
+        try:
+            for lo, hi in zip(bounds, bounds[1:]):
+                shm, descriptor = export_table(data.slice(lo, hi - lo))
+                inputs.append(shm)
+                futures.append(self._pool().submit(_run_partition, steps, descriptor))
+
+            parts: list[Table] = []
+            for i, future in enumerate(futures):
+                try:
+                    parts.append(_receive(future))
+                except BaseException:
+                    # Don't leak the result blocks of partitions that did finish
+                    _discard(futures[i + 1:])
+                    raise
+        finally:
+            for shm in inputs:
+                shm.close()
+                shm.unlink()
+        return concat(parts)
+
+    def imap_tables(
+        self,
+        func: Callable[..., Table],
+        args: Iterable[Sequence[Any]],
+        prefetch: Optional[int] = None,
+    ) -> Iterator[Table]:
+        """
+        Calls ``func(*a)`` in the workers for each ``a`` in ``args`` and yields
+        the resulting tables in order. Results come back through shared memory.
+
+        Args:
+            func: A picklable (module-level) function returning a Table.
+            args: Argument tuples, consumed lazily.
+            prefetch: Number of tasks kept in flight (default: twice the worker count).
+        """
+        pool = self._pool()
+        args = iter(args)
+        pending: deque[Future[TableDescriptor]] = deque(
+            pool.submit(_produce_table, func, a)
+            for a in islice(args, prefetch or 2 * self.max_workers)
+        )
+        try:
+            while pending:
+                table = _receive(pending.popleft())
+                for a in islice(args, 1):
+                    pending.append(pool.submit(_produce_table, func, a))
+                yield table
+        finally:
+            _discard(pending)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stops the worker processes.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    def __enter__(self) -> "ProcessPool":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.shutdown()
+
+    def __repr__(self) -> str:
+        state = "running" if self._executor is not None else "idle"
+        return f"ProcessPool(max_workers={self.max_workers}, state={state})"
@@ -1,27 +1,347 @@
-from typing import Any, List, Callable
-from corepy.data import Table
+import asyncio
+import inspect
+import time
+import weakref
+from collections import deque
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
+from concurrent.futures import Executor
+from typing import Any, Callable, Optional, Union
+
+from corepy.data import Table, concat
+
+from .batching import AdaptiveBatchSizer
+from .cache import StepCache, chain_key, fingerprint_step, fingerprint_table
+from .executor import ProcessPool
+
+
+def _is_async_step(step: Callable[..., Any]) -> bool:
+    return inspect.iscoroutinefunction(step) or (
+        callable(step) and inspect.iscoroutinefunction(type(step).__call__)
+    )
+
+
+async def _aiter_batches(
+    batches: Union[Iterable[Table], AsyncIterable[Table]],
+) -> AsyncIterator[Table]:
+    if hasattr(batches, "__aiter__"):
+        async for batch in batches:
+            yield batch
+    else:
+        for batch in batches:
+            yield batch
+
 
 class Pipeline:
     """
     A linear execution pipeline for data transformations.
     """
-    def __init__(self, steps: List[Callable[[Table], Table]] = None):
+    def __init__(
+        self,
+        steps: list[Callable[[Table], Table]] = None,
+        cache: Optional[StepCache] = None,
+    ):
+        """
+        Initialize a Pipeline.
+
+        Args:
+            steps: Initial transformation steps, applied in order.
+            cache: Optional StepCache. When set, step results are stored under a
+                   fingerprint of the step's code, parameters and input, and
+                   reruns skip every step whose result is already cached.
+        """
         self.steps = steps or []
+        self.cache = cache
+        self._last_status: list[str] = []
+        self._max_concurrency: dict[int, int] = {}
+        # Per-event-loop semaphores enforcing the per-step concurrency limits
+        self._semaphores: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[int, asyncio.Semaphore]
+        ] = weakref.WeakKeyDictionary()
 
-    def add_step(self, step: Callable[[Table], Table]) -> None:
+    def add_step(
+        self, step: Callable[[Table], Table], max_concurrency: Optional[int] = None
+    ) -> None:
         """
         Adds a transformation step to the pipeline.
+
+        Args:
+            step: A callable taking and returning a Table. Coroutine functions are
+                  awaited by ``arun``/``astream``; plain callables are offloaded
+                  to an executor there.
+            max_concurrency: Optional limit on how many batches may execute this
+                  step at the same time during async execution.
         """
+        if max_concurrency is not None:
+            if max_concurrency < 1:
+                raise ValueError("max_concurrency must be at least 1")
+            self._max_concurrency[len(self.steps)] = max_concurrency
         self.steps.append(step)
 
-    def run(self, data: Table) -> Table:
+    def run(
+        self,
+        data: Table,
+        pool: Optional[ProcessPool] = None,
+        partitions: Optional[int] = None,
+    ) -> Table:
         """
         Executes the pipeline on the given data.
+
+        Args:
+            data: Input table.
+            pool: Optional ProcessPool. When set, the rows are split into
+                  ``partitions`` slices and each slice runs through the steps in
+                  a worker process. Steps must be picklable and row-partitionable.
+            partitions: Number of row partitions (default: the pool size).
         """
-        result = data
+        if self.cache is None:
+            self._last_status = ["run"] * len(self.steps)
+            if pool is not None:
+                return pool.run(self.steps, data, partitions)
+            result = data
+            for step in self.steps:
+                result = step(result)
+            return result
+        return self._run_cached(data, pool, partitions)
+
+    def _run_cached(
+        self, data: Table, pool: Optional[ProcessPool], partitions: Optional[int]
+    ) -> Table:
+        keys, start, result, self._last_status = self._resume_point(data)
+        if pool is not None:
+            # The remaining steps run as one chain per partition, so only the
+            # final result is materialized in this process and cached.
+            if start < len(self.steps):
+                result = pool.run(self.steps[start:], result, partitions)
+                self._store(keys[-1], result)
+            return result
+        for i in range(start, len(self.steps)):
+            result = self.steps[i](result)
+            self._store(keys[i], result)
+        return result
+
+    def _store(self, key: Optional[str], result: Table) -> None:
+        if self.cache is not None and key is not None:
+            self.cache.put(key, result)
+
+    def _resume_point(
+        self, data: Table
+    ) -> tuple[list[Optional[str]], int, Table, list[str]]:
+        """
+        Computes the step cache keys and finds the deepest cached step.
+        Returns the keys, the index of the first step to execute, its input
+        and how each step is resolved (see ``explain``).
+        """
+        # Keys chain through the step fingerprints, so the key of step i only
+        # depends on the input table and steps 0..i. Intermediate results never
+        # need to be hashed. A step without a stable fingerprint (None) and
+        # every step after it are run without caching.
+        assert self.cache is not None
+        keys: list[Optional[str]] = []
+        key = fingerprint_table(data)
         for step in self.steps:
-            result = step(result)
+            fingerprint = fingerprint_step(step)
+            if key is not None and fingerprint is not None:
+                key = chain_key(key, fingerprint)
+            else:
+                key = None
+            keys.append(key)
+
+        # Resume after the deepest cached step; everything upstream of it is skipped.
+        status = ["miss" if key is not None else "run" for key in keys]
+        start, result = 0, data
+        for i in range(len(self.steps) - 1, -1, -1):
+            key = keys[i]
+            if key is None:
+                continue
+            cached = self.cache.get(key)
+            if cached is not None:
+                status[:i] = ["skipped"] * i
+                status[i] = "hit"
+                start, result = i + 1, cached
+                break
+        return keys, start, result, status
+
+    def stream(
+        self,
+        data: Union[Table, Iterable[Table]],
+        batch_size: Union[int, AdaptiveBatchSizer] = 1024,
+    ) -> Iterator[Table]:
+        """
+        Runs the pipeline batch by batch, yielding one result per input batch.
+
+        Args:
+            data: A Table to split into batches, or an iterable of Tables whose
+                  rows are re-batched.
+            batch_size: A fixed number of rows per batch, or an AdaptiveBatchSizer
+                  that measures each stage and resizes batches as it goes. Its
+                  ``report()`` gives the settled size and per-stage rows/sec.
+        """
+        sizer = batch_size if isinstance(batch_size, AdaptiveBatchSizer) else None
+        if not isinstance(batch_size, AdaptiveBatchSizer) and batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        names = [
+            getattr(step, "__qualname__", None) or type(step).__name__
+            for step in self.steps
+        ]
+
+        for batch in self._batches(data, sizer, batch_size):
+            if sizer is None:
+                result = batch
+                for step in self.steps:
+                    result = step(result)
+                yield result
+                continue
+
+            rows = len(batch)
+            start = time.perf_counter()
+            result = batch
+            for i, step in enumerate(self.steps):
+                t0 = time.perf_counter()
+                result = step(result)
+                sizer.record_stage(f"[{i}] {names[i]}", rows, time.perf_counter() - t0)
+            sizer.observe(rows, time.perf_counter() - start, batch.nbytes)
+            yield result
+
+    @staticmethod
+    def _batches(
+        data: Union[Table, Iterable[Table]],
+        sizer: Optional[AdaptiveBatchSizer],
+        fixed_size: Any,
+    ) -> Iterator[Table]:
+        sources = [data] if isinstance(data, Table) else data
+        # Rows of previous sources that didn't fill a whole batch yet
+        pending: Optional[Table] = None
+        for source in sources:
+            pending = (
+                source
+                if pending is None or not len(pending)
+                else concat([pending, source])
+            )
+            offset = 0
+            # The size is re-read after every batch: the sizer adapts as we go
+            size = sizer.batch_size if sizer is not None else fixed_size
+            while len(pending) - offset >= size:
+                yield pending.slice(offset, size)
+                offset += size
+                size = sizer.batch_size if sizer is not None else fixed_size
+            if offset:
+                pending = pending.slice(offset)
+        if pending is not None and len(pending):
+            yield pending
+
+    def _step_semaphore(self, index: int) -> Optional[asyncio.Semaphore]:
+        limit = self._max_concurrency.get(index)
+        if limit is None:
+            return None
+        loop_semaphores = self._semaphores.setdefault(asyncio.get_running_loop(), {})
+        if index not in loop_semaphores:
+            loop_semaphores[index] = asyncio.Semaphore(limit)
+        return loop_semaphores[index]
+
+    async def _arun_step(
+        self, index: int, data: Table, executor: Optional[Executor]
+    ) -> Table:
+        step = self.steps[index]
+        semaphore = self._step_semaphore(index)
+        if semaphore is not None:
+            await semaphore.acquire()
+        result: Table
+        try:
+            if _is_async_step(step):
+                # Declared as returning a Table, but awaitable when async
+                pending: Any = step(data)
+                result = await pending
+            else:
+                result = await asyncio.get_running_loop().run_in_executor(
+                    executor, step, data
+                )
+                if inspect.isawaitable(result):
+                    result = await result
+        finally:
+            if semaphore is not None:
+                semaphore.release()
         return result
 
+    async def arun(self, data: Table, executor: Optional[Executor] = None) -> Table:
+        """
+        Executes the pipeline on the given data without blocking the event loop.
+
+        Coroutine steps are awaited on the running loop. Plain steps run in
+        ``executor`` (the loop's default thread pool if None), so file reads and
+        service calls inside them overlap with other tasks.
+        """
+        result, self._last_status = await self._arun(data, executor)
+        return result
+
+    async def _arun(
+        self, data: Table, executor: Optional[Executor]
+    ) -> tuple[Table, list[str]]:
+        """
+        Runs the pipeline once; returns the result and this run's step statuses.
+        """
+        if self.cache is None:
+            keys: list[Optional[str]] = [None] * len(self.steps)
+            start, result, status = 0, data, ["run"] * len(self.steps)
+        else:
+            # Hashing the input and reading spilled entries would block the loop
+            loop = asyncio.get_running_loop()
+            resumed = await loop.run_in_executor(executor, self._resume_point, data)
+            keys, start, result, status = resumed
+        for i in range(start, len(self.steps)):
+            result = await self._arun_step(i, result, executor)
+            self._store(keys[i], result)
+        return result, status
+
+    async def astream(
+        self,
+        batches: Union[Iterable[Table], AsyncIterable[Table]],
+        max_in_flight: int = 4,
+        executor: Optional[Executor] = None,
+    ) -> AsyncIterator[Table]:
+        """
+        Runs the pipeline over a stream of batches, yielding results in input order.
+
+        Up to ``max_in_flight`` batches are processed concurrently, so their I/O
+        waits overlap. Per-step limits set with ``add_step(max_concurrency=...)``
+        still apply across all in-flight batches. ``explain`` describes the
+        most recently yielded batch.
+
+        Args:
+            batches: An iterable or async iterable of input Tables.
+            max_in_flight: Maximum number of batches being processed at once.
+            executor: Executor for plain (non-async) steps.
+        """
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        pending: deque[asyncio.Future[tuple[Table, list[str]]]] = deque()
+        try:
+            async for batch in _aiter_batches(batches):
+                pending.append(asyncio.ensure_future(self._arun(batch, executor)))
+                if len(pending) >= max_in_flight:
+                    result, self._last_status = await pending.popleft()
+                    yield result
+            while pending:
+                result, self._last_status = await pending.popleft()
+                yield result
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def explain(self) -> str:
+        """
+        Describes the pipeline steps and, after a run, how each step was resolved.
+
+        With a cache, each step is reported as ``hit`` (result loaded from the
+        cache), ``skipped`` (upstream of a hit, not executed), ``miss``
+        (executed and stored) or ``run`` (executed, not cacheable: the step or
+        one before it holds a value without a stable fingerprint).
+        """
+        lines = [repr(self) if self.cache is None else f"{self!r} cache={self.cache!r}"]
+        for i, step in enumerate(self.steps):
+            name = getattr(step, "__qualname__", None) or type(step).__name__
+            status = self._last_status[i] if i < len(self._last_status) else "-"
+            lines.append(f"  [{i}] {name:<32} {status}")
+        return "\n".join(lines)
+
     def __repr__(self) -> str:
         return f"Pipeline(steps={len(self.steps)})"
@@ -0,0 +1,205 @@
+"""
+Shared-memory transfer of Tables between processes.
+
+A table is packed into a single ``multiprocessing.shared_memory`` block with one
+64-byte aligned buffer per column (plus its validity bitmap). Only a small
+descriptor (block name, column offsets and dtypes) crosses the process
+boundary; ``attach_table`` wraps the column buffers as typed ``memoryview``
+casts without copying them. Categorical columns share their codes the same
+way; their (small) dictionary travels inside the descriptor.
+"""
+import pickle
+import sys
+from array import array
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from typing import Optional, Union
+
+from corepy.backend.types import DataType
+from corepy.data import Column, Table
+from corepy.data.column import TYPECODES
+from corepy.schema import Schema
+
+ALIGNMENT = 64
+
+
+@dataclass
+class ColumnDescriptor:
+    """
+    Location of one column inside a shared-memory block.
+    Fixed-width columns hold raw values and categorical columns raw codes
+    (of typecode ``codes``); other columns hold a pickled list.
+    """
+    name: str
+    dtype: str
+    offset: int
+    nbytes: int
+    validity_offset: Optional[int] = None
+    validity_nbytes: int = 0
+    codes: Optional[str] = None
+    dictionary: Optional[list[str]] = None
+
+
+@dataclass
+class TableDescriptor:
+    """
+    A picklable handle to a Table packed into shared memory.
+    """
+    shm_name: str
+    num_rows: int
+    columns: list[ColumnDescriptor] = field(default_factory=list)
+    schema_json: Optional[str] = None
+
+
+# A column's descriptor, its values as bytes and its validity bitmap
+Payload = tuple[
+    ColumnDescriptor, memoryview, Optional[Union[bytes, bytearray, memoryview]]
+]
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _attach(name: str, track: bool = True) -> shared_memory.SharedMemory:
+    # Python 3.13+ can skip resource tracking for blocks owned by another process
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=track)
+    return shared_memory.SharedMemory(name=name)
+
+
+def table_layout(table: Table) -> tuple[TableDescriptor, list[Payload], int]:
+    """
+    Plans the packing of ``table``: its descriptor (without a block name),
+    the payloads to write at the descriptor's offsets and the bytes needed.
+    """
+    payloads: list[Payload] = []
+    descriptors = []
+    offset = 0
+    for name in table.column_names:
+        column = table.column(name)
+        values = column.values
+        codes = None
+        if isinstance(values, list):
+            payload = memoryview(pickle.dumps(values, protocol=pickle.HIGHEST_PROTOCOL))
+        else:
+            payload = memoryview(values).cast("B")
+            if column.dictionary is not None:
+                codes = memoryview(values).format
+        col = ColumnDescriptor(
+            name, column.dtype.value, _align(offset), payload.nbytes, codes=codes
+        )
+        if column.dictionary is not None:
+            col.dictionary = list(column.dictionary)
+        offset = col.offset + col.nbytes
+        if column.validity is not None:
+            col.validity_offset = _align(offset)
+            col.validity_nbytes = len(column.validity)
+            offset = col.validity_offset + col.validity_nbytes
+        payloads.append((col, payload, column.validity))
+        descriptors.append(col)
+
+    schema_json = table.schema.model_dump_json() if table.schema is not None else None
+    return TableDescriptor("", len(table), descriptors, schema_json), payloads, offset
+
+
+def write_payloads(
+    buf: memoryview,
+    payloads: list[Payload],
+    base: int = 0,
+) -> None:
+    """
+    Copies the payloads planned by ``table_layout`` into ``buf``, ``base`` bytes in.
+    """
+    for col, payload, validity in payloads:
+        buf[base + col.offset:base + col.offset + col.nbytes] = payload
+        if validity is not None:
+            assert col.validity_offset is not None
+            start = base + col.validity_offset
+            buf[start:start + col.validity_nbytes] = validity
+
+
+def export_table(table: Table) -> tuple[shared_memory.SharedMemory, TableDescriptor]:
+    """
+    Packs ``table`` into a new shared-memory block.
+
+    The caller owns the returned block and is responsible for unlinking it once
+    the receiving side is done (see ``release``).
+    """
+    descriptor, payloads, size = table_layout(table)
+    shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    assert shm.buf is not None  # None only once closed
+    write_payloads(shm.buf, payloads)
+    descriptor.shm_name = shm.name
+    return shm, descriptor
+
+
+def table_from_buffer(
+    buf: memoryview, descriptor: TableDescriptor, copy: bool, base: int = 0
+) -> Table:
+    """
+    Rebuilds a table packed at ``base`` in ``buf``. Without ``copy`` its
+    fixed-width columns and validity bitmaps are views into ``buf``.
+    """
+    columns = {}
+    for col in descriptor.columns:
+        dtype = DataType(col.dtype)
+        raw = buf[base + col.offset:base + col.offset + col.nbytes]
+        typecode = col.codes or TYPECODES.get(dtype)
+        if typecode is not None:
+            if copy:
+                values = array(typecode)
+                values.frombytes(raw)
+            else:
+                values = raw.cast(typecode)  # type: ignore[call-overload]
+        else:
+            values = pickle.loads(raw)
+        validity: Optional[Union[bytes, memoryview]] = None
+        if col.validity_offset is not None:
+            start = base + col.validity_offset
+            validity = buf[start:start + col.validity_nbytes]
+            if copy:
+                validity = bytes(validity)
+        columns[col.name] = Column(dtype, values, validity, col.dictionary)
+    schema = (
+        Schema.model_validate_json(descriptor.schema_json)
+        if descriptor.schema_json
+        else None
+    )
+    return Table._from_columns(columns, schema, descriptor.num_rows)
+
+
+def attach_table(
+    descriptor: TableDescriptor,
+) -> tuple[shared_memory.SharedMemory, Table]:
+    """
+    Maps a Table published by ``export_table`` without copying its buffers.
+
+    The returned table's fixed-width columns are views into the shared block,
+    which must stay open while the table is in use.
+    """
+    shm = _attach(descriptor.shm_name, track=False)
+    assert shm.buf is not None
+    return shm, table_from_buffer(shm.buf, descriptor, copy=False)
+
+
+def import_table(descriptor: TableDescriptor) -> Table:
+    """
+    Copies a Table published by ``export_table`` into private memory.
+    The block is closed (but not unlinked) before returning.
+    """
+    shm = _attach(descriptor.shm_name, track=False)
+    try:
+        assert shm.buf is not None
+        return table_from_buffer(shm.buf, descriptor, copy=True)
+    finally:
+        shm.close()
+
+
+def release(descriptor: TableDescriptor) -> None:
+    """
+    Unlinks the shared-memory block behind ``descriptor``.
+    """
+    shm = _attach(descriptor.shm_name)
+    shm.close()
+    shm.unlink()
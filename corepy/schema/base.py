@@ -1,9 +1,13 @@
 from typing import Any, Dict, List, Optional
-from pydantic import BaseModel, Field as PydanticField
+from pydantic import BaseModel, Field as PydanticField, PrivateAttr
 
 class Field(BaseModel):
     """
     Represents a single field in a schema.
+
+    Besides free-form annotations, ``metadata`` may hold constraints that
+    ``Table`` validation enforces: ``nullable`` (bool, default True), inclusive
+    ``min``/``max`` bounds and ``enum`` (the allowed values).
     """
     name: str
     dtype: str
@@ -14,6 +18,9 @@ class Schema(BaseModel):
     Defines the structure of a dataset.
     """
     fields: List[Field]
+    # Name -> position in ``fields``, rebuilt when the list is replaced or resized
+    _index: dict[str, int] = PrivateAttr(default_factory=dict)
+    _index_key: Optional[tuple[int, int]] = PrivateAttr(default=None)
 
     def add_field(self, name: str, dtype: str, metadata: Optional[Dict[str, Any]] = None) -> None:
         """
@@ -21,14 +28,31 @@ class Schema(BaseModel):
         """
         self.fields.append(Field(name=name, dtype=dtype, metadata=metadata or {}))
 
+    def _field_index(self, rebuild: bool = False) -> dict[str, int]:
+        key = (id(self.fields), len(self.fields))
+        if rebuild or self._index_key != key:
+            index: dict[str, int] = {}
+            for i, field in enumerate(self.fields):
+                index.setdefault(field.name, i)
+            self._index = index
+            self._index_key = key
+        return self._index
+
     def get_field(self, name: str) -> Optional[Field]:
         """
         Retrieves a field by name.
         """
-        for field in self.fields:
-            if field.name == name:
-                return field
-        return None
+        i = self._field_index().get(name)
+        if i is not None and self.fields[i].name != name:
+            # The field at that position was replaced in place
+            i = self._field_index(rebuild=True).get(name)
+        return None if i is None else self.fields[i]
+
+    def __eq__(self, other: Any) -> bool:
+        # Compare the fields only, not the lookup index
+        if not isinstance(other, Schema):
+            return NotImplemented
+        return self.fields == other.fields
 
     def __repr__(self) -> str:
         return f"Schema(fields={self.fields})"
@@ -0,0 +1,350 @@
+"""
+A named, cross-process store of read-only Tables and Tensors.
+
+``put(name, obj)`` copies the object's buffers once into a POSIX shared-memory
+block named after ``name``; ``get(name)`` in any process on the machine maps
+that block and returns a Table or Tensor whose buffers are views into it, so N
+worker processes share one copy of the data instead of holding N.
+
+A block starts with a small header: a holder table of ``(pid, count)`` slots
+that reference-counts the block across processes, then the pickled
+descriptor of the object (column offsets and dtypes, or tensor dtype and
+shape) and finally the 64-byte aligned buffers themselves.
+
+* ``put`` takes one reference for the publishing process, dropped with
+  ``release(name)``.
+* Each ``get`` takes a reference that is dropped when the returned object is
+  garbage-collected (or the process exits).
+* Slots of processes that died without releasing are reclaimed on the next
+  update, so a crashed worker does not pin the block.
+
+When the last reference goes, the name is unlinked. Mappings still open (e.g.
+a column kept after its table was dropped) stay valid until they are dropped.
+Holder updates are serialized by locking the block (``flock``, or a lock file
+where shared-memory descriptors cannot be locked). A lock file outlives its
+block: removing it could let two processes lock different files of one name.
+Windows has no ``flock``; there the operating system frees the block once
+every handle is closed.
+"""
+import hashlib
+import mmap
+import os
+import pickle
+import sys
+import tempfile
+import weakref
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Union
+
+from corepy.backend.types import DataType
+from corepy.data import Table
+from corepy.data.column import TYPECODES
+from corepy.data.tensors import _flat, _tensor
+from corepy.runtime.shm import (
+    ALIGNMENT,
+    TableDescriptor,
+    table_from_buffer,
+    table_layout,
+    write_payloads,
+)
+from corepy.tensor import Tensor
+
+if sys.platform != "win32":
+    import fcntl
+
+MAGIC = b"CPSHARE1"
+
+# Processes that can hold one object at a time
+MAX_HOLDERS = 256
+
+# Header: magic, descriptor length, data offset, then (pid, count) slots
+_HOLDERS = len(MAGIC) + 16
+_DESCRIPTOR = _HOLDERS + MAX_HOLDERS * 16
+
+# Objects mapped by this process, so repeated gets share one mapping
+_attached: "weakref.WeakValueDictionary[tuple[int, str], Union[Table, Tensor]]" = (
+    weakref.WeakValueDictionary()
+)
+
+
+@dataclass
+class TensorDescriptor:
+    """
+    Location of a Tensor's buffer inside a shared block.
+    """
+    dtype: str
+    shape: tuple[int, ...]
+    nbytes: int
+
+
+def _block_name(name: str) -> str:
+    # Short and free of '/', within the name limits of every POSIX platform
+    return "cp_" + hashlib.sha1(name.encode("utf8")).hexdigest()[:24]
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _fd(shm: shared_memory.SharedMemory) -> int:
+    # SharedMemory keeps its POSIX descriptor private
+    fd: int = shm._fd  # type: ignore[attr-defined]
+    return fd
+
+
+def _tracked_name(shm: shared_memory.SharedMemory) -> str:
+    # The name as the resource tracker knows it (with the leading '/')
+    name: str = shm._name  # type: ignore[attr-defined]
+    return name
+
+
+def _open(
+    block: str, create: bool = False, size: int = 0
+) -> shared_memory.SharedMemory:
+    """
+    Opens a block whose lifetime the holder table manages, not the process
+    that happened to create or open it.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(block, create, size, track=False)
+    shm = shared_memory.SharedMemory(block, create, size)
+    if os.name == "posix":
+        resource_tracker.unregister(_tracked_name(shm), "shared_memory")
+    return shm
+
+
+def _unlink(shm: shared_memory.SharedMemory) -> None:
+    if sys.version_info < (3, 13) and os.name == "posix":
+        # unlink() unregisters from the resource tracker, which _open skipped
+        resource_tracker.register(_tracked_name(shm), "shared_memory")
+    shm.unlink()
+
+
+def _map(shm: shared_memory.SharedMemory) -> mmap.mmap:
+    """
+    A read-only mapping of the block. Views into it keep it alive on their
+    own, so the SharedMemory handle can be closed at once, and writes through
+    them raise instead of reaching every other process mapping the block.
+    """
+    if sys.platform == "win32":
+        return mmap.mmap(-1, shm.size, tagname=shm.name, access=mmap.ACCESS_READ)
+    return mmap.mmap(_fd(shm), shm.size, access=mmap.ACCESS_READ)
+
+
+def _lock_path(shm: shared_memory.SharedMemory) -> str:
+    return os.path.join(tempfile.gettempdir(), f"{shm.name}.lock")
+
+
+@contextmanager
+def _locked(shm: shared_memory.SharedMemory) -> Iterator[None]:
+    if sys.platform == "win32":
+        yield
+        return
+    try:
+        fcntl.flock(_fd(shm), fcntl.LOCK_EX)
+    except OSError:
+        # macOS cannot lock shared-memory descriptors
+        with open(_lock_path(shm), "a+b") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
+        return
+    try:
+        yield
+    finally:
+        fcntl.flock(_fd(shm), fcntl.LOCK_UN)
+
+
+def _find(name: str) -> shared_memory.SharedMemory:
+    try:
+        return _open(_block_name(name))
+    except FileNotFoundError:
+        raise KeyError(f"No shared object named '{name}'") from None
+
+
+def _alive(pid: int) -> bool:
+    if pid == os.getpid() or os.name == "nt":
+        # os.kill cannot probe a process on Windows (it terminates it)
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # Owned by another user: alive
+        return True
+    return True
+
+
+def _update(buf: Any, pid: int, delta: int) -> int:
+    """
+    Adds ``delta`` to ``pid``'s holder count, clearing the slots of dead
+    processes, and returns the total count. The caller holds the lock.
+    """
+    slots = buf[_HOLDERS:_DESCRIPTOR].cast("q")
+    try:
+        free = None
+        total = 0
+        for i in range(0, len(slots), 2):
+            holder = slots[i]
+            if holder and holder != pid and not _alive(holder):
+                slots[i] = slots[i + 1] = 0
+                holder = 0
+            if holder == pid:
+                slots[i + 1] = max(0, slots[i + 1] + delta)
+                delta = 0
+                if not slots[i + 1]:
+                    slots[i] = 0
+            elif not holder and free is None:
+                free = i
+            total += slots[i + 1]
+        if delta > 0:
+            if free is None:
+                raise ValueError(
+                    f"More than {MAX_HOLDERS} processes hold this shared object"
+                )
+            slots[free], slots[free + 1] = pid, delta
+            total += delta
+        return total
+    finally:
+        slots.release()
+
+
+def _attach(name: str) -> tuple[mmap.mmap, Any]:
+    """
+    Maps the block of ``name`` and takes a reference to it for this process.
+    Returns the mapping and the object's descriptor.
+    """
+    shm = _find(name)
+    try:
+        mapping = _map(shm)
+        buf = memoryview(mapping)
+        pid = os.getpid()
+        # The holder table is updated through the handle's own, writable mapping
+        with _locked(shm):
+            # No magic yet: still being written; no holders: being deleted
+            if bytes(buf[:len(MAGIC)]) != MAGIC or not _update(shm.buf, pid, 0):
+                raise KeyError(f"No shared object named '{name}'")
+            _update(shm.buf, pid, 1)
+        length, base = buf[len(MAGIC):_HOLDERS].cast("q")
+        descriptor = pickle.loads(buf[_DESCRIPTOR:_DESCRIPTOR + length])
+        buf.release()
+    finally:
+        shm.close()
+    return mapping, (descriptor, base)
+
+
+def _drop(name: str, pid: int) -> None:
+    """
+    Releases one of ``pid``'s references to ``name``, unlinking the block
+    when none is left.
+    """
+    if os.getpid() != pid:
+        # A forked child inherited the object; the reference is its parent's
+        return
+    try:
+        shm = _find(name)
+    except KeyError:
+        return
+    try:
+        with _locked(shm):
+            if not _update(shm.buf, pid, -1):
+                _unlink(shm)
+    finally:
+        shm.close()
+
+
+def put(name: str, obj: Union[Table, Tensor]) -> None:
+    """
+    Publishes a Table or Tensor under ``name`` for every process on this
+    machine. The data is copied once; the publishing process holds a reference
+    until it calls ``release(name)``.
+    """
+    descriptor: Union[TableDescriptor, TensorDescriptor]
+    if isinstance(obj, Table):
+        descriptor, payloads, size = table_layout(obj)
+    elif isinstance(obj, Tensor):
+        flat, dtype = _flat(obj._backing_data, obj.dtype)
+        data = memoryview(flat).cast("B")
+        descriptor = TensorDescriptor(dtype.value, tuple(obj.shape), data.nbytes)
+        size = data.nbytes
+    else:
+        raise TypeError(
+            f"Only Tables and Tensors can be shared, got {type(obj).__name__}"
+        )
+
+    header = pickle.dumps(descriptor, protocol=pickle.HIGHEST_PROTOCOL)
+    base = _align(_DESCRIPTOR + len(header))
+    try:
+        shm = _open(_block_name(name), create=True, size=base + size)
+    except FileExistsError:
+        raise ValueError(f"A shared object named '{name}' already exists") from None
+    try:
+        with _locked(shm):
+            buf = shm.buf
+            assert buf is not None  # None only once closed
+            if isinstance(obj, Table):
+                write_payloads(buf, payloads, base)
+            else:
+                buf[base:base + size] = data
+            buf[_DESCRIPTOR:_DESCRIPTOR + len(header)] = header
+            fields = buf[len(MAGIC):_HOLDERS].cast("q")
+            fields[0], fields[1] = len(header), base
+            fields.release()
+            _update(buf, os.getpid(), 1)
+            # Written last: a block without it is still being filled
+            buf[:len(MAGIC)] = MAGIC
+            del buf
+    except BaseException:
+        _unlink(shm)
+        raise
+    finally:
+        shm.close()
+
+
+def get(name: str) -> Union[Table, Tensor]:
+    """
+    Maps the object published under ``name`` without copying its buffers.
+
+    The result holds a reference to the shared block until it is
+    garbage-collected. Repeated calls in one process return the same object
+    while it is alive.
+    """
+    key = (os.getpid(), name)
+    obj = _attached.get(key)
+    if obj is not None:
+        return obj
+    mapping, (descriptor, base) = _attach(name)
+    buf = memoryview(mapping)
+    if isinstance(descriptor, TableDescriptor):
+        obj = table_from_buffer(buf, descriptor, copy=False, base=base)
+    else:
+        dtype = DataType(descriptor.dtype)
+        typecode = TYPECODES[dtype]
+        data = buf[base:base + descriptor.nbytes]
+        obj = _tensor(data, typecode, descriptor.shape, dtype)
+    weakref.finalize(obj, _drop, name, os.getpid())
+    _attached[key] = obj
+    return obj
+
+
+def release(name: str) -> None:
+    """
+    Drops the reference ``put`` took in this process. The block is freed
+    once every process that got the object has dropped it too.
+    """
+    _drop(name, os.getpid())
+
+
+def refcount(name: str) -> int:
+    """
+    The number of live references to ``name`` across all processes.
+    """
+    shm = _find(name)
+    try:
+        with _locked(shm):
+            return _update(shm.buf, os.getpid(), 0)
+    finally:
+        shm.close()
@@ -1,4 +1,5 @@
 from typing import Optional, Union, Sequence, Any, Tuple
+from array import array
 import logging
 from .backend.types import BackendType, OperationType, OperationProperties, DataType
 from .backend.selector import select_backend
@@ -30,6 +31,8 @@ class Tensor:
                     If provided, overrides 'backend'.
         """
         self._dtype = dtype
+        self._shape: tuple[int, ...]
+        self._backing_data: Any
         
         # Determine shape and element count (simplified for this implementation)
         # In a real impl, we'd recursively check list depth/lengths
@@ -37,6 +40,12 @@ class Tensor:
             self._shape = (len(data),) # Simplified 1D assumption for now
             self._element_count = len(data)
             self._backing_data = data # Placeholder for real storage buffer
+        elif isinstance(data, (array, memoryview)):
+            # Typed buffers, e.g. from Table.to_tensor
+            view = memoryview(data)
+            self._shape = tuple(view.shape or ())
+            self._element_count = view.nbytes // view.itemsize
+            self._backing_data = data
         elif hasattr(data, 'shape'): # numpy compatibility
              self._shape = data.shape
              self._element_count = data.size
@@ -103,6 +112,27 @@ class Tensor:
     def shape(self) -> Tuple[int, ...]:
         return self._shape
 
+    @property
+    def dtype(self) -> DataType:
+        return self._dtype
+
+    def to_table(
+        self, names: Optional[Union[str, Sequence[str]]] = None, layout: str = "row"
+    ) -> Any:
+        """
+        Converts a 1-D or 2-D tensor to a ``corepy.data.Table``. Columns view
+        the tensor buffer where they are contiguous in it (1-D tensors and
+        ``layout="col"``) and are copied otherwise.
+
+        Args:
+            names: Column names; defaults to ``column_0``, ``column_1``, ...
+            layout: ``"row"`` if each tensor row is a table row, ``"col"`` if
+                    each tensor row is a column.
+        """
+        from .data.tensors import tensor_to_table
+
+        return tensor_to_table(self, names, layout)
+
     def to(self, device: str) -> 'Tensor':
         """
         Explicitly move tensor to a device.
@@ -116,6 +146,18 @@ class Tensor:
     def __repr__(self):
         return f"Tensor({self._backing_data}, backend='{self._backend_type.value}')"
 
+    def _elementwise_result(self, result_data: Any) -> "Tensor":
+        """
+        Wraps a kernel result on this tensor's backend. A typed buffer carries
+        its own dtype, which the kernel may have promoted (int64 * 0.5).
+        """
+        dtype = self._dtype
+        if isinstance(result_data, (array, memoryview)):
+            from .data.tensors import _format_dtype
+
+            dtype = _format_dtype(memoryview(result_data)) or dtype
+        return Tensor(result_data, dtype=dtype, backend=self.backend)
+
     def __add__(self, other: Any) -> 'Tensor':
         """
         Element-wise addition.
@@ -143,7 +185,27 @@ class Tensor:
         # 3. Return new Tensor on same backend (usually)
         # In real engine, result placement depends on Op rules. 
         # Add usually stays on same device.
-        return Tensor(result_data, dtype=self._dtype, backend=self.backend)
+        return self._elementwise_result(result_data)
+
+    def __mul__(self, other: Any) -> "Tensor":
+        """
+        Element-wise multiplication.
+        """
+        if isinstance(other, Tensor):
+            if other.backend != self.backend:
+                raise BackendError(
+                    f"Backend mismatch: {self.backend} vs {other.backend}"
+                )
+            other_data = other._backing_data
+        else:
+            other_data = other
+
+        from .backend.dispatch import dispatch_kernel
+
+        result_data = dispatch_kernel(
+            "mul", self.backend, self._backing_data, other_data
+        )
+        return self._elementwise_result(result_data)
 
     def matmul(self, other: 'Tensor') -> 'Tensor':
         """
@@ -160,3 +222,57 @@ class Tensor:
         result_data = dispatch_kernel("matmul", self.backend, self._backing_data, other._backing_data)
         
         return Tensor(result_data, dtype=self._dtype, backend=self.backend)
+
+    def argsort(self, descending: bool = False) -> "Tensor":
+        """
+        Indices that stably sort the tensor.
+        """
+        from .backend.dispatch import dispatch_kernel
+
+        result_data = dispatch_kernel(
+            "argsort", self.backend, self._backing_data, descending
+        )
+        return Tensor(result_data, dtype=DataType.INT64, backend=self.backend)
+
+    def sort(self, descending: bool = False) -> "Tensor":
+        """
+        Sorted copy of the tensor.
+        """
+        from .backend.dispatch import dispatch_kernel
+
+        result_data = dispatch_kernel(
+            "sort", self.backend, self._backing_data, descending
+        )
+        return Tensor(result_data, dtype=self._dtype, backend=self.backend)
+
+    def top_k(self, k: int, descending: bool = True) -> "Tensor":
+        """
+        Indices of the ``k`` largest (or smallest) elements, in sorted order,
+        found without a full sort.
+        """
+        from .backend.dispatch import dispatch_kernel
+
+        result_data = dispatch_kernel(
+            "top_k", self.backend, self._backing_data, k, descending
+        )
+        return Tensor(result_data, dtype=DataType.INT64, backend=self.backend)
+
+    def searchsorted(self, values: Any, side: str = "left") -> Union[int, "Tensor"]:
+        """
+        Insertion points of ``values`` in this (ascending) tensor.
+        A scalar input returns an int; a sequence or Tensor returns a Tensor.
+        """
+        from .backend.dispatch import dispatch_kernel
+
+        if isinstance(values, Tensor):
+            values = values._backing_data
+        sequences = (list, tuple, array, memoryview)
+        scalar = not isinstance(values, sequences) and not hasattr(values, "shape")
+        needles = [values] if scalar else values
+        result_data = dispatch_kernel(
+            "searchsorted", self.backend, self._backing_data, needles, side
+        )
+        if scalar:
+            index: int = result_data[0]
+            return index
+        return Tensor(result_data, dtype=DataType.INT64, backend=self.backend)
@@ -1,5 +1,56 @@
 #pragma once
 
+#include <cstdint>
+
 namespace corepy {
     int add_one_kernel(int x);
+
+    // Element types of the flat column buffers (bool is one byte per value)
+    enum class DType : uint8_t { Bool, Int32, Int64, Float32, Float64 };
+
+    // A contiguous typed buffer. An input of size 1 broadcasts against the output.
+    struct ConstSpan {
+        const void* data;
+        int64_t size;
+        DType dtype;
+    };
+
+    struct Span {
+        void* data;
+        int64_t size;
+        DType dtype;
+    };
+
+    // Fallback: the machine result would differ from Python's (integer
+    // overflow, division by zero, a value the output type cannot hold, an
+    // int/float comparison beyond 2**53), so the caller reruns the operation
+    // in Python, which raises or widens as usual.
+    // Unsupported: no native kernel for these types or this operation.
+    enum class Status : int { Ok = 0, Fallback = 1, Unsupported = 2 };
+
+    enum class BinaryOp : uint8_t { Add, Sub, Mul, TrueDiv, FloorDiv, Mod };
+    enum class CompareOp : uint8_t { Eq, Ne, Lt, Le, Gt, Ge, And, Or, Xor };
+    enum class UnaryOp : uint8_t { Neg, Abs, Not };
+    enum class ReduceOp : uint8_t { Sum, Min, Max };
+
+    struct Scalar {
+        bool is_float;
+        int64_t i;
+        double f;
+    };
+
+    // out[i] = a[i] <op> b[i], computed in int64 for integer outputs and in
+    // double for float outputs (float32 x float32 stays in float32, which
+    // rounds identically for + - * /)
+    Status binary(BinaryOp op, ConstSpan a, ConstSpan b, Span out);
+    // out[i] = a[i] <op> b[i] as 0/1 bytes; and/or/xor take bool inputs
+    Status compare(CompareOp op, ConstSpan a, ConstSpan b, Span out);
+    Status unary(UnaryOp op, ConstSpan a, Span out);
+    // Floats truncate toward zero when cast to integers; any non-zero is true
+    Status cast(ConstSpan a, Span out);
+    // Integer sums, and min/max with Python's NaN handling (a leading NaN wins)
+    Status reduce(ReduceOp op, ConstSpan a, Scalar* result);
+
+    // The instruction set the kernels dispatch to on this CPU
+    const char* simd_level();
 }
@@ -0,0 +1,393 @@
+// Elementwise arithmetic, comparisons, unary ops and casts over typed buffers.
+//
+// Each public entry point picks a compute type (int64 for integer results,
+// double for float ones) and walks the output in blocks, converting operand
+// blocks to the compute type where needed. The inner loops accumulate a flag
+// instead of branching, so the Python-semantics checks (overflow, division
+// by zero, range) don't stop vectorization.
+
+#include <algorithm>
+#include <cmath>
+
+#include "corepy_kernels.h"
+#include "simd.h"
+
+namespace corepy {
+namespace {
+
+using simd::Tag;
+using simd::kBlock;
+using simd::visit;
+using simd::is_float;
+
+constexpr int64_t kInt64Min = std::numeric_limits<int64_t>::min();
+
+// Sets ``flag`` negative when ``bad``
+inline void check(int64_t& flag, bool bad) {
+    flag |= -static_cast<int64_t>(bad);
+}
+
+// Narrows a computed value to the output type, flagging values it cannot hold
+template <typename Out, typename C>
+inline Out store(C value, int64_t& flag) {
+    if constexpr (std::is_same_v<Out, int32_t> && std::is_same_v<C, int64_t>) {
+        check(flag, value != static_cast<int32_t>(value));
+    }
+    return static_cast<Out>(value);
+}
+
+inline int64_t wrapping_add(int64_t a, int64_t b) {
+    return static_cast<int64_t>(static_cast<uint64_t>(a) + static_cast<uint64_t>(b));
+}
+
+inline int64_t wrapping_sub(int64_t a, int64_t b) {
+    return static_cast<int64_t>(static_cast<uint64_t>(a) - static_cast<uint64_t>(b));
+}
+
+struct Add {
+    template <typename C>
+    static C apply(C a, C b, int64_t& flag) {
+        if constexpr (std::is_integral_v<C>) {
+            const int64_t r = wrapping_add(a, b);
+            // Overflow iff both operands' signs differ from the result's
+            flag |= (a ^ r) & (b ^ r);
+            return r;
+        } else {
+            return a + b;
+        }
+    }
+};
+
+struct Sub {
+    template <typename C>
+    static C apply(C a, C b, int64_t& flag) {
+        if constexpr (std::is_integral_v<C>) {
+            const int64_t r = wrapping_sub(a, b);
+            flag |= (a ^ b) & (a ^ r);
+            return r;
+        } else {
+            return a - b;
+        }
+    }
+};
+
+struct Mul {
+    template <typename C>
+    static C apply(C a, C b, int64_t& flag) {
+        if constexpr (std::is_integral_v<C>) {
+#if defined(__GNUC__) || defined(__clang__)
+            int64_t r;
+            check(flag, __builtin_mul_overflow(a, b, &r));
+            return r;
+#else
+            const int64_t r = static_cast<int64_t>(static_cast<uint64_t>(a) * static_cast<uint64_t>(b));
+            check(flag, (a == -1 && b == kInt64Min) || (a != 0 && r / a != b));
+            return r;
+#endif
+        } else {
+            return a * b;
+        }
+    }
+};
+
+struct TrueDiv {
+    template <typename C>
+    static C apply(C a, C b, int64_t& flag) {
+        // Python raises ZeroDivisionError for float division by zero too
+        check(flag, b == 0);
+        return a / b;
+    }
+};
+
+// Python's floor division and modulo: the remainder takes the divisor's sign
+struct FloorDiv {
+    static int64_t apply(int64_t a, int64_t b, int64_t& flag) {
+        const bool bad = (b == 0) | ((a == kInt64Min) & (b == -1));
+        check(flag, bad);
+        const int64_t d = bad ? 1 : b;
+        const int64_t q = a / d;
+        return q - static_cast<int64_t>((a % d != 0) & ((a < 0) != (d < 0)));
+    }
+};
+
+struct Mod {
+    static int64_t apply(int64_t a, int64_t b, int64_t& flag) {
+        const bool bad = (b == 0) | ((a == kInt64Min) & (b == -1));
+        check(flag, bad);
+        const int64_t d = bad ? 1 : b;
+        const int64_t r = a % d;
+        return r + (((r != 0) & ((r < 0) != (d < 0))) ? d : 0);
+    }
+};
+
+template <typename C, typename Out, typename Op>
+COREPY_CLONES void binary_loop(const C* a, bool a_scalar, const C* b, bool b_scalar, Out* out, int64_t n, int64_t* flag_out) {
+    int64_t flag = 0;
+    if (a_scalar && !b_scalar) {
+        const C x = a[0];
+        for (int64_t i = 0; i < n; ++i) out[i] = store<Out>(Op::apply(x, b[i], flag), flag);
+    } else if (b_scalar && !a_scalar) {
+        const C y = b[0];
+        for (int64_t i = 0; i < n; ++i) out[i] = store<Out>(Op::apply(a[i], y, flag), flag);
+    } else if (a_scalar) {
+        const Out value = store<Out>(Op::apply(a[0], b[0], flag), flag);
+        for (int64_t i = 0; i < n; ++i) out[i] = value;
+    } else {
+        for (int64_t i = 0; i < n; ++i) out[i] = store<Out>(Op::apply(a[i], b[i], flag), flag);
+    }
+    *flag_out |= flag;
+}
+
+template <typename C, typename Out, typename Op>
+Status run_binary(ConstSpan a, ConstSpan b, Span out) {
+    C scratch_a[kBlock];
+    C scratch_b[kBlock];
+    Out* target = static_cast<Out*>(out.data);
+    int64_t flag = 0;
+    for (int64_t start = 0; start < out.size; start += kBlock) {
+        const int64_t length = std::min(kBlock, out.size - start);
+        const C* pa = simd::block_of<C>(a, start, length, scratch_a);
+        const C* pb = simd::block_of<C>(b, start, length, scratch_b);
+        binary_loop<C, Out, Op>(pa, a.size == 1, pb, b.size == 1, target + start, length, &flag);
+    }
+    return flag < 0 ? Status::Fallback : Status::Ok;
+}
+
+template <typename C, typename Out>
+Status binary_as(BinaryOp op, ConstSpan a, ConstSpan b, Span out) {
+    switch (op) {
+        case BinaryOp::Add: return run_binary<C, Out, Add>(a, b, out);
+        case BinaryOp::Sub: return run_binary<C, Out, Sub>(a, b, out);
+        case BinaryOp::Mul: return run_binary<C, Out, Mul>(a, b, out);
+        default: break;
+    }
+    if constexpr (std::is_integral_v<C>) {
+        if (op == BinaryOp::FloorDiv) return run_binary<C, Out, FloorDiv>(a, b, out);
+        if (op == BinaryOp::Mod) return run_binary<C, Out, Mod>(a, b, out);
+    } else {
+        if (op == BinaryOp::TrueDiv) return run_binary<C, Out, TrueDiv>(a, b, out);
+    }
+    return Status::Unsupported;
+}
+
+bool broadcasts(ConstSpan span, int64_t n) {
+    return span.size == n || span.size == 1;
+}
+
+bool exact_in_double(ConstSpan span) {
+    if (is_float(span.dtype)) return true;
+    return visit(span.dtype, [&](auto tag) {
+        using T = typename decltype(tag)::type;
+        return simd::exact_in_double(static_cast<const T*>(span.data), span.size);
+    });
+}
+
+// Comparisons ------------------------------------------------------------
+
+struct Eq { template <typename C> static bool apply(C a, C b) { return a == b; } };
+struct Ne { template <typename C> static bool apply(C a, C b) { return a != b; } };
+struct Lt { template <typename C> static bool apply(C a, C b) { return a < b; } };
+struct Le { template <typename C> static bool apply(C a, C b) { return a <= b; } };
+struct Gt { template <typename C> static bool apply(C a, C b) { return a > b; } };
+struct Ge { template <typename C> static bool apply(C a, C b) { return a >= b; } };
+struct And { template <typename C> static C apply(C a, C b) { return a & b; } };
+struct Or { template <typename C> static C apply(C a, C b) { return a | b; } };
+struct Xor { template <typename C> static C apply(C a, C b) { return a ^ b; } };
+
+template <typename C, typename Op>
+COREPY_CLONES void compare_loop(const C* a, bool a_scalar, const C* b, bool b_scalar, uint8_t* out, int64_t n) {
+    if (a_scalar && !b_scalar) {
+        const C x = a[0];
+        for (int64_t i = 0; i < n; ++i) out[i] = static_cast<uint8_t>(Op::apply(x, b[i]));
+    } else if (b_scalar && !a_scalar) {
+        const C y = b[0];
+        for (int64_t i = 0; i < n; ++i) out[i] = static_cast<uint8_t>(Op::apply(a[i], y));
+    } else if (a_scalar) {
+        const uint8_t value = static_cast<uint8_t>(Op::apply(a[0], b[0]));
+        for (int64_t i = 0; i < n; ++i) out[i] = value;
+    } else {
+        for (int64_t i = 0; i < n; ++i) out[i] = static_cast<uint8_t>(Op::apply(a[i], b[i]));
+    }
+}
+
+template <typename C, typename Op>
+Status run_compare(ConstSpan a, ConstSpan b, Span out) {
+    C scratch_a[kBlock];
+    C scratch_b[kBlock];
+    uint8_t* target = static_cast<uint8_t*>(out.data);
+    for (int64_t start = 0; start < out.size; start += kBlock) {
+        const int64_t length = std::min(kBlock, out.size - start);
+        const C* pa = simd::block_of<C>(a, start, length, scratch_a);
+        const C* pb = simd::block_of<C>(b, start, length, scratch_b);
+        compare_loop<C, Op>(pa, a.size == 1, pb, b.size == 1, target + start, length);
+    }
+    return Status::Ok;
+}
+
+template <typename C>
+Status compare_as(CompareOp op, ConstSpan a, ConstSpan b, Span out) {
+    switch (op) {
+        case CompareOp::Eq: return run_compare<C, Eq>(a, b, out);
+        case CompareOp::Ne: return run_compare<C, Ne>(a, b, out);
+        case CompareOp::Lt: return run_compare<C, Lt>(a, b, out);
+        case CompareOp::Le: return run_compare<C, Le>(a, b, out);
+        case CompareOp::Gt: return run_compare<C, Gt>(a, b, out);
+        case CompareOp::Ge: return run_compare<C, Ge>(a, b, out);
+        default: return Status::Unsupported;
+    }
+}
+
+// Unary ops and casts ----------------------------------------------------
+
+struct Neg {
+    template <typename C>
+    static C apply(C a, int64_t& flag) {
+        if constexpr (std::is_integral_v<C>) check(flag, a == kInt64Min);
+        return -a;
+    }
+};
+
+struct Abs {
+    template <typename C>
+    static C apply(C a, int64_t& flag) {
+        if constexpr (std::is_integral_v<C>) {
+            check(flag, a == kInt64Min);
+            return a < 0 ? -a : a;
+        } else {
+            // Clears the sign of -0.0 and NaN, like Python's abs
+            return std::fabs(a);
+        }
+    }
+};
+
+template <typename C, typename Out, typename Op>
+COREPY_CLONES void unary_loop(const C* a, Out* out, int64_t n, int64_t* flag_out) {
+    int64_t flag = 0;
+    for (int64_t i = 0; i < n; ++i) out[i] = store<Out>(Op::apply(a[i], flag), flag);
+    *flag_out |= flag;
+}
+
+template <typename C, typename Out, typename Op>
+Status run_unary(ConstSpan a, Span out) {
+    C scratch[kBlock];
+    Out* target = static_cast<Out*>(out.data);
+    int64_t flag = 0;
+    for (int64_t start = 0; start < out.size; start += kBlock) {
+        const int64_t length = std::min(kBlock, out.size - start);
+        unary_loop<C, Out, Op>(simd::block_of<C>(a, start, length, scratch), target + start, length, &flag);
+    }
+    return flag < 0 ? Status::Fallback : Status::Ok;
+}
+
+template <typename C, typename Out>
+Status unary_as(UnaryOp op, ConstSpan a, Span out) {
+    return op == UnaryOp::Neg ? run_unary<C, Out, Neg>(a, out) : run_unary<C, Out, Abs>(a, out);
+}
+
+template <typename T>
+COREPY_CLONES void not_loop(const T* a, uint8_t* out, int64_t n) {
+    for (int64_t i = 0; i < n; ++i) out[i] = static_cast<uint8_t>(a[i] == 0);
+}
+
+template <typename T, typename Out>
+COREPY_CLONES void cast_loop(const T* a, Out* out, int64_t n, int64_t* flag_out) {
+    int64_t flag = 0;
+    for (int64_t i = 0; i < n; ++i) {
+        if constexpr (std::is_same_v<Out, uint8_t>) {
+            // bool(x): NaN is true
+            out[i] = static_cast<uint8_t>(a[i] != 0);
+        } else if constexpr (std::is_floating_point_v<Out>) {
+            // Python converts ints to double first, then narrows
+            out[i] = static_cast<Out>(static_cast<double>(a[i]));
+        } else if constexpr (std::is_floating_point_v<T>) {
+            // int(x) truncates; NaN, infinities and out-of-range values raise
+            const double x = static_cast<double>(a[i]);
+            const bool fits = x >= -9223372036854775808.0 && x < 9223372036854775808.0;
+            check(flag, !fits);
+            out[i] = store<Out>(fits ? static_cast<int64_t>(x) : int64_t{0}, flag);
+        } else {
+            out[i] = store<Out>(static_cast<int64_t>(a[i]), flag);
+        }
+    }
+    *flag_out |= flag;
+}
+
+}  // namespace
+
+Status binary(BinaryOp op, ConstSpan a, ConstSpan b, Span out) {
+    if (!broadcasts(a, out.size) || !broadcasts(b, out.size) || out.dtype == DType::Bool) {
+        return Status::Unsupported;
+    }
+    if (is_float(out.dtype)) {
+        if (op == BinaryOp::FloorDiv || op == BinaryOp::Mod) return Status::Unsupported;
+        // Python computes int <op> int exactly and rounds once; going through
+        // double gives the same result only when both operands convert exactly
+        if (!is_float(a.dtype) && !is_float(b.dtype) && !(exact_in_double(a) && exact_in_double(b))) {
+            return Status::Fallback;
+        }
+        if (out.dtype == DType::Float32) {
+            if (a.dtype == DType::Float32 && b.dtype == DType::Float32) return binary_as<float, float>(op, a, b, out);
+            return binary_as<double, float>(op, a, b, out);
+        }
+        return binary_as<double, double>(op, a, b, out);
+    }
+    if (is_float(a.dtype) || is_float(b.dtype) || op == BinaryOp::TrueDiv) return Status::Unsupported;
+    if (out.dtype == DType::Int32) return binary_as<int64_t, int32_t>(op, a, b, out);
+    return binary_as<int64_t, int64_t>(op, a, b, out);
+}
+
+Status compare(CompareOp op, ConstSpan a, ConstSpan b, Span out) {
+    if (!broadcasts(a, out.size) || !broadcasts(b, out.size) || out.dtype != DType::Bool) {
+        return Status::Unsupported;
+    }
+    if (op == CompareOp::And || op == CompareOp::Or || op == CompareOp::Xor) {
+        if (a.dtype != DType::Bool || b.dtype != DType::Bool) return Status::Unsupported;
+        if (op == CompareOp::And) return run_compare<uint8_t, And>(a, b, out);
+        if (op == CompareOp::Or) return run_compare<uint8_t, Or>(a, b, out);
+        return run_compare<uint8_t, Xor>(a, b, out);
+    }
+    if (!is_float(a.dtype) && !is_float(b.dtype)) return compare_as<int64_t>(op, a, b, out);
+    if (a.dtype == DType::Float32 && b.dtype == DType::Float32) return compare_as<float>(op, a, b, out);
+    // Python compares ints with floats exactly
+    if (!exact_in_double(a) || !exact_in_double(b)) return Status::Fallback;
+    return compare_as<double>(op, a, b, out);
+}
+
+Status unary(UnaryOp op, ConstSpan a, Span out) {
+    if (a.size != out.size) return Status::Unsupported;
+    if (op == UnaryOp::Not) {
+        if (out.dtype != DType::Bool) return Status::Unsupported;
+        return visit(a.dtype, [&](auto tag) {
+            using T = typename decltype(tag)::type;
+            not_loop(static_cast<const T*>(a.data), static_cast<uint8_t*>(out.data), a.size);
+            return Status::Ok;
+        });
+    }
+    switch (out.dtype) {
+        case DType::Float64: return unary_as<double, double>(op, a, out);
+        case DType::Float32:
+            if (a.dtype == DType::Float32) return unary_as<float, float>(op, a, out);
+            return unary_as<double, float>(op, a, out);
+        case DType::Int64:
+        case DType::Int32:
+            if (is_float(a.dtype)) return Status::Unsupported;
+            if (out.dtype == DType::Int32) return unary_as<int64_t, int32_t>(op, a, out);
+            return unary_as<int64_t, int64_t>(op, a, out);
+        default: return Status::Unsupported;
+    }
+}
+
+Status cast(ConstSpan a, Span out) {
+    if (a.size != out.size) return Status::Unsupported;
+    int64_t flag = 0;
+    visit(a.dtype, [&](auto in_tag) {
+        using T = typename decltype(in_tag)::type;
+        visit(out.dtype, [&](auto out_tag) {
+            using Out = typename decltype(out_tag)::type;
+            cast_loop<T, Out>(static_cast<const T*>(a.data), static_cast<Out*>(out.data), a.size, &flag);
+        });
+    });
+    return flag < 0 ? Status::Fallback : Status::Ok;
+}
+
+}  // namespace corepy
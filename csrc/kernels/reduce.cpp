@@ -0,0 +1,100 @@
+// Reductions over typed buffers, and the runtime SIMD level report.
+
+#include <cmath>
+
+#include "corepy_kernels.h"
+#include "simd.h"
+
+namespace corepy {
+namespace {
+
+using simd::visit;
+
+// int32/bool sums cannot overflow int64 for any buffer that fits in memory
+template <typename T>
+COREPY_CLONES int64_t sum_narrow(const T* a, int64_t n) {
+    int64_t total = 0;
+    for (int64_t i = 0; i < n; ++i) total += a[i];
+    return total;
+}
+
+// Sums int64 values exactly; false when the total does not fit in int64
+bool sum_wide(const int64_t* a, int64_t n, int64_t* total) {
+#if defined(__SIZEOF_INT128__)
+    __int128 sum = 0;
+    for (int64_t i = 0; i < n; ++i) sum += a[i];
+    *total = static_cast<int64_t>(sum);
+    return sum == static_cast<__int128>(*total);
+#else
+    // Without 128-bit integers an intermediate overflow sends the sum to Python
+    int64_t sum = 0;
+    for (int64_t i = 0; i < n; ++i) {
+        const int64_t r = static_cast<int64_t>(static_cast<uint64_t>(sum) + static_cast<uint64_t>(a[i]));
+        if (((sum ^ r) & (a[i] ^ r)) < 0) return false;
+        sum = r;
+    }
+    *total = sum;
+    return true;
+#endif
+}
+
+// min/max skipping NaN, like the Python kernels: a NaN so far is replaced by
+// any later value, so the result is NaN only when every value is. (m != m is
+// false for integers and folds away.)
+template <typename T>
+COREPY_CLONES T min_of(const T* a, int64_t n) {
+    T m = a[0];
+    for (int64_t i = 1; i < n; ++i) m = (a[i] < m || m != m) ? a[i] : m;
+    return m;
+}
+
+template <typename T>
+COREPY_CLONES T max_of(const T* a, int64_t n) {
+    T m = a[0];
+    for (int64_t i = 1; i < n; ++i) m = (a[i] > m || m != m) ? a[i] : m;
+    return m;
+}
+
+}  // namespace
+
+Status reduce(ReduceOp op, ConstSpan a, Scalar* result) {
+    return visit(a.dtype, [&](auto tag) {
+        using T = typename decltype(tag)::type;
+        const T* data = static_cast<const T*>(a.data);
+        result->is_float = std::is_floating_point_v<T>;
+        if (op == ReduceOp::Sum) {
+            // Float sums stay with math.fsum, which rounds exactly once
+            if constexpr (std::is_floating_point_v<T>) {
+                return Status::Unsupported;
+            } else if constexpr (std::is_same_v<T, int64_t>) {
+                return sum_wide(data, a.size, &result->i) ? Status::Ok : Status::Fallback;
+            } else {
+                result->i = sum_narrow(data, a.size);
+                return Status::Ok;
+            }
+        }
+        if (a.size == 0) return Status::Unsupported;
+        const T value = op == ReduceOp::Min ? min_of(data, a.size) : max_of(data, a.size);
+        if constexpr (std::is_floating_point_v<T>) {
+            result->f = static_cast<double>(value);
+        } else {
+            result->i = static_cast<int64_t>(value);
+        }
+        return Status::Ok;
+    });
+}
+
+const char* simd_level() {
+#if defined(__x86_64__) && (defined(__GNUC__) || defined(__clang__)) && defined(__ELF__)
+    __builtin_cpu_init();
+    if (__builtin_cpu_supports("avx512f")) return "avx512";
+    if (__builtin_cpu_supports("avx2")) return "avx2";
+    return "sse2";
+#elif defined(__aarch64__) || defined(_M_ARM64)
+    return "neon";
+#else
+    return "scalar";
+#endif
+}
+
+}  // namespace corepy
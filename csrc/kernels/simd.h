@@ -0,0 +1,91 @@
+#pragma once
+
+// Kernel loops are written as plain loops over contiguous buffers, with the
+// branches (broadcasting, checks) hoisted out so the compiler vectorizes them.
+//
+// On x86-64 (GCC/Clang, ELF) COREPY_CLONES compiles each loop three times,
+// for AVX-512, AVX2 and the SSE2 baseline (the scalar fallback), and the
+// loader picks the best one for the running CPU. On AArch64, NEON is part of
+// the baseline, so the single build is already vectorized for it.
+
+#include <cstdint>
+#include <limits>
+#include <type_traits>
+
+#include "corepy_kernels.h"
+
+#if defined(__x86_64__) && (defined(__GNUC__) || defined(__clang__)) && defined(__ELF__)
+#define COREPY_CLONES __attribute__((target_clones("avx512f", "avx2", "default")))
+#else
+#define COREPY_CLONES
+#endif
+
+namespace corepy {
+namespace simd {
+
+// Rows processed per step; blocks of converted operands stay in L1
+constexpr int64_t kBlock = 1024;
+
+// Largest magnitude up to which every int64 converts to double exactly
+constexpr int64_t kExactDouble = int64_t{1} << 53;
+
+template <typename T>
+struct Tag {
+    using type = T;
+};
+
+template <typename F>
+decltype(auto) visit(DType dtype, F&& f) {
+    switch (dtype) {
+        case DType::Bool: return f(Tag<uint8_t>{});
+        case DType::Int32: return f(Tag<int32_t>{});
+        case DType::Int64: return f(Tag<int64_t>{});
+        case DType::Float32: return f(Tag<float>{});
+        default: return f(Tag<double>{});
+    }
+}
+
+inline bool is_float(DType dtype) {
+    return dtype == DType::Float32 || dtype == DType::Float64;
+}
+
+// Converts n values, e.g. an operand block into the compute type
+template <typename From, typename To>
+COREPY_CLONES void convert(const From* in, To* out, int64_t n) {
+    for (int64_t i = 0; i < n; ++i) {
+        out[i] = static_cast<To>(in[i]);
+    }
+}
+
+// Whether every value of an integer buffer converts to double exactly
+template <typename T>
+bool exact_in_double(const T* in, int64_t n) {
+    int64_t outside = 0;
+    for (int64_t i = 0; i < n; ++i) {
+        const int64_t v = static_cast<int64_t>(in[i]);
+        outside |= (v > kExactDouble) | (v < -kExactDouble);
+    }
+    return outside == 0;
+}
+
+// A block of an operand in the compute type C: the input itself when it
+// already has that type, else converted into ``scratch``
+template <typename C>
+const C* block_of(ConstSpan span, int64_t start, int64_t length, C* scratch) {
+    const bool scalar = span.size == 1;
+    const int64_t offset = scalar ? 0 : start;
+    const int64_t count = scalar ? 1 : length;
+    return visit(span.dtype, [&](auto tag) -> const C* {
+        using T = typename decltype(tag)::type;
+        const T* data = static_cast<const T*>(span.data) + offset;
+        if constexpr (std::is_same_v<T, C>) {
+            return data;
+        } else {
+            convert(data, scratch, count);
+            return scratch;
+        }
+    });
+}
+
+}  // namespace simd
+}  // namespace corepy
@@ -55,3 +55,12 @@ def test_tensor_explicit_override_api():
 def test_tensor_explicit_device_api():
     t = Tensor([1,2,3], device="cuda:0")
     assert t.backend == BackendType.GPU
+
+def test_tensor_ordering_ops():
+    t = Tensor([3.0, 1.0, 2.0, 1.0])
+    assert t.argsort()._backing_data == [1, 3, 2, 0]
+    assert t.sort(descending=True)._backing_data == [3.0, 2.0, 1.0, 1.0]
+    assert t.top_k(2)._backing_data == [0, 2]
+    s = t.sort()
+    assert s.searchsorted(1.0) == 0
+    assert s.searchsorted([1.0, 2.5], side="right")._backing_data == [2, 3]
@@ -1,3 +1,5 @@
+import pytest
+
 from corepy.data import Table
 from corepy.schema import Schema
 
@@ -26,3 +28,1343 @@ def test_table_with_schema():
     data = [{"id": 1}]
     table = Table(data, schema=schema)
     assert table.schema is not None
+
+def test_table_columnar_storage_from_rows():
+    from array import array
+
+    from corepy.backend.types import DataType
+
+    t = Table(
+        [{"id": 1, "score": 1.5, "ok": True}, {"id": 2, "score": None, "ok": False}]
+    )
+    assert t.column_names == ["id", "score", "ok"]
+    assert t.dtypes == {
+        "id": DataType.INT64,
+        "score": DataType.FLOAT64,
+        "ok": DataType.BOOL,
+    }
+    assert isinstance(t["id"].values, array)
+    assert t["score"].null_count == 1
+    assert t["score"].to_pylist() == [1.5, None]
+    assert t.to_list()[1] == {"id": 2, "score": None, "ok": False}
+
+
+def test_table_schema_drives_dtypes():
+    from corepy.backend.types import DataType
+
+    schema = Schema(fields=[])
+    schema.add_field("id", "int32")
+    schema.add_field("value", "float")
+    t = Table([{"id": 1, "value": 2}], schema=schema)
+    assert t.dtypes == {"id": DataType.INT32, "value": DataType.FLOAT64}
+    assert t.to_list() == [{"id": 1, "value": 2.0}]
+
+
+def test_table_from_pydict_and_missing_keys():
+    t = Table.from_pydict({"a": [1, 2, 3], "b": ["x", None, "z"]})
+    assert len(t) == 3
+    assert t.to_pydict() == {"a": [1, 2, 3], "b": ["x", None, "z"]}
+
+    rows = Table([{"a": 1}, {"b": "y"}]).to_list()
+    assert rows == [{"a": 1, "b": None}, {"a": None, "b": "y"}]
+
+
+def test_table_from_numpy_shares_buffers():
+    np = __import__("pytest").importorskip("numpy")
+    arr = np.arange(5, dtype=np.int64)
+    t = Table.from_numpy({"x": arr})
+    arr[0] = 42
+    assert t["x"].to_pylist() == [42, 1, 2, 3, 4]
+
+
+def test_column_bitmap_roundtrip():
+    from corepy.data.column import pack_bits, unpack_bits
+
+    mask = bytes([1, 0, 1, 1, 0, 0, 0, 1, 1, 0, 1])
+    bitmap = pack_bits(mask, len(mask))
+    assert len(bitmap) == 2
+    assert unpack_bits(bitmap, len(mask)) == mask
+    assert unpack_bits(bitmap, 5, offset=3) == mask[3:8]
+
+
+def test_table_slice_and_concat():
+    from corepy.data import concat
+
+    t = Table.from_pydict({"a": [1, 2, 3, 4], "b": [None, "x", "y", None]})
+    part = t.slice(1, 2)
+    assert part.to_pydict() == {"a": [2, 3], "b": ["x", "y"]}
+    joined = concat([t.slice(0, 1), Table.from_pydict({"a": [9]})])
+    assert joined.to_pydict() == {"a": [1, 9], "b": [None, None]}
+
+
+def test_table_views_and_chunked_concat():
+    from corepy.data import Column, col, concat
+
+    t = Table.from_pydict(
+        {
+            "a": [1, None, 3, 4, 5, 6, 7, 8, 9, 10],
+            "c": Column.from_pylist(["x", "y"] * 5, "category"),
+        }
+    )
+    head = t.head(8)
+    assert (
+        isinstance(head["a"].values, memoryview)
+        and head["a"].values.obj is t["a"].values
+    )
+    assert head["a"].null_count == 1 and t.tail(2).to_pydict() == {
+        "a": [9, 10],
+        "c": ["x", "y"],
+    }
+
+    other = Table.from_pydict(
+        {"a": [None, 12], "c": Column.from_pylist(["z", "x"], "category")}
+    )
+    joined = concat([t, t.slice(3, 3), other])
+    a = joined["a"]
+    assert len(a.chunks) == 3 and a.chunks[0] is t["a"]
+    assert (len(a), a.null_count, a[-1], a.sum(), a.max()) == (15, 2, 12, 80, 12)
+    assert joined.slice(9, 4).to_pydict() == {
+        "a": [10, 4, 5, 6],
+        "c": ["y", "y", "x", "y"],
+    }
+    # The first input keeps its codes; the other dictionary is merged into it
+    assert (
+        joined["c"].dictionary == ["x", "y", "z"]
+        and joined["c"].chunks[0].values is t["c"].values
+    )
+    expected = joined.to_pydict()
+    assert joined.filter(col("a") > 8).to_pydict() == {
+        "a": [9, 10, 12],
+        "c": ["x", "y", "x"],
+    }
+    assert len(joined["a"].chunks) == 1 and joined["a"].to_pylist() == expected["a"]
+    assert all(len(c.chunks) == 1 for c in joined.rechunk()._columns.values())
+    assert joined.rechunk().to_pydict() == expected
+
+
+def test_table_select_filter_with_columns():
+    from corepy.data import col
+
+    t = Table.from_pydict(
+        {
+            "price": [1.5, 2.0, None, 4.0],
+            "qty": [1, 2, 3, None],
+            "region": ["eu", "us", None, "eu"],
+        }
+    )
+    assert t.select("price").mean() == {"price": 2.5}
+    assert t.select("price")["price"] is t["price"]
+
+    derived = t.with_columns(total=col("price") * col("qty"))
+    assert derived["total"].to_pylist() == [1.5, 4.0, None, None]
+
+    kept = t.filter((col("price") > 1.6) | (col("region") == "eu"))
+    assert kept.to_pydict()["price"] == [1.5, 2.0, 4.0]
+    assert t.filter(col("price").is_null()).to_pydict()["qty"] == [3]
+    assert t.filter([True, False, False, True])["qty"].to_pylist() == [1, None]
+
+
+def test_table_aggregates_skip_nulls():
+    from corepy.data import col
+
+    t = Table.from_pydict({"x": [3, None, 1], "s": ["b", "a", None]})
+    assert t.sum() == {"x": 4}
+    assert t.min() == {"x": 1, "s": "a"}
+    assert t.count() == {"x": 2, "s": 2}
+    assert t.agg(col("x").max(), n=col("s").count()) == {"x": 3, "n": 2}
+    assert Table.from_pydict({"x": [None]}).select(col("x").cast("float")).mean() == {
+        "x": None
+    }
+
+
+def test_expression_type_errors():
+    import pytest
+
+    from corepy.data import col
+
+    t = Table.from_pydict({"x": [1], "s": ["a"]})
+    with pytest.raises(TypeError):
+        t.with_columns(bad=col("x") + col("s"))
+    with pytest.raises(TypeError):
+        t.filter(col("x"))
+    with pytest.raises(TypeError):
+        bool(col("x") > 0)
+
+
+def test_expression_arithmetic_never_aborts_on_a_row():
+    import math
+
+    from corepy.data import col, lit
+
+    inf = math.inf
+    t = Table.from_pydict({"x": [1.0, -2.0, 0.0, None], "y": [0.0, 0.0, 0.0, 1.0]})
+    out = t.with_columns(q=col("x") / col("y"), f=col("x") // col("y"))
+    for name in ("q", "f"):
+        values = out[name].to_pylist()
+        assert values[:2] == [inf, -inf] and math.isnan(values[2]) and values[3] is None
+    assert all(math.isnan(v) for v in out.select(col("x") % 0.0)["x"].to_pylist()[:3])
+    assert t.select(col("x") ** 2000.0)["x"].to_pylist() == [1.0, inf, 0.0, None]
+    # Folded constants follow the same rules
+    assert t.select(col("y") + lit(1.0) / lit(0.0))["y"].to_pylist() == [inf] * 4
+
+    big = Table.from_pydict({"i": [2**62, -(2**63), 7], "j": [0, 2, 0]})
+    wrapped = big.with_columns(m=col("i") * 4, n=-col("i"), d=col("i") // col("j"))
+    assert wrapped["m"].to_pylist() == [0, 0, 28]
+    assert wrapped["n"].to_pylist() == [-(2**62), -(2**63), -7]
+    assert wrapped["d"].to_pylist() == [None, -(2**62), None]
+    assert big.select(col("i") / col("j"))["i"].to_pylist() == [inf, -(2.0**62), inf]
+
+
+def test_group_by_aggregations():
+    from corepy.data import col
+
+    t = Table.from_pydict(
+        {
+            "k": ["a", "b", "a", None, "b"],
+            "x": [1.0, 2.0, None, 4.0, 6.0],
+            "y": [1, 2, 3, 4, 5],
+        }
+    )
+    g = t.group_by("k").agg(
+        col("y").sum(),
+        col("x").mean(),
+        n=col("x").count(),
+        d=col("y").count_distinct(),
+        f=col("x").first(),
+        l=col("y").last(),
+        lo=col("x").min(),
+        hi=col("y").max(),
+    )
+    assert g.to_pydict() == {
+        "k": ["a", "b", None],
+        "y": [4, 7, 4],
+        "x": [1.0, 4.0, 4.0],
+        "n": [1, 2, 1],
+        "d": [2, 2, 1],
+        "f": [1.0, 2.0, 4.0],
+        "l": [3, 5, 4],
+        "lo": [1.0, 2.0, 4.0],
+        "hi": [3, 5, 4],
+    }
+
+    multi = t.group_by("k", "y").agg(n=col("x").count())
+    assert len(multi) == 5
+
+
+def test_group_by_parallel_partitions_merge(monkeypatch):
+    import corepy.data.groupby as groupby
+    from corepy.data import col
+
+    monkeypatch.setattr(groupby, "MIN_PARTITION_ROWS", 4)
+    keys = [i % 3 for i in range(20)]
+    t = Table.from_pydict({"k": keys, "v": list(range(20))})
+    serial = t.group_by("k").agg(
+        col("v").sum(), m=col("v").mean(), f=col("v").first(), l=col("v").last()
+    )
+    parallel = t.group_by("k", workers=4).agg(
+        col("v").sum(), m=col("v").mean(), f=col("v").first(), l=col("v").last()
+    )
+    assert parallel.to_pydict() == serial.to_pydict()
+    assert serial["f"].to_pylist() == [0, 1, 2]
+
+
+def test_min_max_skip_nan(monkeypatch):
+    import math
+
+    import corepy.data.groupby as groupby
+    from corepy.backend.reference import ReferenceBackend
+    from corepy.data import Column, col
+
+    nan = float("nan")
+    for values in ([nan, 1.0, 0.5], [1.0, nan, 0.5], [1.0, 0.5, nan]):
+        column = Column.from_pylist(values)
+        assert (column.min(), column.max()) == (0.5, 1.0)
+        reference = ReferenceBackend.min(values), ReferenceBackend.max(values)
+        assert reference == (0.5, 1.0)
+    assert math.isnan(Column.from_pylist([nan, nan]).min())
+
+    # The first partition holds only NaN
+    monkeypatch.setattr(groupby, "MIN_PARTITION_ROWS", 4)
+    t = Table.from_pydict({"k": [0] * 8, "x": [nan] * 4 + [2.0, 1.0, nan, 3.0]})
+    for workers in (1, 2):
+        g = t.group_by("k", workers=workers).agg(lo=col("x").min(), hi=col("x").max())
+        assert g.to_pydict() == {"k": [0], "lo": [1.0], "hi": [3.0]}
+
+
+def test_count_distinct_counts_nan_once(tmp_path):
+    from corepy.data import MaterializedAggregate, col
+
+    nan = float("nan")
+    t = Table.from_pydict({"k": [1, 1, 1, 2], "x": [nan, nan, 1.0, nan]})
+    assert t["x"].count_distinct() == 2
+    counts = t.group_by("k").agg(n=col("x").count_distinct())
+    assert counts.to_pydict() == {"k": [1, 2], "n": [2, 1]}
+    rolling = t.rolling(3).agg(n=col("x").count_distinct())
+    assert rolling["n"].to_pylist() == [1, 1, 2, 2]
+
+    # NaNs in checkpointed states are copies of the shared one
+    aggs = {"n": col("x").count_distinct()}
+    path = str(tmp_path / "state.ckpt")
+    MaterializedAggregate("k", aggs).update(t).checkpoint(path)
+    restored = MaterializedAggregate.restore(path, "k", aggs)
+    assert restored.update(t).snapshot().to_pydict() == counts.to_pydict()
+
+
+def test_table_join_types():
+    left = Table.from_pydict({"id": [1, 2, 3, None], "v": ["a", "b", "c", "d"]})
+    right = Table.from_pydict(
+        {"id": [2, 3, 2, 4], "w": [20, 30, 21, 40], "v": ["x", "y", "z", "q"]}
+    )
+
+    inner = left.join(right, on="id")
+    assert inner.to_pydict() == {
+        "id": [2, 2, 3],
+        "v": ["b", "b", "c"],
+        "w": [20, 21, 30],
+        "v_right": ["x", "z", "y"],
+    }
+    outer = left.join(right, on="id", how="left")
+    assert outer["w"].to_pylist() == [None, 20, 21, 30, None]
+    assert left.join(right, on="id", how="semi")["v"].to_pylist() == ["b", "c"]
+    assert left.join(right, on="id", how="anti")["v"].to_pylist() == ["a", "d"]
+
+
+def test_join_suffix_never_overwrites_a_column():
+    left = Table.from_pydict({"id": [1, 2], "v": ["a", "b"], "v_right": [10, 20]})
+    right = Table.from_pydict({"id": [2, 1], "v": ["x", "y"]})
+    joined = left.join(right, on="id")
+    assert joined.to_pydict() == {
+        "id": [1, 2],
+        "v": ["a", "b"],
+        "v_right": [10, 20],
+        "v_right_right": ["y", "x"],
+    }
+    lazy = left.lazy().join(right.lazy(), on="id").select("v_right_right")
+    assert lazy.collect().to_pydict() == {"v_right_right": ["y", "x"]}
+    with pytest.raises(ValueError):
+        left.join(right, on="id", suffix="")
+
+
+def test_table_join_strategies_agree(monkeypatch):
+    import corepy.data.join as join_module
+
+    monkeypatch.setattr(join_module, "MIN_PARTITION_ROWS", 1)
+    left = Table.from_pydict({"k": [1, 2, 2, 3, 5], "a": [1, 2, 3, 4, 5]})
+    right = Table.from_pydict({"k": [2, 2, 3, 4], "b": [1, 2, 3, 4]})
+    for how in ("inner", "left"):
+        expected = left.join(right, on="k", how=how, strategy="hash").to_pydict()
+        assert (
+            left.join(right, on="k", how=how, strategy="merge").to_pydict() == expected
+        )
+        assert left.join(right, on="k", how=how, workers=3).to_pydict() == expected
+
+    multi = Table.from_pydict({"a": [1, 1, 2], "b": ["x", "y", "x"]})
+    dim = Table.from_pydict({"a": [1, 2], "b": ["y", "x"], "w": [9, 8]})
+    assert multi.join(dim, on=["a", "b"])["w"].to_pylist() == [9, 8]
+
+
+def test_table_sort_multi_key_nulls_and_nan():
+    t = Table.from_pydict(
+        {"a": [3, 1, None, 2, 1], "b": [1.0, float("nan"), 2.0, None, 0.5]}
+    )
+    assert t.sort("a")["a"].to_pylist() == [1, 1, 2, 3, None]
+    assert t.sort("a", descending=True, nulls_last=False)["a"].to_pylist() == [
+        None,
+        3,
+        2,
+        1,
+        1,
+    ]
+    by_b = t.sort("b")["b"].to_pylist()
+    assert by_b[:3] == [0.5, 1.0, 2.0] and by_b[4] is None
+    both = t.sort(["a", "b"], descending=[False, True])["b"].to_pylist()
+    assert (
+        both[0] != both[0] and both[1] == 0.5
+    )  # NaN is largest, so first when descending
+
+
+def test_table_top_k_matches_sort():
+    import random
+
+    rnd = random.Random(0)
+    t = Table.from_pydict(
+        {
+            "k": [rnd.randrange(5) for _ in range(200)],
+            "v": [rnd.random() for _ in range(200)],
+        }
+    )
+    assert (
+        t.top_k(10, "v").to_pydict()
+        == t.sort("v", descending=True).slice(0, 10).to_pydict()
+    )
+    expected = t.sort(["k", "v"], descending=[True, False]).slice(0, 7).to_pydict()
+    assert t.top_k(7, ["k", "v"], descending=[True, False]).to_pydict() == expected
+
+
+def test_read_csv_typed_and_inferred(tmp_path):
+    import corepy as cp
+    from corepy.backend.types import DataType
+
+    path = tmp_path / "data.csv"
+    path.write_text('id,price,name,flag\n1,1.5,"a,b",true\n2,,b,false\n3,3,,true\n')
+    t = cp.read_csv(path)
+    assert t.dtypes == {
+        "id": DataType.INT64,
+        "price": DataType.FLOAT64,
+        "name": DataType.STRING,
+        "flag": DataType.BOOL,
+    }
+    assert t.to_pydict() == {
+        "id": [1, 2, 3],
+        "price": [1.5, None, 3.0],
+        "name": ["a,b", "b", None],
+        "flag": [True, False, True],
+    }
+
+    schema = Schema(
+        fields=[{"name": "id", "dtype": "int32"}, {"name": "price", "dtype": "float"}]
+    )
+    projected = cp.read_csv(path, schema=schema, columns=["price", "id"])
+    assert projected.column_names == ["price", "id"]
+    assert projected.dtypes == {"price": DataType.FLOAT64, "id": DataType.INT32}
+
+    bad = Schema(fields=[{"name": "name", "dtype": "int"}])
+    with pytest.raises(ValueError):
+        cp.read_csv(path, schema=bad)
+
+
+def test_read_csv_chunks_widen_and_pool(tmp_path):
+    from corepy.data import iter_csv, read_csv
+    from corepy.runtime import ProcessPool
+
+    path = tmp_path / "data.csv"
+    rows = [f"{i},{i % 3}" for i in range(50)] + ["50,x"]
+    path.write_text("a,b\n" + "\n".join(rows) + "\n")
+    chunks = list(iter_csv(path, sample_rows=10, chunk_bytes=64))
+    assert len(chunks) > 1
+    # The last chunk doesn't fit the inferred int64 and widens to string
+    assert chunks[-1]["b"].to_pylist()[-1] == "x"
+    table = read_csv(path, sample_rows=10, chunk_bytes=64)
+    assert table["a"].to_pylist() == list(range(51))
+    assert table["b"].to_pylist()[:3] == ["0", "1", "2"]
+
+    with ProcessPool(max_workers=2) as pool:
+        assert (
+            read_csv(path, chunk_bytes=64, pool=pool).to_pydict() == table.to_pydict()
+        )
+
+
+def test_read_csv_splits_outside_quoted_newlines(tmp_path):
+    from corepy.data import iter_csv, read_csv
+
+    path = tmp_path / "data.csv"
+    path.write_bytes(b'a,b\n1,"q\n2,3"\n4,5\n6,"say ""hi""\n7,8"\n9,10\n')
+    expected = {"a": [1, 4, 6, 9], "b": ["q\n2,3", "5", 'say "hi"\n7,8', "10"]}
+    for chunk_bytes in (1, 2, 4, 8, 1024):
+        assert read_csv(path, chunk_bytes=chunk_bytes).to_pydict() == expected
+        assert sum(len(t) for t in iter_csv(path, chunk_bytes=chunk_bytes)) == 4
+
+    # Digit separators are text, not numbers
+    path.write_text("n,x\n1_000,1_0.5\n2,2.5\n")
+    assert read_csv(path).to_pydict() == {"n": ["1_000", "2"], "x": ["1_0.5", "2.5"]}
+
+
+def test_ipc_roundtrip_and_mmap(tmp_path):
+    from array import array
+
+    import corepy as cp
+    from corepy.data import col
+
+    schema = Schema(
+        fields=[{"name": "a", "dtype": "int"}, {"name": "s", "dtype": "str"}]
+    )
+    t = Table.from_pydict({"a": [7, None, 9], "s": ["x", None, "héllo"]}, schema=schema)
+    t = t.with_columns(f=col("a") > 8, v=col("a") * 0.5)
+    path = tmp_path / "t.arrow"
+    t.write_ipc(path)
+
+    loaded = cp.read_ipc(path)
+    assert loaded.to_pydict() == t.to_pydict()
+    assert loaded.dtypes == t.dtypes
+    assert isinstance(loaded["a"].values, memoryview) and loaded["a"].values.readonly
+    assert (
+        cp.read_ipc(path, columns=["v", "s"], mmap=False).to_pydict()
+        == t.select("v", "s").to_pydict()
+    )
+
+    data = path.read_bytes()
+    assert data[:6] == data[-6:] == b"ARROW1"
+    assert data.find(array("q", [7, 0, 9]).tobytes()) % 64 == 0
+
+    with_schema = Table.from_pydict({"a": [1], "s": ["y"]}, schema=schema)
+    with_schema.write_ipc(path)
+    assert cp.read_ipc(path).schema == schema
+
+    with pytest.raises(TypeError):
+        Table.from_pydict({"o": [object()]}).write_ipc(path)
+
+
+def test_columnar_roundtrip_encodings(tmp_path):
+    import math
+
+    from corepy.data import ColumnarFile, col
+
+    n = 1000
+    t = Table.from_pydict(
+        {
+            "ts": list(range(10**9, 10**9 + n)),
+            "sym": ["ab", "cd", "é"][:2] * (n // 2),
+            "runs": [i // 100 for i in range(n)],
+            "flag": [i % 7 == 0 for i in range(n)],
+            "x": [None if i % 10 == 0 else i * 1.5 for i in range(n)],
+            "s": [None if i % 3 == 0 else f"v{i}é" for i in range(n)],
+        }
+    ).with_columns(f=col("x").cast("float32"))
+    path = tmp_path / "t.col"
+    t.write_columnar(path, row_group_size=256)
+
+    f = ColumnarFile(path)
+    assert f.num_rows == n and len(f.row_groups) == 4
+    encodings = {
+        name: f.row_groups[0]["columns"][i]["encoding"]
+        for i, name in enumerate(f.column_names)
+    }
+    assert encodings["ts"] == "delta"
+    assert encodings["sym"] == "dictionary"
+    assert encodings["runs"] == "rle"
+    assert encodings["flag"] == "bitmap"
+    assert f.statistics(1)["ts"]["min"] == 10**9 + 256
+    assert f.statistics(0)["x"]["null_count"] == 26
+
+    loaded = f.read()
+    assert loaded.dtypes == t.dtypes
+    assert loaded.to_pydict() == t.to_pydict()
+
+    special = Table.from_pydict({"v": [float("nan"), -0.0, 1.0]})
+    special.write_columnar(path)
+    values = ColumnarFile(path).read()["v"].to_pylist()
+    assert math.isnan(values[0]) and math.copysign(1.0, values[1]) == -1.0
+
+    # Deltas of mixed-sign floats' bit patterns, or of far-apart ints, do not
+    # fit the column's 64-bit type
+    mixed = Table.from_pydict({"f": [1.5, -2.5, 3.5], "q": [-(2**63), 2**63 - 1, 0]})
+    mixed.write_columnar(path)
+    assert ColumnarFile(path).read().to_pydict() == mixed.to_pydict()
+
+
+def test_columnar_filter_skips_row_groups(tmp_path):
+    import corepy as cp
+    from corepy.data import ColumnarFile, col
+
+    schema = Schema(
+        fields=[{"name": "k", "dtype": "int"}, {"name": "v", "dtype": "str"}]
+    )
+    t = Table.from_pydict(
+        {"k": list(range(100)), "v": [str(i % 4) for i in range(100)]}, schema=schema
+    )
+    path = tmp_path / "t.col"
+    t.write_columnar(path, row_group_size=10)
+    f = ColumnarFile(path)
+    assert f.read().schema == schema
+
+    predicate = (col("k") >= 42) & (col("k") < 55) & (col("v") == "1")
+    assert f.matching_row_groups(predicate) == [4, 5]
+    assert f.matching_row_groups((col("k") < 5) | col("k").isin([95])) == [0, 9]
+    assert f.matching_row_groups(col("v").is_null()) == []
+
+    result = cp.read_columnar(path, columns=["v"], filter=predicate)
+    assert result.column_names == ["v"]
+    assert result.to_pydict() == t.filter(predicate).select("v").to_pydict()
+    assert len(cp.read_columnar(path, filter=col("k") > 1000)) == 0
+
+
+def test_categorical_encoding_and_kernels():
+    from corepy.backend.types import DataType
+    from corepy.data import col, concat
+    from corepy.data.column import Column
+
+    cities = ["nyc", "sf", None, "la"] * 100
+    t = Table.from_pydict({"city": cities, "v": list(range(400))})
+    city = t["city"]
+    assert city.dtype == DataType.CATEGORICAL and city.dictionary == ["nyc", "sf", "la"]
+    assert city.values.typecode == "b" and city.to_pylist() == cities
+    assert city.nbytes < city.dictionary_decode().nbytes
+    assert Table.from_pydict({"s": ["a", "b"]})["s"].dtype == DataType.STRING
+    assert Column.from_pylist(
+        ["x", None, "x"], "category"
+    ).dictionary_decode().to_pylist() == ["x", None, "x"]
+
+    assert t.filter(col("city") == "sf")["v"].to_pylist() == list(range(1, 400, 4))
+    assert len(t.filter(col("city") > "m")) == 200
+    assert len(t.filter(col("city").isin(["la", "boston"]))) == 100
+    assert t.filter(col("city") == "boston")["city"].to_pylist() == []
+
+    g = t.group_by("city").agg(n=col("v").count(), lo=col("city").min())
+    assert g.to_pydict() == {
+        "city": ["nyc", "sf", None, "la"],
+        "n": [100] * 4,
+        "lo": ["nyc", "sf", None, "la"],
+    }
+    assert g["city"].dtype == DataType.CATEGORICAL
+    assert t.sort("city").slice(0, 1)["city"].to_pylist() == ["la"]
+
+    dim = Table.from_pydict(
+        {
+            "city": Column.from_pylist(["sf", "la", "paris"], "category"),
+            "pop": [1, 4, 2],
+        }
+    )
+    joined = t.slice(0, 4).join(dim, on="city", how="left")
+    assert joined["pop"].to_pylist() == [None, 1, None, 4]
+    plain = Table.from_pydict({"city": ["la"], "pop": [4]})
+    assert t.slice(0, 4).join(plain, on="city")["v"].to_pylist() == [3]
+
+    mixed = concat(
+        [
+            t.select("city").slice(0, 2),
+            Table.from_pydict({"city": Column.from_pylist(["rome", "sf"], "category")}),
+        ]
+    )
+    assert mixed["city"].to_pylist() == ["nyc", "sf", "rome", "sf"] and mixed[
+        "city"
+    ].dictionary == ["nyc", "sf", "la", "rome"]
+
+
+def test_categorical_io_roundtrips(tmp_path):
+    import corepy as cp
+    from corepy.backend.types import DataType
+    from corepy.data import ColumnarFile, col
+    from corepy.runtime.shm import export_table, import_table, release
+
+    t = Table.from_pydict(
+        {
+            "k": [["x", "y", "z"][i % 3] if i % 5 else None for i in range(600)],
+            "i": list(range(600)),
+        }
+    )
+    assert t["k"].dtype == DataType.CATEGORICAL
+
+    t.write_ipc(tmp_path / "t.arrow")
+    for mmap in (True, False):
+        loaded = cp.read_ipc(tmp_path / "t.arrow", mmap=mmap)
+        assert loaded.dtypes == t.dtypes and loaded.to_pydict() == t.to_pydict()
+
+    t.write_columnar(tmp_path / "t.col", row_group_size=200)
+    f = ColumnarFile(tmp_path / "t.col")
+    assert f.statistics(0)["k"] == {"min": "x", "max": "z", "null_count": 40}
+    assert f.matching_row_groups(col("k") == "w") == []
+    assert (
+        f.read().to_pydict() == t.to_pydict()
+        and f.read()["k"].dtype == DataType.CATEGORICAL
+    )
+
+    shm, descriptor = export_table(t)
+    shm.close()
+    try:
+        assert import_table(descriptor).to_pydict() == t.to_pydict()
+    finally:
+        release(descriptor)
+
+    path = tmp_path / "t.csv"
+    path.write_text(
+        "k,i\n"
+        + "".join(f"{k or ''},{i}\n" for k, i in zip(t["k"].to_pylist(), range(600)))
+    )
+    read = cp.read_csv(path, chunk_bytes=500)
+    assert (
+        read["k"].dtype == DataType.CATEGORICAL
+        and read["k"].to_pylist() == t["k"].to_pylist()
+    )
+
+
+def test_schema_validation_reports_in_bulk(tmp_path):
+    import corepy as cp
+    from corepy.data import Column, SchemaValidationError
+
+    schema = Schema(
+        fields=[
+            {
+                "name": "age",
+                "dtype": "int",
+                "metadata": {"min": 0, "max": 120, "nullable": False},
+            },
+            {"name": "kind", "dtype": "str", "metadata": {"enum": ["a", "b"]}},
+            {"name": "score", "dtype": "float", "metadata": {"min": 0.0}},
+        ]
+    )
+    ok = Table.from_pydict(
+        {
+            "age": [1, 50, 120],
+            "kind": ["a", None, "b"],
+            "score": [0.0, float("nan"), 2.5],
+        },
+        schema=schema,
+    )
+    assert ok.validate() == []
+
+    with pytest.raises(SchemaValidationError) as info:
+        Table.from_pydict(
+            {
+                "age": [-1, 5, None, 130] * 10,
+                "kind": ["a", "c", "b", "d"] * 10,
+                "score": [1.0] * 40,
+            },
+            schema=schema,
+        )
+    found = {(v.column, v.rule): (v.count, v.rows) for v in info.value.violations}
+    assert found == {
+        ("age", "nullable"): (10, list(range(2, 40, 4))),
+        ("age", "min"): (10, list(range(0, 40, 4))),
+        ("age", "max"): (10, list(range(3, 40, 4))),
+        ("kind", "enum"): (20, [1, 3, 5, 7, 9, 11, 13, 15, 17, 19]),
+    }
+    assert "'age': 10 values below min 0 (rows 0, 4" in str(info.value)
+
+    loose = Table.from_pydict({"age": Column.from_pylist([1.5]), "kind": ["a"]})
+    assert [(v.column, v.rule) for v in loose.validate(schema)] == [
+        ("age", "dtype"),
+        ("score", "missing"),
+    ]
+
+    path = tmp_path / "t.csv"
+    path.write_text("age,kind\n3,a\n-4,b\n")
+    with pytest.raises(SchemaValidationError):
+        cp.read_csv(path, schema=schema)
+    assert cp.read_csv(path, schema=schema, columns=["kind"])["kind"].to_pylist() == [
+        "a",
+        "b",
+    ]
+
+
+def test_lazy_plan_pushdown_matches_eager(tmp_path):
+    import corepy as cp
+    from corepy.data import col
+
+    t = Table.from_pydict(
+        {
+            "k": [i % 7 for i in range(400)],
+            "x": [i * 0.5 for i in range(400)],
+            "s": ["a", "b", "c", "d"] * 100,
+            "ts": list(range(400)),
+            "unused": [0] * 400,
+        }
+    )
+    dim = Table.from_pydict(
+        {"k": list(range(5)), "name": [f"n{i}" for i in range(5)], "x": [1.0] * 5}
+    )
+    t.write_columnar(tmp_path / "t.col", row_group_size=50)
+
+    def query(q):
+        q = q.with_columns(y=col("x") * 2, dead=col("x") + 1).with_columns(
+            w=col("y") + 1
+        )
+        q = (
+            q.filter((col("ts") >= 300) & (col("s") == "a"))
+            .join(dim, on="k")
+            .filter(col("name") != "n3")
+        )
+        return q.select("k", "w", "name", "x_right")
+
+    lazy = (
+        query(cp.scan_columnar(tmp_path / "t.col")).sort("w", descending=True).head(5)
+    )
+    eager = query(t).sort("w", descending=True).slice(0, 5)
+    assert lazy.collect().to_pydict() == eager.to_pydict()
+
+    plan = lazy.explain().splitlines()
+    assert plan[0].startswith("TopK k=5")
+    scan = next(line for line in plan if "Scan columnar" in line)
+    assert "columns=['k', 'x']" in scan
+    assert "filter=[(col('s') == lit('a')), (col('ts') >= lit(300))]" in scan
+    assert "dead" not in lazy.explain() and "dead" in lazy.explain(optimized=False)
+    assert (
+        "Scan table rows=5 columns=['k', 'name', 'x'] filter=[(col('name') != "
+        "lit('n3'))]"
+        in lazy.explain()
+    )
+
+    grouped = t.lazy().group_by("s").agg(n=col("ts").count()).filter(col("s") != "b")
+    assert "Scan table rows=400 columns=['s', 'ts'] filter=" in grouped.explain()
+    assert grouped.collect().to_pydict() == {"s": ["a", "c", "d"], "n": [100, 100, 100]}
+
+
+def test_lazy_filters_stay_above_limits_and_outer_sides():
+    from corepy.data import col, lit
+
+    t = Table.from_pydict({"k": [1, 2, 3, 4], "v": [10, 20, 30, 40]})
+    right = Table.from_pydict({"k": [1, 2], "w": [5, None]})
+
+    limited = t.lazy().head(2).filter(col("v") > 10)
+    assert limited.explain().splitlines()[0].startswith("Filter")
+    assert limited.collect()["v"].to_pylist() == [20]
+
+    outer = t.lazy().join(right, on="k", how="left").filter(col("w").is_null())
+    assert outer.explain().splitlines()[0].startswith("Filter")
+    assert outer.collect()["k"].to_pylist() == [2, 3, 4]
+
+    # A global aggregate has a row even when no input row passes
+    total = t.lazy().agg(s=col("v").sum()).filter(lit(False))
+    assert total.explain().splitlines()[0].startswith("Filter")
+    assert len(total.collect()) == 0
+    kept = t.lazy().agg(s=col("v").sum()).filter(lit(True)).collect()
+    assert kept.to_pydict() == {"s": [100]}
+
+    swapped = t.lazy().select(col("k").alias("v"), col("v").alias("k")).select("v")
+    assert swapped.collect().to_pydict() == {"v": [1, 2, 3, 4]}
+    with pytest.raises(KeyError):
+        t.lazy().select("k").filter(col("v") > 1)
+
+
+def test_rolling_windows_match_recomputation():
+    import math
+    import random
+    import statistics
+
+    from corepy.data import col, parse_duration
+
+    rng = random.Random(7)
+    ts = sorted(rng.sample(range(5_000), 200))
+    px = [None if rng.random() < 0.1 else rng.uniform(90, 110) for _ in ts]
+    t = Table.from_pydict({"ts": ts, "px": px, "sym": [rng.choice("ab") for _ in ts]})
+
+    out = t.rolling(250, on="ts").agg(
+        col("px").mean(),
+        lo=col("px").min(),
+        hi=col("px").max(),
+        sd=col("px").std(),
+        n=col("px").count(),
+    )
+    for i, now in enumerate(ts):
+        window = [p for s, p in zip(ts, px) if now - 250 < s <= now and p is not None]
+        assert out["n"][i] == len(window)
+        assert out["lo"][i] == (min(window) if window else None) and out["hi"][i] == (
+            max(window) if window else None
+        )
+        assert (
+            math.isclose(out["px"][i], statistics.mean(window))
+            if window
+            else out["px"][i] is None
+        )
+        assert (
+            math.isclose(out["sd"][i], statistics.stdev(window))
+            if len(window) > 1
+            else out["sd"][i] is None
+        )
+
+    rows = Table.from_pydict({"x": [1, 2, None, 4, 5]})
+    assert rows.rolling(3).agg(
+        col("x").sum(), d=col("x").count_distinct()
+    ).to_pydict() == {"x": [1, 3, 3, 6, 9], "d": [1, 2, 2, 2, 2]}
+    assert rows.rolling(3, min_periods=3).agg(col("x").sum())["x"].to_pylist() == [
+        None,
+        None,
+        None,
+        None,
+        None,
+    ]
+    grouped = t.group_by("sym").rolling(250, on="ts").agg(col("px").max())
+    assert (
+        grouped.column_names == ["sym", "ts", "px"] and grouped["ts"].to_pylist() == ts
+    )
+    a = (
+        t.filter(col("sym") == "a")
+        .rolling(250, on="ts")
+        .agg(col("px").max())["px"]
+        .to_pylist()
+    )
+    assert [
+        m
+        for m, s in zip(grouped["px"].to_pylist(), grouped["sym"].to_pylist())
+        if s == "a"
+    ] == a
+
+    assert (
+        parse_duration("1.5s", "ms") == 1500 and parse_duration("250us", "ms") == 0.25
+    )
+    with pytest.raises(ValueError):
+        rows.rolling("1s").agg(col("x").sum())
+    with pytest.raises(ValueError):
+        Table.from_pydict({"ts": [2, 1], "x": [1, 2]}).rolling(5, on="ts").agg(
+            col("x").sum()
+        )
+    assert Table.from_pydict({"g": ["a", "b", "a"], "x": [1.0, 2.0, 4.0]}).group_by(
+        "g"
+    ).agg(col("x").std())["x"].to_pylist() == [math.sqrt(4.5), None]
+
+
+def test_rolling_windows_recover_after_nan_and_inf_leave():
+    import math
+
+    from corepy.data import Table, col
+
+    nan, inf = math.nan, math.inf
+    t = Table.from_pydict({"x": [1.0, nan, 2.0, 3.0, inf, 4.0, 5.0, -inf, inf, 6.0]})
+    out = t.rolling(2).agg(s=col("x").sum(), m=col("x").mean(), sd=col("x").std())
+    sums = out["s"].to_pylist()
+    assert [math.isnan(v) for v in sums[1:3]] == [True, True]
+    assert sums[3:] == [5.0, inf, inf, 9.0, -inf, sums[8], inf]
+    assert math.isnan(sums[8])
+    assert out["m"].to_pylist()[3:7] == [2.5, inf, inf, 4.5]
+    deviations = out["sd"].to_pylist()
+    assert deviations[3] == deviations[6] == math.sqrt(0.5)
+    assert all(math.isnan(v) for v in deviations[1:3] + deviations[4:6])
+
+    # NaN is skipped by min and max, and is their result only in an all-NaN window
+    t = Table.from_pydict({"x": [1.0, nan, 0.5, nan, nan, nan, 2.0]})
+    out = t.rolling(3).agg(lo=col("x").min(), hi=col("x").max())
+    lo, hi = out["lo"].to_pylist(), out["hi"].to_pylist()
+    assert lo[:5] == [1.0, 1.0, 0.5, 0.5, 0.5] and hi[:5] == [1.0, 1.0, 1.0, 0.5, 0.5]
+    assert math.isnan(lo[5]) and math.isnan(hi[5]) and lo[6] == hi[6] == 2.0
+
+
+def test_windows_stream_across_batches():
+    from corepy.data import (
+        EwmAggregator,
+        RollingAggregator,
+        WindowAggregator,
+        col,
+        concat,
+    )
+
+    ts = [0, 3, 7, 10, 12, 19, 20, 33, 41, 42]
+    t = Table.from_pydict({"ts": ts, "x": list(range(1, 11))})
+    assert t.window(10, on="ts").agg(
+        col("x").sum(), n=col("x").count()
+    ).to_pydict() == {
+        "ts": [0, 10, 20, 30, 40],
+        "x": [6, 15, 7, 8, 19],
+        "n": [3, 3, 1, 1, 2],
+    }
+    sliding = t.window(10, period=20, on="ts").agg(col("x").max())
+    assert sliding.to_pydict() == {
+        "ts": [-10, 0, 10, 20, 30, 40],
+        "x": [3, 6, 7, 8, 10, 10],
+    }
+    assert t.window(4).agg(col("x").first()).to_pydict() == {
+        "row": [0, 4, 8],
+        "x": [1, 5, 9],
+    }
+
+    # Batch boundaries don't change any result
+    rolling = RollingAggregator(
+        15, [col("x").sum(), col("x").min().alias("lo")], on="ts"
+    )
+    windows = WindowAggregator(10, {"x": col("x").max()}, period=20, on="ts")
+    ewm = EwmAggregator(["x"], half_life=10, on="ts")
+    batches = [t.slice(0, 3), t.slice(3, 1), t.slice(4, 0), t.slice(4, 6)]
+    assert (
+        concat([rolling.update(b) for b in batches]).to_pydict()
+        == t.rolling(15, on="ts").agg(col("x").sum(), lo=col("x").min()).to_pydict()
+    )
+    emitted = [windows.update(b) for b in batches]
+    assert [len(e) for e in emitted] == [0, 1, 0, 3]
+    assert concat(emitted + [windows.flush()]).to_pydict() == sliding.to_pydict()
+    assert (
+        concat([ewm.update(b) for b in batches]).to_pydict()
+        == t.ewm_mean("x", half_life=10, on="ts").to_pydict()
+    )
+    assert Table.from_pydict({"x": [1.0, None, 3.0]}).ewm_mean("x", alpha=0.5)[
+        "x"
+    ].to_pylist() == [1.0, 1.0, 2.0]
+    with pytest.raises(ValueError):
+        t.ewm_mean("x", alpha=0.5, span=3)
+
+
+def test_sketch_aggregates_estimate_merge_and_serialize(monkeypatch):
+    import random
+
+    from corepy.data import Column, HeavyHitters, HyperLogLog, TDigest, col, groupby
+
+    rng = random.Random(7)
+    users = [f"user{rng.randrange(20_000)}" for _ in range(50_000)]
+    latency = [rng.expovariate(1.0) for _ in range(50_000)]
+    exact = sorted(latency)
+
+    hll = HyperLogLog().update(Column.from_pylist(users))
+    assert abs(hll.estimate() - len(set(users))) < 0.03 * len(set(users))
+    halves = (
+        HyperLogLog().update(users[:25_000]).merge(HyperLogLog().update(users[25_000:]))
+    )
+    assert halves.estimate() == hll.estimate()
+    assert HyperLogLog.from_bytes(hll.to_bytes()).estimate() == hll.estimate()
+    assert (
+        HyperLogLog().update([1, 2, 2, None]).estimate() == 2
+        and HyperLogLog().estimate() == 0
+    )
+    with pytest.raises(ValueError):
+        hll.merge(HyperLogLog(10))
+
+    digest = (
+        TDigest().update(latency[:30_000]).merge(TDigest().update(latency[30_000:]))
+    )
+    for q in (0.5, 0.9, 0.99):
+        assert (
+            abs(digest.quantile(q) - exact[int(q * len(exact))])
+            < 0.02 * exact[int(q * len(exact))]
+        )
+    assert digest.quantile(0) == exact[0] and digest.quantile(1) == exact[-1]
+    assert TDigest.from_bytes(digest.to_bytes()).quantile(0.99) == digest.quantile(0.99)
+    assert (
+        TDigest().update([1.0, float("nan"), 3.0]).quantile(0.5) == 2.0
+        and TDigest().quantile(0.5) is None
+    )
+
+    hitters = HeavyHitters(5).update(
+        ["a"] * 50 + ["b"] * 30 + [str(i) for i in range(40)]
+    )
+    assert [v for v, _ in hitters.top(2)] == ["a", "b"] and hitters.top(1)[0][
+        1
+    ] >= 50 - hitters.error
+    assert HeavyHitters.from_bytes(hitters.to_bytes()).top() == hitters.top()
+
+    monkeypatch.setattr(groupby, "MIN_PARTITION_ROWS", 1000)
+    t = Table.from_pydict({"g": [u[-1] for u in users], "u": users, "lat": latency})
+    grouped = t.group_by("g", workers=4).agg(
+        col("u").approx_count_distinct(),
+        p99=col("lat").approx_quantile(0.99),
+        top=col("u").heavy_hitters(1),
+    )
+    for g, estimate, p99, top in zip(*grouped.to_pydict().values()):
+        distinct = {u for u in users if u[-1] == g}
+        assert abs(estimate - len(distinct)) < 0.05 * len(distinct)
+        assert top[0][0] in distinct and p99 > exact[len(exact) // 2]
+    assert t.agg(n=col("u").approx_count_distinct())["n"] == hll.estimate()
+    assert (
+        repr(col("lat").approx_quantile(0.5).alias("p"))
+        == "col('lat').approx_quantile(0.5, 200.0).alias('p')"
+    )
+    with pytest.raises(ValueError):
+        t.rolling(10).agg(col("lat").approx_quantile(0.5))
+
+
+def test_materialized_aggregate_matches_full_recompute(tmp_path):
+    from corepy.backend.types import DataType
+    from corepy.data import MaterializedAggregate, col, concat
+
+    aggs = {
+        "x": col("x").sum(),
+        "m": col("x").mean(),
+        "v": col("x").var(),
+        "lo": col("i").min(),
+        "n": col("x").count(),
+        "f": col("g").first(),
+    }
+    batches = [
+        Table.from_pydict({"g": ["a", "b", "a"], "x": [1, 2, None], "i": [5, 3, 4]}),
+        Table.from_pydict({"g": [], "x": [], "i": []}),
+        Table.from_pydict({"g": ["c", "a"], "x": [None, None], "i": [1, 9]}),
+        Table.from_pydict({"g": ["b", "c", "a"], "x": [0.5, 4.0, 3.0], "i": [7, 0, 2]}),
+    ]
+    materialized = MaterializedAggregate("g", aggs)
+    assert len(materialized.snapshot()) == 0
+    for batch in batches:
+        materialized.update(batch)
+    expected = concat(batches).group_by("g").agg(**aggs).to_pydict()
+    assert materialized.snapshot().to_pydict() == expected and materialized.rows == 8
+    assert materialized.snapshot() is materialized.snapshot()
+
+    path = str(tmp_path / "state.ckpt")
+    materialized.checkpoint(path)
+    restored = MaterializedAggregate.restore(path, "g", aggs)
+    extra = Table.from_pydict({"g": ["d", "b"], "x": [1.0, 1.0], "i": [1, 1]})
+    assert (
+        restored.update(extra).snapshot().to_pydict()
+        == concat(batches + [extra]).group_by("g").agg(**aggs).to_pydict()
+    )
+    with pytest.raises(ValueError):
+        MaterializedAggregate.restore(path, "g", {"x": col("x").max()})
+    with pytest.raises(TypeError):
+        materialized.update(Table.from_pydict({"g": ["a"], "x": ["text"], "i": [1]}))
+
+    seeded = batches[0].group_by("g").materialize(col("x").sum())
+    assert seeded.update(batches[3]).snapshot().to_pydict() == {
+        "g": ["a", "b", "c"],
+        "x": [4.0, 2.5, 4.0],
+    }
+
+    # A rejected batch widens nothing, not even the columns checked before the bad one
+    numbered = MaterializedAggregate("k", {"s": col("v").sum()})
+    numbered.update(Table.from_pydict({"k": [1, 2], "v": [1, 2]}))
+    with pytest.raises(TypeError):
+        numbered.update(Table.from_pydict({"k": [1.5], "v": ["text"]}))
+    assert numbered.snapshot().dtypes == {"k": DataType.INT64, "s": DataType.INT64}
+
+    # All-null batches leave the dtypes to the first batch with values
+    late = MaterializedAggregate("g", {"s": col("x").sum()})
+    late.update(Table.from_pydict({"g": [None, None], "x": [None, None]}))
+    late.update(Table.from_pydict({"g": ["a", None], "x": [1.5, 2.0]}))
+    assert late.snapshot().to_pydict() == {"g": [None, "a"], "s": [2.0, 1.5]}
+    assert late.snapshot().dtypes == {"g": DataType.STRING, "s": DataType.FLOAT64}
+
+
+def test_indexes_answer_filters_joins_and_persist(tmp_path):
+    from corepy.data import HashIndex, SortedIndex, col, read_columnar
+
+    t = Table.from_pydict(
+        {
+            "id": [4, 2, 9, 7, 1, 3],
+            "g": [2.5, None, 1.0, float("nan"), 2.5, -3.0],
+            "s": ["a", "b", "a", "c", "b", "a"],
+        }
+    )
+    predicates = [
+        col("id") == 9,
+        col("s").isin(["a", "z"]),
+        (col("g") >= 1.0) & (col("s") == "a"),
+        col("g") < 2.5,
+        1.0 < col("g"),
+        col("g") == float("nan"),
+        col("id") == 2.0,
+    ]
+    expected = [t.filter(p).to_pydict() for p in predicates]
+    assert isinstance(t.create_index("id"), HashIndex) and isinstance(
+        t.create_index("g", "sorted"), SortedIndex
+    )
+    t.create_index("s")
+    assert [t.filter(p).to_pydict() for p in predicates] == expected
+    assert t.indexes["s"].lookup("a") == [0, 2, 5] and t.indexes["g"].range(
+        0, 2.5, upper_inclusive=False
+    ) == [2]
+    assert t.lookup("id", 7).to_pydict()["s"] == ["c"] and len(t.lookup("id", 8)) == 0
+    assert set(t.select("id", "s").indexes) == {"id", "s"} and set(
+        t.with_columns(s=col("id")).indexes
+    ) == {"id", "g"}
+    assert (
+        "index=" in t.lazy().filter(col("id") == 9).explain()
+        and t.lazy().filter(col("id") == 9).collect().to_pydict() == expected[0]
+    )
+
+    left = Table.from_pydict({"s": ["a", None, "c", "d", "b"], "n": [1, 2, 3, 4, 5]})
+    right = t.select("s", "id")
+    joins = {
+        how: left.join(right, on="s", how=how).to_pydict()
+        for how in ("inner", "left", "semi", "anti")
+    }
+    plain = Table.from_pydict(right.to_pydict())
+    assert joins == {
+        how: left.join(plain, on="s", how=how).to_pydict() for how in joins
+    }
+
+    path = tmp_path / "indexed.col"
+    t.write_columnar(path, row_group_size=4)
+    loaded = read_columnar(path)
+    assert {name: index.kind for name, index in loaded.indexes.items()} == {
+        "id": "hash",
+        "g": "sorted",
+        "s": "hash",
+    }
+    assert loaded.indexes["g"].order == t.indexes["g"].order
+    assert [loaded.filter(p).to_pydict() for p in predicates] == expected
+    assert not read_columnar(path, filter=col("id") > 2).indexes
+    with pytest.raises(TypeError):
+        t.filter(col("id") == "x")
+    t.drop_index("g")
+    with pytest.raises(ValueError):
+        t.create_index("id", kind="bitmap")
+    with pytest.raises(KeyError):
+        t.drop_index("g")
+
+
+def test_nan_keys_match_nothing_in_indexes_and_joins():
+    from corepy.data import HashIndex
+
+    nan = float("nan")
+    index = HashIndex(Table.from_pydict({"k": [nan, 1.0, nan, None, 1.0]})["k"])
+    assert len(index) == 1 and nan not in index and index.lookup(1.0) == [1, 4]
+
+    left = Table.from_pydict({"k": [nan, 1.0, 2.0], "j": [1, 1, 1], "n": [0, 1, 2]})
+    right = Table.from_pydict({"k": [nan, 1.0, nan], "j": [1, 1, 1], "m": [7, 8, 9]})
+    for on in (["k"], ["k", "j"]):
+        assert left.join(right, on=on)["n"].to_pylist() == [1]
+        assert left.join(right, on=on, how="left")["m"].to_pylist() == [None, 8, None]
+        assert left.join(right, on=on, how="anti")["n"].to_pylist() == [0, 2]
+    right.create_index("k")
+    joined = left.join(right, on="k")
+    assert joined.to_pydict() == {
+        "k": [1.0],
+        "j": [1],
+        "n": [1],
+        "j_right": [1],
+        "m": [8],
+    }
+    assert left.join(right, on="k", how="semi")["n"].to_pylist() == [1]
+
+
+def test_spilling_operators_match_in_memory_results(tmp_path):
+    from corepy.backend.session import get_session, parse_bytes
+    from corepy.data import col
+
+    t = Table.from_pydict(
+        {
+            "k": [["a", "b", None][i % 3] for i in range(3000)],
+            "x": [
+                float("nan")
+                if i % 11 == 0
+                else None
+                if i % 13 == 0
+                else (i * 7919) % 101 / 4
+                for i in range(3000)
+            ],
+            "n": [(i * 31) % 97 for i in range(3000)],
+        }
+    )
+    right = Table.from_pydict(
+        {"n": [i % 50 for i in range(120)], "v": list(range(120))}
+    )
+
+    def run():
+        return [
+            t.sort(["k", "x"], descending=[True, False]).to_list(),
+            t.sort("x", nulls_last=False).to_list(),
+            t.group_by("k", "n").agg(col("x").sum(), c=col("x").count()).to_list(),
+            *(
+                t.join(right, "n", how=how).to_list()
+                for how in ("inner", "left", "anti")
+            ),
+        ]
+
+    session = get_session()
+    budget, spill_dir = session.memory_budget, session.spill_dir
+    expected = repr(run())
+    try:
+        session.set_memory_budget("64KB")
+        session.spill_dir = str(tmp_path)
+        session.reset_spill_stats()
+        assert repr(run()) == expected
+        stats = session.spill_stats
+        assert (
+            stats["operations"] == 6
+            and stats["files"] > 6
+            and stats["rows"] > 3 * len(t)
+        )
+        assert not list(tmp_path.iterdir())
+    finally:
+        session.memory_budget, session.spill_dir = budget, spill_dir
+    assert parse_bytes("1.5KB") == 1536 and parse_bytes(10) == 10
+    with pytest.raises(ValueError):
+        parse_bytes("lots")
+
+
+def test_external_sort_streams_spilled_runs(tmp_path):
+    import random
+    import tracemalloc
+
+    from corepy.backend.session import get_session
+
+    rng = random.Random(3)
+    keys = [rng.random() for _ in range(20000)]
+    t = Table.from_pydict({"k": keys, "i": list(range(20000))})
+
+    def peak():
+        tracemalloc.start()
+        try:
+            out = t.sort("k")
+            return out, tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    session = get_session()
+    budget, spill_dir = session.memory_budget, session.spill_dir
+    expected, in_memory = peak()
+    try:
+        session.set_memory_budget("64KB")
+        session.spill_dir = str(tmp_path)
+        session.reset_spill_stats()
+        out, spilled = peak()
+        assert session.spill_stats["operations"] == 1
+    finally:
+        session.memory_budget, session.spill_dir = budget, spill_dir
+    assert out.to_pydict() == expected.to_pydict()
+    # The merge reads the runs a block at a time instead of loading them all
+    assert spilled < in_memory
+
+
+def test_table_tensor_bridge_shares_and_interleaves_buffers():
+    import math
+
+    from corepy import Tensor
+    from corepy.backend.types import DataType
+    from corepy.schema import Field, Schema
+
+    t = Table.from_pydict(
+        {"a": [1.5, None, 3.0], "b": [1, 2, 3], "flag": [True, False, True]}
+    )
+    single = t.to_tensor("b")
+    assert (
+        single.shape == (3,)
+        and single.dtype == DataType.INT64
+        and single._backing_data.obj is t.column("b").values
+    )
+    rows = t.to_tensor(["a", "b", "flag"])
+    assert rows.shape == (3, 3) and rows.dtype == DataType.FLOAT64
+    assert rows._backing_data.tolist()[0] == [1.5, 1.0, 1.0] and math.isnan(
+        rows._backing_data[1, 0]
+    )
+    cols = t.to_tensor(["b", "flag"], layout="col")
+    assert cols.shape == (2, 3) and cols._backing_data.tolist() == [
+        [1, 2, 3],
+        [1, 0, 1],
+    ]
+
+    assert cols.to_table(["b", "flag"], layout="col").to_pydict() == {
+        "b": [1, 2, 3],
+        "flag": [1, 0, 1],
+    }
+    back = rows.to_table(["a", "b", "flag"])
+    assert (
+        back.to_pydict()["b"] == [1.0, 2.0, 3.0]
+        and back.dtypes["a"] == DataType.FLOAT64
+    )
+    assert single.to_table("b").column("b").values.obj is t.column("b").values
+    assert Tensor([1.0, 2.0]).to_table().to_pydict() == {"column_0": [1.0, 2.0]}
+    assert t.slice(0, 0).to_tensor(["a", "b"]).shape == (0, 2)
+
+    schema = Schema(
+        fields=[Field(name="x", dtype="float32"), Field(name="n", dtype="int32")]
+    )
+    typed = Table.from_pydict({"x": [0.5, 1.0], "n": [1, 2]}, schema=schema)
+    assert typed.to_tensor(["x", "n"]).dtype == DataType.FLOAT32
+    assert t.to_tensor(["b", "a"], dtype=DataType.FLOAT32).dtype == DataType.FLOAT32
+    with pytest.raises(TypeError):
+        t.to_tensor(["a", "b"], dtype=DataType.INT64)
+    with pytest.raises(ValueError):
+        t.to_tensor(["a"], dtype=DataType.FLOAT64, layout="diagonal")
+    with pytest.raises(TypeError):
+        Table.from_pydict({"s": ["x", "y"]}).to_tensor()
+
+
+def test_bridged_tensors_support_arithmetic_and_matmul():
+    from array import array
+
+    from corepy import Tensor
+    from corepy.backend.types import DataType
+
+    t = Table.from_pydict({"x": [1.0, 2.0, 3.0], "y": [4.0, 5.0, 6.0]})
+    rows = t.to_tensor(["x", "y"])
+    doubled = (rows + rows).to_table(["x", "y"]).to_pydict()
+    assert (rows + rows).shape == (3, 2)
+    assert doubled == {"x": [2.0, 4.0, 6.0], "y": [8.0, 10.0, 12.0]}
+    assert (rows * 2).to_table(["x", "y"]).to_pydict() == doubled
+    pair = Tensor(array("d", [1, 2]))
+    assert list((pair + pair)._backing_data) == [2.0, 4.0]
+    assert list((t.to_tensor("x") * [1, 0, 2])._backing_data) == [1.0, 0.0, 6.0]
+    # Mixed int64 and float32 buffers promote to float64
+    mixed = Tensor(array("q", [1, 2])) + Tensor(array("f", [0.5, 0.5]))
+    assert mixed._backing_data == array("d", [1.5, 2.5])
+    assert mixed.dtype == DataType.FLOAT64
+    halved = Tensor(array("q", [1, 3]), dtype=DataType.INT64) * 0.5
+    assert halved.dtype == DataType.FLOAT64 and list(halved._backing_data) == [0.5, 1.5]
+
+    scale = Table.from_pydict({"a": [1.0, 0.0], "b": [0.0, 2.0]}).to_tensor(["a", "b"])
+    product = rows.matmul(scale)
+    assert product.shape == (3, 2)
+    assert product._backing_data.tolist() == [[1.0, 8.0], [2.0, 10.0], [3.0, 12.0]]
+    with pytest.raises(ValueError):
+        rows + t.to_tensor("x")
+    with pytest.raises(ValueError):
+        rows.matmul(rows)
+
+    # Typed buffers of needles are sequences, not scalars
+    column = t.to_tensor("x")
+    assert column.searchsorted(array("d", [1.5, 3.0]))._backing_data == [1, 2]
+    assert column.searchsorted(memoryview(array("d", [0.0])))._backing_data == [0]
@@ -2,6 +2,7 @@ import sys
 import pytest
 from unittest.mock import patch
 import importlib
+import types
 
 def test_init_fallback_missing_extension():
     """
@@ -51,3 +52,34 @@ def test_init_fallback_missing_extension():
         if "corepy" in sys.modules:
              import corepy
              importlib.reload(corepy)
+
+
+def test_init_with_extension_registers_native_kernels():
+    """
+    Test that corepy imports with the C++ extension present and registers the
+    native kernels over the Python ones.
+    """
+    original_modules = sys.modules.copy()
+    extension = types.ModuleType("corepy._corepy_cpp")
+    extension.add_one = lambda x: x + 1
+    extension.simd_level = lambda: "scalar"
+
+    try:
+        for key in list(sys.modules.keys()):
+            if key.startswith("corepy"):
+                del sys.modules[key]
+        sys.modules["corepy._corepy_cpp"] = extension
+
+        import corepy
+        from corepy.backend.dispatch import Dispatcher
+        from corepy.backend.types import BackendType
+
+        assert corepy.add_one(1) == 2
+        for name in ("elementwise.add", "compare.lt", "cast", "reduce.sum"):
+            kernel = Dispatcher.get_kernel(name, BackendType.CPU)
+            assert kernel.__module__ == "corepy.ops.native"
+    finally:
+        for key in list(sys.modules.keys()):
+            if key.startswith("corepy"):
+                del sys.modules[key]
+        sys.modules.update(original_modules)
@@ -0,0 +1,105 @@
+from array import array
+
+import pytest
+
+
+def _values(batch, typecode):
+    return memoryview(batch._backing_data).cast("B").cast(typecode).tolist()
+
+def test_npy_round_trip_and_validation(tmp_path):
+    from corepy.backend.types import DataType
+    from corepy.io import read_npy, write_npy
+
+    write_npy(tmp_path / "a.npy", array("q", range(6)), shape=(2, 3))
+    t = read_npy(tmp_path / "a.npy")
+    assert t.shape == (2, 3) and t.dtype == DataType.INT64
+    assert _values(t, "q") == list(range(6))
+    # The data starts on a 64-byte boundary, like numpy's writer
+    assert ((tmp_path / "a.npy").stat().st_size - 6 * 8) % 64 == 0
+    header = b"{'descr': '<u2', 'fortran_order': False, 'shape': (1,)}\n"
+    (tmp_path / "b.npy").write_bytes(
+        b"\x93NUMPY\x01\x00" + bytes([len(header), 0]) + header + b"\0\0"
+    )
+    with pytest.raises(TypeError):
+        read_npy(tmp_path / "b.npy")
+
+
+def test_loader_batches_npy_files_in_order_with_pooled_buffers(tmp_path):
+    from corepy.io import DataLoader, glob, write_npy
+
+    for i in range(43):
+        write_npy(tmp_path / f"s{i:02}.npy", array("f", [i] * 6), shape=(2, 3))
+    loader = DataLoader(str(tmp_path / "*.npy"), batch_size=5, workers=3, prefetch=2)
+    assert loader.format == "npy" and len(loader) == 9
+    shapes, first = [], []
+    for batch in loader:
+        shapes.append(batch.shape)
+        first += _values(batch, "f")[::6]
+    assert shapes == [(5, 2, 3)] * 8 + [(3, 2, 3)]
+    assert first == list(range(43))
+    # Dropped batches give their buffers back; live ones are never reused
+    assert loader.pool.allocations <= 5
+    kept = list(DataLoader(glob(str(tmp_path / "*.npy")), batch_size=5, drop_last=True))
+    assert [_values(b, "f")[0] for b in kept] == [5.0 * i for i in range(8)]
+
+    write_npy(tmp_path / "s99.npy", array("f", [0.0] * 4), shape=(4,))
+    with pytest.raises(ValueError, match="expects"):
+        list(DataLoader(str(tmp_path / "*.npy"), batch_size=8))
+
+
+def test_loader_shuffle_and_shard_are_deterministic(tmp_path):
+    from corepy.backend.types import DataType
+    from corepy.io import DataLoader
+
+    path = tmp_path / "records.bin"
+    path.write_bytes(array("q", range(200)).tobytes())
+
+    def epoch(**options):
+        loader = DataLoader(
+            [path], batch_size=16, dtype=DataType.INT64, record_shape=(2,), **options
+        )
+        return [v for batch in loader for v in _values(batch, "q")[::2]]
+
+    assert epoch() == list(range(0, 200, 2))
+    shuffled = epoch(shuffle=True, seed=5)
+    assert shuffled == epoch(shuffle=True, seed=5) != epoch(shuffle=True, seed=6)
+    assert sorted(shuffled) == list(range(0, 200, 2))
+    shards = [epoch(shuffle=True, seed=5, shard=(i, 3)) for i in range(3)]
+    assert sorted(sum(shards, [])) == sorted(shuffled) and shards[0] == shuffled[0::3]
+
+    loader = DataLoader(
+        [path],
+        batch_size=100,
+        dtype=DataType.INT64,
+        record_shape=(2,),
+        shuffle=True,
+        seed=5,
+    )
+    first, second = [_values(b, "q") for b in loader], [_values(b, "q") for b in loader]
+    assert first != second
+    loader.set_epoch(0)
+    assert [_values(b, "q") for b in loader] == first
+    with pytest.raises(ValueError):
+        DataLoader([path], dtype=DataType.INT64, record_shape=(3,))
+
+
+def test_loader_yields_table_batches_across_files(tmp_path):
+    from corepy.data import Table
+    from corepy.io import DataLoader
+
+    Table.from_pydict({"x": list(range(10))}).write_columnar(tmp_path / "a.col")
+    Table.from_pydict({"x": list(range(10, 25))}).write_columnar(tmp_path / "b.col")
+    loader = DataLoader([tmp_path / "a.col", tmp_path / "b.col"], batch_size=4)
+    batches = list(loader)
+    assert [len(b) for b in batches] == [4, 4, 4, 4, 4, 4, 1]
+    assert [v for b in batches for v in b["x"].to_pylist()] == list(range(25))
+    shuffled = [
+        v
+        for b in DataLoader(
+            [tmp_path / "a.col", tmp_path / "b.col"], batch_size=4, shuffle=True, seed=2
+        )
+        for v in b["x"].to_pylist()
+    ]
+    assert sorted(shuffled) == list(range(25)) and shuffled != list(range(25))
+    with pytest.raises(TypeError):
+        len(loader)
@@ -0,0 +1,178 @@
+import math
+import random
+from array import array
+
+import pytest
+
+pytest.importorskip("corepy._corepy_cpp")
+
+from corepy.backend.reference import ReferenceBackend as ref
+from corepy.ops import native
+
+
+def _columns(seed=7, n=2500):
+    # n spans several 1024-row blocks and a ragged tail
+    rng = random.Random(seed)
+    return {
+        "q": array("q", (rng.randint(-(10**6), 10**6) for _ in range(n))),
+        "i": array("i", (rng.randint(-1000, 1000) for _ in range(n))),
+        "d": array(
+            "d",
+            [rng.uniform(-1e3, 1e3) for _ in range(n - 3)] + [math.nan, -0.0, math.inf],
+        ),
+        "f": array("f", (rng.uniform(-1e3, 1e3) for _ in range(n))),
+        "B": array("B", (rng.random() < 0.5 for _ in range(n))),
+    }
+
+
+def _same(got, expected):
+    assert len(got) == len(expected)
+    for x, y in zip(got, expected):
+        assert x == y or (math.isnan(x) and math.isnan(y))
+
+
+def test_native_kernels_are_registered():
+    from corepy.backend.dispatch import Dispatcher
+    from corepy.backend.types import BackendType
+
+    assert native.available()
+    assert native.simd_level() in ("avx512", "avx2", "sse2", "neon", "scalar")
+    kernel = Dispatcher.get_kernel("elementwise.add", BackendType.CPU)
+    assert kernel.__module__ == "corepy.ops.native"
+
+
+def test_native_arithmetic_matches_reference():
+    from corepy.backend.dispatch import Dispatcher
+    from corepy.backend.types import BackendType
+
+    cols = _columns()
+    out_type = {
+        ("q", "q"): "q",
+        ("i", "i"): "i",
+        ("q", "i"): "q",
+        ("d", "q"): "d",
+        ("f", "f"): "f",
+        ("d", "f"): "d",
+        ("B", "q"): "q",
+    }
+    nonzero = {
+        code: array(col.typecode, (x if x else 1 for x in col))
+        for code, col in cols.items()
+    }
+    for (left, right), typecode in out_type.items():
+        a, b = cols[left], nonzero[right]
+        for op, reference in (
+            ("add", ref.add),
+            ("sub", ref.sub),
+            ("mul", ref.mul),
+            ("truediv", ref.div),
+            ("floordiv", ref.floordiv),
+            ("mod", ref.mod),
+        ):
+            kernel = Dispatcher.get_kernel(f"elementwise.{op}", BackendType.CPU)
+            result_type = (
+                "d" if op == "truediv" and typecode in ("q", "i") else typecode
+            )
+            expected = array(result_type, reference(list(a), list(b)))
+            _same(kernel(a, b, result_type), expected)
+            _same(
+                kernel(a, 3, result_type),
+                array(result_type, reference(list(a), [3] * len(a))),
+            )
+    # Scalar on the left broadcasts as well
+    _same(
+        Dispatcher.get_kernel("elementwise.sub", BackendType.CPU)(2.5, cols["d"], "d"),
+        array("d", ref.sub([2.5] * len(cols["d"]), list(cols["d"]))),
+    )
+
+
+def test_native_compare_unary_cast_reduce_match_reference():
+    from corepy.backend.dispatch import Dispatcher
+    from corepy.backend.types import BackendType
+
+    def kernel(name):
+        return Dispatcher.get_kernel(name, BackendType.CPU)
+
+    cols = _columns(seed=11)
+    for left, right in (("q", "i"), ("d", "q"), ("f", "f"), ("f", "d"), ("i", "B")):
+        a, b = cols[left], cols[right]
+        for op in ("eq", "ne", "lt", "le", "gt", "ge"):
+            assert list(kernel(f"compare.{op}")(a, b)) == ref.compare(
+                op, list(a), list(b)
+            )
+            assert list(kernel(f"compare.{op}")(a, 0)) == ref.compare(
+                op, list(a), [0] * len(a)
+            )
+    flags, other = cols["B"], array("B", reversed(cols["B"]))
+    for op in ("and", "or", "xor"):
+        assert list(kernel(f"compare.{op}")(flags, other)) == ref.compare(
+            op, list(flags), list(other)
+        )
+    assert list(kernel("elementwise.not")(flags)) == [int(not x) for x in flags]
+
+    for code in ("q", "i", "d", "f"):
+        values = cols[code]
+        _same(
+            kernel("elementwise.neg")(values, code), array(code, ref.neg(list(values)))
+        )
+        _same(
+            kernel("elementwise.abs")(values, code), array(code, ref.abs(list(values)))
+        )
+        _same([kernel("reduce.sum")(values)], [ref.sum(list(values))])
+        _same(
+            [kernel("reduce.min")(values), kernel("reduce.max")(values)],
+            [ref.min(list(values)), ref.max(list(values))],
+        )
+
+    finite = array("d", (x for x in cols["d"] if math.isfinite(x)))
+    _same(kernel("cast")(finite, "q"), array("q", ref.cast(list(finite), int)))
+    _same(kernel("cast")(cols["q"], "d"), array("d", ref.cast(list(cols["q"]), float)))
+    _same(kernel("cast")(cols["d"], "B"), array("B", ref.cast(list(cols["d"]), bool)))
+    _same(kernel("cast")(cols["q"], "f"), array("f", ref.cast(list(cols["q"]), float)))
+    assert kernel("reduce.min")(array("d", [math.nan, 1.0, 0.5])) != kernel(
+        "reduce.min"
+    )(array("d", [math.nan, 1.0, 0.5]))
+    assert kernel("reduce.min")(array("d", [1.0, math.nan, 0.5])) == 0.5
+    assert kernel("reduce.max")(array("q")) is None
+
+
+def test_native_kernels_fall_back_to_python_semantics():
+    from corepy.backend.dispatch import Dispatcher
+    from corepy.backend.types import BackendType
+
+    def kernel(name):
+        return Dispatcher.get_kernel(name, BackendType.CPU)
+
+    big = array("q", [2**62, 1])
+    with pytest.raises(OverflowError):
+        kernel("elementwise.add")(big, big, "q")
+    with pytest.raises(ZeroDivisionError):
+        kernel("elementwise.floordiv")(array("q", [1, 2]), array("q", [1, 0]), "q")
+    with pytest.raises(ZeroDivisionError):
+        kernel("elementwise.truediv")(array("d", [1.0]), 0.0, "d")
+    with pytest.raises(OverflowError):
+        kernel("cast")(array("d", [1e30]), "q")
+    with pytest.raises(ValueError):
+        kernel("cast")(array("d", [math.nan]), "q")
+    # Sums past int64 and ints beyond 2**53 are exact, as in Python
+    assert kernel("reduce.sum")(array("q", [2**62, 2**62, 2**62])) == 3 * 2**62
+    assert list(
+        kernel("compare.lt")(array("q", [2**53 + 1]), array("d", [2.0**53]))
+    ) == [0]
+    assert list(
+        kernel("elementwise.add")(array("q", [2**60 + 1]), array("q", [2**60 + 1]), "d")
+    ) == [float(2**61 + 2)]
+    # Lists, strings and pow stay in Python
+    assert list(kernel("elementwise.add")(["a", "b"], "c")) == ["ac", "bc"]
+    assert list(kernel("elementwise.pow")(array("q", [2, 3]), 2, "q")) == [4, 9]
+    assert kernel("reduce.sum")(array("d", [1e100, 1.0, -1e100])) == 1.0
+
+
+def test_table_expressions_use_native_kernels():
+    from corepy.data import Table, col
+
+    t = Table.from_pydict({"a": list(range(5000)), "b": [x * 0.5 for x in range(5000)]})
+    out = t.with_columns(c=col("a") * 2 + col("b")).filter(col("c") > 10)
+    assert out["c"].to_pylist()[:2] == [12.5, 15.0]
+    assert len(out) == 4995
+    assert t.sum() == {"a": sum(range(5000)), "b": sum(x * 0.5 for x in range(5000))}
@@ -1,3 +1,6 @@
+import logging
+import threading
+
 from corepy.data import Table
 from corepy.runtime.pipeline import Pipeline
 
@@ -37,3 +40,299 @@ def test_pipeline_execution(sample_data):
     
     for row in result.to_list():
         assert row["processed"] is True
+
+_steps_log = logging.getLogger("tests.pipeline.steps")
+
+
+def test_pipeline_cache_skips_unchanged_prefix(sample_data, caplog):
+    from corepy.runtime import StepCache
+
+    # Steps report through a logger, which pickles by name: logging does not
+    # change their fingerprints (a module-level list they append to would)
+    caplog.set_level(logging.INFO, logger=_steps_log.name)
+
+    def double_score(table: Table) -> Table:
+        _steps_log.info("double")
+        return Table([{**row, "score": row["score"] * 2} for row in table.to_list()])
+
+    def add_bonus(table: Table) -> Table:
+        _steps_log.info("bonus")
+        return Table([{**row, "score": row["score"] + 1} for row in table.to_list()])
+
+    cache = StepCache(max_entries=8)
+    pipeline = Pipeline([double_score, add_bonus], cache=cache)
+    first = pipeline.run(Table(sample_data))
+    assert caplog.messages == ["double", "bonus"]
+    assert "miss" in pipeline.explain()
+
+    # Identical rerun resolves entirely from the cache
+    again = pipeline.run(Table(sample_data))
+    assert caplog.messages == ["double", "bonus"]
+    assert again.to_list() == first.to_list()
+    assert pipeline.explain().splitlines()[1].endswith("skipped")
+    assert pipeline.explain().splitlines()[2].endswith("hit")
+
+    # Changing the last step only reruns the last step
+    def add_bonus(table: Table) -> Table:  # noqa: F811
+        _steps_log.info("bonus2")
+        return Table([{**row, "score": row["score"] + 2} for row in table.to_list()])
+
+    pipeline.steps[1] = add_bonus
+    result = pipeline.run(Table(sample_data))
+    assert caplog.messages == ["double", "bonus", "bonus2"]
+    assert result.to_list()[0]["score"] == 90.5 * 2 + 2
+
+
+def test_pipeline_cache_key_tracks_parameters_and_input(sample_data):
+    from functools import partial
+
+    from corepy.runtime.cache import _code_bytes, fingerprint_step, fingerprint_table
+
+    def scale(table: Table, factor: float) -> Table:
+        return table
+
+    assert fingerprint_step(partial(scale, factor=2)) == fingerprint_step(
+        partial(scale, factor=2)
+    )
+    assert fingerprint_step(partial(scale, factor=2)) != fingerprint_step(
+        partial(scale, factor=3)
+    )
+    assert fingerprint_table(Table(sample_data)) != fingerprint_table(
+        Table(sample_data[:1])
+    )
+
+    # {0, 8} and {8, 0} iterate in different orders, as sets of strings do
+    # between processes with different PYTHONHASHSEEDs
+    assert fingerprint_step(partial(scale, factor={0, 8})) == fingerprint_step(
+        partial(scale, factor={8, 0})
+    )
+
+    def sized(table: Table) -> bool:
+        return len(table) in {0, 8}
+
+    code = sized.__code__
+    consts = tuple(
+        frozenset([8, 0]) if isinstance(c, frozenset) else c for c in code.co_consts
+    )
+    assert _code_bytes(code) == _code_bytes(code.replace(co_consts=consts))
+
+
+_THRESHOLDS = {"score": 50}
+_LOCK = threading.Lock()
+
+
+class _Scaler:
+    factor = 2
+
+
+def test_step_fingerprint_tracks_global_values(sample_data):
+    from corepy.runtime import StepCache
+    from corepy.runtime.cache import fingerprint_step
+
+    def keep_high(table: Table) -> Table:
+        rows = table.to_list()
+        return Table([row for row in rows if row["score"] > _THRESHOLDS["score"]])
+
+    def scale(table: Table) -> Table:
+        rows = table.to_list()
+        return Table([{**row, "score": row["score"] * _Scaler.factor} for row in rows])
+
+    def locked(table: Table) -> Table:
+        with _LOCK:
+            return table
+
+    before = fingerprint_step(keep_high), fingerprint_step(scale)
+    try:
+        _THRESHOLDS["score"] = 60
+        _Scaler.factor = 3
+        assert fingerprint_step(keep_high) != before[0]
+        assert fingerprint_step(scale) != before[1]
+    finally:
+        _THRESHOLDS["score"] = 50
+        _Scaler.factor = 2
+    assert (fingerprint_step(keep_high), fingerprint_step(scale)) == before
+
+    # A lock can neither be pickled nor told apart by repr: never cached
+    assert fingerprint_step(locked) is None
+    pipeline = Pipeline([keep_high, locked, scale], cache=StepCache())
+    for _ in range(2):
+        pipeline.run(Table(sample_data))
+    statuses = [line.split()[-1] for line in pipeline.explain().splitlines()[1:]]
+    assert statuses == ["hit", "run", "run"]
+
+
+def test_step_cache_lru_eviction_and_spill(sample_data, tmp_path):
+    from corepy.runtime import StepCache
+
+    cache = StepCache(max_entries=1, spill_dir=str(tmp_path))
+    cache.put("a", Table(sample_data))
+    cache.put("b", Table(sample_data[:1]))
+    assert len(cache) == 1
+    assert cache.stats["evictions"] == 1
+    assert (tmp_path / "a.pkl").exists()
+
+    restored = cache.get("a")
+    assert restored.to_list() == sample_data
+    assert cache.get("missing") is None
+
+
+def test_pipeline_arun_mixes_async_and_plain_steps(sample_data):
+    import asyncio
+
+    async def fetch_bonus(table: Table) -> Table:
+        await asyncio.sleep(0)
+        return Table([{**row, "bonus": 1} for row in table.to_list()])
+
+    def apply_bonus(table: Table) -> Table:
+        return Table(
+            [{**row, "score": row["score"] + row["bonus"]} for row in table.to_list()]
+        )
+
+    pipeline = Pipeline([fetch_bonus, apply_bonus])
+    result = asyncio.run(pipeline.arun(Table(sample_data)))
+    assert [row["score"] for row in result.to_list()] == [91.5, 86.0]
+
+
+def test_pipeline_astream_overlaps_batches_with_step_limit():
+    import asyncio
+
+    active = {"now": 0, "peak": 0}
+
+    async def slow_io(table: Table) -> Table:
+        active["now"] += 1
+        active["peak"] = max(active["peak"], active["now"])
+        await asyncio.sleep(0.01)
+        active["now"] -= 1
+        return table
+
+    pipeline = Pipeline()
+    pipeline.add_step(slow_io, max_concurrency=2)
+    pipeline.add_step(lambda t: Table([{"n": len(t)}]))
+
+    async def collect():
+        batches = [Table([{"i": i}] * (i + 1)) for i in range(6)]
+        return [out async for out in pipeline.astream(batches, max_in_flight=6)]
+
+    results = asyncio.run(collect())
+    assert [t.to_list()[0]["n"] for t in results] == [1, 2, 3, 4, 5, 6]
+    assert active["peak"] == 2
+
+
+def test_pipeline_async_runs_resolve_cache_off_the_loop(sample_data):
+    import asyncio
+    import threading
+
+    from corepy.runtime import StepCache
+
+    def add_one(table: Table) -> Table:
+        return Table([{**row, "score": row["score"] + 1} for row in table.to_list()])
+
+    pipeline = Pipeline([add_one], cache=StepCache())
+    threads = []
+    resume_point = pipeline._resume_point
+
+    def recording_resume_point(data):
+        threads.append(threading.current_thread())
+        return resume_point(data)
+
+    pipeline._resume_point = recording_resume_point
+    first = Table(sample_data)
+    asyncio.run(pipeline.arun(first))
+    assert threads and threading.main_thread() not in threads
+    assert pipeline.explain().splitlines()[1].endswith("miss")
+
+    async def collect(batches):
+        return [out async for out in pipeline.astream(batches, max_in_flight=2)]
+
+    # Statuses belong to each run: the last batch was cached, the one before not
+    results = asyncio.run(collect([Table(sample_data[:1]), first]))
+    assert [len(t) for t in results] == [1, 2]
+    assert pipeline.explain().splitlines()[1].endswith("hit")
+
+
+def _square_score(table: Table) -> Table:
+    return Table(
+        [{**row, "score": row["score"] ** 2} for row in table.to_list()],
+        schema=table.schema,
+    )
+
+
+def test_shared_memory_table_roundtrip():
+    from corepy.runtime.shm import export_table, import_table
+
+    rows = [
+        {"id": 1, "name": "Alice", "score": 90.5, "ok": True, "tag": None},
+        {"id": 2, "name": None, "score": 85.0, "ok": False, "tag": 3},
+    ]
+    shm, descriptor = export_table(Table(rows))
+    try:
+        assert import_table(descriptor).to_list() == rows
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def test_pipeline_process_pool_matches_serial_run():
+    from corepy.runtime import ProcessPool
+
+    rows = [{"id": i, "score": float(i)} for i in range(50)]
+    pipeline = Pipeline([_square_score])
+    with ProcessPool(max_workers=2) as pool:
+        first = pipeline.run(Table(rows), pool=pool, partitions=3)
+        second = pipeline.run(Table(rows), pool=pool)
+    expected = pipeline.run(Table(rows))
+    assert first.to_list() == expected.to_list()
+    assert second.to_list() == expected.to_list()
+
+
+def test_pipeline_stream_fixed_batches():
+    rows = [{"i": i} for i in range(10)]
+    pipeline = Pipeline([lambda t: Table([{"n": len(t)}])])
+    sizes = [t.to_list()[0]["n"] for t in pipeline.stream(Table(rows), batch_size=4)]
+    assert sizes == [4, 4, 2]
+
+    # Iterables of tables are re-batched
+    chunks = [Table(rows[:3]), Table(rows[3:])]
+    sizes = [t.to_list()[0]["n"] for t in pipeline.stream(chunks, batch_size=5)]
+    assert sizes == [5, 5]
+
+
+def test_adaptive_batch_sizer_targets_latency():
+    from corepy.runtime import AdaptiveBatchSizer
+
+    sizer = AdaptiveBatchSizer(initial=10, target_latency=0.1, max_size=10_000)
+    # 1ms per row -> 100 rows hit the 100ms target
+    for _ in range(10):
+        sizer.observe(sizer.batch_size, sizer.batch_size * 0.001)
+    assert sizer.batch_size == 100
+    assert sizer.settled
+
+
+def test_adaptive_batch_sizer_memory_budget_and_throughput():
+    from corepy.runtime import AdaptiveBatchSizer
+
+    # Fixed overhead per batch: throughput grows with size until the budget caps it
+    sizer = AdaptiveBatchSizer(initial=16, memory_budget=64 * 100)
+    for _ in range(20):
+        rows = sizer.batch_size
+        sizer.observe(rows, 0.01 + rows * 1e-6, nbytes=rows * 64)
+    assert sizer.batch_size == 100
+    assert sizer.settled
+
+
+def test_pipeline_stream_reports_stage_stats():
+    from corepy.runtime import AdaptiveBatchSizer
+
+    def passthrough(table: Table) -> Table:
+        return table
+
+    rows = [{"i": i} for i in range(1000)]
+    sizer = AdaptiveBatchSizer(initial=8, max_size=256)
+    out = list(Pipeline([passthrough]).stream(Table(rows), batch_size=sizer))
+    assert sum(len(t) for t in out) == 1000
+    report = sizer.report()
+    assert report["batches"] == len(out)
+    assert (
+        "[0] test_pipeline_stream_reports_stage_stats.<locals>.passthrough"
+        in report["stages"]
+    )
@@ -41,3 +41,15 @@ def test_schema_field_metadata():
     schema.add_field("score", "float", metadata={"unit": "points"})
     field = schema.get_field("score")
     assert field.metadata["unit"] == "points"
+
+def test_schema_get_field_index_tracks_changes():
+    schema = Schema(fields=[{"name": f"c{i}", "dtype": "int"} for i in range(100)])
+    assert schema.get_field("c99").name == "c99"
+    schema.add_field("late", "str")
+    assert schema.get_field("late").dtype == "str"
+    schema.fields[0] = Field(name="renamed", dtype="float")
+    assert schema.get_field("c0") is None
+    assert schema.get_field("renamed").dtype == "float"
+    schema.fields = schema.fields[1:] + [Field(name="c0", dtype="int")]
+    assert schema.get_field("c0").name == "c0"
+    assert schema == Schema(fields=list(schema.fields))
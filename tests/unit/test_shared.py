@@ -0,0 +1,79 @@
+import gc
+import multiprocessing
+import uuid
+
+import pytest
+
+
+def _read_shared(name, queue):
+    from corepy import shared
+
+    table = shared.get(name)
+    queue.put((
+        table["x"].to_pylist()[-3:],
+        table["s"].to_pylist()[:2],
+        isinstance(table["x"].values, memoryview),
+        shared.refcount(name),
+    ))
+
+def test_shared_table_is_mapped_by_other_processes():
+    from corepy import shared
+    from corepy.data import Table
+
+    if "fork" not in multiprocessing.get_all_start_methods():
+        pytest.skip("needs fork")
+    name = f"test-{uuid.uuid4()}"
+    table = Table.from_pydict({"x": list(range(100)), "s": ["a", None] * 50})
+    shared.put(name, table)
+    try:
+        with pytest.raises(ValueError):
+            shared.put(name, Table.from_pydict({"x": [1]}))
+        ctx = multiprocessing.get_context("fork")
+        queue = ctx.Queue()
+        workers = [
+            ctx.Process(target=_read_shared, args=(name, queue)) for _ in range(2)
+        ]
+        for worker in workers:
+            worker.start()
+        results = [queue.get(timeout=30) for _ in workers]
+        for worker in workers:
+            worker.join()
+        for tail, strings, zero_copy, holders in results:
+            assert tail == [97, 98, 99] and strings == ["a", None] and zero_copy
+            assert holders >= 2
+        # Workers exited without releasing: their slots are reclaimed
+        assert shared.refcount(name) == 1
+    finally:
+        shared.release(name)
+    with pytest.raises(KeyError):
+        shared.get(name)
+
+def test_shared_tensor_refcount_follows_references():
+    from array import array
+
+    from corepy import shared
+    from corepy.backend.types import DataType
+    from corepy.tensor import Tensor
+
+    name = f"test-{uuid.uuid4()}"
+    source = Tensor(array("d", range(6)), dtype=DataType.FLOAT64)
+    shared.put(name, source.to_table().to_tensor(layout="col"))
+    tensor = shared.get(name)
+    assert shared.get(name) is tensor and shared.refcount(name) == 2
+    assert tensor.shape == (1, 6) and tensor.dtype == DataType.FLOAT64
+    values = memoryview(tensor._backing_data).cast("B").cast("d").tolist()
+    assert values == [0.0, 1.0, 2.0, 3.0, 4.0, 5.0]
+    # The mapping is read-only: a write would reach every other process
+    with pytest.raises(TypeError):
+        memoryview(tensor._backing_data).cast("B")[0] = 1
+    table = tensor.to_table(layout="col")
+    del tensor
+    gc.collect()
+    assert shared.refcount(name) == 1
+    shared.release(name)
+    with pytest.raises(KeyError):
+        shared.refcount(name)
+    # Views taken before the last release stay readable
+    assert table["column_0"].to_pylist()[-1] == 5.0
+    with pytest.raises(TypeError):
+        shared.put(name, [1, 2, 3])